@@ -10,6 +10,11 @@ import time
 import traceback
 from typing import Optional
 
+# Installed before any other project or third-party import so it sees them all
+from lib.startup_trace import startup_trace
+
+startup_trace.install_if_enabled()
+
 from utils.vlc_plugin_cache import ensure_vlc_plugin_cache_if_stale
 
 ensure_vlc_plugin_cache_if_stale()
@@ -121,6 +126,7 @@ class MuseAppQt(FramelessWindowMixin, SmartMainWindow):
         self._effective_volume = int(Globals.DEFAULT_VOLUME_THRESHOLD)
         self._library_data: Optional[LibraryData] = None
         self._closing = False  # Guard for multiple on_closing calls
+        self._first_paint_done = False
         self._active_run_token = None
         self._pending_resume_filepath: Optional[str] = None
         self._pending_resume_position_ms: int = 0
@@ -573,7 +579,23 @@ class MuseAppQt(FramelessWindowMixin, SmartMainWindow):
             self._media_key_handler.stop()
         
         # Save app config (not geometry - SmartMainWindow handles that)
-        self.store_info_cache()
+        self.store_info_cache(on_exit=True)
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self._first_paint_done:
+            self._first_paint_done = True
+            startup_trace.mark("first paint")
+            logger.info(f"First paint {startup_trace.elapsed():.2f}s after startup")
+            QTimer.singleShot(0, self._after_first_paint)
+
+    def _after_first_paint(self):
+        # Extension history and window data are not needed to draw the main window
+        try:
+            PersistentDataManager.load_deferred()
+        except Exception as e:
+            logger.error(e)
+        startup_trace.finish()
 
     def _start_watchlist_service(self) -> None:
         try:
@@ -670,8 +692,12 @@ class MuseAppQt(FramelessWindowMixin, SmartMainWindow):
         override_scheduled = self.current_run is not None and not self.current_run.is_placeholder()
         self.run(override_scheduled=override_scheduled)
 
-    def store_info_cache(self):
-        """Save application config to cache. Geometry is handled by SmartMainWindow."""
+    def store_info_cache(self, on_exit=False):
+        """Save application config to cache. Geometry is handled by SmartMainWindow.
+
+        During normal use the persistent stores are queued for the background
+        writer; on exit they are flushed with a bounded wait.
+        """
         if self.runner_app_config is not None:
             if app_info_cache.set_history(self.runner_app_config):
                 if self.config_history_index > 0:
@@ -679,7 +705,10 @@ class MuseAppQt(FramelessWindowMixin, SmartMainWindow):
         app_info_cache.set("config_history_index", self.config_history_index)
         self._save_playback_session()
         # Note: Window geometry is saved by SmartMainWindow.closeEvent()
-        PersistentDataManager.store()
+        if on_exit:
+            PersistentDataManager.store_on_exit()
+        else:
+            PersistentDataManager.request_store(PersistentDataManager.APP_INFO_CACHE)
 
     def quit(self):
         if qt_alert(self, _("Confirm Quit"), _("Would you like to quit the application?"), "askokcancel"):
@@ -792,6 +821,7 @@ class MuseAppQt(FramelessWindowMixin, SmartMainWindow):
         if current_track is not None:
             from ui_qt.favorites_window import FavoritesWindow
             FavoritesWindow.set_favorite(current_track, favorited)
+            PersistentDataManager.request_store(PersistentDataManager.FAVORITES)
 
     def set_muse(self, _state=None):
         self.runner_app_config.muse = self.muse_check.isChecked()
@@ -820,6 +850,7 @@ class MuseAppQt(FramelessWindowMixin, SmartMainWindow):
             self._sort_config_label.setText(
                 _("(custom)") if result else _("(defaults)")
             )
+            PersistentDataManager.request_store(PersistentDataManager.SORT_CONFIG)
             self.store_info_cache()
 
     def set_widgets_from_config(self):
@@ -839,6 +870,8 @@ class MuseAppQt(FramelessWindowMixin, SmartMainWindow):
 
     def get_args(self, track=None):
         self.store_info_cache()
+        # The library caches change when the tracks for a run are gathered
+        PersistentDataManager.request_store(PersistentDataManager.LIBRARY_CACHES)
         self.set_delay()
         args = RunConfig()
         args.playlist_sort_type = PlaylistSortType.get_from_translation(self.sort_type_combo.currentText())
@@ -1175,6 +1208,10 @@ class MuseAppQt(FramelessWindowMixin, SmartMainWindow):
         from ui_qt.playlist_window import MasterPlaylistWindow
         if MasterPlaylistWindow.top_level is not None:
             MasterPlaylistWindow.top_level.on_track_change(audio_track)
+        # A new track updates the recently played lists and the muse memory
+        PersistentDataManager.request_store(
+            PersistentDataManager.RECENTLY_PLAYED, PersistentDataManager.MUSE_MEMORY
+        )
         QApplication.processEvents()
 
     def update_next_up_text(self, next_up_text, no_title=False):
@@ -1650,7 +1687,9 @@ class MuseAppQt(FramelessWindowMixin, SmartMainWindow):
 
 
 def main():
-    app = QApplication(sys.argv)
+    startup_trace.mark("imports done")
+    with startup_trace.step("QApplication"):
+        app = QApplication(sys.argv)
     app.setApplicationName("Muse")
     # Set application-level icon (used for taskbar, Alt+Tab, etc.)
     # Note: The title bar icon is set separately in MuseAppQt.__init__
@@ -1658,12 +1697,15 @@ def main():
     icon_path = os.path.join(assets, "icon.png")
     if os.path.isfile(icon_path):
         app.setWindowIcon(QIcon(icon_path))
-    window = MuseAppQt()
+    with startup_trace.step("MuseAppQt()"):
+        window = MuseAppQt()
     # Set default size before restoring geometry (in case no saved geometry exists)
     window.resize(1200, 700)
     # Restore saved window geometry (handled by SmartMainWindow)
     window.restore_window_geometry()
-    window.show()
+    with startup_trace.step("window.show()"):
+        window.show()
+    # The startup trace is finished after the first paint (see MuseAppQt.paintEvent)
 
     def graceful_shutdown(*args):
         logger.info("Caught signal, shutting down gracefully...")
@@ -1,7 +1,7 @@
 import datetime
-import requests
 import time
 
+from extensions.http_cache import http_cache
 from utils.logging_setup import get_logger
 
 logger = get_logger(__name__)
@@ -195,6 +195,9 @@ class Event:
                 events.append(event_to_merge)
 
 
+CALENDAR_CACHE_TTL_SECONDS = 7 * 24 * 60 * 60
+
+
 class HolidayAPI:
     BASE_URL = "https://holidayapi.com/v1/holidays"
 
@@ -207,7 +210,7 @@ class HolidayAPI:
     def get_events_for_country(self, country="US", year=-1):
         events = []
         try:
-            events_json = requests.get(self.__build_url(country, year)).json()
+            events_json = http_cache.get_json(self.__build_url(country, year), ttl=CALENDAR_CACHE_TTL_SECONDS)
             for event in events_json:
                 events.append(Event.from_holiday_api(event))
         except Exception as e:
@@ -235,7 +238,7 @@ class NagerPublicHolidaysAPI:
     def get_events_for_country(self, country_code="US", year=-1):
         events = []
         try:
-            events_json = requests.get(self.__build_url(country_code, year)).json()
+            events_json = http_cache.get_json(self.__build_url(country_code, year), ttl=CALENDAR_CACHE_TTL_SECONDS)
             for event in events_json:
                 events.append(Event.from_nager_public_holidays_api(event))
         except Exception as e:
@@ -262,10 +265,11 @@ class InadiutoriumAPI:
     def get_events_for_month(self, year=-1, month=-1):
         events = []
         try:
-            events_json = requests.get(self.__build_url(year, month)).json()
-            for event in events_json:
+            response = http_cache.get(self.__build_url(year, month), ttl=CALENDAR_CACHE_TTL_SECONDS)
+            for event in response.json():
                 events.append(Event.from_inadiutorium_api(event))
-            time.sleep(0.5)
+            if not response.from_cache:
+                time.sleep(0.5)
         except Exception as e:
             logger.error("Error getting events from Inadiutorium API: " + str(e))
             raise e
@@ -293,7 +297,7 @@ class HijriCalendarAPI:
     def get_events_for_month(self, month=-1, year=-1):
         events = []
         try:
-            dates_json  = requests.get(self.__build_url(month, year)).json()["data"]
+            dates_json  = http_cache.get_json(self.__build_url(month, year), ttl=CALENDAR_CACHE_TTL_SECONDS)["data"]
             for date in dates_json:
                 if len(date["hijri"]["holidays"]) > 0:
                     events.append(Event.from_hijri_api(date))
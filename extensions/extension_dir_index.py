@@ -0,0 +1,141 @@
+"""
+Filename index for the extension download directory.
+
+ExtensionManager.check_dir_for_close_match looks for a file whose path is
+similar (Utils.is_similar_strings) to the destination yt-dlp reported, for
+downloads that landed under a slightly different name.  Rather than listing
+the directory and computing an edit distance against every file on each
+call, DirectoryFilenameIndex keeps the files of the directory with the
+trigrams of their case-folded names:
+
+- The listing is refreshed when the directory mtime changes, incrementally:
+  only new names are stat'ed and removed names are dropped.
+- add() and discard() keep it current when extensions are downloaded or
+  deleted, even on filesystems with a coarse mtime.
+- Before the edit distance is computed, a file is skipped if the candidate
+  has more trigrams missing from its name than the distance threshold
+  allows.  Every edit changes at most three trigrams, so the prefilter never
+  skips a file is_similar_strings would accept.
+"""
+
+import os
+import threading
+from typing import Dict, FrozenSet, Optional
+
+from utils.logging_setup import get_logger
+from utils.utils import Utils
+
+logger = get_logger(__name__)
+
+
+class DirectoryFilenameIndex:
+    NGRAM_SIZE = 3
+
+    _indexes: Dict[str, "DirectoryFilenameIndex"] = {}
+    _indexes_lock = threading.Lock()
+
+    def __init__(self, directory: str) -> None:
+        self.directory = os.path.abspath(directory)
+        self._files: Dict[str, FrozenSet[str]] = {}  # name -> trigrams of the case-folded name
+        self._mtime_ns: Optional[int] = None
+        self._lock = threading.Lock()
+        self.stats: Dict[str, int] = {"scans": 0, "compared": 0, "skipped": 0}
+
+    @classmethod
+    def for_directory(cls, directory: str) -> "DirectoryFilenameIndex":
+        """The shared index of *directory*."""
+        key = os.path.abspath(directory)
+        with cls._indexes_lock:
+            index = cls._indexes.get(key)
+            if index is None:
+                index = cls(key)
+                cls._indexes[key] = index
+            return index
+
+    @staticmethod
+    def normalize(name: str) -> str:
+        # Fold case one character at a time so the edit distance cannot grow
+        return "".join(c if len(c.lower()) != 1 else c.lower() for c in name)
+
+    @classmethod
+    def ngrams(cls, text: str) -> FrozenSet[str]:
+        n = cls.NGRAM_SIZE
+        return frozenset(text[i:i + n] for i in range(len(text) - n + 1))
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def refresh(self) -> None:
+        """Bring the listing up to date if the directory has changed."""
+        try:
+            mtime_ns = os.stat(self.directory).st_mtime_ns
+        except OSError:
+            with self._lock:
+                self._files.clear()
+                self._mtime_ns = None
+            return
+        if mtime_ns == self._mtime_ns:
+            return
+        names = set(os.listdir(self.directory))
+        with self._lock:
+            for name in [name for name in self._files if name not in names]:
+                del self._files[name]
+            for name in names:
+                if name not in self._files and os.path.isfile(os.path.join(self.directory, name)):
+                    self._files[name] = self.ngrams(self.normalize(name))
+            self._mtime_ns = mtime_ns
+            self.stats["scans"] += 1
+
+    def add(self, filepath: Optional[str]) -> None:
+        name = self._name_in_directory(filepath)
+        if name is not None and os.path.isfile(filepath):
+            with self._lock:
+                self._files[name] = self.ngrams(self.normalize(name))
+
+    def discard(self, filepath: Optional[str]) -> None:
+        name = self._name_in_directory(filepath)
+        if name is not None:
+            with self._lock:
+                self._files.pop(name, None)
+
+    def find_close_match(self, t: str) -> Optional[str]:
+        """
+        Return the path of a file in the directory similar to the path *t*
+        by Utils.is_similar_strings, or None.
+        """
+        self.refresh()
+        with self._lock:
+            files = list(self._files.items())
+        if os.path.dirname(t) != self.directory:
+            # The distance between paths only reduces to the distance between
+            # names when both are in the same directory
+            return self._find_by_distance(t, [name for name, _ in files])
+
+        t_grams = self.ngrams(self.normalize(os.path.basename(t)))
+        candidates = []
+        for name, grams in files:
+            filepath = os.path.join(self.directory, name)
+            max_distance = Utils.similar_strings_threshold(len(filepath), len(t)) - 1
+            if (max_distance < 0 or abs(len(filepath) - len(t)) > max_distance
+                    or len(t_grams - grams) > self.NGRAM_SIZE * max_distance):
+                self.stats["skipped"] += 1
+                continue
+            candidates.append(name)
+        return self._find_by_distance(t, candidates)
+
+    def _find_by_distance(self, t: str, names) -> Optional[str]:
+        for name in names:
+            filepath = os.path.join(self.directory, name)
+            self.stats["compared"] += 1
+            if Utils.is_similar_strings(filepath, t, True):
+                logger.info(f"Found close match: {name}")
+                return filepath
+        return None
+
+    def _name_in_directory(self, filepath: Optional[str]) -> Optional[str]:
+        if not filepath:
+            return None
+        filepath = os.path.abspath(filepath)
+        if os.path.dirname(filepath) != self.directory:
+            return None
+        return os.path.basename(filepath)
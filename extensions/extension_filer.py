@@ -21,6 +21,7 @@ from __future__ import annotations
 import os
 from typing import TYPE_CHECKING, Any, Optional
 
+from extensions.extension_dir_index import DirectoryFilenameIndex
 from utils.config import config
 from utils.globals import TrackAttribute
 from utils.logging_setup import get_logger
@@ -231,6 +232,7 @@ def delete_extension_file(filepath: str) -> bool:
         os.remove(filepath)
         logger.info("Deleted extension file: %s", filepath)
         if config.directories:
+            DirectoryFilenameIndex.for_directory(config.directories[0]).discard(filepath)
             _remove_empty_parents(filepath, config.directories[0])
         return True
     except OSError as e:
@@ -3,10 +3,13 @@ import os
 import random
 import re
 import subprocess
-from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Union
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple, Union
 
+from extensions.extension_dir_index import DirectoryFilenameIndex
 from extensions.llm import LLM, LLMResponseException
-from extensions.library_extender import LibraryExtender
 from extensions.soup_utils import SoupUtils
 from muse.playback_config_master import PlaybackConfigMaster
 from muse.prompter import Prompter
@@ -15,6 +18,7 @@ from utils.config import config
 from utils.globals import TrackAttribute, ExtensionStrategy
 from utils.job_queue import JobQueue
 from utils.logging_setup import get_logger
+from utils.persistent_data_manager import PersistentDataManager
 from utils.utils import Utils
 from utils.translations import I18N
 
@@ -27,6 +31,50 @@ _ = I18N._
 # Get logger for this module
 logger = get_logger(__name__)
 
+# Compilation albums/playlists, typically bad choices for single track selection
+_COMPILATION_PATTERN = re.compile("|".join([
+    # Number + "Most" patterns (e.g., "50 Most Beautiful", "100 Most")
+    r'\d+\s+most\s+(beautiful|greatest|best|popular|famous|essential)',
+    # "Best of" patterns
+    r'best\s+of\s+',
+    # "Essential" patterns
+    r'essential\s+(classical|music|collection)',
+    # "Greatest Hits" patterns
+    r'greatest\s+hits',
+    # "Collection" patterns (when it's clearly a compilation)
+    r'(the\s+)?(complete|definitive|ultimate|premium)\s+collection',
+    # "Top X" patterns
+    r'top\s+\d+',
+    # "Ultimate" patterns
+    r'ultimate\s+(collection|anthology|best)',
+    # "Anthology" patterns
+    r'anthology',
+    # "Compilation" patterns
+    r'compilation',
+    # "Various Artists" or similar
+    r'various\s+artists',
+]), re.IGNORECASE)
+_NOT_MUSIC_PATTERN = re.compile(r'biography|(^|\W)RPG', re.IGNORECASE)
+# Spaced '@' as in "artist @ venue" (not email-like local@domain.tld)
+_SPACED_AT_PATTERN = re.compile(r"\s@\s")
+# Symbols standing alone between whitespace (not typical prose punctuation)
+_STANDALONE_SYMBOL_PATTERN = re.compile(r"(^|\s)([#*%$^~=<>+|\\`])($|\s)")
+
+
+@dataclass
+class CandidateRanking:
+    """Result of ExtensionManager.rank_candidates for one page of search results."""
+    # Candidates that passed every filter, in rank order
+    candidates: List[Any] = field(default_factory=list)
+    # Filter stage name -> candidates it rejected
+    rejected: Dict[str, List[Any]] = field(default_factory=dict)
+    # Stage name -> seconds spent, including "metrics" and "rank"
+    timings: Dict[str, float] = field(default_factory=dict)
+
+    def slowest_stage(self) -> Optional[str]:
+        return max(self.timings, key=self.timings.get) if self.timings else None
+
+
 class ExtensionManager:
     # This class should hold a short history of library extensions
     # with convenience methods for filing them into the right
@@ -38,8 +86,15 @@ class ExtensionManager:
     extension_thread_delayed_complete: bool = False
     EXTENSION_QUEUE: JobQueue = JobQueue("Extension queue")
     DELAYED_THREADS: List[Any] = []
+    # Past this length, records of failed extensions and of extension files that
+    # no longer exist are compacted away; the candidate IDs of successful ones are
+    # kept (up to max_compacted_ids) so they are still never re-extended.
     max_extensions_length: int = 100000
+    max_compacted_ids: int = 100000
     minimum_allowed_duration_seconds: int = 120
+    # Threads used to run the candidate filters in rank_candidates; the filters
+    # are mostly pure Python, so more than one only helps if a check blocks.
+    candidate_scoring_workers: int = 1
     extension_thread: Optional[Any] = None
 
     # Candidate currently selected and waiting out its pre-download delay, if any.
@@ -49,9 +104,22 @@ class ExtensionManager:
     # excluded from future selection via _bad_option/_is_rejected.
     rejected_ids: set = set()
 
+    # Hashed indexes over ``extensions``, rebuilt on load and maintained by _append.
+    _by_filename: Dict[str, Dict[str, Any]] = {}
+    _by_candidate_id: Dict[str, Dict[str, Any]] = {}
+    _by_attr_value: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+    _indexed_count: int = 0
+    # Candidate IDs of successful extensions whose records were compacted away.
+    compacted_ids: Dict[str, None] = {}
+    # Length the history must pass before the next compaction, when the last one
+    # could not bring it under max_extensions_length.
+    _compaction_floor: int = 0
+
     @staticmethod
     def load_extensions() -> None:
         ExtensionManager.extensions = app_info_cache.get("extensions", [])
+        ExtensionManager.compacted_ids = dict.fromkeys(app_info_cache.get("compacted_extension_ids", []))
+        ExtensionManager._rebuild_indexes()
         # Load strategy from cache, defaulting to RANDOM if not found
         strategy_name = app_info_cache.get("extension_strategy", "RANDOM")
         try:
@@ -66,6 +134,117 @@ class ExtensionManager:
         app_info_cache.set("extensions", list(ExtensionManager.extensions))
         app_info_cache.set("extension_strategy", ExtensionManager.strategy.name)
         app_info_cache.set("rejected_extension_ids", list(ExtensionManager.rejected_ids))
+        app_info_cache.set("compacted_extension_ids", list(ExtensionManager.compacted_ids))
+
+    @staticmethod
+    def _candidate_id(extension: Dict[str, Any]) -> Optional[str]:
+        candidate_id = extension.get("candidate_id")
+        if candidate_id is None and extension.get("filename") is not None:
+            # Records from before candidate_id was stored: read it from the raw result
+            try:
+                from extensions.library_extender import q20, q23, q29
+            except Exception:
+                return None
+            details = extension.get(q20) or {}
+            candidate_id = details.get(q29) or details.get(q23)
+        return candidate_id
+
+    @staticmethod
+    def _attr_value_key(attr: Optional[Union[TrackAttribute, str]], value: Optional[str]) -> Tuple[str, str]:
+        attr_name = attr.name if isinstance(attr, TrackAttribute) else (attr or "<unknown>")
+        return attr_name, (value or "").strip().lower()
+
+    @staticmethod
+    def _index(extension: Dict[str, Any]) -> None:
+        filename = extension.get("filename")
+        if filename:
+            ExtensionManager._by_filename[filename] = extension
+        if not extension.get("failed"):
+            candidate_id = ExtensionManager._candidate_id(extension)
+            if candidate_id:
+                ExtensionManager._by_candidate_id[candidate_id] = extension
+        key = ExtensionManager._attr_value_key(extension.get("track_attr"), extension.get("search_query"))
+        ExtensionManager._by_attr_value.setdefault(key, []).append(extension)
+        ExtensionManager._indexed_count += 1
+
+    @staticmethod
+    def _rebuild_indexes() -> None:
+        ExtensionManager._by_filename = {}
+        ExtensionManager._by_candidate_id = {}
+        ExtensionManager._by_attr_value = {}
+        ExtensionManager._indexed_count = 0
+        for extension in ExtensionManager.extensions:
+            try:
+                ExtensionManager._index(extension)
+            except Exception as e:
+                logger.warning(f"Failed to index extension record: {e}")
+
+    @staticmethod
+    def _ensure_indexes() -> None:
+        # The extensions list may have been replaced or edited in place
+        if ExtensionManager._indexed_count != len(ExtensionManager.extensions):
+            ExtensionManager._rebuild_indexes()
+
+    @staticmethod
+    def _compact() -> bool:
+        """
+        Once the history is longer than max_extensions_length, drop the records of
+        failed extensions and of extension files that no longer exist, keeping the
+        candidate IDs of the successful ones. Records of files still present are
+        never dropped, so if too few records can go, the next check waits until the
+        history has grown by another tenth of the bound.
+        """
+        limit = max(ExtensionManager.max_extensions_length, ExtensionManager._compaction_floor)
+        if len(ExtensionManager.extensions) <= limit:
+            return False
+        kept = []
+        dropped = 0
+        for extension in ExtensionManager.extensions:
+            filename = extension.get("filename")
+            if not extension.get("failed") and filename and os.path.exists(filename):
+                kept.append(extension)
+                continue
+            if not extension.get("failed"):
+                candidate_id = ExtensionManager._candidate_id(extension)
+                if candidate_id:
+                    ExtensionManager.compacted_ids[candidate_id] = None
+            dropped += 1
+        ExtensionManager.extensions = kept
+        ExtensionManager._compaction_floor = len(kept) + ExtensionManager.max_extensions_length // 10
+        overflow = len(ExtensionManager.compacted_ids) - ExtensionManager.max_compacted_ids
+        if overflow > 0:
+            ExtensionManager.compacted_ids = dict.fromkeys(list(ExtensionManager.compacted_ids)[overflow:])
+        logger.info(f"Compacted extension history, dropped {dropped} failed or missing records")
+        return dropped > 0
+
+    @staticmethod
+    def remove_extension(extension: Dict[str, Any]) -> bool:
+        if extension not in ExtensionManager.extensions:
+            return False
+        ExtensionManager.extensions.remove(extension)
+        ExtensionManager._rebuild_indexes()
+        return True
+
+    @staticmethod
+    def clear_extensions() -> None:
+        ExtensionManager.extensions = []
+        ExtensionManager.compacted_ids = {}
+        ExtensionManager._compaction_floor = 0
+        ExtensionManager._rebuild_indexes()
+
+    @staticmethod
+    def was_extended(candidate_id: Optional[str]) -> bool:
+        """Whether the candidate with this ID was already downloaded as an extension."""
+        if not candidate_id:
+            return False
+        ExtensionManager._ensure_indexes()
+        return candidate_id in ExtensionManager._by_candidate_id or candidate_id in ExtensionManager.compacted_ids
+
+    @staticmethod
+    def get_extensions_for(attr: Optional[Union[TrackAttribute, str]], value: Optional[str]) -> List[Dict[str, Any]]:
+        """Records of extensions searched for by *attr* with *value* (case-insensitive), oldest first."""
+        ExtensionManager._ensure_indexes()
+        return list(ExtensionManager._by_attr_value.get(ExtensionManager._attr_value_key(attr, value), []))
 
     @staticmethod
     def reject_pending_candidate() -> bool:
@@ -83,7 +262,7 @@ class ExtensionManager:
             return False
         ExtensionManager.rejected_ids.add(pending["id"])
         pending["rejected"] = True
-        ExtensionManager.store_extensions()
+        PersistentDataManager.request_store(PersistentDataManager.EXTENSIONS)
         return True
 
     def __init__(self, ui_callbacks: Optional[Any], data_callbacks: Optional[Any]) -> None:
@@ -97,6 +276,7 @@ class ExtensionManager:
 
     def start_extensions_thread(self, initial_sleep: bool = True, overwrite_cache: bool = False, voice: Optional[Any] = None) -> None:
         logger.info('Starting extensions thread')
+        PersistentDataManager.load_deferred()
         if ExtensionManager.extension_thread is not None and ExtensionManager.extension_thread.is_alive():
             logger.info('Extension thread already running')
             return
@@ -309,20 +489,11 @@ class ExtensionManager:
             for i in a:
                 i.n = SoupUtils.clean_html(i.n)
                 i.d = SoupUtils.clean_html(i.d)
-                i.m = self._m(q, i.n)
                 logger.info(f"Extension option: {i.n} {i.x()}")
-            opts = []
-            shuffled = a.copy()
-            random.shuffle(shuffled)
-            # Slightly bias toward higher quality results
-            for i in range(len(shuffled) - 1):
-                if shuffled[i].ggi() < shuffled[i + 1].ggi() and random.random() < 0.3:
-                    shuffled[i], shuffled[i + 1] = shuffled[i + 1], shuffled[i]
-            for b in shuffled:
-                if not self._bad_option(b, strict, attr):
-                    opts.append(b)
-                    if len(opts) >= 2:  # Found two valid options
-                        break
+            ranking = self.rank_candidates(q, a, strict=strict, attr=attr, limit=2)  # a valid option and a backup
+            logger.debug("Candidate scoring timings: " + ", ".join(
+                f"{stage}={seconds * 1000:.1f}ms" for stage, seconds in ranking.timings.items()))
+            opts = ranking.candidates
             if len(opts) == 0:
                 if depth > 4:
                     logger.error(f"Unable to find valid results after multiple attempts: {q}")
@@ -342,13 +513,97 @@ class ExtensionManager:
             else:
                 logger.warning(f'No results found for "{q}"')
 
+    def rank_candidates(self, q: str, candidates: List[Any], strict: Optional[Union[str, 'Composer']] = None,
+                        attr: Optional[TrackAttribute] = None, limit: Optional[int] = None,
+                        shuffle: bool = True, workers: Optional[int] = None) -> CandidateRanking:
+        """
+        Score and filter one page of search results for query *q* together.
+
+        The quality metrics of all candidates are computed in one pass, then the
+        filters of _bad_option run stage by stage over the candidates still in
+        play, cheapest first.  Survivors are ranked by quality (with some
+        randomness if *shuffle*) and the library check, the most expensive
+        stage, runs in rank order until *limit* candidates have passed.
+        """
+        ranking = CandidateRanking()
+        workers = self.candidate_scoring_workers if workers is None else workers
+
+        start = time.perf_counter()
+        remaining = [b for b in candidates if b is not None]
+        for b, metrics in zip(remaining, self._m_batch(q, [b.n for b in remaining])):
+            b.m = metrics
+        ranking.timings["metrics"] = time.perf_counter() - start
+
+        stages: List[Tuple[str, Callable[[Any], bool]]] = [
+            ("unsupported", lambda b: b.y),
+            ("too_short", lambda b: b.xfgi(self.minimum_allowed_duration_seconds)),
+            ("rejected", self._is_rejected),
+            ("extended", self._was_extended),
+            ("emoji", lambda b: Utils.contains_emoji(b.n) and random.random() > 0.05),  # 95% chance to skip emoji titles
+            ("compilation", self._is_compilation),
+            ("not_music", self._not_music),
+            ("blacklisted", self._is_blacklisted),
+        ]
+        if strict:
+            stages.append(("strict", lambda b: self._strict_test(b, attr, strict)))
+
+        pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="candidate-scoring") if workers > 1 else None
+        try:
+            for stage, check in stages:
+                remaining = self._run_stage(ranking, stage, check, remaining, pool, workers)
+
+            start = time.perf_counter()
+            remaining = self._rank(remaining, shuffle)
+            ranking.timings["rank"] = time.perf_counter() - start
+
+            ranking.candidates = self._run_stage(ranking, "in_library", self.is_in_library, remaining, pool, workers, limit)
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=False)
+        return ranking
+
+    def _run_stage(self, ranking: CandidateRanking, stage: str, check: Callable[[Any], bool],
+                   candidates: List[Any], pool: Optional[ThreadPoolExecutor], workers: int,
+                   limit: Optional[int] = None) -> List[Any]:
+        """Return the candidates *check* does not reject, stopping once *limit* have passed."""
+        start = time.perf_counter()
+        passed, rejected = [], []
+        # With a limit, check only as many at a time as there are workers
+        batch_size = max(1, len(candidates) if limit is None else workers)
+        for i in range(0, len(candidates), batch_size):
+            if limit is not None and len(passed) >= limit:
+                break
+            batch = candidates[i:i + batch_size]
+            results = pool.map(check, batch) if pool is not None else map(check, batch)
+            for b, is_bad in zip(batch, results):
+                (rejected if is_bad else passed).append(b)
+        if limit is not None:
+            passed = passed[:limit]
+        if rejected:
+            ranking.rejected[stage] = rejected
+        ranking.timings[stage] = time.perf_counter() - start
+        return passed
+
+    @staticmethod
+    def _rank(candidates: List[Any], shuffle: bool = True) -> List[Any]:
+        if not shuffle:
+            return sorted(candidates, key=lambda b: b.ggi(), reverse=True)
+        ranked = candidates.copy()
+        random.shuffle(ranked)
+        # Slightly bias toward higher quality results
+        for i in range(len(ranked) - 1):
+            if ranked[i].ggi() < ranked[i + 1].ggi() and random.random() < 0.3:
+                ranked[i], ranked[i + 1] = ranked[i + 1], ranked[i]
+        return ranked
+
     def _bad_option(self, b, strict: bool = False, attr: Optional[TrackAttribute] = None) -> bool:
         return (b is None or b.y
                 or b.xfgi(self.minimum_allowed_duration_seconds)
+                or self._is_rejected(b)
+                or self._was_extended(b)
                 or self.is_in_library(b)
                 or (strict and self._strict_test(b, attr, strict))
                 or self._is_blacklisted(b)
-                or self._is_rejected(b)
                 or (Utils.contains_emoji(b.n) and random.random() > 0.05)  # 95% chance to skip emoji titles
                 or self._is_compilation(b)
                 or self._not_music(b))
@@ -359,6 +614,12 @@ class ExtensionManager:
             return True
         return False
 
+    def _was_extended(self, b) -> bool:
+        if ExtensionManager.was_extended(b.w):
+            logger.info(f"Skipping previously-extended candidate: {b.n}")
+            return True
+        return False
+
     def is_in_library(self, b) -> bool:
         if b.w is None or b.w.strip() == "":
             raise Exception("No ID found: " + str(b.x()))
@@ -393,49 +654,18 @@ class ExtensionManager:
         Detect compilation albums/playlists that are typically bad choices for single track selection.
         Example: "50 Most Beautiful X"
         """
-        # Compilation patterns to detect
-        compilation_patterns = [
-            # Number + "Most" patterns (e.g., "50 Most Beautiful", "100 Most")
-            r'\d+\s+most\s+(beautiful|greatest|best|popular|famous|essential)',
-            # "Best of" patterns
-            r'best\s+of\s+',
-            # "Essential" patterns
-            r'essential\s+(classical|music|collection)',
-            # "Greatest Hits" patterns
-            r'greatest\s+hits',
-            # "Collection" patterns (when it's clearly a compilation)
-            r'(the\s+)?(complete|definitive|ultimate|premium)\s+collection',
-            # "Top X" patterns
-            r'top\s+\d+',
-            # "Ultimate" patterns
-            r'ultimate\s+(collection|anthology|best)',
-            # "Anthology" patterns
-            r'anthology',
-            # "Compilation" patterns
-            r'compilation',
-            # "Various Artists" or similar
-            r'various\s+artists',
-        ]
-        return self._do_check(b, compilation_patterns)
+        return self._do_check(b, _COMPILATION_PATTERN)
     
     def _not_music(self, b) -> bool:
-        # Not music patterns to detect
-        patterns = [
-            r'biography',
-            r'(^|\W)RPG',
-        ]
-        return self._do_check(b, patterns)
+        return self._do_check(b, _NOT_MUSIC_PATTERN)
 
-    def _do_check(self, b, patterns: List[str], only_n: bool = False) -> bool:
+    def _do_check(self, b, pattern: re.Pattern, only_n: bool = False) -> bool:
         if not hasattr(b, 'n') or b.n is None:
             return False
         n = b.n.lower()
         d = b.d.lower() if hasattr(b, 'd') and b.d else ""
         text_to_check = n if only_n else f"{n} | {d}"
-        for pattern in patterns:
-            if re.search(pattern, text_to_check, re.IGNORECASE):
-                return True
-        return False
+        return pattern.search(text_to_check) is not None
 
     def delayed(self, b, attr: Optional[TrackAttribute], s: str, b1=None, entity: Optional[Any] = None) -> None:
         thread = Utils.start_thread(self._delayed, use_asyncio=False, args=[b, attr, s, b1, True, entity])
@@ -577,47 +807,49 @@ class ExtensionManager:
                 penalty += 0.08
             elif all(c.isupper() for c in letters):
                 penalty += 0.08
-        # Spaced '@' as in "artist @ venue" (not email-like local@domain.tld)
-        if re.search(r"\s@\s", title):
+        if _SPACED_AT_PATTERN.search(title):
             penalty += 0.07
-        # Other symbols standing alone between whitespace (not typical prose punctuation)
-        standalone = re.findall(r"(^|\s)([#*%$^~=<>+|\\`])($|\s)", title)
+        standalone = _STANDALONE_SYMBOL_PATTERN.findall(title)
         penalty += min(0.12, 0.04 * len(standalone))
         return min(penalty, 0.25)
 
     def _m(self, q: str, t: str) -> Dict[str, float]:
+        return self._m_batch(q, [t])[0]
+
+    def _m_batch(self, q: str, titles: List[str]) -> List[Dict[str, float]]:
+        # The query side is prepared once and the distances computed together
         q_lower = q.lower()
-        t_lower = t.lower()
-        
-        metrics = {}
-        
-        # 1. Substring containment (most important)
-        if q_lower in t_lower:
-            metrics['substring_match'] = len(q) / len(t)
-        else:
-            metrics['substring_match'] = 0.0
-        
-        # 2. Word overlap
         q_words = set(q_lower.split())
-        t_words = set(t_lower.split())
-        common_words = q_words.intersection(t_words)
-        metrics['word_overlap'] = len(common_words) / len(q_words) if q_words else 0.0
-        
-        # 3. String distance (normalized)
-        l_dist = Utils.string_distance(q, t)
-        max_len = max(len(q), len(t))
-        metrics['string_similarity'] = 1.0 - (l_dist / max_len) if max_len > 0 else 0.0
-        
-        # 4. Overall quality score (weighted combination)
-        base = (
-            metrics['substring_match'] * 0.5 +      # Most important
-            metrics['word_overlap'] * 0.3 +         # Important
-            metrics['string_similarity'] * 0.2      # Less important
-        )
-        metrics["presentation_penalty"] = ExtensionManager._j(t)
-        metrics["overall_quality"] = max(0.0, min(1.0, base - metrics["presentation_penalty"]))
-        
-        return metrics
+        distances = Utils.string_distances(q, titles)
+        results = []
+        for t, l_dist in zip(titles, distances):
+            t_lower = t.lower()
+            metrics = {}
+
+            # 1. Substring containment (most important)
+            if q_lower in t_lower:
+                metrics['substring_match'] = len(q) / len(t)
+            else:
+                metrics['substring_match'] = 0.0
+
+            # 2. Word overlap
+            common_words = q_words.intersection(t_lower.split())
+            metrics['word_overlap'] = len(common_words) / len(q_words) if q_words else 0.0
+
+            # 3. String distance (normalized)
+            max_len = max(len(q), len(t))
+            metrics['string_similarity'] = 1.0 - (l_dist / max_len) if max_len > 0 else 0.0
+
+            # 4. Overall quality score (weighted combination)
+            base = (
+                metrics['substring_match'] * 0.5 +      # Most important
+                metrics['word_overlap'] * 0.3 +         # Important
+                metrics['string_similarity'] * 0.2      # Less important
+            )
+            metrics["presentation_penalty"] = ExtensionManager._j(t)
+            metrics["overall_quality"] = max(0.0, min(1.0, base - metrics["presentation_penalty"]))
+            results.append(metrics)
+        return results
 
     def _append(self, b, f: Optional[str], attr: Optional[TrackAttribute], s: str, exception: Optional[str] = None):
         obj = dict(b.u)
@@ -626,6 +858,7 @@ class ExtensionManager:
         obj["strategy"] = ExtensionManager.strategy.name
         obj["track_attr"] = attr.name if attr is not None else "<unknown>"
         obj["search_query"] = s
+        obj["candidate_id"] = b.w
         
         # Calculate quality metrics if we have a valid result
         if exception is None and hasattr(b, 'n') and b.n:
@@ -643,21 +876,25 @@ class ExtensionManager:
         
         obj["failed"] = exception is not None
         obj["exception"] = exception
+        ExtensionManager._ensure_indexes()
         ExtensionManager.extensions.append(obj)
+        if f and config.directories:
+            DirectoryFilenameIndex.for_directory(config.directories[0]).add(f)
+        if ExtensionManager._compact():
+            ExtensionManager._rebuild_indexes()
+        else:
+            ExtensionManager._index(obj)
+        PersistentDataManager.request_store(PersistentDataManager.EXTENSIONS)
 
     def check_dir_for_close_match(self, t: Optional[str]) -> Optional[str]:
         if t is None or t.strip() == "":
             return None
-        _dir = os.path.abspath(config.directories[0])
-        for f in os.listdir(_dir):
-            filepath = os.path.join(_dir, f)
-            if os.path.isfile(filepath) and Utils.is_similar_strings(filepath, t, True):
-                logger.info(f"Found close match: {f}")
-                return filepath
-        return None
+        return DirectoryFilenameIndex.for_directory(config.directories[0]).find_close_match(t)
 
     def s(self, q, x=1):
         logger.info(f"s: {q}")
+        # Imported here: library_extender loads the Google API client
+        from extensions.library_extender import LibraryExtender
         return LibraryExtender.isyMOLB_(q, m=x)
 
     @staticmethod
@@ -666,9 +903,10 @@ class ExtensionManager:
             return None
         try:
             filepath = media_track.filepath
-            for extension in ExtensionManager.extensions:
-                if extension["filename"] == filepath:
-                    return extension
+            ExtensionManager._ensure_indexes()
+            extension = ExtensionManager._by_filename.get(filepath)
+            if extension is not None:
+                return extension
         except Exception as e:
             logger.error(f"Error getting extension details for {filepath}: {e}")
         logger.error(f"No extension details found for {filepath}")
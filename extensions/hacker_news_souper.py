@@ -53,11 +53,12 @@ class HackerNewsItem:
         return f"""{self.title} (from {self.source} {time_str}) {comments_str}"""
 
 class HackerNewsSouper():
+    CACHE_TTL_SECONDS = 10 * 60
 
     @staticmethod
     def get_hacker_news_items():
         # There is one table with alternating classes containing title and subline, so need to update the news item on every other row.
-        soup = SoupUtils.get_soup("https://news.ycombinator.com")
+        soup = SoupUtils.get_soup("https://news.ycombinator.com", ttl=HackerNewsSouper.CACHE_TTL_SECONDS)
         items = []
         main_table = SoupUtils.get_elements(class_path=[["tag", "table"]], parent=soup)[2]
         row_els = SoupUtils.get_elements(class_path=[["tag", "tr"]], parent=main_table)
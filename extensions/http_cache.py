@@ -0,0 +1,290 @@
+"""
+Shared HTTP cache for the extension fetchers.
+
+Responses are stored in the http_cache table of configs/muse_library.db, keyed
+by the SHA-256 of the URL.  The URL itself is not stored, since the fetchers
+pass API keys in query strings.  A response younger than the caller's TTL is served without touching
+the network; an older one is revalidated with a conditional request
+(If-None-Match / If-Modified-Since) when the server gave an ETag or
+Last-Modified, so an unchanged page costs a 304 rather than a full download.
+If the network is unavailable, the stale copy is served rather than failing.
+
+The table is bounded to MAX_BYTES of bodies: the least recently used entries
+are evicted first.  Only successful (2xx) responses are stored.  A cache hit
+does not write to the DB: its time of use is kept in memory and written in a
+batch before the next eviction, or once TOUCH_BATCH_SIZE hits are pending.
+
+On top of that, get_soup() keeps a small in-memory LRU of parsed
+BeautifulSoup documents, keyed by URL and body hash, so a page that has not
+changed is not parsed again.  Those documents are shared between callers and
+must be treated as read-only.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import requests
+
+from utils.logging_setup import get_logger
+
+logger = get_logger(__name__)
+
+
+class HTTPStatusError(Exception):
+    """Raised by CachedResponse.raise_for_status() for a 4xx/5xx response."""
+
+    def __init__(self, url: str, status: int):
+        super().__init__(f"HTTP {status} for {url}")
+        self.url = url
+        self.status = status
+
+
+@dataclass
+class CachedResponse:
+    url: str
+    status: int
+    content: bytes
+    content_type: str = ""
+    etag: str = ""
+    last_modified: str = ""
+    fetched_at: float = 0.0
+    from_cache: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status < 300
+
+    @property
+    def encoding(self) -> str:
+        for param in self.content_type.split(";")[1:]:
+            name, _, value = param.strip().partition("=")
+            if name.lower() == "charset" and value:
+                return value.strip('"')
+        return "utf-8"
+
+    @property
+    def text(self) -> str:
+        try:
+            return self.content.decode(self.encoding, errors="replace")
+        except LookupError:
+            return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.text)
+
+    def raise_for_status(self) -> None:
+        if self.status >= 400:
+            raise HTTPStatusError(self.url, self.status)
+
+
+class HTTPCache:
+    DEFAULT_TTL_SECONDS = 15 * 60
+    DEFAULT_TIMEOUT_SECONDS = 20
+    MAX_BYTES = 64 * 1024 * 1024
+    SOUP_CACHE_SIZE = 16
+    TOUCH_BATCH_SIZE = 64
+
+    _COLUMNS = "key, status, body, content_type, etag, last_modified, fetched_at"
+
+    def __init__(self, max_bytes: int = MAX_BYTES, soup_cache_size: int = SOUP_CACHE_SIZE) -> None:
+        self.max_bytes = max_bytes
+        self.soup_cache_size = soup_cache_size
+        self._soups: "OrderedDict[Tuple[str, str], object]" = OrderedDict()
+        self._touched: Dict[str, float] = {}  # key -> last use not yet written
+        self._lock = threading.Lock()
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0, "revalidated": 0, "stale": 0, "parsed": 0}
+
+    def get(self, url: str, ttl: Optional[float] = None, headers: Optional[dict] = None,
+            timeout: float = DEFAULT_TIMEOUT_SECONDS) -> CachedResponse:
+        """
+        Return the response for *url*, from the cache if it is younger than
+        *ttl* seconds (DEFAULT_TTL_SECONDS if None).  A *ttl* of 0 always
+        revalidates.  Raises the requests exception if the fetch fails and
+        there is no cached copy to fall back on.
+        """
+        ttl = self.DEFAULT_TTL_SECONDS if ttl is None else ttl
+        cached = self._load(url)
+        now = time.time()
+        if cached is not None and now - cached.fetched_at < ttl:
+            self._count("hits")
+            self._touch(self._key(url), now)
+            return cached
+
+        request_headers = dict(headers or {})
+        if cached is not None:
+            if cached.etag:
+                request_headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                request_headers["If-Modified-Since"] = cached.last_modified
+        try:
+            response = requests.get(url, headers=request_headers, timeout=timeout)
+        except requests.RequestException as e:
+            if cached is None:
+                raise
+            logger.warning(f"Serving stale cached response for {url}: {e}")
+            self._count("stale")
+            return cached
+
+        if response.status_code == 304 and cached is not None:
+            self._count("revalidated")
+            cached.fetched_at = now
+            cached.etag = response.headers.get("ETag", cached.etag)
+            cached.last_modified = response.headers.get("Last-Modified", cached.last_modified)
+            self._refresh(cached)
+            return cached
+
+        self._count("misses")
+        fetched = CachedResponse(
+            url=url,
+            status=response.status_code,
+            content=response.content,
+            content_type=response.headers.get("Content-Type", ""),
+            etag=response.headers.get("ETag", ""),
+            last_modified=response.headers.get("Last-Modified", ""),
+            fetched_at=now,
+        )
+        if fetched.ok:
+            self._store(fetched)
+        return fetched
+
+    def get_text(self, url: str, ttl: Optional[float] = None, **kwargs) -> str:
+        return self.get(url, ttl=ttl, **kwargs).text
+
+    def get_json(self, url: str, ttl: Optional[float] = None, **kwargs):
+        return self.get(url, ttl=ttl, **kwargs).json()
+
+    def get_soup(self, url: str, ttl: Optional[float] = None, parser: str = "lxml", **kwargs):
+        """
+        Return the parsed document for *url*.  Raises HTTPStatusError on an
+        error status.  The document may be shared with other callers.
+        """
+        from bs4 import BeautifulSoup
+
+        response = self.get(url, ttl=ttl, **kwargs)
+        response.raise_for_status()
+        key = (url, hashlib.sha1(response.content).hexdigest())
+        with self._lock:
+            soup = self._soups.get(key)
+            if soup is not None:
+                self._soups.move_to_end(key)
+                return soup
+        soup = BeautifulSoup(response.text, parser)
+        with self._lock:
+            self._soups[key] = soup
+            self.stats["parsed"] += 1
+            while len(self._soups) > self.soup_cache_size:
+                self._soups.popitem(last=False)
+        return soup
+
+    def invalidate(self, url: str) -> None:
+        from utils.db import write_transaction
+        key = self._key(url)
+        with write_transaction() as conn:
+            conn.execute("DELETE FROM http_cache WHERE key=?", (key,))
+        with self._lock:
+            self._touched.pop(key, None)
+            for key in [key for key in self._soups if key[0] == url]:
+                del self._soups[key]
+
+    def clear(self) -> None:
+        from utils.db import write_transaction
+        with write_transaction() as conn:
+            conn.execute("DELETE FROM http_cache")
+        with self._lock:
+            self._touched.clear()
+            self._soups.clear()
+
+    def total_bytes(self) -> int:
+        from utils.db import get_read_connection
+        return get_read_connection().execute("SELECT COALESCE(SUM(size), 0) FROM http_cache").fetchone()[0]
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _count(self, stat: str) -> None:
+        with self._lock:
+            self.stats[stat] += 1
+
+    def _load(self, url: str) -> Optional[CachedResponse]:
+        from utils.db import get_read_connection
+        row = get_read_connection().execute(
+            f"SELECT {self._COLUMNS} FROM http_cache WHERE key=?", (self._key(url),)
+        ).fetchone()
+        if row is None:
+            return None
+        return CachedResponse(
+            url=url,
+            status=row["status"],
+            content=bytes(row["body"]),
+            content_type=row["content_type"],
+            etag=row["etag"],
+            last_modified=row["last_modified"],
+            fetched_at=row["fetched_at"],
+            from_cache=True,
+        )
+
+    def _touch(self, key: str, now: float) -> None:
+        with self._lock:
+            self._touched[key] = now
+            if len(self._touched) < self.TOUCH_BATCH_SIZE:
+                return
+        from utils.db import write_transaction
+        with write_transaction() as conn:
+            self._flush_touches(conn)
+
+    def _flush_touches(self, conn) -> None:
+        """Write the pending times of use, which only eviction reads."""
+        with self._lock:
+            touched, self._touched = self._touched, {}
+        if touched:
+            conn.executemany(
+                "UPDATE http_cache SET last_used=? WHERE key=? AND last_used<?",
+                [(now, key, now) for key, now in touched.items()],
+            )
+
+    def _refresh(self, cached: CachedResponse) -> None:
+        from utils.db import write_transaction
+        with write_transaction() as conn:
+            conn.execute(
+                "UPDATE http_cache SET fetched_at=?, last_used=?, etag=?, last_modified=? WHERE key=?",
+                (cached.fetched_at, cached.fetched_at, cached.etag, cached.last_modified, self._key(cached.url)),
+            )
+
+    def _store(self, response: CachedResponse) -> None:
+        from utils.db import write_transaction
+        size = len(response.content)
+        if size > self.max_bytes:
+            return
+        with write_transaction() as conn:
+            conn.execute(
+                f"""INSERT OR REPLACE INTO http_cache ({self._COLUMNS}, last_used, size)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                (
+                    self._key(response.url), response.status, response.content, response.content_type,
+                    response.etag, response.last_modified, response.fetched_at, response.fetched_at, size,
+                ),
+            )
+            self._flush_touches(conn)
+            self._evict(conn)
+
+    def _evict(self, conn) -> None:
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM http_cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        evicted = 0
+        for key, size in conn.execute("SELECT key, size FROM http_cache ORDER BY last_used").fetchall():
+            if total <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM http_cache WHERE key=?", (key,))
+            total -= size
+            evicted += 1
+        logger.debug(f"Evicted {evicted} least recently used HTTP cache entries")
+
+
+http_cache = HTTPCache()
@@ -196,6 +196,7 @@ class ImslpCompilationData:
 
 
 class ImslpSouper():
+    CACHE_TTL_SECONDS = 24 * 60 * 60
 
     @staticmethod
     def get_wiki_main_content(soup):
@@ -253,7 +254,7 @@ class ImslpSouper():
     @staticmethod
     def get_wiki_tables(wiki_url):
         # There is one table with alternating classes containing title and subline, so need to update the news item on every other row.
-        soup = SoupUtils.get_soup(wiki_url)
+        soup = SoupUtils.get_soup(wiki_url, ttl=ImslpSouper.CACHE_TTL_SECONDS)
         body_content = ImslpSouper.get_wiki_body_content(soup)
         tables = SoupUtils.get_elements(class_path=[["tag", "table"]], parent=body_content)
         # catlinks = WikiSouper.get_catlinks(soup)
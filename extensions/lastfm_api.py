@@ -195,9 +195,15 @@ class LastFmReadAPI:
     https://www.last.fm/api/account/create
     """
 
-    def __init__(self, api_key: Optional[str] = None, user_agent: str = DEFAULT_USER_AGENT) -> None:
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        user_agent: str = DEFAULT_USER_AGENT,
+        api_root: str = API_ROOT,
+    ) -> None:
         self.api_key = api_key if api_key is not None else config.lastfm_api_key
         self.user_agent = user_agent
+        self.api_root = api_root
         self._session = requests.Session()
         self._session.headers["User-Agent"] = user_agent
 
@@ -220,7 +226,7 @@ class LastFmReadAPI:
                 query[key] = value
 
         try:
-            response = self._session.get(API_ROOT, params=query, timeout=30)
+            response = self._session.get(self.api_root, params=query, timeout=30)
         except requests.RequestException as exc:
             logger.error("Last.fm request failed for %s: %s", method, exc)
             raise LastFmAPIError(str(exc)) from exc
@@ -404,6 +410,18 @@ class LastFmReadAPI:
             tracks=tracks,
         )
 
+    def get_scrobble_count_since(self, username: str, since_unixtime: float) -> int:
+        """Number of scrobbles a user has made since *since_unixtime* (``user.getRecentTracks``)."""
+        payload = self._call(
+            "user.getRecentTracks",
+            user=username,
+            limit=1,
+            page=1,
+            **{"from": int(since_unixtime)},
+        )
+        attr = (payload.get("recenttracks") or {}).get("@attr") or {}
+        return _int(attr.get("total"), 0)
+
     def iter_library_tracks(
         self,
         username: str,
@@ -542,8 +560,8 @@ class LastFmLibraryCache:
 
     def get_scope(self, username: str, scope: str) -> Optional[List[Dict[str, Any]]]:
         """Return cached items for *username* / *scope*, or None if never fetched."""
-        from utils.db import get_connection
-        conn = get_connection()
+        from utils.db import get_read_connection
+        conn = get_read_connection()
         sentinel = conn.execute(
             "SELECT 1 FROM lfm_scopes WHERE username=? AND scope=?",
             (username.lower(), scope),
@@ -559,42 +577,91 @@ class LastFmLibraryCache:
         return [{f: row[f] for f in fields} for row in rows]
 
     def set_scope(self, username: str, scope: str, items: List[Dict[str, Any]]) -> None:
-        from utils.db import get_connection
-        conn = get_connection()
+        from utils.db import write_transaction
         key = username.lower()
         now = time.time()
-        conn.execute(
-            "INSERT OR REPLACE INTO lfm_scopes (username, scope, fetched_at) VALUES (?, ?, ?)",
-            (key, scope, now),
-        )
-        conn.execute(
-            "DELETE FROM lfm_tracks WHERE username=? AND scope=?", (key, scope)
-        )
-        if items:
-            conn.executemany(
-                """INSERT OR REPLACE INTO lfm_tracks
-                   (username, scope, mbid, name, artist, playcount, rank, album, fetched_at)
-                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                [
-                    (
-                        key,
-                        scope,
-                        item.get("mbid") or "",
-                        item.get("name", ""),
-                        item.get("artist") or "",
-                        item.get("playcount") or 0,
-                        item.get("rank"),
-                        item.get("album"),
-                        now,
-                    )
-                    for item in items
-                ],
+        with write_transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO lfm_scopes (username, scope, fetched_at) VALUES (?, ?, ?)",
+                (key, scope, now),
+            )
+            conn.execute(
+                "DELETE FROM lfm_tracks WHERE username=? AND scope=?", (key, scope)
+            )
+            if items:
+                self._insert_items(conn, key, scope, items, now)
+
+    # ------------------------------------------------------------------
+    # Streaming writes (used by extensions.lastfm_sync)
+    #
+    # Pages are upserted as they arrive, stamped with the sync's start time.
+    # finish_scope() then marks the scope as fetched and, after a complete
+    # pass, drops rows the pass did not touch (items no longer in the library).
+    # ------------------------------------------------------------------
+
+    def upsert_items(self, username: str, scope: str, items: List[Dict[str, Any]], generation: float) -> None:
+        """Insert or update *items* without touching the rest of the scope."""
+        from utils.db import write_transaction
+        if not items:
+            return
+        with write_transaction() as conn:
+            self._insert_items(conn, username.lower(), scope, items, generation)
+
+    def finish_scope(self, username: str, scope: str, generation: float, prune: bool) -> int:
+        """Record *generation* as the scope's fetched_at; return the number of pruned rows."""
+        from utils.db import write_transaction
+        key = username.lower()
+        with write_transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO lfm_scopes (username, scope, fetched_at) VALUES (?, ?, ?)",
+                (key, scope, generation),
             )
-        conn.commit()
+            if not prune:
+                return 0
+            return conn.execute(
+                "DELETE FROM lfm_tracks WHERE username=? AND scope=? AND fetched_at < ?",
+                (key, scope, generation),
+            ).rowcount
+
+    def get_playcounts(self, username: str, scope: str) -> Dict[tuple, int]:
+        """Map of (artist, name) -> playcount for every cached item in the scope."""
+        from utils.db import get_read_connection
+        rows = get_read_connection().execute(
+            "SELECT artist, name, playcount FROM lfm_tracks WHERE username=? AND scope=?",
+            (username.lower(), scope),
+        ).fetchall()
+        return {(row[0], row[1]): row[2] for row in rows}
+
+    @staticmethod
+    def item_key(item: Dict[str, Any]) -> tuple:
+        """The (artist, name) pair that identifies an item row within a scope."""
+        return (item.get("artist") or "", item.get("name", ""))
+
+    @classmethod
+    def _insert_items(cls, conn, key: str, scope: str, items: List[Dict[str, Any]], fetched_at: float) -> None:
+        conn.executemany(
+            """INSERT OR REPLACE INTO lfm_tracks
+               (username, scope, mbid, name, artist, playcount, rank, album, fetched_at)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            [
+                (
+                    key,
+                    scope,
+                    item.get("mbid") or "",
+                    item.get("name", ""),
+                    item.get("artist") or "",
+                    item.get("playcount") or 0,
+                    item.get("rank"),
+                    item.get("album"),
+                    fetched_at,
+                )
+                for item in items
+            ],
+        )
 
     def fetched_at(self, username: str, scope: str) -> Optional[float]:
-        from utils.db import get_connection
-        row = get_connection().execute(
+        from utils.db import get_read_connection
+        row = get_read_connection().execute(
             "SELECT fetched_at FROM lfm_scopes WHERE username=? AND scope=?",
             (username.lower(), scope),
         ).fetchone()
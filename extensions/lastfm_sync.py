@@ -0,0 +1,250 @@
+"""
+Concurrent, incremental Last.fm library sync.
+
+LastFmLibrarySync pages through a user's top tracks, albums or artists with a
+bounded number of requests in flight, all drawing from one TokenBucket so the
+combined request rate stays within Last.fm's limits.  Pages are written to
+LastFmLibraryCache in page order as they arrive rather than being collected
+in memory and rewritten as a whole scope at the end.
+
+Incremental refresh: Last.fm top lists are ordered by playcount, not time, so
+there is no "modified since" filter.  Instead the sync asks how many scrobbles
+the user has made since the scope's fetched_at.  With none, nothing is
+fetched.  Otherwise pages are fetched from the top, summing each item's
+playcount increase over the cached value, and the sync stops once those
+increases account for every new scrobble: the remaining pages cannot have
+changed.  Scopes where a scrobble need not raise any item (albums, for
+untagged scrobbles) simply fall back to a full pass.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+from extensions.lastfm_api import (
+    LastFmAPIError,
+    LastFmLibraryCache,
+    LastFmReadAPI,
+    get_lastfm_cache,
+)
+from utils.logging_setup import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_CONCURRENCY = 4
+# Last.fm asks API clients to stay under 5 requests/second averaged over 5 minutes.
+DEFAULT_REQUESTS_PER_SECOND = 4.0
+DEFAULT_SYNC_PAGE_LIMIT = 200
+
+# Error codes Last.fm documents as temporary: operation failed, service
+# offline, temporarily unavailable, rate limit exceeded.
+_TRANSIENT_ERROR_CODES = {8, 11, 16, 29}
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter.
+
+    Allows bursts of up to *capacity* calls, refilled at *rate* tokens per
+    second.  acquire() blocks until a token is available.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.capacity = float(capacity) if capacity is not None else max(1.0, self.rate)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            self._sleep(wait)
+
+
+@dataclass
+class LastFmSyncResult:
+    scope: str
+    total_pages: int = 0
+    pages_fetched: int = 0
+    items_written: int = 0
+    pruned: int = 0
+    # Scrobbles since the previous sync (incremental refresh only)
+    new_scrobbles: Optional[int] = None
+    # True when an incremental refresh stopped before the last page
+    stopped_early: bool = False
+
+
+class LastFmLibrarySync:
+    """Sync one library scope ("tracks", "albums" or "artists") into LastFmLibraryCache."""
+
+    def __init__(
+        self,
+        api: LastFmReadAPI,
+        cache: Optional[LastFmLibraryCache] = None,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND,
+        page_limit: int = DEFAULT_SYNC_PAGE_LIMIT,
+        max_retries: int = 3,
+        retry_delay_seconds: float = 1.0,
+    ) -> None:
+        self.api = api
+        self.cache = cache if cache is not None else get_lastfm_cache()
+        self.concurrency = max(1, int(concurrency))
+        self.limiter = TokenBucket(requests_per_second)
+        self.page_limit = page_limit
+        self.max_retries = max(1, int(max_retries))
+        self.retry_delay_seconds = retry_delay_seconds
+
+    def sync(
+        self,
+        username: str,
+        scope: str,
+        incremental: bool = False,
+        max_pages: Optional[int] = None,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+    ) -> LastFmSyncResult:
+        """
+        Fetch *scope* for *username* and stream it into the cache.
+
+        *progress_callback* is called with ``(pages_fetched, total_pages)``
+        after each page is written.  A complete pass removes cached items that
+        are no longer in the library; an incremental pass that stops early, or
+        one cut short by *max_pages*, leaves the rest of the scope as it was.
+        """
+        if not self.api.api_key:
+            # Checked up front so the missing key is not retried like a network error
+            raise LastFmAPIError("No Last.fm API key configured. Set lastfm_api_key in config.json.")
+        fetch, items_attr, serialise = self._scope_handlers(username, scope)
+        result = LastFmSyncResult(scope=scope)
+        generation = time.time()
+
+        known: Optional[Dict[tuple, int]] = None
+        remaining_delta = 0
+        if incremental:
+            fetched_at = self.cache.fetched_at(username, scope)
+            if fetched_at is not None:
+                result.new_scrobbles = self._call(
+                    lambda: self.api.get_scrobble_count_since(username, fetched_at)
+                )
+                if result.new_scrobbles == 0:
+                    self.cache.finish_scope(username, scope, generation, prune=False)
+                    logger.info("Last.fm %s for %s unchanged since last sync", scope, username)
+                    return result
+                known = self.cache.get_playcounts(username, scope)
+                remaining_delta = result.new_scrobbles
+
+        def store(page_result: Any) -> bool:
+            """Write one page; return True once an incremental pass has seen every change."""
+            nonlocal remaining_delta
+            items = serialise(getattr(page_result, items_attr))
+            self.cache.upsert_items(username, scope, items, generation)
+            result.pages_fetched += 1
+            result.items_written += len(items)
+            if progress_callback is not None:
+                progress_callback(result.pages_fetched, result.total_pages)
+            if known is None:
+                return False
+            for item in items:
+                previous = known.get(LastFmLibraryCache.item_key(item), 0)
+                remaining_delta -= max(0, (item.get("playcount") or 0) - previous)
+            return remaining_delta <= 0
+
+        first = self._call(lambda: fetch(1))
+        result.total_pages = max(first.pagination.total_pages, 1)
+        if max_pages is not None:
+            result.total_pages = min(result.total_pages, max_pages)
+        result.stopped_early = store(first) and result.total_pages > 1
+
+        if not result.stopped_early and result.total_pages > 1:
+            with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="lastfm-sync") as pool:
+                # Keep at most `concurrency` pages ahead of the writer, and write
+                # them in page order so an incremental stop is well defined.
+                pending = {}
+                next_page = 2
+                for page in range(2, result.total_pages + 1):
+                    while next_page <= result.total_pages and len(pending) < self.concurrency:
+                        pending[next_page] = pool.submit(self._call, lambda p=next_page: fetch(p))
+                        next_page += 1
+                    try:
+                        page_result = pending.pop(page).result()
+                    except BaseException:
+                        for future in pending.values():
+                            future.cancel()
+                        raise
+                    if store(page_result):
+                        result.stopped_early = page < result.total_pages
+                        for future in pending.values():
+                            future.cancel()
+                        break
+
+        complete = not result.stopped_early and (max_pages is None or result.total_pages >= first.pagination.total_pages)
+        result.pruned = self.cache.finish_scope(username, scope, generation, prune=complete)
+        logger.info(
+            "Last.fm %s sync for %s: %d/%d pages, %d items, %d pruned%s",
+            scope, username, result.pages_fetched, result.total_pages,
+            result.items_written, result.pruned,
+            " (incremental stop)" if result.stopped_early else "",
+        )
+        return result
+
+    def _scope_handlers(self, username: str, scope: str):
+        limit = self.page_limit
+        if scope == "tracks":
+            return (
+                lambda page: self.api.get_library_tracks(username, page=page, limit=limit),
+                "tracks",
+                LastFmLibraryCache.serialise_tracks,
+            )
+        if scope == "albums":
+            return (
+                lambda page: self.api.get_library_albums(username, page=page, limit=limit),
+                "albums",
+                LastFmLibraryCache.serialise_albums,
+            )
+        if scope == "artists":
+            return (
+                lambda page: self.api.get_library_artists(username, page=page, limit=limit),
+                "artists",
+                LastFmLibraryCache.serialise_artists,
+            )
+        raise ValueError(f"Unknown Last.fm library scope: {scope}")
+
+    def _call(self, fn: Callable[[], Any]) -> Any:
+        """Run one API request under the rate limiter, retrying transient failures."""
+        delay = self.retry_delay_seconds
+        for attempt in range(1, self.max_retries + 1):
+            self.limiter.acquire()
+            try:
+                return fn()
+            except LastFmAPIError as exc:
+                transient = exc.code is None or exc.code in _TRANSIENT_ERROR_CODES
+                if not transient or attempt >= self.max_retries:
+                    raise
+                logger.warning(
+                    "Last.fm request failed (attempt %d/%d): %s. Retrying in %.1fs",
+                    attempt, self.max_retries, exc, delay,
+                )
+                time.sleep(delay)
+                delay *= 2
@@ -8,8 +8,10 @@ import random
 import threading
 import time
 from typing import Callable, Iterator, List, Optional, Tuple
-from urllib import request
+from urllib.parse import urlsplit
 
+from extensions.llm_history import PromptResponseLog
+from extensions.ollama_client import OllamaHTTPClient
 from extensions.llm_redundancy import (
     DefaultRedundancyPolicy,
     RedundancyPolicy,
@@ -157,6 +159,7 @@ class LLM:
         use_streaming: bool = False,
         use_redundancy_elimination: bool = False,
         thinking_budget_chars: Optional[int] = None,
+        keep_alive: Optional[str] = None,
     ):
         self.model_name = model_name
         self.run_context = run_context
@@ -165,14 +168,14 @@ class LLM:
         self.use_streaming = bool(use_streaming)
         self.use_redundancy_elimination = bool(use_redundancy_elimination)
         self.thinking_budget_chars = thinking_budget_chars
-        self.prompt_response_history = []
-        self._prompt_response_lock = threading.Lock()
+        self.keep_alive = keep_alive
         state_suffix = "".join(
             c if (c.isalnum() or c in ("-", "_")) else "_" for c in str(self.state_key)
         )
         self.prompt_response_history_file = os.path.join(
-            os.getcwd(), f"temp_llm_prompt_response_history_{state_suffix}.json"
+            os.getcwd(), f"temp_llm_prompt_response_history_{state_suffix}.jsonl"
         )
+        self._prompt_response_log = None
         self._cancelled = False
         self._result = None
         self._exception = None
@@ -209,6 +212,7 @@ class LLM:
         - ``llm_stream_redundancy``
         - ``llm_thinking_budget_chars``
         - ``llm_track_prompts_and_responses``
+        - ``llm_keep_alive``
         """
         if config_obj is None:
             from utils.config import config as config_obj
@@ -228,6 +232,7 @@ class LLM:
                 getattr(config_obj, "llm_stream_redundancy", False)
             ),
             thinking_budget_chars=thinking_budget,
+            keep_alive=getattr(config_obj, "llm_keep_alive", None),
         )
 
     @classmethod
@@ -319,6 +324,10 @@ class LLM:
             interrupt_on_skip=interrupt_on_skip,
         )
 
+    def get_redundancy_policy(self) -> Optional[RedundancyPolicy]:
+        """A fresh instance of the policy :attr:`use_redundancy_elimination` enables, or ``None``."""
+        return self._resolve_redundancy_policy(_USE_INSTANCE_REDUNDANCY)
+
     def _resolve_redundancy_policy(self, redundancy_policy) -> Optional[RedundancyPolicy]:
         """Resolve policy: sentinel → instance flag; ``None`` → off; else use policy."""
         if redundancy_policy is _USE_INSTANCE_REDUNDANCY:
@@ -353,6 +362,8 @@ class LLM:
             #     "timeout": timeout * 1000  # Convert to milliseconds
             # }
         }
+        if self.keep_alive is not None:
+            data["keep_alive"] = self.keep_alive
         if context is not None:
             data["context"] = context
             logger.debug(f"Adding context to LLM request, length: {len(context)}")
@@ -366,13 +377,26 @@ class LLM:
             logger.debug("Dropping system prompt from LLM request")
         return data, system_prompt_included
 
-    def _make_generate_request(self, data: dict) -> request.Request:
-        return request.Request(
-            LLM.ENDPOINT,
-            headers={"Content-Type": "application/json"},
-            data=json.dumps(data).encode("utf-8"),
+    @staticmethod
+    def _http_client() -> OllamaHTTPClient:
+        """The pooled keep-alive client shared by every LLM talking to ``LLM.ENDPOINT``."""
+        return OllamaHTTPClient.for_url(LLM.ENDPOINT)
+
+    @staticmethod
+    def _endpoint_path() -> str:
+        return urlsplit(LLM.ENDPOINT).path or "/api/generate"
+
+    def warm_up(self, timeout: float = DEFAULT_TIMEOUT) -> bool:
+        """Load the model ahead of the first generation (an empty generate
+        request), keeping it loaded for ``keep_alive``. Returns True on success."""
+        return self._http_client().warm_up(
+            self._endpoint_path(), self.model_name, self.keep_alive, self._get_timeout(timeout)
         )
 
+    def latency_summary(self) -> str:
+        """Connect / first token / total latency histograms for ``LLM.ENDPOINT``."""
+        return self._http_client().latency_summary()
+
     def _finalize_result(
         self,
         result: LLMResult,
@@ -380,6 +404,7 @@ class LLM:
         query: str,
         context_provided: bool,
         system_prompt_included: bool,
+        timings: Optional[dict] = None,
     ) -> LLMResult:
         result.response = self._clean_response_for_models(result.response)
         self._track_prompt_response(
@@ -389,6 +414,7 @@ class LLM:
             system_prompt_included=system_prompt_included,
             truncated=result.truncated,
             truncation_reason=result.truncation_reason,
+            timings=timings,
         )
         logger.debug(f"LLM response received, length: {len(result.response)}")
         if result.validate():
@@ -397,19 +423,16 @@ class LLM:
             raise LLMResponseException("LLM response is invalid!")
         return result
 
-    def _iter_ollama_stream_events(self, req: request.Request, timeout: float) -> Iterator[dict]:
+    def _iter_ollama_stream_events(self, data: dict, timeout: float) -> Iterator[dict]:
         """Yield parsed JSON objects from an Ollama streaming response."""
-        with request.urlopen(req, timeout=timeout) as resp:
+        with self._http_client().stream_json(self._endpoint_path(), data, timeout) as (resp, events):
             self._active_http_response = resp
             try:
-                for raw in resp:
+                for event in events:
                     if self._cancelled:
                         logger.debug("Stopping Ollama stream read (cancelled)")
                         break
-                    raw = raw.strip()
-                    if not raw:
-                        continue
-                    yield json.loads(raw.decode("utf-8"))
+                    yield event
             finally:
                 self._active_http_response = None
 
@@ -420,6 +443,7 @@ class LLM:
         context,
         system_prompt,
         system_prompt_drop_rate,
+        requested_at: Optional[float] = None,
     ) -> LLMResult:
         data, system_prompt_included = self._build_generate_payload(
             query,
@@ -428,16 +452,16 @@ class LLM:
             system_prompt=system_prompt,
             system_prompt_drop_rate=system_prompt_drop_rate,
         )
-        req = self._make_generate_request(data)
         logger.debug("Making LLM request (buffered)...")
-        response = request.urlopen(req, timeout=timeout).read().decode("utf-8")
-        resp_json = json.loads(response)
+        sent_at = time.perf_counter()
+        resp_json = self._http_client().post_json(self._endpoint_path(), data, timeout)
         result = LLMResult.from_json(resp_json, context_provided=context is not None)
         return self._finalize_result(
             result,
             query=query,
             context_provided=context is not None,
             system_prompt_included=system_prompt_included,
+            timings=self._timings(requested_at, sent_at),
         )
 
     def _close_active_stream(self) -> None:
@@ -456,6 +480,7 @@ class LLM:
         system_prompt_drop_rate,
         on_stream_chunk: Optional[Callable[[StreamChunk], None]] = None,
         redundancy_policy: Optional[RedundancyPolicy] = None,
+        requested_at: Optional[float] = None,
     ) -> LLMResult:
         data, system_prompt_included = self._build_generate_payload(
             query,
@@ -464,16 +489,19 @@ class LLM:
             system_prompt=system_prompt,
             system_prompt_drop_rate=system_prompt_drop_rate,
         )
-        req = self._make_generate_request(data)
         logger.debug("Making LLM request (streaming)...")
 
         accumulated_raw = ""
         final: dict = {}
         truncated = False
         truncation_reason = ""
-        for event in self._iter_ollama_stream_events(req, timeout):
+        sent_at = time.perf_counter()
+        first_token_at = None
+        for event in self._iter_ollama_stream_events(data, timeout):
             delta = event.get("response", "") or ""
             if delta:
+                if first_token_at is None:
+                    first_token_at = time.perf_counter()
                 accumulated_raw += delta
             done = bool(event.get("done"))
             # streaming_visible_response is a no-op when no thinking tags are
@@ -531,6 +559,7 @@ class LLM:
             query=query,
             context_provided=context is not None,
             system_prompt_included=system_prompt_included,
+            timings=self._timings(requested_at, sent_at, first_token_at),
         )
 
     def generate_response(
@@ -543,6 +572,7 @@ class LLM:
         stream: Optional[bool] = None,
         on_stream_chunk: Optional[Callable[[StreamChunk], None]] = None,
         redundancy_policy=_USE_INSTANCE_REDUNDANCY,
+        requested_at: Optional[float] = None,
     ):
         """Generate a response from the LLM.
 
@@ -553,8 +583,12 @@ class LLM:
 
         Pass ``redundancy_policy=None`` explicitly to disable redundancy even
         when :attr:`use_redundancy_elimination` is on (e.g. JSON extraction).
+        *requested_at* (a ``time.perf_counter()`` value) is when the caller
+        asked for the response, for the queue time in the tracked history.
         """
         logger.debug(f"LLM.generate_response called with query length: {len(query)}")
+        if requested_at is None:
+            requested_at = time.perf_counter()
         query = self._sanitize_query(query)
         timeout = self._get_timeout(timeout)
         policy = self._resolve_redundancy_policy(redundancy_policy)
@@ -575,6 +609,7 @@ class LLM:
                     system_prompt_drop_rate,
                     on_stream_chunk=on_stream_chunk,
                     redundancy_policy=policy,
+                    requested_at=requested_at,
                 )
             return self._generate_response_buffered(
                 query,
@@ -582,6 +617,7 @@ class LLM:
                 context,
                 system_prompt,
                 system_prompt_drop_rate,
+                requested_at=requested_at,
             )
         except LLMGenerationCancelled:
             raise
@@ -592,6 +628,29 @@ class LLM:
             self.increment_failure_count()
             raise LLMResponseException(f"Failed to generate LLM response: {e}")
 
+    @staticmethod
+    def _timings(requested_at: Optional[float], sent_at: float, first_token_at: Optional[float] = None) -> dict:
+        """
+        Latency fields for the tracked history, in seconds: ``queue`` from the
+        caller's request to sending it to Ollama, ``first_token`` from sending
+        to the first streamed token (None when not streaming), and ``total``
+        from the caller's request to the finished response.
+        """
+        if requested_at is None:
+            requested_at = sent_at
+        return {
+            "queue_seconds": round(sent_at - requested_at, 4),
+            "first_token_seconds": None if first_token_at is None else round(first_token_at - sent_at, 4),
+            "total_seconds": round(time.perf_counter() - requested_at, 4),
+        }
+
+    def _get_prompt_response_log(self) -> PromptResponseLog:
+        if self._prompt_response_log is None:
+            self._prompt_response_log = PromptResponseLog.for_path(
+                self.prompt_response_history_file, self.PROMPT_RESPONSE_HISTORY_MAX_ITEMS
+            )
+        return self._prompt_response_log
+
     def _track_prompt_response(
         self,
         prompt,
@@ -600,6 +659,7 @@ class LLM:
         system_prompt_included=False,
         truncated=False,
         truncation_reason="",
+        timings=None,
     ):
         """Record prompt/response pairs for debugging when enabled."""
         if not self.track_prompts_and_responses:
@@ -607,6 +667,7 @@ class LLM:
         entry = {
             "timestamp": time.time(),
             "model": self.model_name,
+            "state_key": self.state_key,
             "prompt": prompt,
             "response": response,
             "context_provided": bool(context_provided),
@@ -614,32 +675,16 @@ class LLM:
             "truncated": bool(truncated),
             "truncation_reason": truncation_reason or "",
         }
-        with self._prompt_response_lock:
-            self.prompt_response_history.append(entry)
-            if len(self.prompt_response_history) > self.PROMPT_RESPONSE_HISTORY_MAX_ITEMS:
-                self.prompt_response_history = self.prompt_response_history[
-                    -self.PROMPT_RESPONSE_HISTORY_MAX_ITEMS:
-                ]
-            self._persist_prompt_response_history()
-            logger.debug(
-                "Tracked LLM prompt/response pair (history size: %s)",
-                len(self.prompt_response_history),
-            )
+        if timings:
+            entry.update(timings)
+        self._get_prompt_response_log().append(entry)
+        logger.debug("Queued LLM prompt/response pair for the history log")
 
-    def _persist_prompt_response_history(self):
-        """Persist tracked prompt/response history to a readable temp JSON file."""
-        payload = {
-            "model": self.model_name,
-            "state_key": self.state_key,
-            "updated_at": time.time(),
-            "max_items": self.PROMPT_RESPONSE_HISTORY_MAX_ITEMS,
-            "items": self.prompt_response_history,
-        }
-        try:
-            with open(self.prompt_response_history_file, "w", encoding="utf-8") as out_file:
-                json.dump(payload, out_file, indent=2, ensure_ascii=False)
-        except Exception as e:
-            logger.warning("Failed to persist LLM prompt/response history: %s", e)
+    def get_prompt_response_history(self, n: Optional[int] = None) -> List[dict]:
+        """The last *n* tracked prompt/response entries (default: the history maximum), oldest first."""
+        log = self._get_prompt_response_log()
+        log.flush()
+        return log.read_last(n)
 
     def generate_response_async(
         self,
@@ -662,6 +707,7 @@ class LLM:
         (topic commentary, track context, etc.).
         """
         logger.debug(f"LLM.generate_response_async called with query length: {len(query)}")
+        requested_at = time.perf_counter()
         self._cancelled = False
         self._result = None
         self._exception = None
@@ -679,6 +725,7 @@ class LLM:
                     stream=stream,
                     on_stream_chunk=on_stream_chunk,
                     redundancy_policy=redundancy_policy,
+                    requested_at=requested_at,
                 )
                 if not self._cancelled:
                     self._result = result
@@ -0,0 +1,133 @@
+"""
+Append-only JSONL log of LLM prompt/response pairs.
+
+Used when ``llm_track_prompts_and_responses`` is on.  Entries are handed to a
+background writer thread and appended to the log one line each, so tracking
+never costs the generation path more than a queue put.  When the file grows
+past COMPACT_FACTOR times *max_items* lines, the writer rewrites it with only
+the last *max_items* entries.  read_last() reconstructs the most recent
+entries from the file.
+
+One PromptResponseLog (and writer thread) is shared per file: every LLM
+instance with the same state key appends to the same log.
+"""
+
+import json
+import os
+import queue
+import threading
+from collections import deque
+from typing import Dict, List, Optional
+
+from utils.logging_setup import get_logger
+
+logger = get_logger(__name__)
+
+
+class PromptResponseLog:
+    COMPACT_FACTOR = 2
+    WRITER_IDLE_SECONDS = 5  # the writer thread exits after this long without entries
+
+    _logs: Dict[str, "PromptResponseLog"] = {}
+    _logs_lock = threading.Lock()
+
+    def __init__(self, path: str, max_items: int) -> None:
+        self.path = path
+        self.max_items = max_items
+        self._queue: "queue.Queue[dict]" = queue.Queue()
+        self._line_count: Optional[int] = None  # counted lazily by the writer
+        self._writer: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+
+    @classmethod
+    def for_path(cls, path: str, max_items: int) -> "PromptResponseLog":
+        """The shared log writing to *path*."""
+        key = os.path.abspath(path)
+        with cls._logs_lock:
+            log = cls._logs.get(key)
+            if log is None:
+                log = cls(path, max_items)
+                cls._logs[key] = log
+            return log
+
+    def append(self, entry: dict) -> None:
+        """Queue *entry* to be written; returns immediately."""
+        self._queue.put(entry)
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_loop, name="llm-history-writer", daemon=True)
+                self._writer.start()
+
+    def flush(self) -> None:
+        """Block until every queued entry has been written."""
+        self._queue.join()
+
+    def read_last(self, n: Optional[int] = None) -> List[dict]:
+        """The last *n* entries (default: max_items), oldest first."""
+        n = self.max_items if n is None else n
+        if n <= 0:
+            return []
+        items: deque = deque(maxlen=n)
+        try:
+            with open(self.path, "r", encoding="utf-8") as log_file:
+                for line in log_file:
+                    entry = self._parse(line)
+                    if entry is not None:
+                        items.append(entry)
+        except FileNotFoundError:
+            return []
+        return list(items)
+
+    @staticmethod
+    def _parse(line: str) -> Optional[dict]:
+        line = line.strip()
+        if not line:
+            return None
+        try:
+            return json.loads(line)
+        except json.JSONDecodeError:
+            return None  # e.g. a line cut short by a crash mid-write
+
+    def _write_loop(self) -> None:
+        while True:
+            try:
+                entry = self._queue.get(timeout=self.WRITER_IDLE_SECONDS)
+            except queue.Empty:
+                with self._writer_lock:
+                    if self._queue.empty():
+                        self._writer = None
+                        return
+                continue
+            try:
+                self._write(entry)
+            except Exception as e:
+                logger.warning("Failed to append to LLM prompt/response history: %s", e)
+            finally:
+                self._queue.task_done()
+
+    def _write(self, entry: dict) -> None:
+        if self._line_count is None:
+            self._line_count = self._count_lines()
+        with open(self.path, "a", encoding="utf-8") as log_file:
+            log_file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._line_count += 1
+        if self._line_count > self.max_items * self.COMPACT_FACTOR:
+            self._compact()
+
+    def _count_lines(self) -> int:
+        try:
+            with open(self.path, "r", encoding="utf-8") as log_file:
+                return sum(1 for _ in log_file)
+        except FileNotFoundError:
+            return 0
+
+    def _compact(self) -> None:
+        """Rewrite the log keeping only the last max_items entries."""
+        items = self.read_last(self.max_items)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as out_file:
+            for item in items:
+                out_file.write(json.dumps(item, ensure_ascii=False) + "\n")
+        os.replace(temp_path, self.path)
+        self._line_count = len(items)
+        logger.debug("Compacted LLM prompt/response history to %d entries", len(items))
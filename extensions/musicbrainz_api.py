@@ -44,10 +44,13 @@ Last.fm MBID fields are crowd-sourced and unreliable.  Known failure causes:
 
 from __future__ import annotations
 
+import queue
+import threading
 import time
+from collections import deque
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
 
 import requests
 
@@ -139,6 +142,10 @@ class MusicBrainzCache:
     """
 
     _MULTI_VALUE_FIELDS = ("mb_genres", "composer", "lyricist", "arranger", "orchestrator", "writer")
+    _RECORD_COLUMNS = "mb_title, mb_artist, mb_genres, composer, lyricist, arranger, orchestrator, writer"
+    # Bound parameters per IN (...) query; stays under SQLITE_MAX_VARIABLE_NUMBER
+    # on older SQLite builds (999).
+    BULK_CHUNK_SIZE = 500
 
     def __init__(self, path: Path = _CACHE_FILE) -> None:  # noqa: ARG002
         pass
@@ -148,40 +155,74 @@ class MusicBrainzCache:
     # ------------------------------------------------------------------
 
     def get(self, recording_mbid: str) -> Optional[Dict[str, Any]]:
-        from utils.db import get_connection, delim_to_list
+        from utils.db import get_connection
         row = get_connection().execute(
-            "SELECT mb_title, mb_artist, mb_genres, composer, lyricist, "
-            "arranger, orchestrator, writer FROM mb_recordings WHERE mbid=?",
+            f"SELECT {self._RECORD_COLUMNS} FROM mb_recordings WHERE mbid=?",
             (recording_mbid,),
         ).fetchone()
-        if row is None:
-            return None
+        return self._row_to_record(row) if row is not None else None
+
+    def _row_to_record(self, row) -> Dict[str, Any]:
+        from utils.db import delim_to_list
         record = dict(row)
+        record.pop("mbid", None)
         for field in self._MULTI_VALUE_FIELDS:
             record[field] = delim_to_list(record[field])
         return record
 
+    # ------------------------------------------------------------------
+    # Bulk lookups — one query per BULK_CHUNK_SIZE MBIDs instead of one per MBID
+    # ------------------------------------------------------------------
+
+    def _query_chunks(self, sql: str, mbids: Iterable[str]):
+        """Yield rows of *sql* (containing a ``{placeholders}`` slot) over chunks of *mbids*."""
+        from utils.db import get_connection
+        unique = [m for m in dict.fromkeys(mbids) if m]
+        conn = get_connection()
+        for start in range(0, len(unique), self.BULK_CHUNK_SIZE):
+            chunk = unique[start:start + self.BULK_CHUNK_SIZE]
+            yield from conn.execute(sql.format(placeholders=",".join("?" * len(chunk))), chunk)
+
+    def contains_many(self, mbids: Iterable[str]) -> Set[str]:
+        """The subset of *mbids* that have a row in mb_recordings."""
+        return {
+            row[0] for row in self._query_chunks(
+                "SELECT mbid FROM mb_recordings WHERE mbid IN ({placeholders})", mbids
+            )
+        }
+
+    def get_many(self, mbids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Records for every cached MBID in *mbids*; missing MBIDs are simply absent."""
+        return {
+            row["mbid"]: self._row_to_record(row) for row in self._query_chunks(
+                f"SELECT mbid, {self._RECORD_COLUMNS} FROM mb_recordings "
+                "WHERE mbid IN ({placeholders})",
+                mbids,
+            )
+        }
+
     def set(self, recording_mbid: str, record: Dict[str, Any]) -> None:
         import time
-        from utils.db import get_connection, list_to_delim
-        get_connection().execute(
-            """INSERT OR REPLACE INTO mb_recordings
-               (mbid, mb_title, mb_artist, mb_genres, composer,
-                lyricist, arranger, orchestrator, writer, fetched_at)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-            (
-                recording_mbid,
-                record.get("mb_title", ""),
-                record.get("mb_artist", ""),
-                list_to_delim(record.get("mb_genres", [])),
-                list_to_delim(record.get("composer", [])),
-                list_to_delim(record.get("lyricist", [])),
-                list_to_delim(record.get("arranger", [])),
-                list_to_delim(record.get("orchestrator", [])),
-                list_to_delim(record.get("writer", [])),
-                time.time(),
-            ),
-        )
+        from utils.db import list_to_delim, write_transaction
+        with write_transaction() as conn:
+            conn.execute(
+                """INSERT OR REPLACE INTO mb_recordings
+                   (mbid, mb_title, mb_artist, mb_genres, composer,
+                    lyricist, arranger, orchestrator, writer, fetched_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                (
+                    recording_mbid,
+                    record.get("mb_title", ""),
+                    record.get("mb_artist", ""),
+                    list_to_delim(record.get("mb_genres", [])),
+                    list_to_delim(record.get("composer", [])),
+                    list_to_delim(record.get("lyricist", [])),
+                    list_to_delim(record.get("arranger", [])),
+                    list_to_delim(record.get("orchestrator", [])),
+                    list_to_delim(record.get("writer", [])),
+                    time.time(),
+                ),
+            )
 
     def __contains__(self, recording_mbid: str) -> bool:
         from utils.db import get_connection
@@ -192,9 +233,7 @@ class MusicBrainzCache:
         return row is not None
 
     def save(self) -> None:
-        """Commit any pending batch writes to the database."""
-        from utils.db import get_connection
-        get_connection().commit()
+        """Kept for callers that batch writes; set() and set_failed() commit as they write."""
         logger.debug("MusicBrainz cache committed")
 
     @property
@@ -222,12 +261,13 @@ class MusicBrainzCache:
         status_code: Optional[int] = None,
     ) -> None:
         import time as _time
-        from utils.db import get_connection
-        get_connection().execute(
-            "INSERT OR REPLACE INTO mb_failed_lookups "
-            "(mbid, endpoint, status_code, failed_at) VALUES (?, ?, ?, ?)",
-            (mbid, endpoint, status_code, _time.time()),
-        )
+        from utils.db import write_transaction
+        with write_transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO mb_failed_lookups "
+                "(mbid, endpoint, status_code, failed_at) VALUES (?, ?, ?, ?)",
+                (mbid, endpoint, status_code, _time.time()),
+            )
 
     def has_failed(self, mbid: str) -> bool:
         from utils.db import get_connection
@@ -236,6 +276,14 @@ class MusicBrainzCache:
             (mbid,),
         ).fetchone() is not None
 
+    def failed_many(self, mbids: Iterable[str]) -> Set[str]:
+        """The subset of *mbids* recorded in mb_failed_lookups."""
+        return {
+            row[0] for row in self._query_chunks(
+                "SELECT mbid FROM mb_failed_lookups WHERE mbid IN ({placeholders})", mbids
+            )
+        }
+
     def get_failed(self, mbid: str) -> Optional[Dict[str, Any]]:
         from utils.db import get_connection
         row = get_connection().execute(
@@ -263,6 +311,103 @@ def get_mb_cache() -> MusicBrainzCache:
     return _mb_cache_instance
 
 
+class MusicBrainzRequestScheduler:
+    """
+    Issues MusicBrainz requests from a dedicated thread, one at a time.
+
+    Each request starts no sooner than *min_interval* seconds after the
+    previous one started, so the network is kept busy at the permitted
+    cadence while the consumer parses responses and writes to the database
+    between results.  Requests are keyed; submitting a key that was already
+    submitted is a no-op, so shared work MBIDs are fetched once.
+
+    Results are (key, payload, error) tuples, read with next_result() in the
+    order the requests completed.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[str, Dict[str, Any]], Dict[str, Any]],
+        min_interval: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._fetch = fetch
+        self.min_interval = MIN_REQUEST_INTERVAL if min_interval is None else min_interval
+        self._clock = clock
+        self._pending: deque = deque()
+        self._submitted: Set[Any] = set()
+        self._cond = threading.Condition()
+        self._closed = threading.Event()
+        self._results: queue.Queue = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._request_count = 0
+        self._first_start: Optional[float] = None
+        self._last_start: Optional[float] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="musicbrainz-requests", daemon=True)
+        self._thread.start()
+
+    def submit(self, key: Any, endpoint: str, params: Dict[str, Any], priority: bool = False) -> bool:
+        """Queue a request; *priority* requests go ahead of those already waiting."""
+        with self._cond:
+            if key in self._submitted:
+                return False
+            self._submitted.add(key)
+            entry = (key, endpoint, params)
+            if priority:
+                self._pending.appendleft(entry)
+            else:
+                self._pending.append(entry)
+            self._cond.notify()
+        return True
+
+    def next_result(self, timeout: Optional[float] = None) -> Tuple[Any, Optional[Dict[str, Any]], Optional[Exception]]:
+        return self._results.get(timeout=timeout)
+
+    def close(self) -> None:
+        """Stop after the request in flight; requests still queued are dropped."""
+        self._closed.set()
+        with self._cond:
+            self._cond.notify_all()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    @property
+    def request_count(self) -> int:
+        return self._request_count
+
+    @property
+    def requests_per_second(self) -> Optional[float]:
+        """Sustained rate: requests started per second between the first and last start."""
+        if self._request_count < 2 or self._last_start == self._first_start:
+            return None
+        return (self._request_count - 1) / (self._last_start - self._first_start)
+
+    def _run(self) -> None:
+        next_slot = 0.0
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed.is_set():
+                    self._cond.wait()
+                if self._closed.is_set():
+                    return
+                key, endpoint, params = self._pending.popleft()
+            wait = next_slot - self._clock()
+            if wait > 0 and self._closed.wait(wait):
+                return
+            started = self._clock()
+            next_slot = started + self.min_interval
+            if self._first_start is None:
+                self._first_start = started
+            self._last_start = started
+            self._request_count += 1
+            try:
+                self._results.put((key, self._fetch(endpoint, params), None))
+            except Exception as exc:
+                self._results.put((key, None, exc))
+
+
 class MusicBrainzReadAPI:
     """
     Read-only MusicBrainz API client.
@@ -271,6 +416,9 @@ class MusicBrainzReadAPI:
     fetched recordings, works, and artists for the lifetime of the instance.
     """
 
+    _RECORDING_INC = "work-rels+artist-credits+genres+work-level-rels"
+    _WORK_INC = "artist-rels+genres"
+
     def __init__(self, user_agent: str = DEFAULT_USER_AGENT) -> None:
         self._session = requests.Session()
         self._session.headers.update({
@@ -285,13 +433,18 @@ class MusicBrainzReadAPI:
         # Populated by get_composition_credits so enrich_recordings can write
         # a precise entry to mb_failed_lookups without re-raising the exception.
         self._failed_recording_codes: Dict[str, Optional[int]] = {}
+        # Sustained request rate of the last enrich_recordings run
+        self.last_requests_per_second: Optional[float] = None
 
     def _call(self, endpoint: str, **params: Any) -> Dict[str, Any]:
         elapsed = time.monotonic() - self._last_request_at
         if elapsed < MIN_REQUEST_INTERVAL:
             time.sleep(MIN_REQUEST_INTERVAL - elapsed)
+        return self._request(endpoint, params)
 
-        params["fmt"] = "json"
+    def _request(self, endpoint: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Issue one request without rate limiting; callers are responsible for the cadence."""
+        params = dict(params, fmt="json")
         try:
             response = self._session.get(f"{API_ROOT}{endpoint}", params=params, timeout=30)
         except requests.RequestException as exc:
@@ -330,19 +483,20 @@ class MusicBrainzReadAPI:
         """
         if mbid in self._recording_cache:
             return self._recording_cache[mbid]
-        payload = self._call(
-            f"recording/{mbid}",
-            inc="work-rels+artist-credits+genres+work-level-rels",
-        )
+        payload = self._call(f"recording/{mbid}", inc=self._RECORDING_INC)
+        return self._cache_recording(mbid, payload)
+
+    def _cache_recording(self, mbid: str, payload: Dict[str, Any]) -> MusicBrainzRecording:
         recording = self._parse_recording(mbid, payload)
         self._recording_cache[mbid] = recording
         # Pre-populate work cache from inline work-level-rels data so
-        # get_composition_credits doesn't need separate work requests.
+        # get_composition_credits doesn't need separate work requests.  A work
+        # embedded without its relations is left to be fetched on its own.
         for rel in payload.get("relations") or []:
             if rel.get("target-type") == "work":
                 work_data = rel.get("work") or {}
                 work_id = work_data.get("id")
-                if work_id and work_id not in self._work_cache:
+                if work_id and work_id not in self._work_cache and "relations" in work_data:
                     self._work_cache[work_id] = self._parse_work(work_id, work_data)
         return recording
 
@@ -350,7 +504,7 @@ class MusicBrainzReadAPI:
         """Fetch a work by MBID, including artist relations and genres."""
         if mbid in self._work_cache:
             return self._work_cache[mbid]
-        payload = self._call(f"work/{mbid}", inc="artist-rels+genres")
+        payload = self._call(f"work/{mbid}", inc=self._WORK_INC)
         work = self._parse_work(mbid, payload)
         self._work_cache[mbid] = work
         return work
@@ -438,65 +592,139 @@ class MusicBrainzReadAPI:
 
         Writes are committed to the database at least every 5 minutes so that
         a long-running job does not lose progress if interrupted.
+
+        Requests go through a MusicBrainzRequestScheduler, so the next request
+        is already in flight while a response is parsed and stored.  The
+        sustained request rate is kept in ``last_requests_per_second``.
         """
         SAVE_INTERVAL = 60  # seconds
         # Skip MBIDs already in mb_recordings *and* those already known to have
         # failed — avoids re-issuing requests for stale/invalid Last.fm MBIDs.
-        uncached = [m for m in mbids if m and m not in cache and not cache.has_failed(m)]
+        # Both checks run as a few set-based queries rather than two per MBID.
+        candidates = [m for m in dict.fromkeys(mbids) if m]
+        known = cache.contains_many(candidates) | cache.failed_many(candidates)
+        uncached = [m for m in candidates if m not in known]
         total = len(uncached)
+        if total == 0:
+            cache.save()
+            return
+
+        # Requests are issued by the scheduler's thread at the permitted
+        # cadence; this thread parses the responses and writes the cache in
+        # the gaps.  Recordings normally embed their works (work-level-rels);
+        # any work that is missing is fetched once however many recordings
+        # link to it, ahead of the remaining recordings.
+        scheduler = MusicBrainzRequestScheduler(self._request)
+        for mbid in uncached:
+            scheduler.submit(("recording", mbid), f"recording/{mbid}", {"inc": self._RECORDING_INC})
+        waiting_on_works: Dict[str, Set[str]] = {}
+        work_waiters: Dict[str, List[str]] = {}
+        failed_works: Set[str] = set()
+        completed = 0
         last_save_at = time.monotonic()
-        for i, mbid in enumerate(uncached):
-            try:
-                credits = self.get_composition_credits(mbid)
-                recording = self._recording_cache.get(mbid)
-
-                if recording is None:
-                    # get_recording raised MusicBrainzError (swallowed inside
-                    # get_composition_credits).  Persist to the failed-lookup
-                    # table rather than writing a blank row to mb_recordings so
-                    # that genuinely credit-free recordings stay distinguishable
-                    # from invalid or stale MBIDs.
-                    status_code = self._failed_recording_codes.get(mbid)
-                    cache.set_failed(mbid, endpoint="recording", status_code=status_code)
-                    logger.debug("Recorded failed lookup for %s (status=%s)", mbid, status_code)
-                else:
-                    # Merge genres: recording-level first, then each linked work's genres.
-                    # Recording genres tend to describe the performance; work genres tend
-                    # to describe the form/style (especially for classical).  Both are
-                    # valuable, so we keep both, deduplicated, in that order.
-                    seen_genres: set = set()
-                    merged_genres: list = []
-                    for g in recording.genres:
-                        if g not in seen_genres:
-                            merged_genres.append(g)
-                            seen_genres.add(g)
-                    for work_mbid in recording.work_mbids:
-                        work = self._work_cache.get(work_mbid)
-                        if work:
-                            for g in work.genres:
-                                if g not in seen_genres:
-                                    merged_genres.append(g)
-                                    seen_genres.add(g)
-                    cache.set(mbid, {
-                        "mb_title": recording.title,
-                        "mb_artist": recording.artist_credit,
-                        "mb_genres": merged_genres,
-                        "composer": [a.name for a in credits.get("composer", [])],
-                        "lyricist": [a.name for a in credits.get("lyricist", [])],
-                        "arranger": [a.name for a in credits.get("arranger", [])],
-                        "orchestrator": [a.name for a in credits.get("orchestrator", [])],
-                        "writer": [a.name for a in credits.get("writer", [])],
-                    })
-            except MusicBrainzError as exc:
-                logger.warning("Skipping recording %s during enrichment: %s", mbid, exc)
-                cache.set_failed(mbid, endpoint="recording", status_code=exc.status_code)
+
+        def finish(mbid: str) -> None:
+            nonlocal completed, last_save_at
+            recording = self._recording_cache.get(mbid)
+            if recording is None:
+                # The recording request failed.  Persist to the failed-lookup
+                # table rather than writing a blank row to mb_recordings so
+                # that genuinely credit-free recordings stay distinguishable
+                # from invalid or stale MBIDs.
+                status_code = self._failed_recording_codes.get(mbid)
+                cache.set_failed(mbid, endpoint="recording", status_code=status_code)
+                logger.debug("Recorded failed lookup for %s (status=%s)", mbid, status_code)
+            else:
+                cache.set(mbid, self._build_cache_record(recording))
+            completed += 1
             if progress_callback:
-                progress_callback(i + 1, total)
+                progress_callback(completed, total)
             if time.monotonic() - last_save_at >= SAVE_INTERVAL:
                 cache.save()
                 last_save_at = time.monotonic()
-                logger.info("Batch save: %d/%d records committed", i + 1, total)
-        cache.save()
+                logger.info("Batch save: %d/%d records committed", completed, total)
+
+        scheduler.start()
+        try:
+            while completed < total:
+                (kind, mbid), payload, error = scheduler.next_result()
+                if error is not None and not isinstance(error, MusicBrainzError):
+                    raise error
+                if kind == "recording":
+                    if error is not None:
+                        logger.warning("Could not fetch recording %s: %s", mbid, error)
+                        self._failed_recording_codes[mbid] = error.status_code
+                        finish(mbid)
+                        continue
+                    recording = self._cache_recording(mbid, payload)
+                    missing = {
+                        w for w in recording.work_mbids
+                        if w not in self._work_cache and w not in failed_works
+                    }
+                    if not missing:
+                        finish(mbid)
+                        continue
+                    waiting_on_works[mbid] = missing
+                    for work_mbid in missing:
+                        work_waiters.setdefault(work_mbid, []).append(mbid)
+                        scheduler.submit(
+                            ("work", work_mbid), f"work/{work_mbid}", {"inc": self._WORK_INC}, priority=True
+                        )
+                else:
+                    if error is not None:
+                        logger.warning("Could not fetch work %s: %s", mbid, error)
+                        failed_works.add(mbid)
+                    else:
+                        self._work_cache[mbid] = self._parse_work(mbid, payload)
+                    for recording_mbid in work_waiters.pop(mbid, []):
+                        remaining = waiting_on_works[recording_mbid]
+                        remaining.discard(mbid)
+                        if not remaining:
+                            del waiting_on_works[recording_mbid]
+                            finish(recording_mbid)
+        finally:
+            scheduler.close()
+            cache.save()
+
+        self.last_requests_per_second = scheduler.requests_per_second
+        if self.last_requests_per_second is not None:
+            logger.info(
+                "MusicBrainz enrichment: %d requests for %d recordings, %.2f req/s sustained",
+                scheduler.request_count, total, self.last_requests_per_second,
+            )
+
+    def _build_cache_record(self, recording: MusicBrainzRecording) -> Dict[str, Any]:
+        """Normalised cache record for a recording whose works are already resolved."""
+        credits: Dict[str, List[MusicBrainzArtist]] = {}
+        # Merge genres: recording-level first, then each linked work's genres.
+        # Recording genres tend to describe the performance; work genres tend
+        # to describe the form/style (especially for classical).  Both are
+        # valuable, so we keep both, deduplicated, in that order.
+        seen_genres: set = set()
+        merged_genres: list = []
+        for g in recording.genres:
+            if g not in seen_genres:
+                merged_genres.append(g)
+                seen_genres.add(g)
+        for work_mbid in recording.work_mbids:
+            work = self._work_cache.get(work_mbid)
+            if work:
+                for role, artists in work.composition_credits.items():
+                    credits.setdefault(role, []).extend(artists)
+                for g in work.genres:
+                    if g not in seen_genres:
+                        merged_genres.append(g)
+                        seen_genres.add(g)
+        return {
+            "mb_title": recording.title,
+            "mb_artist": recording.artist_credit,
+            "mb_genres": merged_genres,
+            "composer": [a.name for a in credits.get("composer", [])],
+            "lyricist": [a.name for a in credits.get("lyricist", [])],
+            "arranger": [a.name for a in credits.get("arranger", [])],
+            "orchestrator": [a.name for a in credits.get("orchestrator", [])],
+            "writer": [a.name for a in credits.get("writer", [])],
+        }
 
     @staticmethod
     def _parse_recording(mbid: str, payload: Dict[str, Any]) -> MusicBrainzRecording:
@@ -1,8 +1,8 @@
 
 
 import datetime
-import requests
 
+from extensions.http_cache import http_cache
 from library_data.blacklist import Blacklist
 from utils.config import config
 from utils.utils import Utils
@@ -50,6 +50,7 @@ class NewsResponse:
 class NewsAPI:
     ENDPOINT = "https://newsapi.org/v2/top-headlines"
     KEY = config.news_api_key
+    CACHE_TTL_SECONDS = 30 * 60
 
     def __init__(self) -> None:
         pass
@@ -58,7 +59,7 @@ class NewsAPI:
         url = f"{self.ENDPOINT}?country={country}&apiKey={NewsAPI.KEY}"
         if topic is not None:
             url += "&q={}".format(topic.value)
-        news = NewsResponse(requests.get(url).json(), country)
+        news = NewsResponse(http_cache.get_json(url, ttl=NewsAPI.CACHE_TTL_SECONDS), country)
         return news
 
 
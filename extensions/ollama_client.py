@@ -0,0 +1,251 @@
+"""
+Keep-alive HTTP client for the Ollama API.
+
+urllib opens a new TCP connection for every request.  OllamaHTTPClient keeps a
+small pool of persistent HTTP/1.1 connections per server instead, shared by
+every LLM instance that talks to it, and records latency histograms for each
+request phase:
+
+- ``connect``: time to open a connection (0 when a pooled one is reused)
+- ``first_token``: time from sending a streaming request to its first event
+- ``total``: time from sending a request to reading the whole response
+
+It also issues the warm-up request that loads a model into memory ahead of
+the first real generation.  Only the standard library is used.
+"""
+
+import bisect
+import http.client
+import json
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from utils.logging_setup import get_logger
+
+logger = get_logger(__name__)
+
+
+class OllamaHTTPError(Exception):
+    """Raised when the Ollama server answers with a non-200 status."""
+
+    def __init__(self, status: int, body: str = ""):
+        super().__init__(f"Ollama returned HTTP {status}: {body[:200]}")
+        self.status = status
+
+
+class LatencyHistogram:
+    """Thread-safe histogram of request latencies in seconds."""
+
+    BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, math.inf)
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.counts: List[int] = [0] * len(self.BUCKETS)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self.counts[bisect.bisect_left(self.BUCKETS, seconds)] += 1
+            self.count += 1
+            self.total += seconds
+            self.max = max(self.max, seconds)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, fraction: float) -> float:
+        """Upper bound of the bucket holding the given fraction of observations."""
+        with self._lock:
+            if self.count == 0:
+                return 0.0
+            target = math.ceil(fraction * self.count)
+            seen = 0
+            for bound, count in zip(self.BUCKETS, self.counts):
+                seen += count
+                if seen >= target:
+                    return min(bound, self.max)
+            return self.max
+
+    def summary(self) -> str:
+        if self.count == 0:
+            return "no requests"
+        return (
+            f"n={self.count} mean={self.mean * 1000:.0f}ms p50<={self.percentile(0.5) * 1000:.0f}ms "
+            f"p95<={self.percentile(0.95) * 1000:.0f}ms max={self.max * 1000:.0f}ms"
+        )
+
+
+class OllamaHTTPClient:
+    """Pooled keep-alive client for one Ollama server, e.g. ``http://localhost:11434``."""
+
+    PHASES = ("connect", "first_token", "total")
+    DEFAULT_POOL_SIZE = 4
+
+    _clients: Dict[Tuple[str, str, int], "OllamaHTTPClient"] = {}
+    _clients_lock = threading.Lock()
+
+    def __init__(self, url: str, pool_size: int = DEFAULT_POOL_SIZE) -> None:
+        parts = urlsplit(url)
+        self.scheme = parts.scheme or "http"
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port or (443 if self.scheme == "https" else 80)
+        self.pool_size = pool_size
+        self._idle: List[http.client.HTTPConnection] = []
+        self._lock = threading.Lock()
+        self.connections_opened = 0
+        self.latency: Dict[str, LatencyHistogram] = {phase: LatencyHistogram() for phase in self.PHASES}
+
+    @classmethod
+    def for_url(cls, url: str) -> "OllamaHTTPClient":
+        """The shared client for the server at *url* (any path is ignored)."""
+        parts = urlsplit(url)
+        key = (parts.scheme or "http", parts.hostname or "localhost", parts.port or 0)
+        with cls._clients_lock:
+            client = cls._clients.get(key)
+            if client is None:
+                client = cls(url)
+                cls._clients[key] = client
+            return client
+
+    def _new_connection(self, timeout: float) -> http.client.HTTPConnection:
+        connection_class = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+        connection = connection_class(self.host, self.port, timeout=timeout)
+        connection.connect()
+        with self._lock:
+            self.connections_opened += 1
+        return connection
+
+    def _acquire(self, timeout: float, pooled: bool = True) -> Tuple[http.client.HTTPConnection, bool]:
+        """Return a connection and whether it was reused from the pool."""
+        connection = None
+        if pooled:
+            with self._lock:
+                connection = self._idle.pop() if self._idle else None
+        if connection is not None:
+            connection.timeout = timeout
+            if connection.sock is not None:
+                connection.sock.settimeout(timeout)
+            self.latency["connect"].observe(0.0)
+            return connection, True
+        start = time.perf_counter()
+        connection = self._new_connection(timeout)
+        self.latency["connect"].observe(time.perf_counter() - start)
+        return connection, False
+
+    def _release(self, connection: http.client.HTTPConnection, reusable: bool) -> None:
+        if reusable:
+            with self._lock:
+                if len(self._idle) < self.pool_size:
+                    self._idle.append(connection)
+                    return
+        connection.close()
+
+    def _send(self, path: str, payload: dict, timeout: float):
+        """POST *payload*, retrying once on a new connection if a pooled one went stale."""
+        body = json.dumps(payload).encode("utf-8")
+        headers = {"Content-Type": "application/json"}
+        connection, reused = self._acquire(timeout)
+        while True:
+            try:
+                connection.request("POST", path, body=body, headers=headers)
+                return connection, connection.getresponse()
+            except (http.client.RemoteDisconnected, http.client.CannotSendRequest, ConnectionResetError, BrokenPipeError):
+                connection.close()
+                if not reused:
+                    raise
+                logger.debug("Pooled Ollama connection was closed by the server, reconnecting")
+                connection, reused = self._acquire(timeout, pooled=False)
+            except Exception:
+                connection.close()
+                raise
+
+    @staticmethod
+    def _check_status(response) -> None:
+        if response.status != 200:
+            body = response.read().decode("utf-8", errors="replace")
+            raise OllamaHTTPError(response.status, body)
+
+    def post_json(self, path: str, payload: dict, timeout: float) -> dict:
+        """POST *payload* and return the parsed JSON response."""
+        start = time.perf_counter()
+        connection, response = self._send(path, payload, timeout)
+        reusable = False
+        try:
+            self._check_status(response)
+            data = json.loads(response.read().decode("utf-8"))
+            reusable = not response.will_close
+            return data
+        finally:
+            self.latency["total"].observe(time.perf_counter() - start)
+            self._release(connection, reusable)
+
+    @contextmanager
+    def stream_json(self, path: str, payload: dict, timeout: float):
+        """
+        POST *payload* and yield ``(response, events)``, where *events* iterates
+        the parsed NDJSON objects as they arrive.
+
+        Closing *response* from another thread stops the read (cancellation).
+        A connection whose response was not read to the end is not reused.
+        """
+        start = time.perf_counter()
+        connection, response = self._send(path, payload, timeout)
+        finished = False
+
+        def events() -> Iterator[dict]:
+            nonlocal finished
+            first = True
+            for raw in response:
+                raw = raw.strip()
+                if not raw:
+                    continue
+                if first:
+                    self.latency["first_token"].observe(time.perf_counter() - start)
+                    first = False
+                event = json.loads(raw.decode("utf-8"))
+                if event.get("done"):
+                    # Consumers stop at the final event, so finish the response here to keep the connection
+                    response.read()
+                    finished = True
+                yield event
+            finished = True
+
+        try:
+            self._check_status(response)
+            yield response, events()
+        finally:
+            self.latency["total"].observe(time.perf_counter() - start)
+            self._release(connection, finished and not response.will_close)
+
+    def warm_up(self, path: str, model: str, keep_alive: Optional[str], timeout: float) -> bool:
+        """
+        Load *model* without generating anything (a generate request with no
+        prompt), keeping it loaded for *keep_alive*.  Returns True on success.
+        """
+        payload = {"model": model}
+        if keep_alive is not None:
+            payload["keep_alive"] = keep_alive
+        start = time.perf_counter()
+        try:
+            self.post_json(path, payload, timeout)
+        except Exception as e:
+            logger.warning(f"Failed to warm up LLM model {model}: {e}")
+            return False
+        logger.info(f"Warmed up LLM model {model} in {time.perf_counter() - start:.2f}s (keep_alive={keep_alive})")
+        return True
+
+    def latency_summary(self) -> str:
+        return "\n".join(f"{phase}: {self.latency[phase].summary()}" for phase in self.PHASES)
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection in idle:
+            connection.close()
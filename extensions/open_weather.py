@@ -1,6 +1,6 @@
 from datetime import datetime
-import requests
 
+from extensions.http_cache import http_cache
 from utils.config import config
 from utils.logging_setup import get_logger
 
@@ -218,24 +218,26 @@ class OpenWeatherAPI:
     HOURLY_FORECAST_ENDPOINT = "https://api.openweathermap.org/data/2.5/forecast"
     GEO_ENDPOINT = "https://api.openweathermap.org/geo/1.0/direct"
     api_key = config.open_weather_api_key
+    GEO_CACHE_TTL_SECONDS = 30 * 24 * 60 * 60
+    WEATHER_CACHE_TTL_SECONDS = 10 * 60
+    FORECAST_CACHE_TTL_SECONDS = 30 * 60
     
     def __init__(self):
         pass
 
     def get_coordinates(self, city=config.open_weather_city):
         url = f"{self.GEO_ENDPOINT}?q={city}&limit=3&appid={self.api_key}"
-        response = requests.get(url)
-        resp_json = response.json()[0]
+        resp_json = http_cache.get_json(url, ttl=self.GEO_CACHE_TTL_SECONDS)[0]
         return float(resp_json["lat"]), float(resp_json["lon"])
 
     def get_weather_for_city(self, city):
         lat, lon = self.get_coordinates(city)
 
         current_weather_url = f"{self.WEATHER_ENDPOINT}?lat={lat}&lon={lon}&appid={self.api_key}&units=imperial"
-        current_weather_response = requests.get(current_weather_url)
+        current_weather_response = http_cache.get(current_weather_url, ttl=self.WEATHER_CACHE_TTL_SECONDS)
 
         hourly_forecast_url = f"{self.HOURLY_FORECAST_ENDPOINT}?lat={lat}&lon={lon}&appid={self.api_key}&units=imperial"
-        hourly_forecast_response = requests.get(hourly_forecast_url)
+        hourly_forecast_response = http_cache.get(hourly_forecast_url, ttl=self.FORECAST_CACHE_TTL_SECONDS)
 
         weather = OpenWeatherResponse(current_weather_response.json(), hourly_forecast_response.json())
         return weather
@@ -7,9 +7,11 @@ All state is module-level and cached for the process lifetime.
 import json
 import random
 from urllib import request
-from urllib.error import URLError
 from urllib.parse import urlencode
 
+import requests
+
+from extensions.http_cache import HTTPStatusError, http_cache
 from utils.logging_setup import get_logger
 
 logger = get_logger(__name__)
@@ -17,6 +19,8 @@ logger = get_logger(__name__)
 _USER_AGENT = "Muse/1.0"
 _DISCOVERY_URL = "https://all.api.radio-browser.info/json/servers"
 _cached_server: str = ""
+_SEARCH_CACHE_TTL_SECONDS = 60 * 60
+_STATION_CACHE_TTL_SECONDS = 24 * 60 * 60
 
 
 def _resolve_server() -> str:
@@ -36,20 +40,22 @@ def _resolve_server() -> str:
     return _cached_server
 
 
-def _api_get(path: str, params: dict | None = None) -> list:
+def _api_get(path: str, params: dict | None = None, ttl: float = 0) -> list:
     global _cached_server
     server = _resolve_server()
     url = f"{server}{path}"
     if params:
         url = f"{url}?{urlencode(params)}"
-    req = request.Request(
-        url,
-        headers={"User-Agent": _USER_AGENT, "Accept": "application/json"},
-    )
     try:
-        with request.urlopen(req, timeout=10) as resp:
-            return json.loads(resp.read().decode())
-    except URLError:
+        response = http_cache.get(
+            url,
+            ttl=ttl,
+            headers={"User-Agent": _USER_AGENT, "Accept": "application/json"},
+            timeout=10,
+        )
+        response.raise_for_status()
+        return response.json()
+    except (requests.RequestException, HTTPStatusError):
         _cached_server = ""  # force re-resolution on next call
         raise
 
@@ -78,13 +84,13 @@ def search_stations(
         params["tag"] = tags
     if country:
         params["country"] = country
-    return _api_get("/json/stations/search", params)
+    return _api_get("/json/stations/search", params, ttl=_SEARCH_CACHE_TTL_SECONDS)
 
 
 def get_station_by_uuid(uuid: str) -> "dict | None":
     """Return the Radio Browser station dict for *uuid*, or ``None`` if not found."""
     try:
-        results = _api_get(f"/json/stations/byuuid/{uuid}")
+        results = _api_get(f"/json/stations/byuuid/{uuid}", ttl=_STATION_CACHE_TTL_SECONDS)
         return results[0] if results else None
     except Exception as exc:
         logger.warning("Failed to fetch station by UUID %s: %s", uuid, exc)
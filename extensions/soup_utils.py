@@ -1,8 +1,5 @@
 import html
 import urllib.parse
-import urllib.request
-from bs4 import BeautifulSoup
-import pandas as pd
 import io
 import re
 
@@ -25,14 +22,17 @@ class SoupUtils:
         return urllib.parse.unquote(html.unescape(html_encoded))
 
     @staticmethod
-    def get_soup(url=None, base_url="", extension=""):
+    def get_soup(url=None, base_url="", extension="", ttl=None):
+        """
+        Fetch and parse *url* through the shared HTTP cache, reusing a cached
+        copy younger than *ttl* seconds.  The returned soup may be shared with
+        other callers, so don't modify it.
+        """
         if url is None:
             url = f"{base_url}{extension}"
         try:
-            response = urllib.request.urlopen(url)
-            html_string = response.read().decode("utf-8")
-            soup = BeautifulSoup(html_string, "lxml")
-            return soup
+            from extensions.http_cache import http_cache
+            return http_cache.get_soup(url, ttl=ttl)
         except Exception as e:
             raise WebConnectionException(f"Failed to get HTML for {url}: {e}")
 
@@ -87,6 +87,7 @@ class SoupUtils:
 
     @staticmethod
     def get_table_data(table_el):
+        import pandas as pd  # slow to import and only needed here
         return pd.read_html(io.StringIO(str(table_el)))[0]
 
     @staticmethod
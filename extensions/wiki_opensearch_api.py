@@ -1,6 +1,7 @@
 import requests
 import traceback
 
+from extensions.http_cache import http_cache
 from extensions.soup_utils import SoupUtils
 from utils.logging_setup import get_logger
 
@@ -39,6 +40,7 @@ class RandomWikiResponse:
         return self.title + '\n\n' + self.data
 
 class WikiOpenSearchAPI:
+    SEARCH_CACHE_TTL_SECONDS = 24 * 60 * 60
     def __init__(self, language_code: str = "en") -> None:
         self.language_code = language_code
         self.BASE_URL = f'https://{language_code}.wikipedia.org/w/api.php'
@@ -55,7 +57,7 @@ class WikiOpenSearchAPI:
     def search(self, query: str, limit=-1):
         try:
             headers = self.__get_headers()
-            req = requests.get(self.__build_url(query, limit), headers=headers)
+            req = http_cache.get(self.__build_url(query, limit), ttl=self.SEARCH_CACHE_TTL_SECONDS, headers=headers)
             return WikiOpenSearchResponse(req.json())
         except Exception as e:
             logger.error(f"Failed to connect to Wiki OpenSearch API: {e}")
@@ -65,6 +67,7 @@ class WikiOpenSearchAPI:
     def random_wiki(self):
         try:
             headers = self.__get_headers()
+            # Not cached: every call should return a different article
             req = requests.get(f'{self.BASE_URL}?action=query&generator=random&grnnamespace=0&grnlimit=1&prop=extracts&format=json', headers=headers)
             return RandomWikiResponse(req.json())
         except Exception as e:
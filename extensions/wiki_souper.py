@@ -197,6 +197,7 @@ class WikiCompilationData:
 
 
 class WikiSouper():
+    CACHE_TTL_SECONDS = 24 * 60 * 60
     disallowed_links = [
         "Category:",
         "Category_talk:",
@@ -301,7 +302,7 @@ class WikiSouper():
     @staticmethod
     def get_wiki_tables(wiki_url):
         # There is one table with alternating classes containing title and subline, so need to update the news item on every other row.
-        soup = SoupUtils.get_soup(wiki_url)
+        soup = SoupUtils.get_soup(wiki_url, ttl=WikiSouper.CACHE_TTL_SECONDS)
         body_content = WikiSouper.get_mw_content(soup)
         tables = SoupUtils.get_elements(class_path=[["tag", "table"]], parent=body_content)
         more_citations = WikiSouper.get_more_citations_needed(soup)
@@ -365,7 +366,7 @@ class WikiSouper():
             return None, None
         logger.info("Container category item: " + item_title)
         item_links = []
-        item_soup = SoupUtils.get_soup(category_item_link)
+        item_soup = SoupUtils.get_soup(category_item_link, ttl=WikiSouper.CACHE_TTL_SECONDS)
         links = SoupUtils.get_links(item_soup)
         for link2 in links:
             if link2.startswith(WIKI):
@@ -410,7 +411,7 @@ class WikiSouper():
             logger.info("Container category: " + title)
             container = {}
             out_obj[title] = container
-            soup = SoupUtils.get_soup(link)
+            soup = SoupUtils.get_soup(link, ttl=WikiSouper.CACHE_TTL_SECONDS)
             category_tree_items = SoupUtils.get_elements(class_path=[["tag", "div"], ["class", "CategoryTreeItem"]], parent=soup)
             for item in category_tree_items:
                 for link1 in SoupUtils.get_links(item):
@@ -0,0 +1,187 @@
+"""
+Startup critical-path tracing.
+
+Run with the environment variable MUSE_STARTUP_TRACE=1 to record the wall time
+of every module imported during startup (cumulative and self time, main thread
+only) and of each named startup step, such as the PersistentDataManager.load()
+steps.  When startup finishes the report is written to startup_trace.txt in the
+cache directory and its location is logged.
+
+This module imports only the standard library, so app_qt can install it before
+anything else and see every import that follows.  With tracing off, step() and
+mark() cost next to nothing.
+"""
+
+import builtins
+import importlib.util
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterator, List, Optional
+
+ENV_VAR = "MUSE_STARTUP_TRACE"
+REPORT_FILENAME = "startup_trace.txt"
+
+
+@dataclass
+class _ImportRecord:
+    name: str
+    start: float
+    cumulative: float
+    self_time: float
+    depth: int
+
+
+@dataclass
+class _StepRecord:
+    name: str
+    start: float
+    duration: Optional[float]  # None for a point-in-time mark
+    depth: int
+
+
+class StartupTrace:
+    def __init__(self) -> None:
+        self.enabled = False
+        self._origin = time.perf_counter()
+        self._original_import = builtins.__import__
+        self._hooked = False
+        self._main_thread = threading.main_thread().ident
+        self._import_stack: List[List[float]] = []  # [start, child time] per open import
+        self._step_depth = 0
+        self.imports: List[_ImportRecord] = []
+        self.steps: List[_StepRecord] = []
+
+    def install_if_enabled(self) -> bool:
+        if os.environ.get(ENV_VAR, "").strip().lower() in ("", "0", "false", "no"):
+            return False
+        self.install()
+        return True
+
+    def install(self) -> None:
+        if self._hooked:
+            return
+        if not self.enabled:
+            self.enabled = True
+            self._origin = time.perf_counter()
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._traced_import
+        self._hooked = True
+
+    def uninstall(self) -> None:
+        if not self._hooked:
+            return
+        self._hooked = False
+        # Only restore if nothing has wrapped __import__ since; otherwise the
+        # hook stays in the chain and passes every import straight through.
+        if builtins.__import__ == self._traced_import:
+            builtins.__import__ = self._original_import
+
+    def _traced_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        original = self._original_import
+        if not self._hooked or threading.get_ident() != self._main_thread:
+            return original(name, globals, locals, fromlist, level)
+        module_name = name
+        if level > 0:
+            try:
+                module_name = importlib.util.resolve_name("." * level + name, (globals or {}).get("__package__"))
+            except (ImportError, ValueError):
+                pass
+        if module_name in sys.modules:
+            # "from package import submodule" can still import something new
+            new_submodules = [item for item in fromlist or ()
+                              if item != "*" and f"{module_name}.{item}" not in sys.modules]
+            if not new_submodules:
+                return original(name, globals, locals, fromlist, level)
+            module_name = f"{module_name}.{{{', '.join(new_submodules)}}}"
+        modules_before = len(sys.modules)
+        start = time.perf_counter()
+        frame = [start, 0.0]
+        self._import_stack.append(frame)
+        try:
+            return original(name, globals, locals, fromlist, level)
+        finally:
+            self._import_stack.pop()
+            elapsed = time.perf_counter() - start
+            if self._import_stack:
+                self._import_stack[-1][1] += elapsed
+            if len(sys.modules) > modules_before:
+                self.imports.append(_ImportRecord(
+                    module_name, start - self._origin, elapsed, elapsed - frame[1], len(self._import_stack),
+                ))
+
+    @contextmanager
+    def step(self, name: str) -> Iterator[None]:
+        """Record the wall time of the enclosed block as a named startup step."""
+        if not self.enabled:
+            yield
+            return
+        record = _StepRecord(name, time.perf_counter() - self._origin, None, self._step_depth)
+        self.steps.append(record)
+        self._step_depth += 1
+        try:
+            yield
+        finally:
+            self._step_depth -= 1
+            record.duration = time.perf_counter() - self._origin - record.start
+
+    def mark(self, name: str) -> None:
+        """Record a point in time, e.g. "main window shown"."""
+        if self.enabled:
+            self.steps.append(_StepRecord(name, time.perf_counter() - self._origin, None, self._step_depth))
+
+    def elapsed(self) -> float:
+        """Seconds since this module was imported, or since tracing started."""
+        return time.perf_counter() - self._origin
+
+    def report(self, top_imports: int = 40) -> str:
+        total = self.elapsed()
+        lines = [f"Muse startup trace: {total:.3f}s from trace start", "", "Steps (start, duration):"]
+        for step in self.steps:
+            indent = "  " * (step.depth + 1)
+            duration = "      mark" if step.duration is None else f"{step.duration * 1000:8.1f}ms"
+            lines.append(f"{indent}{step.start:7.3f}s {duration}  {step.name}")
+
+        top_level = [r for r in self.imports if r.depth == 0]
+        lines += [
+            "",
+            f"Imports: {len(self.imports)} modules, "
+            f"{sum(r.cumulative for r in top_level):.3f}s in top-level imports",
+            "",
+            f"Slowest imports by cumulative time (top {top_imports}):",
+            f"  {'cumulative':>10} {'self':>10}  module",
+        ]
+        for record in sorted(self.imports, key=lambda r: r.cumulative, reverse=True)[:top_imports]:
+            lines.append(f"  {record.cumulative * 1000:8.1f}ms {record.self_time * 1000:8.1f}ms  {record.name}")
+        lines += ["", f"Slowest imports by self time (top {top_imports}):"]
+        for record in sorted(self.imports, key=lambda r: r.self_time, reverse=True)[:top_imports]:
+            lines.append(f"  {record.self_time * 1000:8.1f}ms  {record.name}")
+        return "\n".join(lines) + "\n"
+
+    def finish(self, path: Optional[str] = None) -> Optional[str]:
+        """Stop tracing imports and write the report. Returns the report path."""
+        if not self.enabled:
+            return None
+        self.uninstall()
+        # utils is imported here, not at module level, so this module can be installed first
+        from utils.logging_setup import get_logger
+        logger = get_logger(__name__)
+        self.mark("trace finished")
+        if path is None:
+            from utils.cache_paths import resolve_cache_file
+            path = resolve_cache_file(REPORT_FILENAME)
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(self.report())
+        except OSError as e:
+            logger.warning(f"Could not write startup trace to {path}: {e}")
+            return None
+        self.enabled = False
+        logger.info(f"Startup trace written to {os.path.abspath(path)}")
+        return path
+
+
+startup_trace = StartupTrace()
@@ -0,0 +1,274 @@
+"""
+Album artwork store keyed by content hash.
+
+Embedded artwork is identical for every track of an album, so it is written to
+disk once per distinct image under its SHA-1 digest instead of being kept on
+each MediaTrack and copied to a fresh temp file on every request.  Tracks are
+mapped to a digest (memoized per filepath and mtime, so an edited file is
+re-read); the image itself is only read back when a caller needs it.
+
+Pre-scaled thumbnails for the sizes the UI displays are written next to the
+original on first use (requires Pillow; without it the original is used), so
+the media frame does not decode and rescale a full-size scan every time.
+
+The directory is bounded by max_cache_bytes: past it, the least recently used
+images are deleted with their thumbnails (use order survives restarts through
+the file mtimes) and are stored again from the track when next needed.  The
+track to digest map keeps the max_tracked_files most recently used tracks.
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+from utils.cache_paths import resolve_cache_file
+from utils.logging_setup import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    from PIL import Image
+    _PIL_AVAILABLE = True
+except ImportError:
+    _PIL_AVAILABLE = False
+
+
+# Magic bytes -> extension, so the stored file opens with the right decoder
+_IMAGE_SIGNATURES = (
+    (b"\xff\xd8\xff", ".jpg"),
+    (b"\x89PNG\r\n\x1a\n", ".png"),
+    (b"GIF8", ".gif"),
+    (b"BM", ".bmp"),
+)
+
+
+def _image_extension(data: bytes) -> str:
+    for signature, ext in _IMAGE_SIGNATURES:
+        if data.startswith(signature):
+            return ext
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return ".webp"
+    return ".jpg"
+
+
+class ArtworkStore:
+    CACHE_DIRNAME = "artwork_cache"
+    # Longest edge in pixels of the thumbnails kept on disk
+    THUMBNAIL_SIZES = (256, 512, 1024)
+    max_cache_bytes = 512 * 1024 * 1024
+    max_tracked_files = 20000
+
+    def __init__(self, directory: Optional[str] = None):
+        self._directory = directory
+        self._lock = threading.RLock()
+        # digest -> original image path
+        self._originals: Dict[str, str] = {}
+        # filepath -> (mtime, digest or None when the track has no artwork), least recently used first
+        self._track_digests: "OrderedDict[str, Tuple[float, Optional[str]]]" = OrderedDict()
+        # digest -> bytes on disk of the original and its thumbnails, least recently
+        # used first; read from the directory on first use
+        self._usage: Optional["OrderedDict[str, int]"] = None
+        self._total_bytes = 0
+
+    @property
+    def directory(self) -> str:
+        if self._directory is None:
+            self._directory = os.path.abspath(resolve_cache_file(ArtworkStore.CACHE_DIRNAME))
+        os.makedirs(self._directory, exist_ok=True)
+        return self._directory
+
+    def put(self, data: bytes) -> str:
+        """Store image bytes (once per distinct content) and return their digest."""
+        digest = hashlib.sha1(data).hexdigest()
+        with self._lock:
+            if digest in self._originals and os.path.exists(self._originals[digest]):
+                return digest
+            path = os.path.join(self.directory, digest + _image_extension(data))
+            if not os.path.exists(path):
+                tmp_path = path + ".tmp"
+                with open(tmp_path, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+                self._originals[digest] = path
+                self._add_usage(digest, path)
+            else:
+                self._originals[digest] = path
+                self._touch(digest)
+        return digest
+
+    def original_path(self, digest: str) -> Optional[str]:
+        path = self._originals.get(digest)
+        if path is None or not os.path.exists(path):
+            path = None
+            for ext in {ext for _, ext in _IMAGE_SIGNATURES} | {".webp"}:
+                candidate = os.path.join(self.directory, digest + ext)
+                if os.path.exists(candidate):
+                    path = candidate
+                    self._originals[digest] = path
+                    break
+        if path is not None:
+            self._touch(digest)
+        return path
+
+    def read(self, digest: str) -> Optional[bytes]:
+        path = self.original_path(digest)
+        if path is None:
+            return None
+        with open(path, "rb") as f:
+            return f.read()
+
+    def thumbnail_path(self, digest: str, size: int) -> Optional[str]:
+        """Path of the stored image scaled to fit *size* (one of THUMBNAIL_SIZES).
+
+        Thumbnails are never upscaled; if the original is already small enough,
+        or Pillow is unavailable, the original path is returned.
+        """
+        original = self.original_path(digest)
+        if original is None or not _PIL_AVAILABLE:
+            return original
+        path = os.path.join(self.directory, f"{digest}_{size}.jpg")
+        if os.path.exists(path):
+            return path
+        try:
+            with Image.open(original) as img:
+                if max(img.size) <= size:
+                    return original
+                img.thumbnail((size, size), Image.LANCZOS)
+                tmp_path = path + ".tmp"
+                img.convert("RGB").save(tmp_path, format="JPEG", quality=90)
+            os.replace(tmp_path, path)
+            with self._lock:
+                self._add_usage(digest, path)
+            return path
+        except Exception as e:
+            logger.warning(f"Could not create {size}px artwork thumbnail for {digest}: {e}")
+            return original
+
+    def display_path(self, path: str, width: int, height: int) -> str:
+        """Smallest stored rendition of *path* that still covers a width x height view.
+
+        Paths outside the store (persona art, assets) are returned unchanged.
+        """
+        if not path or os.path.dirname(os.path.abspath(path)) != self.directory:
+            return path
+        if width <= 0 or height <= 0:
+            return path  # view not laid out yet
+        digest = os.path.splitext(os.path.basename(path))[0].split("_")[0]
+        needed = max(width, height)
+        for size in ArtworkStore.THUMBNAIL_SIZES:
+            if size >= needed:
+                return self.thumbnail_path(digest, size) or path
+        return path
+
+    def digest_for_track(self, filepath: str, loader: Callable[[], Optional[bytes]]) -> Optional[str]:
+        """Digest of the artwork embedded in *filepath*, calling *loader* only when not yet known."""
+        try:
+            mtime = os.path.getmtime(filepath)
+        except OSError:
+            mtime = None
+        cached = self._track_digests.get(filepath)
+        if cached is not None and cached[0] == mtime:
+            digest = cached[1]
+            if digest is None or self.original_path(digest) is not None:
+                self._remember_track(filepath, cached)
+                return digest
+        data = loader()
+        digest = self.put(data) if data else None
+        self._remember_track(filepath, (mtime, digest))
+        return digest
+
+    def set_track_artwork(self, filepath: str, data: Optional[bytes]) -> Optional[str]:
+        """Record new artwork written to *filepath* (e.g. after a metadata update)."""
+        try:
+            mtime = os.path.getmtime(filepath)
+        except OSError:
+            mtime = None
+        digest = self.put(data) if data else None
+        self._remember_track(filepath, (mtime, digest))
+        return digest
+
+    def forget_track(self, filepath: str) -> None:
+        with self._lock:
+            self._track_digests.pop(filepath, None)
+
+    def _remember_track(self, filepath: str, entry: Tuple[Optional[float], Optional[str]]) -> None:
+        with self._lock:
+            self._track_digests[filepath] = entry
+            self._track_digests.move_to_end(filepath)
+            while len(self._track_digests) > ArtworkStore.max_tracked_files:
+                self._track_digests.popitem(last=False)
+
+    def _load_usage(self) -> "OrderedDict[str, int]":
+        """Sizes of the stored images by digest, ordered by the newest mtime of their files."""
+        if self._usage is None:
+            sizes: Dict[str, int] = {}
+            mtimes: Dict[str, float] = {}
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    if not entry.is_file() or entry.name.endswith(".tmp"):
+                        continue
+                    stat = entry.stat()
+                    digest = os.path.splitext(entry.name)[0].split("_")[0]
+                    sizes[digest] = sizes.get(digest, 0) + stat.st_size
+                    mtimes[digest] = max(mtimes.get(digest, 0.0), stat.st_mtime)
+            self._usage = OrderedDict((digest, sizes[digest]) for digest in sorted(sizes, key=mtimes.get))
+            self._total_bytes = sum(sizes.values())
+        return self._usage
+
+    def _touch(self, digest: str) -> None:
+        with self._lock:
+            usage = self._load_usage()
+            if digest not in usage or next(reversed(usage)) == digest:
+                return
+            usage.move_to_end(digest)
+            path = self._originals.get(digest)
+        # The mtime keeps the use order for the next session
+        try:
+            if path is not None:
+                os.utime(path)
+        except OSError:
+            pass
+
+    def _add_usage(self, digest: str, path: str) -> None:
+        """Count the file just written at *path*, then evict if the directory is over the bound."""
+        if self._usage is None:
+            usage = self._load_usage()  # the scan includes the new file
+        else:
+            usage = self._usage
+            nbytes = os.path.getsize(path)
+            usage[digest] = usage.get(digest, 0) + nbytes
+            self._total_bytes += nbytes
+        if digest in usage:
+            usage.move_to_end(digest)
+        self._evict()
+
+    def _evict(self) -> None:
+        """Delete the least recently used images until the directory fits max_cache_bytes."""
+        usage = self._load_usage()
+        evicted = 0
+        while self._total_bytes > ArtworkStore.max_cache_bytes and len(usage) > 1:
+            digest, nbytes = usage.popitem(last=False)
+            self._total_bytes -= nbytes
+            self._originals.pop(digest, None)
+            for name in self._file_names(digest):
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except FileNotFoundError:
+                    pass
+                except OSError as e:
+                    logger.warning(f"Could not delete cached artwork {name}: {e}")
+            evicted += 1
+        if evicted:
+            logger.debug(f"Evicted {evicted} least recently used images from the artwork cache")
+
+    @staticmethod
+    def _file_names(digest: str):
+        for ext in {ext for _, ext in _IMAGE_SIGNATURES} | {".webp"}:
+            yield digest + ext
+        for size in ArtworkStore.THUMBNAIL_SIZES:
+            yield f"{digest}_{size}.jpg"
+
+
+artwork_store = ArtworkStore()
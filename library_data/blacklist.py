@@ -477,10 +477,22 @@ class Blacklist:
             dict: A dictionary mapping found blacklisted tags to their blacklist items.
                  Empty if no blacklisted items are found.
         """
+        filtered = Blacklist.find_blacklisted_tags(text.split(','))
+        filtered.update(Blacklist.find_blacklisted_tags(text.split('.')))
+        return filtered
+
+    @staticmethod
+    def find_blacklisted_tags(tags) -> dict:
+        """Match already-split text pieces against the blacklist.
+
+        find_blacklisted_items() splits text on commas and on dots and checks
+        each piece with this; streaming callers check pieces as they complete.
+
+        Returns:
+            dict: Matched (cleaned) tags mapped to their blacklist item strings.
+        """
         filtered = {}
-        user_tags = text.split(',')
-        
-        for tag in user_tags:
+        for tag in tags:
             # Clean the tag by removing parentheses and extra whitespace
             tag = tag.strip()
             if not tag:
@@ -498,22 +510,6 @@ class Blacklist:
                 if blacklist_item.matches_tag(tag):
                     filtered[tag] = blacklist_item.string
                     break
-
-        user_tags_dot = text.split('.')
-        for tag in user_tags_dot:
-            tag = tag.strip()
-            if not tag:
-                continue
-            while tag.startswith('(') or tag.startswith('['):
-                tag = tag[1:].strip()
-            while tag.endswith(')') or tag.endswith(']'):
-                tag = tag[:-1].strip()
-            for blacklist_item in Blacklist.TAG_BLACKLIST:
-                if not blacklist_item.enabled:
-                    continue
-                if blacklist_item.matches_tag(tag):
-                    filtered[tag] = blacklist_item.string
-                    break
                     
         return filtered
 
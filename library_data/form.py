@@ -1,7 +1,7 @@
 import json
 import re
 
-from utils.db import get_connection, delim_to_list, list_to_delim
+from utils.db import get_connection, delim_to_list, list_to_delim, write_transaction
 from utils.logging_setup import get_logger
 from utils.translations import I18N
 
@@ -203,39 +203,33 @@ class FormsData:
         old_name = original_name if original_name else form.name
         renaming = old_name != form.name
 
+        if renaming and form.name in self._forms:
+            return False, _("A form named \"{0}\" already exists").format(form.name)
         try:
-            conn = get_connection()
+            with write_transaction() as conn:
+                if renaming:
+                    conn.execute("DELETE FROM forms WHERE name = ?", (old_name,))
+                conn.execute(
+                    """
+                    INSERT INTO forms (name, transliterations, notes)
+                    VALUES (?, ?, ?)
+                    ON CONFLICT(name) DO UPDATE SET
+                        transliterations = excluded.transliterations,
+                        notes = excluded.notes
+                    """,
+                    (
+                        form.name,
+                        list_to_delim(form.transliterations),
+                        json.dumps(form.notes or {}),
+                    ),
+                )
             if renaming:
-                if form.name in self._forms and form.name != old_name:
-                    return False, _("A form named \"{0}\" already exists").format(form.name)
-                conn.execute("DELETE FROM forms WHERE name = ?", (old_name,))
-                if old_name in self._forms:
-                    self._forms.pop(old_name)
-
-            conn.execute(
-                """
-                INSERT INTO forms (name, transliterations, notes)
-                VALUES (?, ?, ?)
-                ON CONFLICT(name) DO UPDATE SET
-                    transliterations = excluded.transliterations,
-                    notes = excluded.notes
-                """,
-                (
-                    form.name,
-                    list_to_delim(form.transliterations),
-                    json.dumps(form.notes or {}),
-                ),
-            )
-            conn.commit()
+                self._forms.pop(old_name, None)
             self._forms[form.name] = form
             return True, ""
         except Exception as e:
             error_msg = str(e)
             logger.error("Error saving form: %s", error_msg)
-            try:
-                get_connection().rollback()
-            except Exception:
-                pass
             return False, error_msg
 
     def delete_form(self, form):
@@ -248,9 +242,8 @@ class FormsData:
             return False, _("Invalid form data")
 
         try:
-            conn = get_connection()
-            cur = conn.execute("DELETE FROM forms WHERE name = ?", (form.name,))
-            conn.commit()
+            with write_transaction() as conn:
+                cur = conn.execute("DELETE FROM forms WHERE name = ?", (form.name,))
             if cur.rowcount == 0 and form.name not in self._forms:
                 return False, _("Form not found")
             self._forms.pop(form.name, None)
@@ -258,10 +251,6 @@ class FormsData:
         except Exception as e:
             error_msg = str(e)
             logger.error("Error deleting form: %s", error_msg)
-            try:
-                get_connection().rollback()
-            except Exception:
-                pass
             return False, error_msg
 
     def do_search(self, data_search):
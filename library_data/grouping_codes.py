@@ -0,0 +1,89 @@
+"""
+Dictionary-encoded grouping attributes for playlist construction.
+
+A playlist groups its tracks by one attribute (album, artist, composer, genre,
+form, instrument or catalogue).  GroupingCodes reads that attribute once per
+track and replaces each value with a small integer code, so grouping,
+counting, ordering and reshuffling can run as NumPy operations over an index
+array instead of calling the attribute getter per track on every pass.
+"""
+
+from operator import attrgetter, methodcaller
+from typing import Iterable, List, Optional, Sequence
+
+import numpy as np
+
+
+class GroupingCodes:
+    """
+    Codes of one grouping attribute over a sequence of tracks.
+
+    ``codes[i]`` is the code of ``tracks[i]``'s value and ``values[code]`` the
+    value itself, with codes assigned in first-seen order.  Values are
+    compared exactly as Playlist always has, so None is a group of its own.
+    """
+
+    def __init__(self, getter_name: str, codes: np.ndarray, values: List) -> None:
+        self.getter_name = getter_name
+        self.codes = codes
+        self.values = values
+        self._code_of = {value: code for code, value in enumerate(values)}
+
+    @classmethod
+    def from_tracks(cls, tracks: Sequence, getter_name: str) -> "GroupingCodes":
+        # Getter names starting with "get_" are methods, as in PlaylistSortType.getter_name_mapping()
+        if getter_name.startswith("get_"):
+            read = methodcaller(getter_name)
+        else:
+            read = attrgetter(getter_name)
+        track_values = list(map(read, tracks))
+        values = list(dict.fromkeys(track_values))
+        code_of = {value: code for code, value in enumerate(values)}
+        codes = np.fromiter(map(code_of.__getitem__, track_values), dtype=np.int32, count=len(track_values))
+        return cls(getter_name, codes, values)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def code_of(self, value) -> int:
+        """Code of *value*, or -1 if no track has it."""
+        return self._code_of.get(value, -1)
+
+    def value_at(self, position: int):
+        return self.values[self.codes[position]]
+
+    def take(self, order: np.ndarray) -> "GroupingCodes":
+        """Codes for the tracks reordered by *order* (an index array)."""
+        return GroupingCodes(self.getter_name, self.codes[order], self.values)
+
+    def counts(self) -> np.ndarray:
+        """Number of tracks per code."""
+        return np.bincount(self.codes, minlength=len(self.values))
+
+    def count_of(self, value) -> int:
+        code = self.code_of(value)
+        return int(np.count_nonzero(self.codes == code)) if code >= 0 else 0
+
+    def mask_for_values(self, values: Iterable) -> np.ndarray:
+        """Boolean array over tracks: True where the track's value is in *values*."""
+        code_mask = np.zeros(len(self.values), dtype=bool)
+        for value in values:
+            code = self._code_of.get(value, -1)
+            if code >= 0:
+                code_mask[code] = True
+        return code_mask[self.codes]
+
+    def group_order(self, group_rank: Sequence[int], tiebreak: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Index array that sorts the tracks by group, groups in *group_rank* order.
+
+        *group_rank* lists codes in the order their groups should appear.  Within
+        a group, tracks are ordered by *tiebreak* (e.g. an array of filepaths),
+        or keep their current relative order without one.
+        """
+        rank_of_code = np.empty(len(self.values), dtype=np.int64)
+        rank_of_code[np.asarray(group_rank, dtype=np.int64)] = np.arange(len(group_rank))
+        ranks = rank_of_code[self.codes]
+        if tiebreak is None:
+            return np.argsort(ranks, kind="stable")
+        return np.lexsort((tiebreak, ranks))
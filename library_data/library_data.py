@@ -22,6 +22,7 @@ from utils.cache_paths import resolve_cache_file
 from utils.config import config
 from utils.globals import MediaFileType, PlaylistSortType
 from utils.logging_setup import get_logger
+from utils.path_index import PathIndexedDict
 from utils.utils import Utils
 from utils.translations import I18N
 
@@ -32,6 +33,23 @@ libary_dir = os.path.join(os.path.dirname(os.path.realpath(__file__)))
 logger = get_logger(__name__)
 
 class LibraryDataSearch:
+    # Search fields and the media_tracks columns (all in media_tracks_fts) holding
+    # the values test() matches them against
+    DB_COLUMNS = {
+        "title": "searchable_title",
+        "album": "searchable_album",
+        "artist": "searchable_artist",
+        "composer": "searchable_composer",
+        "genre": "searchable_genre",
+        "instrument": "instrument",
+        "form": "form",
+        "catalogue": "catalogue",
+    }
+    # The fields test() checks for the "all" field (not catalogue).
+    ALL_DB_FIELDS = ("title", "artist", "composer", "album", "genre", "instrument", "form")
+    # The trigram index cannot match anything shorter.
+    MIN_FTS_LENGTH = 3
+
     def __init__(self, all="", title="", album="", artist="", composer="", genre="", instrument="", form="",
                  catalogue="",
                  selected_track_path=None, stored_results_count=0, max_results=200, id=None, offset=0):
@@ -144,6 +162,43 @@ class LibraryDataSearch:
     def get_results(self):
         return self.results
 
+    def to_db_query(self):
+        """
+        Build the media_tracks filter test() applies, as (FTS5 MATCH expression
+        or None, SQL conditions on the media_tracks row aliased m, parameters).
+
+        Each populated field is matched against the column holding the value
+        test() checks.  Values long enough for the trigram index become
+        phrases, which match exactly the substrings test() does; shorter
+        values are matched with instr().
+        """
+        if len(self.all) > 0:
+            columns = [LibraryDataSearch.DB_COLUMNS[field] for field in LibraryDataSearch.ALL_DB_FIELDS]
+            phrase = self._fts_phrase(self.all)
+            if phrase is not None:
+                return "{" + " ".join(columns) + "} : " + phrase, [], []
+            return None, ["(" + " OR ".join(f"instr(m.{c}, ?) > 0" for c in columns) + ")"], [self.all] * len(columns)
+        clauses = []
+        conditions = []
+        params = []
+        for field, column in LibraryDataSearch.DB_COLUMNS.items():
+            value = getattr(self, field)
+            if len(value) == 0:
+                continue
+            phrase = self._fts_phrase(value)
+            if phrase is not None:
+                clauses.append(f"{column} : {phrase}")
+            else:
+                conditions.append(f"instr(m.{column}, ?) > 0")
+                params.append(value)
+        return " AND ".join(clauses) if clauses else None, conditions, params
+
+    @staticmethod
+    def _fts_phrase(value):
+        if len(value) < LibraryDataSearch.MIN_FTS_LENGTH:
+            return None
+        return '"' + value.replace('"', '""') + '"'
+
     def sort_results_by(self, attr=None):
         if len(self.results) == 0 or (attr is not None and attr.strip() == ""):
             return
@@ -305,15 +360,23 @@ class LibraryDataSearch:
 
 class LibraryData:
     extension_thread_started = False
-    DIRECTORIES_CACHE = {}
-    MEDIA_TRACK_CACHE = {}
+    DIRECTORIES_CACHE = PathIndexedDict()
+    MEDIA_TRACK_CACHE = PathIndexedDict()
     all_tracks = [] # this list should be contained within the values of MEDIA_TRACK_CACHE, but may not be equivalent to the values
     get_tracks_lock = threading.Lock()
     CACHE_FILENAME = "app_media_track_cache"
     DIRECTORIES_CACHE_FILENAME = "app_directories_cache"
     DIRECTORIES_CACHE_KEY = "directories_cache"  # Keep for migration/backward compatibility
     LIBRARY_REFRESH_TIME_KEY = "library_refresh_time"
+    # db_meta key holding MediaTrack.derived_attributes_fingerprint() for the stored rows
+    DERIVED_ATTRIBUTES_META_KEY = "derived_attributes_fingerprint"
+    _derived_attributes_fingerprint = None
     _directory_cache_loaded = False
+    # Bumped when a track is created or all_tracks is gathered; with
+    # MediaTrack.metadata_updates this tells whether the stored media_tracks rows
+    # (and their in_library flags) still match the library in memory.
+    _tracks_version = 0
+    _db_tracks_version = None
 
     @staticmethod
     def media_track_cache_path() -> str:
@@ -325,21 +388,32 @@ class LibraryData:
 
     @staticmethod
     def store_caches():
-        from utils.db import get_connection
-        conn = get_connection()
+        from utils.db import set_meta, write_transaction
         now = time.time()
+        version = LibraryData._library_version()
+        # This runs on the persistence worker while other threads update the caches,
+        # so work from copies taken in one step rather than iterating the live dicts.
+        directories = list(LibraryData.DIRECTORIES_CACHE.items())
+        media_tracks = list(LibraryData.MEDIA_TRACK_CACHE.items())
+        library_filepaths = {track.filepath for track in list(LibraryData.all_tracks)}
+
+        # Forms or instruments edited this session change the derived values
+        fingerprint = MediaTrack.derived_attributes_fingerprint()
+        if fingerprint != LibraryData._derived_attributes_fingerprint:
+            for _, track in media_tracks:
+                track.compute_derived_attributes()
 
         # Directories
         try:
             rows = [
-                (path, json.dumps(files), now)
-                for path, files in LibraryData.DIRECTORIES_CACHE.items()
+                (path, json.dumps(list(files)), now)
+                for path, files in directories
             ]
-            conn.executemany(
-                "INSERT OR REPLACE INTO directories (path, files, scanned_at) VALUES (?, ?, ?)",
-                rows,
-            )
-            conn.commit()
+            with write_transaction() as conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO directories (path, files, scanned_at) VALUES (?, ?, ?)",
+                    rows,
+                )
             logger.debug("Stored %d directory entries to DB", len(rows))
         except Exception as e:
             logger.error(f"Error storing directories cache to DB: {e}")
@@ -348,21 +422,35 @@ class LibraryData:
         # only need to be made in one place (MediaTrack.to_db_row).
         try:
             rows = []
-            for filepath, track in LibraryData.MEDIA_TRACK_CACHE.items():
+            skipped = []
+            for filepath, track in media_tracks:
                 try:
                     r = track.to_db_row()
+                    r["in_library"] = 1 if filepath in library_filepaths else 0
                     r["scanned_at"] = now
                     rows.append(r)
                 except Exception as e:
+                    skipped.append(filepath)
                     logger.warning(f"Skipping track {filepath} for DB store: {e}")
             if rows:
                 cols = list(rows[0].keys())
+                # Upsert rather than INSERT OR REPLACE so rowids stay stable and the
+                # search index triggers only re-index rows whose text changed.
+                updates = ", ".join(f"{c}=excluded.{c}" for c in cols if c != "filepath")
                 sql = (
-                    f"INSERT OR REPLACE INTO media_tracks "
-                    f"({', '.join(cols)}) VALUES ({', '.join(['?'] * len(cols))})"
+                    f"INSERT INTO media_tracks "
+                    f"({', '.join(cols)}) VALUES ({', '.join(['?'] * len(cols))}) "
+                    f"ON CONFLICT(filepath) DO UPDATE SET {updates}"
                 )
-                conn.executemany(sql, [tuple(r[c] for c in cols) for r in rows])
-                conn.commit()
+                with write_transaction() as conn:
+                    conn.executemany(sql, [tuple(r[c] for c in cols) for r in rows])
+                    # Rows not written here are for tracks no longer in the cache
+                    conn.execute("UPDATE media_tracks SET in_library = 0 WHERE in_library = 1 AND scanned_at < ?",
+                                 (now,))
+                    set_meta(conn, LibraryData.DERIVED_ATTRIBUTES_META_KEY, fingerprint)
+                LibraryData._derived_attributes_fingerprint = fingerprint
+                if len(skipped) == 0:
+                    LibraryData._db_tracks_version = version
                 logger.debug("Stored %d tracks to DB", len(rows))
         except Exception as e:
             logger.error(f"Error storing media track cache to DB: {e}")
@@ -379,12 +467,14 @@ class LibraryData:
         
         # Try loading from DB first
         try:
-            from utils.db import get_connection
-            rows = get_connection().execute(
+            from utils.db import get_read_connection
+            rows = get_read_connection().execute(
                 "SELECT path, files FROM directories"
             ).fetchall()
             if rows:
-                LibraryData.DIRECTORIES_CACHE = {r["path"]: json.loads(r["files"]) for r in rows}
+                LibraryData.DIRECTORIES_CACHE = PathIndexedDict(
+                    (r["path"], json.loads(r["files"])) for r in rows
+                )
                 logger.debug("Loaded %d directory entries from DB", len(rows))
                 LibraryData._directory_cache_loaded = True
                 return
@@ -396,7 +486,7 @@ class LibraryData:
             directories_path = LibraryData.directories_cache_path()
             if os.path.exists(directories_path):
                 with open(directories_path, "rb") as f:
-                    LibraryData.DIRECTORIES_CACHE = pickle.load(f)
+                    LibraryData.DIRECTORIES_CACHE = PathIndexedDict(pickle.load(f))
                 logger.debug(f"Loaded directories cache from {directories_path}")
                 LibraryData._directory_cache_loaded = True
                 return
@@ -408,7 +498,7 @@ class LibraryData:
             cached_data = app_info_cache.get(LibraryData.DIRECTORIES_CACHE_KEY, default_val={})
             if cached_data:
                 # Make a deep copy to avoid reference issues that could cause duplication
-                LibraryData.DIRECTORIES_CACHE = copy.deepcopy(cached_data)
+                LibraryData.DIRECTORIES_CACHE = PathIndexedDict(copy.deepcopy(cached_data))
                 logger.info("Loaded directories cache from app_info_cache (migrating to pickle file)")
                 # Migrate to pickle file
                 try:
@@ -429,20 +519,21 @@ class LibraryData:
             logger.debug(f"Failed to load directories cache from app_info_cache: {e}")
         
         # If both fail, start with empty cache
-        LibraryData.DIRECTORIES_CACHE = {}
+        LibraryData.DIRECTORIES_CACHE = PathIndexedDict()
         LibraryData._directory_cache_loaded = True
     
     @staticmethod
     def load_media_track_cache():
         # Try loading from DB first
         try:
-            from utils.db import get_connection
-            rows = get_connection().execute("SELECT * FROM media_tracks").fetchall()
+            from utils.db import get_read_connection
+            rows = get_read_connection().execute("SELECT * FROM media_tracks").fetchall()
             if rows:
-                LibraryData.MEDIA_TRACK_CACHE = {
-                    r["filepath"]: MediaTrack.from_db_row(r) for r in rows
-                }
+                LibraryData.MEDIA_TRACK_CACHE = PathIndexedDict(
+                    (r["filepath"], MediaTrack.from_db_row(r)) for r in rows
+                )
                 logger.debug("Loaded %d tracks from DB", len(rows))
+                LibraryData._refresh_stored_derived_attributes()
                 return
         except Exception as e:
             logger.warning(f"Failed to load media track cache from DB: {e}")
@@ -450,10 +541,44 @@ class LibraryData:
         # Fallback: try loading from pickle file
         try:
             with open(LibraryData.media_track_cache_path(), "rb") as f:
-                LibraryData.MEDIA_TRACK_CACHE = pickle.load(f)
+                LibraryData.MEDIA_TRACK_CACHE = PathIndexedDict(pickle.load(f))
         except FileNotFoundError:
             logger.info("No media track cache found, creating new one")
 
+    @staticmethod
+    def _refresh_stored_derived_attributes():
+        """
+        Fill in derived attributes missing from stored rows (written before the
+        catalogue column existed), or recompute all of them if the forms or
+        instruments they were derived from have changed, and write them back.
+        """
+        from utils.db import get_meta, set_meta, write_transaction
+        fingerprint = MediaTrack.derived_attributes_fingerprint()
+        tracks = list(LibraryData.MEDIA_TRACK_CACHE.values())
+        if get_meta(LibraryData.DERIVED_ATTRIBUTES_META_KEY) != fingerprint:
+            stale = tracks
+        else:
+            stale = [t for t in tracks if t.form is None or t.instrument is None or t.catalogue is None]
+        LibraryData._derived_attributes_fingerprint = fingerprint
+        if len(stale) == 0:
+            return
+        for track in stale:
+            track.compute_derived_attributes()
+        try:
+            with write_transaction() as conn:
+                conn.executemany(
+                    "UPDATE media_tracks SET form=?, instrument=?, catalogue=? WHERE filepath=?",
+                    [(t.form, t.instrument, t.catalogue, t.filepath) for t in stale],
+                )
+                set_meta(conn, LibraryData.DERIVED_ATTRIBUTES_META_KEY, fingerprint)
+            logger.info("Recomputed derived attributes for %d tracks", len(stale))
+        except Exception as e:
+            logger.warning(f"Failed to store recomputed derived attributes: {e}")
+
+    @staticmethod
+    def _library_version():
+        return LibraryData._tracks_version, MediaTrack.metadata_updates
+
     @staticmethod
     def get_cache_update_time():
         """Get the last modification time of the media track cache file."""
@@ -523,8 +648,8 @@ class LibraryData:
         any_callback = search_status_callback or (app_actions and app_actions.update_extension_status)
         if overwrite:
             # Clear caches when overwriting to force fresh reads
-            LibraryData.MEDIA_TRACK_CACHE = {}
-            LibraryData.DIRECTORIES_CACHE = {}
+            LibraryData.MEDIA_TRACK_CACHE = PathIndexedDict()
+            LibraryData.DIRECTORIES_CACHE = PathIndexedDict()
             if app_actions is not None:
                 app_actions.update_extension_status(_("Updating tracks"))
         with LibraryData.get_tracks_lock:
@@ -536,6 +661,7 @@ class LibraryData:
                 # Clear existing tracks if overwriting
                 if overwrite:
                     LibraryData.all_tracks = []
+                LibraryData._tracks_version += 1
                 
                 # Process files with progress updates
                 for i, filepath in enumerate(all_filepaths):
@@ -570,6 +696,7 @@ class LibraryData:
         else:
             track = MediaTrack(filepath)
             LibraryData.MEDIA_TRACK_CACHE[filepath] = track
+            LibraryData._tracks_version += 1
             return track
 
 
@@ -598,13 +725,25 @@ class LibraryData:
 
         logger.info(f"Searching for tracks matching query {library_data_search}")
 
+        if not overwrite:
+            if search_status_callback:
+                search_status_callback(_("Searching for tracks..."))
+            if LibraryData._search_in_db(library_data_search):
+                library_data_search.set_stored_results_count()
+                if completion_callback:
+                    try:
+                        completion_callback(library_data_search)
+                    except Exception as e:
+                        logger.error(f"Error in search callback: {e}")
+                return library_data_search
+
         # Get all tracks first to ensure cache is up to date
         all_tracks = LibraryData.get_all_tracks(overwrite=overwrite, search_status_callback=search_status_callback)
         total_files = len(all_tracks)
 
         if search_status_callback:
             search_status_callback("Searching for tracks...")
-        
+
         # Search through tracks
         for i, audio_track in enumerate(all_tracks):
             # Call status callback every 5000 files or at the end
@@ -629,6 +768,57 @@ class LibraryData:
                 
         return library_data_search
 
+    @staticmethod
+    def _search_in_db(library_data_search):
+        """
+        Run the search against the stored tracks, fetching only the requested
+        page (max_results + 1 rows, to detect further results) from SQLite and
+        building MediaTracks only for the rows returned.
+
+        Returns False without touching the search if the stored rows may not
+        match the library in memory (tracks created, edited or gathered since
+        store_caches last ran) or the index is unavailable, in which case the
+        caller falls back to scanning tracks in memory.
+        """
+        if len(LibraryData.all_tracks) == 0 or LibraryData._db_tracks_version != LibraryData._library_version():
+            return False
+        from utils.db import get_read_connection, has_search_index
+        match, conditions, params = library_data_search.to_db_query()
+        source = "media_tracks m"
+        if match is not None:
+            source = "media_tracks_fts f JOIN media_tracks m ON m.rowid = f.rowid"
+            conditions = ["media_tracks_fts MATCH ?"] + conditions
+            params = [match] + params
+        where = " AND ".join(["m.in_library = 1"] + conditions)
+        offset = library_data_search.offset
+        try:
+            conn = get_read_connection()
+            if not has_search_index(conn):
+                return False
+            rows = conn.execute(
+                f"SELECT m.* FROM {source} WHERE {where} ORDER BY m.filepath LIMIT ? OFFSET ?",
+                params + [library_data_search.max_results + 1, offset],
+            ).fetchall()
+            if len(rows) > 0:
+                total = offset + len(rows)
+            else:
+                # Past the last match: count the (fewer than offset) matches skipped
+                total = conn.execute(
+                    f"SELECT COUNT(*) FROM (SELECT 1 FROM {source} WHERE {where} LIMIT ?)",
+                    params + [offset],
+                ).fetchone()[0]
+        except Exception as e:
+            logger.warning(f"Database search failed, falling back to in-memory search: {e}")
+            return False
+
+        for row in rows:
+            track = LibraryData.MEDIA_TRACK_CACHE.get(row["filepath"])
+            if track is None:
+                track = MediaTrack.from_db_row(row)
+            library_data_search.results.append(track)
+        library_data_search.total_matches_count = total
+        return True
+
     def resolve_track(self, media_track):
         # Find any highly similar tracks in the library to this track.
         # Especially in the case that two master directories contain the same track files,
@@ -866,19 +1056,17 @@ class LibraryData:
         if len(album_tracks) < 2:
             return False
             
-        # Check if current track has artwork
-        if track.artwork:
+        # Artwork bytes live in the shared artwork store, not on the track objects
+        track_artwork = track.get_album_artwork_bytes()
+        if track_artwork:
             # This track has artwork, use it as reference
-            # Make a copy of the artwork bytes to avoid shared references
-            ref_artwork = bytes(track.artwork)
             updated = False
             
             # Update other tracks that don't have artwork
             for t in album_tracks:
-                if t != track and not t.artwork:
+                if t != track and not t.get_album_artwork():
                     try:
-                        # Update metadata with the artwork copy
-                        metadata = {'artwork': ref_artwork}
+                        metadata = {'artwork': track_artwork}
                         if t.update_metadata(metadata):
                             updated = True
                     except Exception as e:
@@ -888,12 +1076,10 @@ class LibraryData:
         else:
             # Current track doesn't have artwork, look for it in other tracks
             for t in album_tracks:
-                if t != track and t.artwork:
+                if t != track:
                     try:
-                        # Make a copy of the artwork bytes before updating
-                        artwork_copy = bytes(t.artwork)
-                        metadata = {'artwork': artwork_copy}
-                        if track.update_metadata(metadata):
+                        artwork = t.get_album_artwork_bytes()
+                        if artwork and track.update_metadata({'artwork': artwork}):
                             return True
                     except Exception as e:
                         logger.warning(f"Failed to update artwork for {track.title}: {str(e)}")
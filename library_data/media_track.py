@@ -2,6 +2,8 @@
 
 from datetime import datetime
 import glob
+import hashlib
+import json
 import os
 import re
 from time import sleep
@@ -16,7 +18,6 @@ from library_data.instrument import instruments_data
 from utils.config import config
 from utils.ffmpeg_handler import FFmpegHandler
 from utils.logging_setup import get_logger
-from utils.temp_dir import TempDir
 from utils.translations import I18N
 from utils.utils import Utils
 
@@ -99,6 +100,9 @@ class MediaTrack:
     _ID_PATTERN = re.compile(r'\s*\[([A-Za-z0-9_\-]+)\]')
     ffprobe_available = None
 
+    # Counts update_metadata() calls, so caches of track text can tell they are stale
+    metadata_updates = 0
+
     # Class-level error collection
     _collected_errors = []
     _error_lock = threading.Lock()
@@ -299,7 +303,6 @@ class MediaTrack:
         self.mean_volume = -9999.0
         self.max_volume = -9999.0
         self.length = -1.0
-        self.artwork = None
         self.form = None
         self.instrument = None
         self.catalogue = None
@@ -336,12 +339,6 @@ class MediaTrack:
 
             self._try_music_tag_load(filepath)
 
-            if self.title is not None:
-                self.searchable_title = Utils.ascii_normalize(self.title.lower())
-            if self.artist is not None:
-                self.searchable_artist = Utils.ascii_normalize(self.artist.lower())
-            if self.album is not None:
-                self.searchable_album = Utils.ascii_normalize(self.album.lower())
             if self.composer is None:
                 try:
                     composers = composers_data.get_composers(self)
@@ -349,10 +346,8 @@ class MediaTrack:
                         self.composer = ", ".join(composers)
                 except Exception:
                     pass
-            if self.composer is not None:
-                self.searchable_composer = Utils.ascii_normalize(self.composer.lower())
-            if self.genre is not None:
-                self.searchable_genre = Utils.ascii_normalize(self.genre.lower())
+            self.set_searchable_attributes()
+            self.compute_derived_attributes()
         else:
             self.basename = None
             self.album = None
@@ -387,10 +382,11 @@ class MediaTrack:
         track.mean_volume = row["mean_volume"] if row["mean_volume"] is not None else -9999.0
         track.max_volume = row["max_volume"] if row["max_volume"] is not None else -9999.0
         track.length = row["length"] if row["length"] is not None else -1.0
-        track.artwork = None
         track.form = row["form"]
         track.instrument = row["instrument"]
-        track.catalogue = None  # not persisted; derived lazily by get_catalogue()
+        # Rows written before the catalogue column existed leave it to be derived
+        # by LibraryData.load_media_track_cache (or lazily by get_catalogue())
+        track.catalogue = row["catalogue"] if "catalogue" in row.keys() else None
         is_video = row["is_video"]
         track.is_video = bool(is_video) if is_video is not None else None
         track._is_extended = False
@@ -402,12 +398,7 @@ class MediaTrack:
             track.basename = None
             track.ext = None
 
-        from utils.utils import Utils
-        track.searchable_title = Utils.ascii_normalize(track.title.lower()) if track.title else None
-        track.searchable_artist = Utils.ascii_normalize(track.artist.lower()) if track.artist else None
-        track.searchable_album = Utils.ascii_normalize(track.album.lower()) if track.album else None
-        track.searchable_composer = Utils.ascii_normalize(track.composer.lower()) if track.composer else None
-        track.searchable_genre = Utils.ascii_normalize(track.genre.lower()) if track.genre else None
+        track.set_searchable_attributes()
         return track
 
     def to_db_row(self) -> dict:
@@ -440,12 +431,25 @@ class MediaTrack:
             "length": _float_or_none(self.length, -1.0),
             "form": self.form,
             "instrument": self.instrument,
+            "catalogue": self.catalogue,
             "is_video": (1 if self.is_video else 0) if self.is_video is not None else None,
+            # Indexed for LibraryData searches; not read back, see set_searchable_attributes()
+            "searchable_title": self.searchable_title,
+            "searchable_album": self.searchable_album,
+            "searchable_artist": self.searchable_artist,
+            "searchable_composer": self.searchable_composer,
+            "searchable_genre": self.searchable_genre,
         }
 
     def get_parent_filepath(self):
         return self.filepath if self.parent_filepath is None else self.parent_filepath
 
+    def set_searchable_attributes(self):
+        """Derive the searchable_* values LibraryDataSearch matches against from the tags."""
+        for attr in ("title", "artist", "album", "composer", "genre"):
+            value = getattr(self, attr)
+            setattr(self, "searchable_" + attr, Utils.ascii_normalize(value.lower()) if value else None)
+
     def clean_track_values(self):
         self.title = self.clean_track_value(self.title)
         if self.album is not None:
@@ -600,38 +604,73 @@ class MediaTrack:
             self.is_video = has_video_stream(self.filepath)
         return self.is_video
 
-    def get_album_artwork(self, filename="image"):
-        # music-tags libary may have already set this attribute
-        if self.artwork is None:
-            if self.get_is_video():
-                return None
-            # mutagen for special cases
-            try:
-                _file = File(self.filepath) # mutagen
-                for k, v in _file.tags.items():
-                    if type(v) == list and type(v[0]) == MP4Cover:
-                        self.artwork = bytes(v[0])
-                        logger.info("found artwork in MP4Cover mutagen tag type.")
-                        break
-                if self.artwork is None:
-                    self.artwork = _file.tags['APIC:'].data
-                    logger.info("found artwork by accessing APIC frame")
-            except Exception as e:
-                logger.warning(f"Album artwork not found: {e}")
-            if self.artwork is None:
-                return None
+    def get_album_artwork(self):
+        """Path of this track's embedded artwork in the shared artwork store, or None.
+
+        Tracks with the same artwork (usually a whole album) share one stored file.
+        """
+        if self.get_is_video():
+            return None
+        from library_data.artwork_store import artwork_store
+        try:
+            digest = artwork_store.digest_for_track(self.filepath, self._read_embedded_artwork)
+            return artwork_store.original_path(digest) if digest else None
+        except Exception as e:
+            logger.error(f"Could not store album artwork: {e}")
+            return None
+
+    def get_album_artwork_bytes(self):
+        if self.get_is_video():
+            return None
+        from library_data.artwork_store import artwork_store
+        digest = artwork_store.digest_for_track(self.filepath, self._read_embedded_artwork)
+        return artwork_store.read(digest) if digest else None
+
+    def _read_embedded_artwork(self):
+        if not MUTAGEN_AVAILABLE:
+            return None
         try:
-            # write artwork to new image
-            if "." not in filename:
-                filename += ".jpg" # TODO figure out actual image format
-            return TempDir.get().add_file(filename, file_content=self.artwork, write_flags='wb')
+            _file = File(self.filepath) # mutagen
+            for k, v in _file.tags.items():
+                if type(v) == list and type(v[0]) == MP4Cover:
+                    logger.info("found artwork in MP4Cover mutagen tag type.")
+                    return bytes(v[0])
+            artwork = _file.tags['APIC:'].data
+            logger.info("found artwork by accessing APIC frame")
+            return artwork
         except Exception as e:
-            logger.error(f"Could not write album artwork to temp file: {e}")
+            logger.warning(f"Album artwork not found: {e}")
             return None
 
+    def compute_derived_attributes(self):
+        """Derive form, instrument and catalogue from the title and album.
+
+        Run once at ingestion and after a metadata update, and persisted with the
+        track, so that the getters used in search, sort and shuffle loops are
+        plain attribute reads.
+        """
+        # For now, just save the first form and instrument found
+        forms = forms_data.get_forms(self) if self.title is not None else []
+        self.form = forms[0] if len(forms) > 0 else ""
+        instruments = instruments_data.get_instruments(self) if self.title is not None else []
+        self.instrument = instruments[0] if len(instruments) > 0 else ""
+        self.catalogue = MediaTrack._derive_catalogue(self.album) if self.album else ""
+
+    @staticmethod
+    def derived_attributes_fingerprint():
+        """Digest of the data compute_derived_attributes() depends on besides the track
+        itself, so stored values can be recognised as stale after forms or
+        instruments are edited."""
+        digest = hashlib.sha1(_CATALOGUE_MARKER_RE.pattern.encode("utf-8"))
+        for form in forms_data.get_all_forms():
+            digest.update(json.dumps([form.name, form.transliterations]).encode("utf-8"))
+        for instrument in sorted(instruments_data.get_instrument_names()):
+            digest.update(instrument.encode("utf-8"))
+        return digest.hexdigest()
+
     def get_genre(self):
-        # TODO - get genre from file somehow
-        return None
+        # Read from the file's genre tag at ingestion
+        return self.genre
 
     def get_form(self):
         if self.form is None:
@@ -778,7 +817,6 @@ class MediaTrack:
             if 'artwork' in metadata:
                 try:
                     mfile['artwork'] = metadata['artwork']
-                    self.artwork = metadata['artwork']  # Update local cache
                 except Exception as e:
                     logger.warning(f"Failed to update artwork: {str(e)}")
                     return False
@@ -814,11 +852,22 @@ class MediaTrack:
             # Save the changes
             mfile.save()
 
+            if 'artwork' in metadata:
+                from library_data.artwork_store import artwork_store
+                artwork = metadata['artwork']
+                if isinstance(artwork, (bytes, bytearray)):
+                    artwork_store.set_track_artwork(self.filepath, bytes(artwork))
+                else:
+                    artwork_store.forget_track(self.filepath)
+
             # Update our local object with the new values
             for our_key, value in metadata.items():
                 if hasattr(self, our_key) and value is not None:
                     if value != "" and value != -1:  # Only update if not empty/default
                         setattr(self, our_key, value)
+            self.set_searchable_attributes()
+            self.compute_derived_attributes()
+            MediaTrack.metadata_updates += 1
 
             logger.info(f"Successfully updated metadata for {self.title}")
             return True
@@ -51,7 +51,6 @@ class NetworkMediaTrack(MediaTrack):
         self.mean_volume = -9999.0
         self.max_volume = -9999.0
         self.length = -1.0          # sentinel: unknown / infinite
-        self.artwork = None
         self.form = None
         self.instrument = None
         self.searchable_title = name.lower() if name else None
@@ -85,7 +84,10 @@ class NetworkMediaTrack(MediaTrack):
     def get_volume(self):
         return self.mean_volume, self.max_volume
 
-    def get_album_artwork(self, filename: str = "image"):
+    def get_album_artwork(self):
+        return None
+
+    def get_album_artwork_bytes(self):
         return None
 
     def open_track_location(self) -> None:
@@ -1,17 +1,27 @@
 """
 Muse package for music and video playback with DJ capabilities.
+
+The exported classes are imported on first access, so importing a submodule
+such as muse.playback_state does not also load Muse and its LLM, TTS and
+extension dependencies.
 """
 
-from .muse import Muse
-from .muse_spot_profile import MuseSpotProfile
-from .playback import Playback
-from .playback_config import PlaybackConfig
-from .playlist import Playlist
+import importlib
+
+_EXPORTS = {
+    'Muse': 'muse.muse',
+    'MuseSpotProfile': 'muse.muse_spot_profile',
+    'Playback': 'muse.playback',
+    'PlaybackConfig': 'muse.playback_config',
+    'Playlist': 'muse.playlist',
+}
+
+__all__ = list(_EXPORTS)
+
 
-__all__ = [
-    'Muse',
-    'MuseSpotProfile',
-    'Playback',
-    'PlaybackConfig',
-    'Playlist',
-] 
\ No newline at end of file
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,72 @@
+"""
+Early-abort blacklist enforcement for streaming LLM generations.
+
+Muse.generate_text() checks a finished response against the blacklist and
+regenerates it on a violation.  BlacklistStreamGuard runs the same check while
+the response streams: each comma- and dot-delimited clause is matched as soon
+as it is complete, and the stream is stopped at the first violation so the
+regeneration starts without waiting for the rest of the response.
+
+The clauses are exactly the pieces Blacklist.find_blacklisted_items() splits a
+finished text into, so the guard stops on a violation if and only if the full
+check would have found it in the text generated so far.
+"""
+
+from typing import Dict, Iterable, Optional
+
+from extensions.llm_redundancy import (
+    RedundancyPolicy,
+    RedundancyVerdict,
+    streaming_visible_response,
+)
+from library_data.blacklist import Blacklist
+from utils.logging_setup import get_logger
+
+logger = get_logger(__name__)
+
+# Blacklist.find_blacklisted_items() splits text on both of these
+_CLAUSE_DELIMITERS = (",", ".")
+
+
+class BlacklistStreamGuard:
+    """
+    RedundancyPolicy that stops generation at the first blacklisted clause.
+
+    *ignored_tags* are matches to tolerate, e.g. blacklisted items that already
+    appear in the prompt.  An optional *next_policy* (such as the LLM's own
+    redundancy policy) is consulted for every chunk the guard lets through.
+    """
+
+    def __init__(self, ignored_tags: Iterable[str] = (), next_policy: Optional[RedundancyPolicy] = None) -> None:
+        self._ignored_tags = set(ignored_tags)
+        self._next_policy = next_policy
+        self._checked_to = dict.fromkeys(_CLAUSE_DELIMITERS, 0)
+        self._visible = ""
+        self.violations: Dict[str, str] = {}
+
+    def on_chunk(self, chunk) -> RedundancyVerdict:
+        visible = streaming_visible_response(chunk.accumulated)
+        if not visible.startswith(self._visible):
+            # The visible text was replaced (e.g. a thinking block closed), so start over
+            self._checked_to = dict.fromkeys(_CLAUSE_DELIMITERS, 0)
+        self._visible = visible
+        for delimiter, checked_to in self._checked_to.items():
+            end = visible.rfind(delimiter)
+            if end < checked_to:
+                continue
+            self._checked_to[delimiter] = end + 1
+            violations = {
+                tag: pattern
+                for tag, pattern in Blacklist.find_blacklisted_tags(visible[checked_to:end].split(delimiter)).items()
+                if tag not in self._ignored_tags
+            }
+            if violations:
+                self.violations.update(violations)
+                logger.info(
+                    "Blacklisted items in streamed response after %d chars, stopping generation:\n%s",
+                    len(visible), Blacklist.format_violations_summary(violations),
+                )
+                return RedundancyVerdict(should_stop=True, reason="blacklist")
+        if self._next_policy is not None:
+            return self._next_policy.on_chunk(chunk)
+        return RedundancyVerdict(should_stop=False)
@@ -13,10 +13,13 @@ from extensions.wiki_opensearch_api import WikiOpenSearchAPI
 from extensions.llm import LLM, LLMResponseException, LLMResult
 from library_data.blacklist import Blacklist, BlacklistException
 from library_data.media_track import MediaTrack
+from muse.blacklist_guard import BlacklistStreamGuard
 from muse.dj_persona import DJPersona
 from muse.intro_type import determine_intro_type
 from muse.muse_memory import muse_memory
 from muse.schedules_manager import SchedulesManager, ScheduledShutdownException
+from muse.spot_pool import PooledSpot, SpotPool
+from muse.spot_stream import SentenceStream, SpotStreamMetrics
 from muse.playback import Playback
 from muse.prompter import Prompter
 from muse.voice import Voice
@@ -36,6 +39,14 @@ class Muse:
     enable_preparation = config.muse_config[Globals.ConfigKeys.ENABLE_PREPARATION]
     preparation_starts_minutes_from_end = float(config.muse_config[Globals.ConfigKeys.PREPARATION_STARTS_MINUTES_FROM_END])
     preparation_starts_after_seconds_sleep = int(config.muse_config[Globals.ConfigKeys.PREPARATION_STARTS_AFTER_SECONDS_SLEEP])
+    stream_spots = bool(config.muse_config.get(Globals.ConfigKeys.STREAM_SPOTS, False))
+    spot_pool_size = int(config.muse_config.get(Globals.ConfigKeys.SPOT_POOL_SIZE, 0))
+    # Topics whose spots depend on nothing but the persona, so they can be pre-generated
+    POOLED_TOPICS = [
+        Topic.WEATHER, Topic.NEWS, Topic.HACKERNEWS, Topic.JOKE, Topic.FACT, Topic.TRUTH_AND_LIE,
+        Topic.FABLE, Topic.APHORISM, Topic.POEM, Topic.QUOTE, Topic.MOTIVATION,
+        Topic.RANDOM_WIKI_ARTICLE, Topic.FUNNY_STORY,
+    ]
     _startup_topic_failures_logged = False
     _dict_words: list = []
 
@@ -53,6 +64,7 @@ class Muse:
             raise Exception("Failed to establish active schedule")
         self.memory = muse_memory
         self.llm = LLM.from_config(config, state_key="muse", run_context=self._run_context)
+        self.last_spot_stream_metrics: Optional[SpotStreamMetrics] = None
         
         initial_voice = self._schedule.voice
         persona = self.memory.get_persona_manager().get_persona(initial_voice)
@@ -73,6 +85,10 @@ class Muse:
         self.news_api = NewsAPI()
         self.hacker_news_souper = HackerNewsSouper()
         self.prompter = Prompter()
+        self.spot_pool = SpotPool(Muse.POOLED_TOPICS, Muse.spot_pool_size, self._generate_pooled_spot_text,
+                                  self._synthesize_pooled_spot, self._get_spot_pool_key)
+        self._spot_pool_llm: Optional[LLM] = None
+        self._spot_pool_idle_until = 0.0
         self.has_started_prep = False
         self.preparation_id = None # TODO pass a prep ID along with the speech request so things can be deleted before spoke if necessary.
         self.is_cancelled_prep = False
@@ -134,9 +150,14 @@ class Muse:
             return persona.language_code
         return I18N.locale
 
-    def say_at_some_point(self, text, spot_profile, topic):
+    @staticmethod
+    def _get_speech_options(topic):
         save_mp3 = topic is not None and topic.value in config.save_tts_output_topics
         topic_str = "" if topic is None else topic.translate().replace(" ", "_")
+        return save_mp3, topic_str
+
+    def say_at_some_point(self, text, spot_profile, topic):
+        save_mp3, topic_str = self._get_speech_options(topic)
         if spot_profile.immediate:
             self.say(text, topic=topic_str, save_mp3=save_mp3)
         else:
@@ -148,6 +169,14 @@ class Muse:
     def prepare_to_say(self, text, topic="", save_mp3=False, locale=None):
         self.voice.prepare_to_say(text=text, topic=topic, save_mp3=save_mp3, locale=self.get_locale(locale))
 
+    def say_stream(self, texts, topic="", save_mp3=False, locale=None, on_speech_queued=None):
+        self.voice.say_stream(texts, topic=topic, save_mp3=save_mp3, locale=self.get_locale(locale),
+                              on_speech_queued=on_speech_queued)
+
+    def prepare_to_say_stream(self, texts, topic="", save_mp3=False, locale=None, on_speech_queued=None):
+        self.voice.prepare_to_say_stream(texts, topic=topic, save_mp3=save_mp3, locale=self.get_locale(locale),
+                                         on_speech_queued=on_speech_queued)
+
     def ready_to_prepare(self, cumulative_sleep_seconds, ms_remaining):
         return Muse.enable_preparation \
             and cumulative_sleep_seconds > Muse.preparation_starts_after_seconds_sleep \
@@ -182,6 +211,7 @@ class Muse:
             self.memory.tracks_since_last_spoke += 1
         spot_profile.set_preparation_time()
         spot_profile.is_prepared = True
+        self.memory.record_spot_profile(spot_profile)
 
     def cancel_preparation(self, spot_profile):
         logger.debug(f"Canceling muse prep:\n{spot_profile}")
@@ -258,6 +288,7 @@ class Muse:
         drained synchronously before returning.  This guarantees the intro plays
         in the gap between tracks rather than overlapping with the next track.
         """
+        self.spot_pool.invalidate("voice changed")
         try:
             persona = self.memory.get_persona_manager().get_persona(voice_name)
 
@@ -576,7 +607,12 @@ class Muse:
             logger.warning(f"Unhandled topic: {topic}")
             return False
 
-        topic_succeeded = self._wrap_function(spot_profile, topic, func, args, kwargs)
+        pooled_spot = self.spot_pool.take(topic)
+        if pooled_spot is not None:
+            self._say_pooled_spot(pooled_spot, spot_profile)
+            topic_succeeded = True
+        else:
+            topic_succeeded = self._wrap_function(spot_profile, topic, func, args, kwargs)
         if topic_succeeded:
             self.memory.tracks_since_last_topic = 0
             # Update the last topic that was discussed
@@ -593,47 +629,42 @@ class Muse:
         return topic_succeeded
 
     def talk_about_weather(self, city="Washington", spot_profile=None):
+        self.say_generated_text(self._get_weather_prompt(city), spot_profile, Topic.WEATHER)
+
+    def _get_weather_prompt(self, city, update_history=True, llm=None):
         weather = self.open_weather_api.get_weather_for_city(city)
-        weather_summary = self.generate_text(
-            self.get_prompt(Topic.WEATHER) + city + ":\n\n" + str(weather))
-        self.say_at_some_point(weather_summary, spot_profile, Topic.WEATHER)
+        return self.get_prompt(Topic.WEATHER, update_history, llm) + city + ":\n\n" + str(weather)
 
     def talk_about_news(self, topic=None, spot_profile=None):
+        self.say_generated_text(self._get_news_prompt(topic), spot_profile, topic)
+
+    def _get_news_prompt(self, topic, update_history=True, llm=None):
         if topic == Topic.HACKERNEWS:
             news = self.hacker_news_souper.get_news(total=15)
         else:
             news = self.news_api.get_news(topic=topic)
-        news_summary = self.generate_text(
-            self.get_prompt(topic) + "\n\n" + str(news))
-        self.say_at_some_point(news_summary, spot_profile, topic)
+        return self.get_prompt(topic, update_history, llm) + "\n\n" + str(news)
 
     def tell_a_joke(self, spot_profile):
-        joke = self.generate_text(self.get_prompt(Topic.JOKE))
-        self.say_at_some_point(joke, spot_profile, Topic.JOKE)
+        self.say_generated_text(self.get_prompt(Topic.JOKE), spot_profile, Topic.JOKE)
 
     def share_a_fact(self, spot_profile):
-        fact = self.generate_text(self.get_prompt(Topic.FACT))
-        self.say_at_some_point(fact, spot_profile, Topic.FACT)
+        self.say_generated_text(self.get_prompt(Topic.FACT), spot_profile, Topic.FACT)
 
     def play_two_truths_and_one_lie(self, spot_profile):
-        resp = self.generate_text(self.get_prompt(Topic.TRUTH_AND_LIE))
-        self.say_at_some_point(resp, spot_profile, Topic.TRUTH_AND_LIE)
+        self.say_generated_text(self.get_prompt(Topic.TRUTH_AND_LIE), spot_profile, Topic.TRUTH_AND_LIE)
 
     def share_a_fable(self, spot_profile):
-        fable = self.generate_text(self.get_prompt(Topic.FABLE))
-        self.say_at_some_point(fable, spot_profile, Topic.FABLE)
+        self.say_generated_text(self.get_prompt(Topic.FABLE), spot_profile, Topic.FABLE)
 
     def share_an_aphorism(self, spot_profile):
-        aphorism = self.generate_text(self.get_prompt(Topic.APHORISM))
-        self.say_at_some_point(aphorism, spot_profile, Topic.APHORISM)
+        self.say_generated_text(self.get_prompt(Topic.APHORISM), spot_profile, Topic.APHORISM)
 
     def share_a_poem(self, spot_profile):
-        poem = self.generate_text(self.get_prompt(Topic.POEM))
-        self.say_at_some_point(poem, spot_profile, Topic.POEM)
+        self.say_generated_text(self.get_prompt(Topic.POEM), spot_profile, Topic.POEM)
     
     def share_a_quote(self, spot_profile):
-        quote = self.generate_text(self.get_prompt(Topic.QUOTE))
-        self.say_at_some_point(quote, spot_profile, Topic.QUOTE)
+        self.say_generated_text(self.get_prompt(Topic.QUOTE), spot_profile, Topic.QUOTE)
 
     def share_a_tongue_twister(self, spot_profile):
         if config.tongue_twisters_dir is None or config.tongue_twisters_dir == "":
@@ -652,12 +683,10 @@ class Muse:
         prompt = self.get_prompt(Topic.CALENDAR)
         prompt = prompt.replace("{DATE}", today.strftime("%A %B %d %Y"))
         prompt = prompt.replace("{TIME}", today.strftime("%H:%M"))
-        calendar = self.generate_text(prompt)
-        self.say_at_some_point(calendar, spot_profile, Topic.CALENDAR)
+        self.say_generated_text(prompt, spot_profile, Topic.CALENDAR)
 
     def share_a_motivational_message(self, spot_profile):
-        motivation = self.generate_text(self.get_prompt(Topic.MOTIVATION))
-        self.say_at_some_point(motivation, spot_profile, Topic.MOTIVATION)
+        self.say_generated_text(self.get_prompt(Topic.MOTIVATION), spot_profile, Topic.MOTIVATION)
 
     def talk_about_track_context(self, track, spot_profile, topic):
         if spot_profile.track is None or spot_profile.topic is None or topic is None:
@@ -666,8 +695,7 @@ class Muse:
         persona = self.get_current_persona()
         name = persona.name if persona is not None else "Muse"
         prompt = prompt.format(TRACK_DETAILS=track.get_track_details(), NAME=name)
-        track_context = self.generate_text(prompt)
-        self.say_at_some_point(track_context, spot_profile, None)
+        self.say_generated_text(prompt, spot_profile, None)
 
     def talk_about_icy_track(self, track, spot_profile) -> None:
         """Speak a brief comment about a new track detected via ICY metadata.
@@ -691,10 +719,12 @@ class Muse:
         already_mentioned = _(' [already mentioned]')
         prompt = prompt.format(PREVIOUS_TRACKS="\n".join([f" - {t.get_track_details()}{already_mentioned if was_spoken else ''}" for t, was_spoken in previous_tracks]),
                                UPCOMING_TRACKS="\n".join([f" - {t.get_track_details()}{already_mentioned if was_spoken else ''}" for t, was_spoken in upcoming_tracks]))
-        playlist_context = self.generate_text(prompt)
-        self.say_at_some_point(playlist_context, spot_profile, Topic.PLAYLIST_CONTEXT)
+        self.say_generated_text(prompt, spot_profile, Topic.PLAYLIST_CONTEXT)
 
     def talk_about_random_wiki_article(self, spot_profile):
+        self.say_generated_text(self._get_wiki_article_prompt(), spot_profile, Topic.RANDOM_WIKI_ARTICLE)
+
+    def _get_wiki_article_prompt(self, update_history=True, llm=None):
         article = None
         paragraph_skipped = False
         blacklisted_words_found = set()
@@ -746,7 +776,7 @@ class Muse:
                 f"No valid wiki article found after 10 tries. "
                 f"Blacklisted words: {blacklisted_words_found}"
             )
-        prompt = self.get_prompt(Topic.RANDOM_WIKI_ARTICLE)
+        prompt = self.get_prompt(Topic.RANDOM_WIKI_ARTICLE, update_history, llm)
         article_str = str(article)[:2000]
         if paragraph_skipped:
             article_str = (
@@ -754,13 +784,10 @@ class Muse:
                 "restriction. Please briefly let the listener know you skipped a part.]\n\n"
                 + article_str
             )
-        prompt = prompt.format(ARTICLE=article_str)
-        summary = self.generate_text(prompt)
-        self.say_at_some_point(summary, spot_profile, Topic.RANDOM_WIKI_ARTICLE)
+        return prompt.format(ARTICLE=article_str)
 
     def share_a_funny_story(self, spot_profile):
-        funny_story = self.generate_text(self.get_prompt(Topic.FUNNY_STORY))
-        self.say_at_some_point(funny_story, spot_profile, Topic.FUNNY_STORY)
+        self.say_generated_text(self.get_prompt(Topic.FUNNY_STORY), spot_profile, Topic.FUNNY_STORY)
 
     @classmethod
     def _get_random_word(cls) -> str:
@@ -802,6 +829,61 @@ class Muse:
         language_response = self.generate_text(prompt, include_time_context=False)
         self.say_at_some_point(language_response, spot_profile, Topic.LANGUAGE_LEARNING)
 
+    def maybe_fill_spot_pool(self, ms_remaining):
+        """
+        Top up the spot pool in the background while a track plays, as long as
+        there is time to spare before preparation for the next spot is due.
+        """
+        if not self.args.muse or not self.spot_pool.enabled or not self.voice.can_speak:
+            return
+        idle_ms = ms_remaining - Muse.preparation_starts_minutes_from_end * 60 * 1000
+        self._spot_pool_idle_until = time.monotonic() + idle_ms / 1000
+        if self._is_idle_for_spot_pool():
+            self.spot_pool.start_filling(self._is_idle_for_spot_pool)
+
+    def _is_idle_for_spot_pool(self):
+        return not self.has_started_prep \
+            and time.monotonic() + SpotPool.MIN_IDLE_SECONDS < self._spot_pool_idle_until
+
+    def _get_spot_pool_key(self):
+        persona = self.get_current_persona()
+        if persona is None:
+            return None, I18N.locale
+        return persona.voice_name, persona.language_code
+
+    def _generate_pooled_spot_text(self, topic):
+        if self._spot_pool_llm is None:
+            # Its own LLM, so that pool requests never share request state with the DJ's or get cancelled by skips
+            self._spot_pool_llm = LLM.from_config(config, state_key="muse_spot_pool")
+        llm = self._spot_pool_llm
+        if topic == Topic.WEATHER:
+            prompt = self._get_weather_prompt(config.open_weather_city, update_history=False, llm=llm)
+        elif topic in (Topic.NEWS, Topic.HACKERNEWS):
+            prompt = self._get_news_prompt(topic, update_history=False, llm=llm)
+        elif topic == Topic.RANDOM_WIKI_ARTICLE:
+            prompt = self._get_wiki_article_prompt(update_history=False, llm=llm)
+        else:
+            prompt = self.get_prompt(topic, update_history=False, llm=llm)
+        # The spot airs later on, so it should not refer to the time it was generated
+        return self.generate_text(prompt, include_time_context=False, interrupt_on_skip=False, llm=llm)
+
+    def _synthesize_pooled_spot(self, text, topic):
+        _save_mp3, topic_str = self._get_speech_options(topic)
+        return self.voice.synthesize(text, topic=SpotPool.FILE_PREFIX + topic_str, locale=self.get_locale())
+
+    def _say_pooled_spot(self, spot: PooledSpot, spot_profile):
+        Prompter.update_history(spot.topic)
+        for path in spot.audio_paths:
+            self.voice.add_speech_file_to_queue(path, delete_after_playing=True)
+        if spot_profile.immediate:
+            self.voice.finish_speaking()
+
+    def warm_up_llm(self):
+        """Load the DJ's LLM in the background so the first spot does not pay the model load time."""
+        if not self.args.muse:
+            return
+        Utils.start_thread(self.llm.warm_up, use_asyncio=False)
+
     def start_extensions_thread(self, initial_sleep=True, overwrite_cache=False):
         voice = self.voice if self.args.muse and self.voice.can_speak else None
         self.get_library_data().start_extensions_thread(
@@ -814,8 +896,11 @@ class Muse:
         """Determine if we should use the two-call translation approach for added variety."""
         return random.random() < 0.05  # 5% chance to use two-call approach - it is very slow
 
-    def get_prompt(self, topic):
-        prompt = self.prompter.get_prompt_update_history(topic)
+    def get_prompt(self, topic, update_history=True, llm=None):
+        if update_history:
+            prompt = self.prompter.get_prompt_update_history(topic)
+        else:
+            prompt = self.prompter.get_prompt(topic.get_prompt_topic_value())
 
         # A persona-specific override replaces the shared prompts/<lang>/<topic>.txt
         # file text, but still goes through the same translation logic below.
@@ -855,15 +940,15 @@ class Muse:
             # as the occasional two-call approach used for variety on normal topics.
             if override or self.should_use_two_call_approach():
                 translation_prompt = self.prompter.get_translation_prompt(language_code, language, prompt)
-                prompt = self.generate_text(translation_prompt, json_key="prompt")
+                prompt = self.generate_text(translation_prompt, json_key="prompt", llm=llm)
             else:
                 prompt = self.prompter.get_prompt_with_language(topic, language_code)
         except Exception as e:
             logger.info(f"Failed to translate prompt for topic {topic} into language {language_code} with error: {e}")
         return prompt
 
-    def generate_text(self, prompt, json_key=None, include_time_context=True, interrupt_on_skip=True):
-        """Generate text using the current DJ persona's context."""
+    def _prepare_generation(self, prompt, include_time_context=True):
+        """Return the prompt with time context, the system prompt, and the blacklisted items already in the prompt."""
         # Get the current persona's context and system prompt
         context, system_prompt = self.memory.get_persona_manager().get_context_and_system_prompt()
         language_code = self.get_current_persona().language_code
@@ -892,10 +977,30 @@ class Muse:
             prompt_text_to_test = prompt_text_to_test[prompt_text_to_test.index(variant_part_marker):]
             prompt_text_to_test = prompt_text_to_test[prompt_text_to_test.index("\n") + 1:]
         blacklisted_items_in_prompt = list(Blacklist.find_blacklisted_items(prompt_text_to_test).keys())
+        return prompt, system_prompt, blacklisted_items_in_prompt
+
+    @staticmethod
+    def _find_violations(text, blacklisted_items_in_prompt):
+        return {
+            tag: pattern
+            for tag, pattern in Blacklist.find_blacklisted_items(text).items()
+            if tag not in blacklisted_items_in_prompt
+        }
+
+    def _new_blacklist_guard(self, blacklisted_items_in_prompt):
+        """Stops a streaming generation at its first blacklisted clause, ahead of the LLM's own redundancy policy."""
+        return BlacklistStreamGuard(blacklisted_items_in_prompt, next_policy=self.llm.get_redundancy_policy())
+
+    def generate_text(self, prompt, json_key=None, include_time_context=True, interrupt_on_skip=True, llm=None):
+        """Generate text using the current DJ persona's context, with *llm* if given instead of the DJ's LLM."""
+        llm = self.llm if llm is None else llm
+        prompt, system_prompt, blacklisted_items_in_prompt = self._prepare_generation(prompt, include_time_context)
         
         # Use the context and system prompt in the LLM call
         # NOTE excluding context for now because it's being deprecated for some reason.
-        result = self.llm.ask(prompt, json_key=json_key, context=None, system_prompt=system_prompt, interrupt_on_skip=interrupt_on_skip)
+        guard = self._new_blacklist_guard(blacklisted_items_in_prompt)
+        result = llm.ask(prompt, json_key=json_key, context=None, system_prompt=system_prompt,
+                         redundancy_policy=guard, interrupt_on_skip=interrupt_on_skip)
         text = result.response if result else ""
         if result and getattr(result, "truncated", False):
             logger.info(
@@ -909,11 +1014,7 @@ class Muse:
 
         generations = []
         all_violations = {}
-        violations = {
-            tag: pattern
-            for tag, pattern in Blacklist.find_blacklisted_items(text).items()
-            if tag not in blacklisted_items_in_prompt
-        }
+        violations = self._find_violations(text, blacklisted_items_in_prompt) or guard.violations
         attempts = 0
         while violations:
             all_violations.update(violations)
@@ -921,16 +1022,14 @@ class Muse:
             logger.info("Hit blacklisted items:\n%s", violations_summary)
             logger.info("Text: " + text)
             # NOTE excluding context for now because it's being deprecated for some reason.
-            result = self.llm.ask(prompt, json_key=json_key, context=None, system_prompt=system_prompt, interrupt_on_skip=interrupt_on_skip)
+            guard = self._new_blacklist_guard(blacklisted_items_in_prompt)
+            result = llm.ask(prompt, json_key=json_key, context=None, system_prompt=system_prompt,
+                             redundancy_policy=guard, interrupt_on_skip=interrupt_on_skip)
             text = result.response if result else ""
             if text.strip() == "":
                 raise LLMResponseException("No response text was generated!")
             generations.append(text)
-            violations = {
-                tag: pattern
-                for tag, pattern in Blacklist.find_blacklisted_items(text).items()
-                if tag not in blacklisted_items_in_prompt
-            }
+            violations = self._find_violations(text, blacklisted_items_in_prompt) or guard.violations
             attempts += 1
             if attempts > 2:
                 texts_str = "\n".join(generations)
@@ -940,6 +1039,75 @@ class Muse:
                 )
         return text
 
+    def say_generated_text(self, prompt, spot_profile, topic, include_time_context=True):
+        """Generate text for *prompt* and say it, streaming it into the voice when stream_spots is on."""
+        if Muse.stream_spots and self.voice.can_speak:
+            return self.stream_text_to_voice(prompt, spot_profile, topic, include_time_context=include_time_context)
+        text = self.generate_text(prompt, include_time_context=include_time_context)
+        self.say_at_some_point(text, spot_profile, topic)
+        return text
+
+    def stream_text_to_voice(self, prompt, spot_profile, topic, include_time_context=True, interrupt_on_skip=True):
+        """
+        Generate text for *prompt* and speak it while it is being generated.
+
+        Completed sentences are checked against the blacklist and handed to the
+        voice as they arrive.  A violation stops generation at once: if nothing
+        has been spoken yet the spot is regenerated (up to the same number of
+        attempts as generate_text), otherwise it ends at the last clean sentence.
+        Returns the text that was spoken; timings are kept on
+        last_spot_stream_metrics.
+        """
+        prompt, system_prompt, blacklisted_items_in_prompt = self._prepare_generation(prompt, include_time_context)
+        save_mp3, topic_str = self._get_speech_options(topic)
+        speak = self.say_stream if spot_profile.immediate else self.prepare_to_say_stream
+        metrics = SpotStreamMetrics()
+        self.last_spot_stream_metrics = metrics
+        all_violations = {}
+        generations = []
+        text = ""
+        while True:
+            metrics.attempts += 1
+            sentences = SentenceStream(
+                lambda sentence: self._find_violations(sentence, blacklisted_items_in_prompt),
+                next_policy=self.llm.get_redundancy_policy(),
+                metrics=metrics,
+            )
+            speaker = Utils.start_thread(speak, use_asyncio=False, args=[sentences, topic_str, save_mp3, None, metrics.mark_first_audio])
+            result = None
+            try:
+                # NOTE excluding context for now because it's being deprecated for some reason.
+                result = self.llm.ask(prompt, context=None, system_prompt=system_prompt, stream=True,
+                                      redundancy_policy=sentences, interrupt_on_skip=interrupt_on_skip)
+            finally:
+                if result is None or sentences.violations:
+                    sentences.close()  # an interrupted generation leaves no trailing sentence to speak
+                else:
+                    sentences.finish(result.response)
+                speaker.join()
+            self.memory.get_persona_manager().update_context(result)
+            text = sentences.released_text
+            if not sentences.violations:
+                break
+            all_violations.update(sentences.violations)
+            violations_summary = Blacklist.format_violations_summary(all_violations)
+            logger.info("Hit blacklisted items in streamed text:\n%s", violations_summary)
+            generations.append(text + " " + (sentences.violating_sentence or ""))
+            if sentences.released:
+                logger.info("Ending streamed spot at the last clean sentence")
+                break
+            if metrics.attempts > 3:
+                texts_str = "\n".join(generations)
+                raise BlacklistException(
+                    f"Failed to generate text - blacklist items found:\n{violations_summary}\n\nContext:\n{texts_str}",
+                    filtered=set(all_violations.values()),
+                )
+        metrics.mark_finished()
+        logger.info("Streamed spot: %s", metrics.summary())
+        if result is not None and text.strip() == "":
+            raise LLMResponseException("No response text was generated!")
+        return text
+
     def _wrap_function(self, spot_profile, topic, func, _args=[], _kwargs={}):
         try:
             result = func(*_args, **_kwargs)
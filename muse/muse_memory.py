@@ -1,7 +1,8 @@
 from dataclasses import dataclass
+import os
 import pickle
 import time
-from typing import Optional, Dict
+from typing import Iterable, List, Optional
 
 from muse.dj_persona import DJPersonaManager
 from muse.muse_spot_profile import MuseSpotProfile
@@ -24,33 +25,147 @@ class SpotProfileSnapshot:
     grouping_type: Optional[str]
     old_grouping: Optional[str]
     new_grouping: Optional[str]
+    preparation_time: Optional[float] = None
+    previous_track_path: str = ""
+    current_track_path: str = ""
+    is_group_transition: bool = False
+    speaking_duration: float = 0.0
 
     @classmethod
     def from_spot_profile(cls, profile: MuseSpotProfile) -> 'SpotProfileSnapshot':
         """Create a snapshot from a full spot profile."""
+        topic = Topic.from_value(profile.topic)
         return cls(
             creation_time=profile.creation_time,
             previous_track_title=profile.previous_track.title if profile.previous_track else None,
             current_track_title=profile.track.title if profile.track else None,
             was_spoken=profile.was_spoken,
-            topic=str(Topic.from_value(profile.topic)),
+            topic=topic.value if topic is not None else None,
             topic_translated=profile.topic_translated,
             grouping_type=profile.grouping_type,
             old_grouping=profile.old_grouping,
-            new_grouping=profile.new_grouping
+            new_grouping=profile.new_grouping,
+            preparation_time=getattr(profile, 'preparation_time', None),
+            previous_track_path=getattr(profile.previous_track, 'filepath', None) or "",
+            current_track_path=getattr(profile.track, 'filepath', None) or "",
+            is_group_transition=bool(getattr(profile, 'is_group_transition', False)),
+            speaking_duration=getattr(profile, 'speaking_duration', 0.0) or 0.0,
         )
 
+    def get_time(self):
+        """Same as MuseSpotProfile.get_time(), so a snapshot can stand in for a past profile."""
+        return self.creation_time if self.preparation_time is None else self.preparation_time
+
+
+class SpotProfileHistory:
+    """
+    Spot profile history, backed by the muse_spot_profiles table in
+    configs/muse_library.db.
+
+    Each spot is upserted as it changes (created, prepared, spoken) rather
+    than with the rest of MuseMemory, and lookups query only the rows they
+    need.  Rows come back as SpotProfileSnapshot instances.
+    """
+
+    _COLUMNS = (
+        "creation_time, preparation_time, previous_track_path, track_path, previous_track_title, "
+        "track_title, was_spoken, is_group_transition, speaking_duration, topic, topic_translated, "
+        "grouping_type, old_grouping, new_grouping"
+    )
+
+    @staticmethod
+    def _to_row(snapshot: SpotProfileSnapshot) -> tuple:
+        return (
+            snapshot.creation_time, snapshot.preparation_time, snapshot.previous_track_path,
+            snapshot.current_track_path, snapshot.previous_track_title, snapshot.current_track_title,
+            int(bool(snapshot.was_spoken)), int(bool(snapshot.is_group_transition)), snapshot.speaking_duration,
+            snapshot.topic, snapshot.topic_translated, snapshot.grouping_type, snapshot.old_grouping,
+            snapshot.new_grouping,
+        )
+
+    @staticmethod
+    def _from_row(row) -> SpotProfileSnapshot:
+        return SpotProfileSnapshot(
+            creation_time=row["creation_time"],
+            previous_track_title=row["previous_track_title"],
+            current_track_title=row["track_title"],
+            was_spoken=bool(row["was_spoken"]),
+            topic=row["topic"],
+            topic_translated=row["topic_translated"],
+            grouping_type=row["grouping_type"],
+            old_grouping=row["old_grouping"],
+            new_grouping=row["new_grouping"],
+            preparation_time=row["preparation_time"],
+            previous_track_path=row["previous_track_path"],
+            current_track_path=row["track_path"],
+            is_group_transition=bool(row["is_group_transition"]),
+            speaking_duration=row["speaking_duration"],
+        )
+
+    def record(self, profile: MuseSpotProfile, max_rows: Optional[int] = None) -> None:
+        """Insert or update the row for *profile*, then trim to the newest *max_rows* rows."""
+        self.record_snapshots([SpotProfileSnapshot.from_spot_profile(profile)], max_rows)
+
+    def record_snapshots(self, snapshots: Iterable[SpotProfileSnapshot], max_rows: Optional[int] = None) -> None:
+        from utils.db import write_transaction
+        with write_transaction() as conn:
+            conn.executemany(
+                f"INSERT OR REPLACE INTO muse_spot_profiles ({self._COLUMNS}) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [self._to_row(snapshot) for snapshot in snapshots],
+            )
+            if max_rows is not None:
+                conn.execute(
+                    "DELETE FROM muse_spot_profiles WHERE creation_time < ("
+                    "SELECT creation_time FROM muse_spot_profiles ORDER BY creation_time DESC LIMIT 1 OFFSET ?)",
+                    (max_rows - 1,),
+                )
+
+    def get_last_spoken(self, before_time: Optional[float] = None,
+                        group_transition: bool = False) -> Optional[SpotProfileSnapshot]:
+        """The most recent spoken spot created before *before_time* (optionally a group transition)."""
+        from utils.db import get_read_connection
+        sql = f"SELECT {self._COLUMNS} FROM muse_spot_profiles WHERE was_spoken = 1"
+        params = []
+        if before_time is not None:
+            sql += " AND creation_time < ?"
+            params.append(before_time)
+        if group_transition:
+            sql += " AND is_group_transition = 1"
+        sql += " ORDER BY creation_time DESC LIMIT 1"
+        row = get_read_connection().execute(sql, params).fetchone()
+        return self._from_row(row) if row is not None else None
+
+    def recent(self, limit: int = 100) -> List[SpotProfileSnapshot]:
+        """The newest *limit* spots, newest first."""
+        from utils.db import get_read_connection
+        rows = get_read_connection().execute(
+            f"SELECT {self._COLUMNS} FROM muse_spot_profiles ORDER BY creation_time DESC LIMIT ?", (limit,)
+        ).fetchall()
+        return [self._from_row(row) for row in rows]
+
+    def count(self) -> int:
+        from utils.db import get_read_connection
+        return get_read_connection().execute("SELECT COUNT(*) FROM muse_spot_profiles").fetchone()[0]
+
+    def purge_older_than(self, cutoff_time: float) -> None:
+        from utils.db import write_transaction
+        with write_transaction() as conn:
+            conn.execute("DELETE FROM muse_spot_profiles WHERE creation_time <= ?", (cutoff_time,))
+
 
 class MuseMemory:
+    # Attributes that older versions pickled with the rest of the memory; their
+    # spot profiles are now kept in SpotProfileHistory instead.
+    _LEGACY_HISTORY_ATTRIBUTES = ('all_spot_profiles', 'last_session_spot_profiles',
+                                  'current_session_spot_profiles', '_historical_snapshots')
 
     def __init__(self):
-        self.all_spot_profiles = []
-        self.last_session_spot_profiles = []
         self.current_session_spot_profiles = []
-        self.max_memory_size = 1000
-        self.max_historical_snapshots = 5000  # Maximum number of historical spot profile snapshots to keep
+        self.max_memory_size = 1000  # Maximum number of live spot profiles kept for the current session
+        self.max_historical_snapshots = 6000  # Maximum number of spot profiles kept in the history table
         self.persona_manager: Optional[DJPersonaManager] = None
-        self._historical_snapshots: Dict[float, SpotProfileSnapshot] = {}  # Keyed by creation_time
+        self.spot_profile_history = SpotProfileHistory()
         self.tracks_since_last_topic = 0
         self.tracks_since_last_spoke = 0
         self.last_topic = None
@@ -60,27 +175,18 @@ class MuseMemory:
         self.load()
 
     def __getstate__(self):
-        """Control what gets pickled - exclude non-pickleable objects.
+        """Control what gets pickled.
 
-        MuseSpotProfile.__getstate__ already strips its own callbacks, so
-        we no longer need to mutate the live profile objects here.
+        Spot profiles are persisted incrementally in SpotProfileHistory, so
+        only the persona manager and the small counters are pickled.
         """
         state = self.__dict__.copy()
+        for key in self._LEGACY_HISTORY_ATTRIBUTES + ('spot_profile_history',):
+            state.pop(key, None)
         return state
 
     def __setstate__(self, state):
         """Restore state after unpickling."""
-        # Debug: Show when __setstate__ is called and what keys are being restored
-        # logger.debug(f"MuseMemory.__setstate__() called with {len(state)} keys:")
-        # for key in sorted(state.keys()):
-        #     value_type = type(state[key]).__name__
-        #     if isinstance(state[key], list):
-        #         logger.debug(f"  - {key}: {value_type} with {len(state[key])} items")
-        #     elif isinstance(state[key], dict):
-        #         logger.debug(f"  - {key}: {value_type} with {len(state[key])} keys")
-        #     else:
-        #         logger.debug(f"  - {key}: {value_type}")
-        
         self.__dict__.update(state)
         
         # Reinitialize any non-pickleable objects
@@ -100,8 +206,10 @@ class MuseMemory:
                 loaded = pickle.load(f)
                 # Copy all attributes from loaded instance, being selective
                 for key, value in loaded.__dict__.items():
-                    if not key.startswith('_') or key in ['_historical_snapshots']:
+                    if not key.startswith('_') and key not in self._LEGACY_HISTORY_ATTRIBUTES \
+                            and key not in ('spot_profile_history', 'max_historical_snapshots'):
                         setattr(self, key, value)
+                self._import_legacy_history(loaded.__dict__)
                 
                 # Persona manager is already reloaded by __setstate__() during pickle.load()
                 # Only create a new one if it doesn't exist
@@ -116,18 +224,61 @@ class MuseMemory:
             self.persona_manager = DJPersonaManager()
         except Exception as e:
             logger.info(f"Error loading memory: {e}")
+        self._restore_session_spot_profiles()
         self._is_loaded = True
 
+    def _restore_session_spot_profiles(self):
+        """Reload the newest spots from the spot profile history as the live profiles.
+
+        Spot indexes and previous-profile lookups then carry over a restart as
+        they did when the live profiles were pickled; restored spots come back
+        as SpotProfileSnapshot instances.
+        """
+        try:
+            self.current_session_spot_profiles = self.spot_profile_history.recent(self.max_memory_size)
+        except Exception as e:
+            logger.warning(f"Failed to restore spot profiles from history: {e}")
+
+    def _import_legacy_history(self, loaded_state: dict):
+        """Move spot profiles pickled by older versions into the history table.
+
+        Only done while the table is empty; the next save drops them from the pickle.
+        """
+        snapshots = {}
+        for snapshot in (loaded_state.get('_historical_snapshots') or {}).values():
+            snapshots[snapshot.creation_time] = snapshot
+        for key in ('all_spot_profiles', 'current_session_spot_profiles'):
+            for profile in loaded_state.get(key) or []:
+                try:
+                    snapshots[profile.creation_time] = SpotProfileSnapshot.from_spot_profile(profile)
+                except Exception as e:
+                    logger.debug(f"Skipping legacy spot profile: {e}")
+        if not snapshots:
+            return
+        if self.spot_profile_history.count() == 0:
+            self.spot_profile_history.record_snapshots(snapshots.values(), self.max_historical_snapshots)
+            logger.info(f"Imported {len(snapshots)} pickled spot profiles into the spot profile history")
+
     def save(self):
         try:
-            with open(self._memory_path, 'wb') as f:
-                pickle.dump(self, f)
+            self.write_snapshot(self.snapshot())
         except Exception as e:
             logger.info(f"Error saving muse memory: {e}")
             self._debug_pickle_attributes()
             from scripts.object_inspector import debug_pickle_issues
             debug_pickle_issues(self)
 
+    def snapshot(self) -> bytes:
+        """Pickle the memory now, so it can be written later from another thread."""
+        return pickle.dumps(self)
+
+    def write_snapshot(self, data: bytes) -> None:
+        """Write a snapshot from snapshot(), replacing the memory file only once it is complete."""
+        temp_path = self._memory_path + ".part"
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, self._memory_path)
+
     def get_persona_manager(self) -> Optional[DJPersonaManager]:
         return self.persona_manager
 
@@ -138,9 +289,9 @@ class MuseMemory:
         # Get all instance attributes
         attributes = {}
         
-        # Regular __dict__ attributes
+        # Regular __dict__ attributes, as pickled
         if hasattr(self, '__dict__'):
-            attributes.update(self.__dict__)
+            attributes.update(self.__getstate__())
         
         # __slots__ attributes
         if hasattr(self, '__slots__'):
@@ -203,53 +354,16 @@ class MuseMemory:
         else:
             logger.info("No individual attributes failed to pickle - issue may be with object structure")
 
-    def update_all_spot_profiles(self, spot_profile: MuseSpotProfile):
-        """Update the spot profiles list and maintain historical snapshots."""
-        logger.debug(f"Updating all spot profiles: current count={len(self.all_spot_profiles)}, new profile creation_time={spot_profile.creation_time}")
-
-        # NOTE: do NOT call unset_non_historical_fields() on the previous
-        # profile here.  The previous profile may still be referenced by
-        # Playback.muse_spot_profiles and actively used (e.g. when a
-        # background preparation creates a new profile for the next-next track
-        # while the current-next profile is about to be played).  Zeroing the
-        # callback while the profile is still live causes the
-        # "Previous spot profile callback was not set properly" crash.
-        # Callbacks are stripped safely at serialization time via
-        # MuseSpotProfile.__getstate__(), which works on a copy and never
-        # mutates the live object.
-
-        # Add to current profiles
-        self.all_spot_profiles.insert(0, spot_profile)
-        logger.debug(f"Added new profile at index 0: creation_time={spot_profile.creation_time}, was_spoken={spot_profile.was_spoken}")
-        
-        if len(self.all_spot_profiles) > self.max_memory_size:
-            logger.debug(f"Exceeding max memory size ({self.max_memory_size}), converting excess profiles to snapshots")
-            # Convert excess profiles to snapshots before removing
-            for profile in self.all_spot_profiles[self.max_memory_size:]:
-                logger.debug(f"Converting to snapshot: creation_time={profile.creation_time}, was_spoken={profile.was_spoken}")
-                self._add_historical_snapshot(profile)
-            self.all_spot_profiles = self.all_spot_profiles[:self.max_memory_size]
-            logger.debug(f"Trimmed profiles list to {len(self.all_spot_profiles)} entries")
-
-    def _add_historical_snapshot(self, profile: MuseSpotProfile):
-        """Add a spot profile snapshot to historical storage."""
-        snapshot = SpotProfileSnapshot.from_spot_profile(profile)
-        self._historical_snapshots[profile.creation_time] = snapshot
-        
-        # Purge old snapshots if we exceed the limit
-        if len(self._historical_snapshots) > self.max_historical_snapshots:
-            # Remove oldest snapshots
-            oldest_times = sorted(self._historical_snapshots.keys())[:-self.max_historical_snapshots]
-            for time_key in oldest_times:
-                del self._historical_snapshots[time_key]
+    def record_spot_profile(self, spot_profile: MuseSpotProfile):
+        """Write the current state of *spot_profile* to the spot profile history."""
+        try:
+            self.spot_profile_history.record(spot_profile, self.max_historical_snapshots)
+        except Exception as e:
+            logger.warning(f"Failed to record spot profile history: {e}")
 
     def purge_old_snapshots(self, days_old: int = 30):
-        """Purge historical snapshots older than the specified number of days."""
-        cutoff_time = time.time() - (days_old * 24 * 3600)
-        self._historical_snapshots = {
-            k: v for k, v in self._historical_snapshots.items()
-            if k > cutoff_time
-        }
+        """Purge spot profile history older than the specified number of days."""
+        self.spot_profile_history.purge_older_than(time.time() - (days_old * 24 * 3600))
 
     def update_current_session_spot_profiles(self, spot_profile: MuseSpotProfile):
         self.current_session_spot_profiles.insert(0, spot_profile)
@@ -290,6 +404,34 @@ class MuseMemory:
         logger.debug("No profile found before creation time, returning None")
         return None
 
+    def get_last_spoken_profile(self, creation_time=None, group_transition=False):
+        """Get the most recent spot profile created before *creation_time* where the DJ spoke.
+
+        Live profiles from the current session are checked first, since they may
+        still change; older spots are looked up in the spot profile history.
+
+        Args:
+            creation_time (float, optional): Only consider profiles created before this time
+            group_transition (bool): Only consider profiles that announced a group transition
+
+        Returns:
+            MuseSpotProfile, SpotProfileSnapshot or None
+        """
+        for profile in self.current_session_spot_profiles:
+            if creation_time is not None and profile.creation_time >= creation_time:
+                continue
+            if profile.was_spoken and (not group_transition or getattr(profile, 'is_group_transition', False)):
+                return profile
+        before_time = creation_time
+        if self.current_session_spot_profiles:
+            oldest_live = self.current_session_spot_profiles[-1].creation_time
+            before_time = oldest_live if before_time is None else min(before_time, oldest_live)
+        try:
+            return self.spot_profile_history.get_last_spoken(before_time, group_transition)
+        except Exception as e:
+            logger.warning(f"Failed to query spot profile history: {e}")
+            return None
+
     def update_last_topic(self, topic):
         """Update the last topic that was discussed.
         
@@ -335,9 +477,10 @@ class MuseMemory:
             track_result = TrackResult()
         spot_profile = MuseSpotProfile(previous_track, track_result, last_track_failed, skip_track, grouping_type,
                                        get_previous_spot_profile_callback=self.get_previous_session_spot_profile,
-                                       get_upcoming_tracks_callback=get_upcoming_tracks_callback)
-        self.update_all_spot_profiles(spot_profile)
+                                       get_upcoming_tracks_callback=get_upcoming_tracks_callback,
+                                       get_last_spoken_profile_callback=self.get_last_spoken_profile)
         self.update_current_session_spot_profiles(spot_profile)
+        self.record_spot_profile(spot_profile)
         return spot_profile
 
 
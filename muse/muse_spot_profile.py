@@ -35,7 +35,8 @@ class MuseSpotProfile:
                  skip_track,
                  grouping_type, 
                  get_previous_spot_profile_callback=None,
-                 get_upcoming_tracks_callback=None):
+                 get_upcoming_tracks_callback=None,
+                 get_last_spoken_profile_callback=None):
         track = track_result.track
         old_grouping = track_result.old_grouping
         new_grouping = track_result.new_grouping
@@ -47,6 +48,9 @@ class MuseSpotProfile:
         self.creation_time = time.time()
         self.get_previous_spot_profile_callback = get_previous_spot_profile_callback
         self.get_upcoming_tracks_callback = get_upcoming_tracks_callback
+        # Looks up the last spoken profile (see MuseMemory.get_last_spoken_profile); when
+        # not set, the previous profiles are walked one by one.
+        self.get_last_spoken_profile_callback = get_last_spoken_profile_callback
         
         # Update track history if this is a new track
         if track and (not self._track_history or self._track_history[-1][0] != track):
@@ -196,6 +200,7 @@ class MuseSpotProfile:
         """Clear fields that are not needed for historical reference."""
         self.get_previous_spot_profile_callback = None
         self.get_upcoming_tracks_callback = None
+        self.get_last_spoken_profile_callback = None
         self.topic_translated = None
 
     def __getstate__(self):
@@ -208,6 +213,7 @@ class MuseSpotProfile:
         state = self.__dict__.copy()
         state['get_previous_spot_profile_callback'] = None
         state['get_upcoming_tracks_callback'] = None
+        state['get_last_spoken_profile_callback'] = None
         return state
 
     def get_previous_spot_profile(self, idx=0):
@@ -305,6 +311,8 @@ class MuseSpotProfile:
         Returns:
             MuseSpotProfile or None: The most recent spot profile where was_spoken is True, or None if none found
         """
+        if getattr(self, 'get_last_spoken_profile_callback', None) is not None:
+            return self.get_last_spoken_profile_callback(creation_time=self.creation_time)
         # logger.debug(f"Starting get_last_spoken_profile for profile created at {self.creation_time}")
         idx = 0
         max_iterations = 100  # Failsafe to prevent infinite loops
@@ -351,6 +359,8 @@ class MuseSpotProfile:
         changes don't all receive the full eagerness boost.
         Uses getattr for is_group_transition to tolerate older pickled profiles.
         """
+        if getattr(self, 'get_last_spoken_profile_callback', None) is not None:
+            return self.get_last_spoken_profile_callback(creation_time=self.creation_time, group_transition=True)
         idx = 0
         max_iterations = 100  # Failsafe to prevent infinite loops
         while True:
@@ -208,7 +208,7 @@ class Playback:
                     # Guard: background preparation (prepare_muse called during the
                     # previous track's playback loop) may have already built a spot
                     # profile for self.track and stored it in muse_spot_profiles.
-                    # Creating a second profile would (a) cause update_all_spot_profiles
+                    # Creating a second profile would (a) cause update_current_session_spot_profiles
                     # to push the first one to index-1 without the callback being
                     # needed there, and (b) leave a stale profile in the list that
                     # get_spot_profile() would return first, producing the
@@ -230,6 +230,7 @@ class Playback:
                     self.update_ui_art_for_muse()
                     seconds_passed = self.get_muse().maybe_dj(self.get_spot_profile())
                     self.get_spot_profile().speaking_duration = seconds_passed
+                    self.get_muse().memory.record_spot_profile(self.get_spot_profile())
                     self.remaining_delay_seconds -= seconds_passed
                     self.register_new_song()
                     # self.muse.maybe_dj_prior(self.muse_spot_profile)
@@ -282,6 +283,8 @@ class Playback:
                       and not self._stream_profile_building):
                     self._stream_profile_building = True
                     Utils.start_thread(self._rebuild_stream_spot_profile, use_asyncio=False)
+                elif self.has_muse() and seconds_remaining >= 0:
+                    self.get_muse().maybe_fill_spot_pool(seconds_remaining)
 
             self.vlc_media_player.stop()
             self.has_played_first_track = True
@@ -667,7 +670,7 @@ class Playback:
     def get_current_track_artwork(self) -> str:
         if self.track is None or self.track.is_invalid():
             raise Exception("Track is invalid.")
-        return self.track.get_album_artwork(filename="copy")
+        return self.track.get_album_artwork()
 
     def get_track_text_file(self) -> Optional[str]:
         if self.track is None or self.track.is_invalid():
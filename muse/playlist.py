@@ -1,7 +1,11 @@
+from functools import lru_cache
 import random
 import re
 from typing import List, Optional, TYPE_CHECKING
 
+import numpy as np
+
+from library_data.grouping_codes import GroupingCodes
 from library_data.media_track import MediaTrack
 from muse.sort_config import SortConfig
 from utils.app_info_cache import app_info_cache
@@ -84,8 +88,15 @@ def _matches_exclusion(filepath: str, exclusion: str) -> bool:
     "TTS" will match "/tts_output/TTS_voice.mp3" but not "Rottsolk" or
     "Quartettsatz" where the letters happen to spell 'tts' inside a word.
     """
-    pattern = r'(?<![a-zA-Z])' + re.escape(exclusion) + r'(?![a-zA-Z])'
-    return bool(re.search(pattern, filepath))
+    return _exclusions_pattern((exclusion,)).search(filepath) is not None
+
+
+@lru_cache(maxsize=32)
+def _exclusions_pattern(exclusions: tuple) -> re.Pattern:
+    """Compiled pattern matching a filepath that any of *exclusions* applies to."""
+    return re.compile("|".join(
+        r'(?<![a-zA-Z])' + re.escape(exclusion) + r'(?![a-zA-Z])' for exclusion in exclusions
+    ))
 
 
 def get_exclusion_match(filepath: str) -> Optional[str]:
@@ -124,7 +135,7 @@ class Playlist:
     @staticmethod
     def store_recently_played_lists() -> None:
         for history_type in HistoryType:
-            app_info_cache.set(history_type.value, getattr(Playlist, history_type.value))
+            app_info_cache.set(history_type.value, list(getattr(Playlist, history_type.value)))
 
     @staticmethod
     def update_list(_list: List[str], item: str = "", sort_type: PlaylistSortType = PlaylistSortType.RANDOM) -> None:
@@ -176,12 +187,14 @@ class Playlist:
                  direct_tracks: Optional[List[MediaTrack]] = None) -> None:
         exclusions = app_info_cache.get(TRACK_EXCLUSIONS_KEY, _DEFAULT_TRACK_EXCLUSIONS)
         if exclusions:
-            excluded = [t for t in tracks if any(_matches_exclusion(t, e) for e in exclusions)]
+            exclusions_pattern = _exclusions_pattern(tuple(exclusions))
+            excluded = [t for t in tracks if exclusions_pattern.search(t)]
             if excluded:
                 logger.info(f"Excluded {len(excluded)} track(s) from playlist (filters: {exclusions})")
                 # for t in excluded:
                     # logger.debug(f"  Excluded: {t}")
-                tracks = [t for t in tracks if t not in set(excluded)]
+                excluded_set = set(excluded)
+                tracks = [t for t in tracks if t not in excluded_set]
             self.excluded_count = len(excluded)
         else:
             self.excluded_count = 0
@@ -200,6 +213,9 @@ class Playlist:
                 self.data_callbacks.get_track is not None and \
                 self.data_callbacks.get_all_tracks is not None
         self.sorted_tracks: List[MediaTrack] = []
+        # Grouping codes aligned with sorted_tracks; see _grouping_codes()
+        self._group_codes: Optional[GroupingCodes] = None
+        self._group_codes_source: Optional[List[MediaTrack]] = None
         if direct_tracks is not None:
             for track in direct_tracks:
                 self.sorted_tracks.append(track)
@@ -245,6 +261,7 @@ class Playlist:
             self.pending_tracks.insert(0, track.filepath) # this list is unordered
             self.sorted_tracks.insert(idx, track)
             self.in_sequence.append(track.filepath)
+        self._group_codes = None
 
     def insert_extension(self, track: MediaTrack) -> None:
         self.insert_upcoming_tracks([track], overwrite_existing_at_index=False)
@@ -332,17 +349,12 @@ class Playlist:
         group_total = None
         current_grouping = None
         if self.sort_type.is_grouping_type() and next_track is not None:
-            _attr = self.sort_type.getter_name_mapping()
-            def _get_group(t, _a=_attr):
-                v = getattr(t, _a)
-                return v() if callable(v) else v
-            current_grouping = _get_group(next_track)
+            codes = self._grouping_codes(self.sort_type.getter_name_mapping())
+            current_grouping = codes.value_at(self.current_track_index)
             if current_grouping is not None:
-                group_position = sum(
-                    1 for i in range(self.current_track_index + 1)
-                    if _get_group(self.sorted_tracks[i]) == current_grouping
-                )
-                group_total = sum(1 for t in self.sorted_tracks if _get_group(t) == current_grouping)
+                in_group = codes.codes == codes.codes[self.current_track_index]
+                group_position = int(np.count_nonzero(in_group[:self.current_track_index + 1]))
+                group_total = int(np.count_nonzero(in_group))
         return TrackResult(
             next_track, old_grouping, new_grouping,
             group_position=group_position, group_total=group_total, current_grouping=current_grouping,
@@ -410,23 +422,14 @@ class Playlist:
         if current_track is None:
             return None
         
-        attr_getter_name = self.sort_type.getter_name_mapping()
-        current_track_attr = getattr(current_track, attr_getter_name)
-        if callable(current_track_attr):
-            current_track_attr = current_track_attr()
-        
-        # Iterate through upcoming tracks to find the first different grouping
-        for i in range(self.current_track_index + 1, len(self.sorted_tracks)):
-            upcoming_track = self.sorted_tracks[i]
-            upcoming_track_attr = getattr(upcoming_track, attr_getter_name)
-            if callable(upcoming_track_attr):
-                upcoming_track_attr = upcoming_track_attr()
-            
-            if upcoming_track_attr != current_track_attr:
-                return upcoming_track_attr
-        
-        # No grouping change found - all remaining tracks are in the same group
-        return None
+        codes = self._grouping_codes(self.sort_type.getter_name_mapping())
+        upcoming_codes = codes.codes[self.current_track_index + 1:]
+        # First upcoming track with a different grouping
+        changes = np.flatnonzero(upcoming_codes != codes.codes[self.current_track_index])
+        if len(changes) == 0:
+            # No grouping change found - all remaining tracks are in the same group
+            return None
+        return codes.values[upcoming_codes[changes[0]]]
 
     def sort(self):
         """Sorts the playlist according to the specified sort type with optional memory-based shuffling.
@@ -456,28 +459,23 @@ class Playlist:
         if self.sort_type == PlaylistSortType.RANDOM:
             random.shuffle(self.sorted_tracks)
         elif not do_set_start_track and not self.sort_config.skip_random_start:
-            self.start_track = random.choice(self.sorted_tracks)
-            self.set_start_track(grouping_attr_getter_name, do_print=False)
+            start_position = random.randrange(len(self.sorted_tracks))
+            self.start_track = self.sorted_tracks[start_position]
+            self.set_start_track(grouping_attr_getter_name, do_print=False, start_position=start_position)
         if self.sort_type != PlaylistSortType.SEQUENCE:
             attr_set = set()
             if self.sort_type != PlaylistSortType.RANDOM:
-                is_callable_attr = grouping_attr_getter_name.startswith("get_")
-                for track in self.sorted_tracks:
-                    attr = getattr(track, grouping_attr_getter_name)
-                    if is_callable_attr:
-                        attr = attr()
-                    attr_set.add(attr)
+                codes = self._grouping_codes(grouping_attr_getter_name)
+                attr_set = set(codes.values)
                 if self.deterministic_group_order or self.sort_config.skip_random_start:
-                    all_attrs_list = sorted(attr_set, key=lambda v: (v or ""))
+                    group_rank = sorted(range(len(codes.values)), key=lambda c: (codes.values[c] or ""))
                 else:
                     # ALL_MUSIC should retain shuffle behavior similar to the
                     # pre-refactor path where grouping order was non-deterministic.
-                    all_attrs_list = list(attr_set)
-                    random.shuffle(all_attrs_list)
-                if is_callable_attr:
-                    self.sorted_tracks.sort(key=lambda t: (all_attrs_list.index(getattr(t, grouping_attr_getter_name)()), t.filepath))
-                else:
-                    self.sorted_tracks.sort(key=lambda t: (all_attrs_list.index(getattr(t, grouping_attr_getter_name)), t.filepath))
+                    group_rank = list(range(len(codes.values)))
+                    random.shuffle(group_rank)
+                filepaths = np.array([t.filepath for t in self.sorted_tracks])
+                self._apply_order(codes, codes.group_order(group_rank, tiebreak=filepaths))
             if not self.sort_config.skip_memory_shuffle:
                 history_type = self.sort_type.grouping_list_name_mapping()
                 self.shuffle_with_memory_for_attr(
@@ -581,38 +579,36 @@ class Playlist:
         """
         if inclusion_chance is None:
             inclusion_chance = {}
-        recently_played_set = frozenset(recently_played_attr_list)
-        is_callable_attr = track_attr.startswith("get_")
+        # Work on positions in the current order: `order` is the index array the
+        # playlist is rearranged into, and per-track flags are indexed by position.
+        codes = self._grouping_codes(track_attr)
+        is_recent = codes.mask_for_values(frozenset(recently_played_attr_list))
+        order = np.arange(len(codes))
         tracks_checked = 0
         max_tracks_to_check = min(100000, self.size())  # Reasonable limit for most playlists
         total_moved = 0
         total_resisted = 0
         # Tracks that won their resistance roll are exempt for the rest of this sort run.
-        # Uses id() so this works regardless of whether the track type defines __hash__.
-        resistant_ids: set = set()
+        resistant = np.zeros(len(codes), dtype=bool)
         logger.info(f"Scouring playlist for tracks not in {len(recently_played_attr_list)} recently played {track_attr}s with {recently_played_check_count} tracks to check")
 
         while tracks_checked < max_tracks_to_check:
-            tracks_to_be_reshuffled = []
-            earliest_tracks = list(self.sorted_tracks[:recently_played_check_count])
-
-            for track in earliest_tracks:
-                if id(track) in resistant_ids:
-                    continue
-                raw = getattr(track, track_attr)
-                if is_callable_attr:
-                    raw = raw()
-                if raw not in recently_played_set:
-                    continue
-                if inclusion_chance:
+            earliest = order[:recently_played_check_count]
+            candidates = earliest[is_recent[earliest] & ~resistant[earliest]]
+            if inclusion_chance:
+                to_move = []
+                for position in candidates:
+                    raw = codes.value_at(position)
                     chance = inclusion_chance.get((raw or "").lower(), 0.0)
                     if chance > 0.0 and random.random() < chance:
-                        resistant_ids.add(id(track))
+                        resistant[position] = True
                         total_resisted += 1
                         continue
-                tracks_to_be_reshuffled.append(track)
+                    to_move.append(position)
+                candidates = np.asarray(to_move, dtype=order.dtype)
 
-            if not tracks_to_be_reshuffled:
+            if len(candidates) == 0:
+                self._apply_order(codes, order)
                 if total_moved > 0:
                     logger.info(
                         f"Scour complete: moved {total_moved} tracks, "
@@ -623,16 +619,15 @@ class Playlist:
                     logger.info(f"No tracks needed reshuffling for {track_attr}")
                 return tracks_checked
 
-            logger.info(f"Found {len(tracks_to_be_reshuffled)} tracks with recently played {track_attr} in first {recently_played_check_count} positions")
+            logger.info(f"Found {len(candidates)} tracks with recently played {track_attr} in first {recently_played_check_count} positions")
 
-            # Remove tracks that need reshuffling and add them to the end
-            for track in tracks_to_be_reshuffled:
-                self.sorted_tracks.remove(track)
-                self.sorted_tracks.append(track)
-                total_moved += 1
+            # Move tracks that need reshuffling to the end
+            order = Playlist._move_to_end(order, candidates)
+            total_moved += len(candidates)
 
-            tracks_checked += len(earliest_tracks)
+            tracks_checked += len(earliest)
 
+        self._apply_order(codes, order)
         logger.info(f"Hit max tracks limit ({max_tracks_to_check}) while trying to move tracks with recently played {track_attr}")
         return tracks_checked
 
@@ -663,14 +658,15 @@ class Playlist:
         """
         if inclusion_chance is None:
             inclusion_chance = {}
-        recently_played_set = frozenset(recently_played_attr_list)
-        is_callable_attr = track_attr.startswith("get_")
+        # As in scour_playlist, `order` holds positions in the current order
+        codes = self._grouping_codes(track_attr)
+        is_recent = codes.mask_for_values(frozenset(recently_played_attr_list))
+        order = np.arange(len(codes))
         # Tracks that won their resistance roll are exempt for the rest of this sort run.
-        # Uses id() so this works regardless of whether the track type defines __hash__.
-        resistant_ids: set = set()
+        resistant = np.zeros(len(codes), dtype=bool)
 
         def _collect(earliest):
-            """Collect candidates to reshuffle from the given track slice.
+            """Collect candidates to reshuffle from the given slice of positions.
 
             Returns (tracks_to_be_reshuffled, tracks_to_check) where tracks_to_check
             is the subset that falls within the first recently_played_check_count
@@ -680,33 +676,24 @@ class Playlist:
             """
             to_reshuffle = []
             to_check = []
-            count = 0
-            for track in earliest:
-                if id(track) in resistant_ids:
-                    count += 1
-                    continue
-                raw = getattr(track, track_attr)
-                if is_callable_attr:
-                    raw = raw()
-                if raw in recently_played_set:
-                    if inclusion_chance:
-                        chance = inclusion_chance.get((raw or "").lower(), 0.0)
-                        if chance > 0.0 and random.random() < chance:
-                            resistant_ids.add(id(track))
-                            count += 1
-                            continue
-                    to_reshuffle.append(track)
-                    if count < recently_played_check_count:
-                        to_check.append(track)
-                    elif not to_check:
-                        break
-                count += 1
-            return to_reshuffle, to_check
+            for count in np.flatnonzero(is_recent[earliest] & ~resistant[earliest]):
+                position = earliest[count]
+                if inclusion_chance:
+                    raw = codes.value_at(position)
+                    chance = inclusion_chance.get((raw or "").lower(), 0.0)
+                    if chance > 0.0 and random.random() < chance:
+                        resistant[position] = True
+                        continue
+                to_reshuffle.append(position)
+                if count < recently_played_check_count:
+                    to_check.append(position)
+                elif not to_check:
+                    break
+            return np.asarray(to_reshuffle, dtype=order.dtype), to_check
 
         # Reshuffle twice as many tracks as checked to reduce reshuffling iterations
         doubled_check_count = recently_played_check_count * 2
-        earliest_tracks = list(self.sorted_tracks[:doubled_check_count])
-        tracks_to_be_reshuffled, tracks_to_check = _collect(earliest_tracks)
+        tracks_to_be_reshuffled, tracks_to_check = _collect(order[:doubled_check_count])
         attempts = 0
         max_attempts = 30
         stable_attempts = 0
@@ -726,70 +713,78 @@ class Playlist:
                 stable_attempts = 0
             last_track_count = current_check_count
 
-            # Remove tracks that need reshuffling and add them to the end
-            for track in tracks_to_be_reshuffled:
-                self.sorted_tracks.remove(track)
-                self.sorted_tracks.append(track)
-            earliest_tracks = list(self.sorted_tracks[:doubled_check_count])
-            tracks_to_be_reshuffled, tracks_to_check = _collect(earliest_tracks)
+            # Move tracks that need reshuffling to the end
+            order = Playlist._move_to_end(order, tracks_to_be_reshuffled)
+            tracks_to_be_reshuffled, tracks_to_check = _collect(order[:doubled_check_count])
             attempts += 1
             if attempts == max_attempts:
                 logger.info(f"Hit max attempts limit, too many recently played tracks found in playlist")
-                return attempts
+                break
+        self._apply_order(codes, order)
         return attempts
 
-    def set_start_track(self, grouping_attr_getter_name, do_print=True):
+    def set_start_track(self, grouping_attr_getter_name, do_print=True, start_position=None):
         if self.start_track is None:
             return
-        if self.start_track not in self.sorted_tracks:
-            raise Exception("Playlist start track not in playlist!")
+        if start_position is None:
+            try:
+                start_position = self.sorted_tracks.index(self.start_track)
+            except ValueError:
+                raise Exception("Playlist start track not in playlist!")
         if self.sort_type == PlaylistSortType.RANDOM:
             logger.info(f"Setting playlist start track to {self.start_track}")
-            self.sorted_tracks.remove(self.start_track)
-            self.sorted_tracks.insert(0, self.start_track)
+            self.sorted_tracks.insert(0, self.sorted_tracks.pop(start_position))
         elif self.sort_type == PlaylistSortType.SEQUENCE:
             logger.info(f"Setting playlist start track to {self.start_track}")
-            index = self.sorted_tracks.index(self.start_track)
-            self.sorted_tracks = self.sorted_tracks[index:] + self.sorted_tracks[:index]
+            self.sorted_tracks = self.sorted_tracks[start_position:] + self.sorted_tracks[:start_position]
         else:
             if grouping_attr_getter_name is None:
                 raise Exception(f"Playlist start track attribute {grouping_attr_getter_name} not set!")
-            track_attr_to_extract = getattr(self.start_track, grouping_attr_getter_name)
-            is_callable = False
-            if callable(track_attr_to_extract):
-                is_callable = True
-                track_attr_to_extract = track_attr_to_extract()
+            codes = self._grouping_codes(grouping_attr_getter_name)
+            track_attr_to_extract = codes.value_at(start_position)
             if do_print:
                 logger.info(f"Setting playlist start track attribute {grouping_attr_getter_name} to {track_attr_to_extract}")
-            if is_callable:
-                extracted = [track for track in self.sorted_tracks if getattr(track, grouping_attr_getter_name)() == track_attr_to_extract]
-            else:
-                extracted = [track for track in self.sorted_tracks if getattr(track, grouping_attr_getter_name) == track_attr_to_extract]
+            in_group = codes.codes == codes.codes[start_position]
+            extracted = np.flatnonzero(in_group)
             if do_print:
                 logger.info(f"Found {len(extracted)} tracks with attribute {grouping_attr_getter_name} equal to {track_attr_to_extract}")
-            for track in extracted:
-                self.sorted_tracks.remove(track)
-            index = extracted.index(self.start_track)
-            extracted = extracted[index:] + extracted[:index]
-            self.sorted_tracks = extracted + self.sorted_tracks
+            # The start track's group goes first, rotated to begin at the start track
+            index = int(np.searchsorted(extracted, start_position))
+            order = np.concatenate((extracted[index:], extracted[:index], np.flatnonzero(~in_group)))
+            self._apply_order(codes, order)
 
     def get_group_count(self, group_text: str) -> int:
         if self.sort_type == PlaylistSortType.SEQUENCE or self.sort_type == PlaylistSortType.RANDOM:
             return 1
-        attr_getter_name = self.sort_type.getter_name_mapping()
-        is_callable_attr = attr_getter_name.startswith("get_")
-        def is_matching_group(track: MediaTrack) -> bool:
-            nonlocal group_text
-            nonlocal is_callable_attr
-            nonlocal attr_getter_name
-            if is_callable_attr:
-                return getattr(track, attr_getter_name)() == group_text
-            else:
-                return getattr(track, attr_getter_name) == group_text
-        count = len([t for t in self.sorted_tracks if is_matching_group(t)])
+        count = self._grouping_codes(self.sort_type.getter_name_mapping()).count_of(group_text)
         logger.info(f"Group {group_text} has {count} tracks")
         return count
 
+    def _grouping_codes(self, getter_name: str) -> GroupingCodes:
+        """Grouping codes for sorted_tracks, re-encoded only when the track list has changed."""
+        codes = self._group_codes
+        if (codes is None or codes.getter_name != getter_name
+                or self._group_codes_source is not self.sorted_tracks
+                or len(codes) != len(self.sorted_tracks)):
+            codes = GroupingCodes.from_tracks(self.sorted_tracks, getter_name)
+            self._group_codes = codes
+            self._group_codes_source = self.sorted_tracks
+        return codes
+
+    def _apply_order(self, codes: GroupingCodes, order: np.ndarray) -> None:
+        """Rearrange sorted_tracks by the index array *order*, keeping its codes in step."""
+        self.sorted_tracks = list(map(self.sorted_tracks.__getitem__, order.tolist()))
+        self._group_codes = codes.take(order)
+        self._group_codes_source = self.sorted_tracks
+
+    @staticmethod
+    def _move_to_end(order: np.ndarray, positions: np.ndarray) -> np.ndarray:
+        """Move *positions* (in their current relative order) to the end of *order*."""
+        moving = np.zeros(len(order), dtype=bool)
+        moving[positions] = True
+        moving_in_order = moving[order]
+        return np.concatenate((order[~moving_in_order], order[moving_in_order]))
+
 
 
 
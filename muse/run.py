@@ -2,12 +2,11 @@ import argparse
 from copy import deepcopy
 import time
 import traceback
-from typing import Optional, Any
+from typing import TYPE_CHECKING, Optional, Any
 
 from utils.globals import PlaybackMasterStrategy
 
 from library_data.library_data import LibraryData
-from muse.muse import Muse
 from muse.playback import Playback
 from muse.playback_config import PlaybackConfig
 from muse.playback_config_master import PlaybackConfigMaster
@@ -23,6 +22,9 @@ from utils.temp_dir import TempDir
 from utils.translations import I18N
 from utils.utils import Utils
 
+if TYPE_CHECKING:
+    from muse.muse import Muse
+
 _ = I18N._
 logger = get_logger(__name__)
 
@@ -37,9 +39,21 @@ class Run:
         self.app_actions: Optional[AppActions] = app_actions
         self.library_data: Optional[LibraryData] = None if args.placeholder else LibraryData(app_actions)
         self._run_context: RunContext = RunContext()
-        self.muse: Muse = Muse(self.args, self.library_data, self._run_context, ui_callbacks=app_actions)
+        # The placeholder run created at startup only needs its Muse (LLM, voice,
+        # extension clients) if something asks for it
+        self._muse: Optional['Muse'] = None if args.placeholder else self._create_muse()
         self._playback: Optional[Playback] = None
 
+    def _create_muse(self) -> 'Muse':
+        from muse.muse import Muse
+        return Muse(self.args, self.library_data, self._run_context, ui_callbacks=self.app_actions)
+
+    @property
+    def muse(self) -> 'Muse':
+        if self._muse is None:
+            self._muse = self._create_muse()
+        return self._muse
+
     def is_infinite(self) -> bool:
         return self.args.total == -1
 
@@ -114,6 +128,10 @@ class Run:
             logger.info("\n\nConfig matches last config. Please modify it or quit.")
             return
 
+        # Start loading the LLM now, ahead of the first Muse.prepare() call
+        if not self.args.placeholder:
+            self.muse.warm_up_llm()
+
         try:
             self.is_started = True
             # Set the current config in the state manager
@@ -0,0 +1,201 @@
+"""
+Background pool of ready-to-air DJ spots.
+
+Topic spots are normally generated and synthesized during Muse.prepare(),
+which only starts a couple of minutes before the track ends and can run late.
+A SpotPool fills up during idle time instead: while a track plays and there is
+nothing to prepare, it generates the text for a self-contained topic (a joke,
+a fact, the weather...) and synthesizes it to speech files, so a spot on that
+topic can later be aired at once.
+
+Spots are kept for the persona/voice that generated them only: a spot whose
+key no longer matches the current one is discarded, as is a spot past its
+topic's maximum age (weather and news go stale quickly).
+"""
+
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Hashable, Iterable, List, Optional
+
+from utils.globals import Topic
+from utils.logging_setup import get_logger
+from utils.utils import Utils
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class PooledSpot:
+    """A generated and synthesized spot waiting to be aired."""
+    topic: Topic
+    text: str
+    audio_paths: List[str]
+    key: Hashable
+    expires_at: float
+    created_at: float = field(default_factory=time.monotonic)
+
+    def is_expired(self, now: Optional[float] = None) -> bool:
+        return (time.monotonic() if now is None else now) >= self.expires_at
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.created_at
+
+    def delete_audio(self) -> None:
+        for path in self.audio_paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+class SpotPool:
+    """
+    Pre-generated spots for *topics*, up to *size* per topic.
+
+    *generate* maps a topic to the spot text, *synthesize* maps (text, topic)
+    to the speech file paths, and *get_key* returns the current persona/voice
+    key.  The callbacks may raise; a topic that fails is not retried for
+    RETRY_AFTER_FAILURE_SECONDS.
+    """
+    DEFAULT_MAX_AGE_SECONDS = 6 * 60 * 60
+    TOPIC_MAX_AGE_SECONDS = {
+        Topic.WEATHER: 60 * 60,
+        Topic.NEWS: 2 * 60 * 60,
+        Topic.HACKERNEWS: 2 * 60 * 60,
+    }
+    RETRY_AFTER_FAILURE_SECONDS = 10 * 60
+    MIN_IDLE_SECONDS = 60  # don't start on a spot with less idle time than this left
+    FILE_PREFIX = "spot_pool_"  # speech files left unaired are removed by tts.output_cleanup
+
+    def __init__(
+        self,
+        topics: Iterable[Topic],
+        size: int,
+        generate: Callable[[Topic], str],
+        synthesize: Callable[[str, Topic], List[str]],
+        get_key: Callable[[], Hashable],
+    ) -> None:
+        self.topics = list(topics)
+        self.size = size
+        self._generate = generate
+        self._synthesize = synthesize
+        self._get_key = get_key
+        self._spots: Dict[Topic, List[PooledSpot]] = {topic: [] for topic in self.topics}
+        self._failed_at: Dict[Topic, float] = {}
+        self._lock = threading.Lock()
+        self._filling = False
+
+    @property
+    def enabled(self) -> bool:
+        return self.size > 0 and len(self.topics) > 0
+
+    def max_age(self, topic: Topic) -> float:
+        return self.TOPIC_MAX_AGE_SECONDS.get(topic, self.DEFAULT_MAX_AGE_SECONDS)
+
+    def ready_count(self, topic: Optional[Topic] = None) -> int:
+        self._discard_stale()
+        with self._lock:
+            if topic is not None:
+                return len(self._spots.get(topic, []))
+            return sum(len(spots) for spots in self._spots.values())
+
+    def take(self, topic: Topic) -> Optional[PooledSpot]:
+        """Remove and return the oldest ready spot for *topic*, if any."""
+        self._discard_stale()
+        with self._lock:
+            spots = self._spots.get(topic)
+            if not spots:
+                return None
+            spot = spots.pop(0)
+        logger.info("Airing pooled %s spot generated %.0fs ago", topic.value, spot.age)
+        return spot
+
+    def invalidate(self, reason: str = "") -> None:
+        """Discard every ready spot, e.g. when the DJ persona or voice changes."""
+        with self._lock:
+            discarded = [spot for spots in self._spots.values() for spot in spots]
+            for spots in self._spots.values():
+                spots.clear()
+        if discarded:
+            logger.info("Discarding %d pooled spots%s", len(discarded), f" ({reason})" if reason else "")
+        for spot in discarded:
+            spot.delete_audio()
+
+    def next_topic(self) -> Optional[Topic]:
+        """The topic with the fewest ready spots that is below the pool size."""
+        self._discard_stale()
+        now = time.monotonic()
+        with self._lock:
+            candidates = [
+                topic for topic in self.topics
+                if len(self._spots[topic]) < self.size
+                and now - self._failed_at.get(topic, -self.RETRY_AFTER_FAILURE_SECONDS) >= self.RETRY_AFTER_FAILURE_SECONDS
+            ]
+            if not candidates:
+                return None
+            return min(candidates, key=lambda topic: len(self._spots[topic]))
+
+    def fill_one(self) -> bool:
+        """Generate and synthesize one spot. Returns False if there was nothing to do."""
+        topic = self.next_topic()
+        if topic is None:
+            return False
+        key = self._get_key()
+        start = time.monotonic()
+        try:
+            text = self._generate(topic)
+            audio_paths = self._synthesize(text, topic) if text and text.strip() else []
+        except Exception as e:
+            logger.warning("Failed to pre-generate %s spot: %s", topic.value, e)
+            self._failed_at[topic] = time.monotonic()
+            return True
+        if not audio_paths:
+            logger.warning("Failed to pre-generate %s spot: no speech was synthesized", topic.value)
+            self._failed_at[topic] = time.monotonic()
+            return True
+        spot = PooledSpot(topic, text, audio_paths, key, expires_at=start + self.max_age(topic))
+        if self._get_key() != key:
+            logger.info("Persona changed while pre-generating a %s spot, discarding it", topic.value)
+            spot.delete_audio()
+            return True
+        with self._lock:
+            self._spots[topic].append(spot)
+        logger.info("Pooled a %s spot in %.1fs (%d ready)", topic.value, time.monotonic() - start, self.ready_count())
+        return True
+
+    def fill(self, is_idle: Callable[[], bool]) -> None:
+        """Fill the pool one spot at a time for as long as *is_idle* holds."""
+        try:
+            while self.enabled and is_idle() and self.fill_one():
+                pass
+        finally:
+            with self._lock:
+                self._filling = False
+
+    def start_filling(self, is_idle: Callable[[], bool]) -> bool:
+        """Fill the pool on a background thread unless a fill is already running."""
+        if not self.enabled:
+            return False
+        with self._lock:
+            if self._filling:
+                return False
+            self._filling = True
+        Utils.start_thread(self.fill, use_asyncio=False, args=[is_idle])
+        return True
+
+    def _discard_stale(self) -> None:
+        now = time.monotonic()
+        key = self._get_key()
+        with self._lock:
+            stale = []
+            for topic, spots in self._spots.items():
+                fresh = []
+                for spot in spots:
+                    (fresh if spot.key == key and not spot.is_expired(now) else stale).append(spot)
+                self._spots[topic] = fresh
+        for spot in stale:
+            logger.debug("Discarding stale pooled %s spot", spot.topic.value)
+            spot.delete_audio()
@@ -0,0 +1,214 @@
+"""
+Sentence-level streaming of LLM output into text-to-speech for DJ spots.
+
+A SentenceStream is passed to LLM.ask() as its redundancy policy, so it sees
+every streamed chunk.  Each completed sentence of the visible response is
+checked for blacklisted items and, if clean, queued for the TTS runner, which
+reads the stream as an iterable while the model is still generating.  On a
+violation the stream stops generation immediately and the violating sentence
+is never released.
+"""
+
+import queue
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional
+
+from extensions.llm_redundancy import (
+    RedundancyPolicy,
+    RedundancyVerdict,
+    streaming_visible_response,
+)
+from utils.logging_setup import get_logger
+
+logger = get_logger(__name__)
+
+# End of a sentence: terminal punctuation (optionally closed by a quote or
+# bracket) followed by whitespace, or a paragraph break.
+_SENTENCE_END = re.compile(r"[.!?…。！？]+[\"'”’)\]]*\s+|\n\s*\n")
+
+_CLOSED = object()
+
+
+def _ends_paragraph(text: str) -> bool:
+    return text[len(text.rstrip()):].count("\n") >= 2
+
+
+@dataclass
+class SpotStreamMetrics:
+    """Timings for one streamed spot, in seconds from the start of the spot."""
+    started_at: float = field(default_factory=time.monotonic)
+    first_sentence_at: Optional[float] = None
+    first_audio_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    sentences: int = 0
+    attempts: int = 0
+
+    def mark_first_sentence(self) -> None:
+        if self.first_sentence_at is None:
+            self.first_sentence_at = time.monotonic()
+
+    def mark_first_audio(self, *_args) -> None:
+        if self.first_audio_at is None:
+            self.first_audio_at = time.monotonic()
+
+    def mark_finished(self) -> None:
+        self.finished_at = time.monotonic()
+
+    def _since_start(self, timestamp: Optional[float]) -> Optional[float]:
+        return None if timestamp is None else timestamp - self.started_at
+
+    @property
+    def time_to_first_sentence(self) -> Optional[float]:
+        return self._since_start(self.first_sentence_at)
+
+    @property
+    def time_to_first_audio(self) -> Optional[float]:
+        return self._since_start(self.first_audio_at)
+
+    @property
+    def total_time(self) -> Optional[float]:
+        return self._since_start(self.finished_at)
+
+    def summary(self) -> str:
+        def fmt(seconds):
+            return "n/a" if seconds is None else f"{seconds:.2f}s"
+        return (
+            f"first sentence {fmt(self.time_to_first_sentence)}, "
+            f"first audio {fmt(self.time_to_first_audio)}, "
+            f"total {fmt(self.total_time)}, "
+            f"{self.sentences} sentences, {self.attempts} attempt(s)"
+        )
+
+
+class SentenceStream:
+    """
+    Bridge from a streaming LLM generation to a TTS runner.
+
+    Implements the RedundancyPolicy protocol; *find_violations* maps a sentence
+    to the blacklisted items it contains (empty when clean).  An optional
+    *next_policy* (e.g. the LLM's own redundancy policy) is consulted for every
+    chunk after the blacklist check.
+
+    Iterating the stream yields the released text in batches: everything
+    released since the previous read, so the first sentence is synthesized on
+    its own and later sentences are grouped while the TTS runner is busy.
+    """
+    MIN_SENTENCE_CHARS = 20  # shorter pieces ("Dr.", "Yes!") wait for the next sentence
+
+    def __init__(
+        self,
+        find_violations: Callable[[str], Dict[str, str]],
+        next_policy: Optional[RedundancyPolicy] = None,
+        metrics: Optional[SpotStreamMetrics] = None,
+    ) -> None:
+        self._find_violations = find_violations
+        self._next_policy = next_policy
+        self.metrics = metrics
+        self._queue: "queue.Queue" = queue.Queue()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._consumed = 0  # offset into the visible text already split into sentences
+        self._visible = ""
+        self.released: List[str] = []
+        self.violations: Dict[str, str] = {}
+        self.violating_sentence: Optional[str] = None
+
+    @property
+    def released_text(self) -> str:
+        return "".join(
+            text if text.endswith("\n\n") or i == len(self.released) - 1 else text + " "
+            for i, text in enumerate(self.released)
+        ).strip()
+
+    def on_chunk(self, chunk) -> RedundancyVerdict:
+        """Release the sentences completed by *chunk* (a StreamChunk)."""
+        visible = streaming_visible_response(chunk.accumulated)
+        with self._lock:
+            if self._closed:
+                return RedundancyVerdict(should_stop=True, reason="blacklist")
+            self._visible = visible
+            position = self._consumed
+            while True:
+                match = _SENTENCE_END.search(visible, position)
+                if match is None:
+                    break
+                position = match.end()
+                sentence = visible[self._consumed:position]
+                if len(sentence.strip()) < self.MIN_SENTENCE_CHARS and not _ends_paragraph(sentence):
+                    continue
+                self._consumed = position
+                if not self._release(sentence):
+                    return self._stop_verdict()
+        if self._next_policy is not None:
+            return self._next_policy.on_chunk(chunk)
+        return RedundancyVerdict(should_stop=False)
+
+    def finish(self, final_text: Optional[str] = None) -> None:
+        """
+        Release the trailing sentence and close the stream.
+
+        *final_text* is the complete cleaned response, if any; the part after
+        what has already been split into sentences is released.  Safe to call
+        more than once, and after a violation (when it only closes).
+        """
+        with self._lock:
+            if not self._closed:
+                text = self._visible
+                if final_text is not None and final_text.startswith(self._visible[:self._consumed]):
+                    text = final_text
+                self._release(text[self._consumed:])
+                self._consumed = len(text)
+            self._close()
+
+    def close(self) -> None:
+        with self._lock:
+            self._close()
+
+    def __iter__(self) -> Iterator[str]:
+        while True:
+            item = self._queue.get()
+            if item is _CLOSED:
+                return
+            batch = [item]
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _CLOSED:
+                    yield " ".join(batch)
+                    return
+                batch.append(item)
+            yield " ".join(batch)
+
+    def _release(self, sentence: str) -> bool:
+        """Queue *sentence* unless it has blacklisted items. Returns False on a violation."""
+        if not sentence.strip():
+            return True
+        violations = self._find_violations(sentence)
+        if violations:
+            self.violations.update(violations)
+            self.violating_sentence = sentence.strip()
+            logger.info("Blacklisted items in streamed sentence, stopping generation: %s", list(violations))
+            self._close()
+            return False
+        # Keep paragraph breaks: they end the chunks the TTS chunker builds
+        text = sentence.strip() + ("\n\n" if _ends_paragraph(sentence) else "")
+        self.released.append(text)
+        if self.metrics is not None:
+            self.metrics.sentences += 1
+            self.metrics.mark_first_sentence()
+        self._queue.put(text)
+        return True
+
+    def _stop_verdict(self) -> RedundancyVerdict:
+        # With nothing released, keep the text so the result is not rejected as empty
+        return RedundancyVerdict(should_stop=True, reason="blacklist", truncate_to=self.released_text or None)
+
+    def _close(self) -> None:
+        if not self._closed:
+            self._closed = True
+            self._queue.put(_CLOSED)
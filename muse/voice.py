@@ -65,6 +65,7 @@ class Voice:
 
     def _make_config(self, overwrite: bool = False, **extra) -> "TTSConfig":
         """Build a TTSConfig for the active provider and this persona's voice."""
+        extra.setdefault("run_context", self.run_context)
         coqui_model = None
         if self._provider == TTSProviderType.COQUI:
             coqui_tuple = getattr(app_config, "coqui_tts_model", None)
@@ -79,7 +80,6 @@ class Voice:
             language=self._language,
             filepath="muse_voice",
             overwrite=overwrite,
-            run_context=self.run_context,
             **extra,
         )
 
@@ -125,6 +125,35 @@ class Voice:
             logger.error(e)
             traceback.print_exc()
 
+    def say_stream(self, texts, topic: str = "", save_mp3: bool = False, locale=None, on_speech_queued=None):
+        """Synthesise and play *texts*, an iterable of pieces still being generated."""
+        if not self.can_speak or self._tts is None:
+            logger.warning("Cannot speak.")
+            return
+        logger.info("Saying streamed text")
+        temp_tts = TextToSpeechRunner(self._make_config(overwrite=True))
+        current_time_str = str(datetime.datetime.now().timestamp()).split(".")[0]
+        self._tts.set_output_path(topic + "_" + current_time_str + "_")
+        try:
+            return temp_tts.speak_stream(texts, save_mp3=save_mp3, locale=locale, on_speech_queued=on_speech_queued)
+        except Exception as e:
+            logger.error(e)
+            traceback.print_exc()
+
+    def prepare_to_say_stream(self, texts, topic: str = "", save_mp3: bool = False, locale=None, on_speech_queued=None):
+        """Pre-generate speech for *texts*, an iterable of pieces still being generated."""
+        if not self.can_speak or self._tts is None:
+            logger.warning("Cannot speak.")
+            return
+        logger.info("Preparing to say streamed text")
+        current_time_str = str(datetime.datetime.now().timestamp()).split(".")[0]
+        self._tts.set_output_path(topic + "_" + current_time_str + "_")
+        try:
+            return self._tts.speak_stream(texts, save_mp3=save_mp3, locale=locale, on_speech_queued=on_speech_queued)
+        except Exception as e:
+            logger.error(e)
+            traceback.print_exc()
+
     def speak_file(
         self,
         filepath: str,
@@ -152,6 +181,21 @@ class Voice:
             logger.error(e)
             traceback.print_exc()
 
+    def synthesize(self, text: str, topic: str = "", locale=None):
+        """
+        Generate speech files for *text* without playing them, e.g. to air later
+        with add_speech_file_to_queue().  Skips do not interrupt the synthesis.
+        Returns the file paths in speaking order (empty if the voice cannot speak).
+        """
+        if not self.can_speak or self._tts is None:
+            logger.warning("Cannot speak.")
+            return []
+        logger.info("Synthesizing: %s", text)
+        tts = TextToSpeechRunner(self._make_config(overwrite=True, auto_play=False, run_context=None))
+        current_time_str = str(datetime.datetime.now().timestamp()).split(".")[0]
+        tts.set_output_path(topic + "_" + current_time_str + "_")
+        return tts.synthesize(text, locale=locale)
+
     def finish_speaking(self):
         """Block until all pending speech jobs complete."""
         if not self.can_speak or self._tts is None:
@@ -165,8 +209,10 @@ class Voice:
             return
         self._tts.speech_queue.cancel()
 
-    def add_speech_file_to_queue(self, filepath: str):
+    def add_speech_file_to_queue(self, filepath: str, delete_after_playing: bool = False):
         if not self.can_speak or self._tts is None:
             logger.warning("Cannot speak.")
             return
         self._tts.add_speech_file_to_queue(filepath)
+        if delete_after_playing:
+            self._tts.used_audio_paths.append(filepath)
@@ -37,11 +37,14 @@ def analyze_album_covers():
         # Check for artwork consistency
         has_artwork = []
         no_artwork = []
+        # Stored artwork paths are content-addressed, so equal paths mean equal images
+        artwork_paths = {}
         
         for track in tracks:
             artwork = track.get_album_artwork()
             if artwork:
                 has_artwork.append(track)
+                artwork_paths[track.filepath] = artwork
             else:
                 no_artwork.append(track)
         
@@ -58,11 +61,11 @@ def analyze_album_covers():
         # If all tracks have artwork, check for consistency
         if has_artwork:
             # Get the first artwork as reference
-            ref_artwork = has_artwork[0].artwork
+            ref_artwork = artwork_paths[has_artwork[0].filepath]
             different_artwork = []
             
             for track in has_artwork[1:]:
-                if track.artwork != ref_artwork:
+                if artwork_paths[track.filepath] != ref_artwork:
                     different_artwork.append(track)
             
             if different_artwork:
@@ -7,6 +7,7 @@ The following are pre-bound in the REPL:
   DB_PATH         -- pathlib.Path to the database file
   list_to_delim   -- join a list into a "; "-delimited string
   delim_to_list   -- split a "; "-delimited string into a list
+  query_stats     -- get_query_stats(limit=None): per-statement timings
 
 Example queries:
   conn.execute("SELECT COUNT(*) FROM composers").fetchone()[0]
@@ -20,7 +21,7 @@ import os
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from utils.db import get_connection, DB_PATH, list_to_delim, delim_to_list
+from utils.db import get_connection, get_query_stats, DB_PATH, list_to_delim, delim_to_list
 
 conn = get_connection()
 
@@ -30,6 +31,7 @@ muse_library.db shell  ({DB_PATH})
   conn          sqlite3.Connection
   DB_PATH       {DB_PATH}
   list_to_delim / delim_to_list
+  query_stats(limit=None)  slowest statements by total time
 
 Tables: {", ".join(
     r[0] for r in conn.execute(
@@ -46,4 +48,5 @@ code.interact(banner=banner, local={
     "DB_PATH": DB_PATH,
     "list_to_delim": list_to_delim,
     "delim_to_list": delim_to_list,
+    "query_stats": get_query_stats,
 })
@@ -126,6 +126,8 @@ def _reset_library_caches() -> None:
     library_data.LibraryData.DIRECTORIES_CACHE = {}
     library_data.LibraryData.MEDIA_TRACK_CACHE = {}
     library_data.LibraryData._directory_cache_loaded = False
+    library_data.LibraryData._derived_attributes_fingerprint = None
+    library_data.LibraryData._db_tracks_version = None
 
 
 def _reset_playlist_history() -> None:
@@ -161,6 +163,7 @@ def _make_isolated_db_conn():
 
     from utils.db import (
         _create_schema,
+        ensure_path_key_columns,
         _seed_artists,
         _seed_composers,
         _seed_forms,
@@ -173,6 +176,7 @@ def _make_isolated_db_conn():
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA foreign_keys=ON")
     _create_schema(conn)
+    ensure_path_key_columns(conn)
     _seed_forms(conn)
     _seed_genres(conn)
     _seed_instruments(conn)
@@ -229,6 +233,7 @@ def _patch_app_info_cache_singleton(monkeypatch, cache_instance) -> None:
     for module_name in (
         "muse.playlist",
         "library_data.library_data",
+        "extensions.extension_manager",
         "muse.prompter",
         "muse.schedules_manager",
         "ui_qt.configuration_window",
@@ -275,11 +280,10 @@ def _patch_config_singleton(monkeypatch, config_instance) -> None:
 def _patch_muse_memory_singleton(monkeypatch, memory_instance) -> None:
     import muse.muse as muse_mod
     import muse.muse_memory as muse_memory_mod
-    import utils.persistent_data_manager as pdm
 
+    # utils.persistent_data_manager looks muse_memory up in muse.muse_memory when used
     monkeypatch.setattr(muse_memory_mod, "muse_memory", memory_instance)
     monkeypatch.setattr(muse_mod, "muse_memory", memory_instance)
-    monkeypatch.setattr(pdm, "muse_memory", memory_instance)
 
 
 @pytest.fixture(autouse=True)
@@ -366,8 +370,16 @@ def isolated_singletons(tmp_path, monkeypatch):
     _reset_library_caches()
     _reset_playlist_history()
 
+    # Stores requested during a test are written to this test's singletons
+    from utils.persistent_data_manager import PersistentDataManager
+    monkeypatch.setattr(PersistentDataManager, "_service", None)
+    # As after the first paint; tests of the deferred load reset this themselves
+    monkeypatch.setattr(PersistentDataManager, "_is_deferred_loaded", True)
+
     yield
 
+    if PersistentDataManager._service is not None:
+        PersistentDataManager._service.shutdown(timeout=10)
     isolated_db_conn.close()
 
 
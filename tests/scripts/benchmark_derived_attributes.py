@@ -0,0 +1,85 @@
+"""Time the hot paths that read MediaTrack form/instrument/catalogue, with the
+values derived lazily on first access vs precomputed at ingestion.
+
+Runs against synthetic tracks built with MediaTrack.__new__ (no audio files).
+Each "lazy" pass starts from fresh tracks whose derived attributes are unset,
+which is what every track read from an older media_tracks table looked like.
+
+Usage:  python benchmark_derived_attributes.py [track_count]
+"""
+
+import os
+import sys
+import time
+
+_project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if _project_root not in sys.path:
+    sys.path.insert(0, _project_root)
+
+from library_data.library_data import LibraryDataSearch
+from library_data.media_track import MediaTrack
+from muse.playlist import Playlist
+
+TRACK_COUNT = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+TITLES = ["Piano Sonata No. {0}", "Violin Concerto in D, Op. {0}", "Nocturne No. {0}",
+          "Symphony No. {0}: I. Allegro", "Cello Suite No. {0}", "String Quartet No. {0}"]
+ALBUMS = ["Beethoven Sonatas Vol. {0}", "Complete Works Volume {0}", "Klavierwerke Bd. {0}",
+          "Night Music", "Chamber Music: Vol. {0}"]
+
+
+def make_tracks(precomputed):
+    tracks = []
+    for i in range(TRACK_COUNT):
+        track = MediaTrack.__new__(MediaTrack)
+        track.filepath = f"/bench/{i}.flac"
+        track.title = TITLES[i % len(TITLES)].format(i % 40 + 1)
+        track.album = ALBUMS[i % len(ALBUMS)].format(i % 12 + 1)
+        track.artist = f"Artist {i % 300}"
+        track.composer = f"Composer {i % 120}"
+        track.genre = "classical"
+        track.searchable_title = track.title.lower()
+        track.searchable_album = track.album.lower()
+        track.searchable_artist = track.artist.lower()
+        track.searchable_composer = track.composer.lower()
+        track.searchable_genre = track.genre
+        track.form = None
+        track.instrument = None
+        track.catalogue = None
+        if precomputed:
+            track.compute_derived_attributes()
+        tracks.append(track)
+    return tracks
+
+
+def search_all(tracks):
+    search = LibraryDataSearch(all="sonata", max_results=TRACK_COUNT)
+    for track in tracks:
+        search.test(track)
+
+
+def sort_keys(tracks):
+    for getter in (MediaTrack.get_form, MediaTrack.get_instrument, MediaTrack.get_catalogue, MediaTrack.get_genre):
+        sorted(tracks, key=lambda t: getter(t) or "")
+
+
+def recently_played(tracks):
+    for track in tracks:
+        Playlist.update_recently_played_lists(track)
+
+
+def timed(fn, precomputed):
+    tracks = make_tracks(precomputed)
+    start = time.perf_counter()
+    fn(tracks)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    print(f"{TRACK_COUNT} synthetic tracks")
+    print(f"{'path':<22}{'lazy (s)':>12}{'precomputed (s)':>18}{'speedup':>10}")
+    for name, fn in (("search all", search_all), ("sort keys", sort_keys),
+                     ("recently played", recently_played)):
+        lazy = timed(fn, precomputed=False)
+        precomputed = timed(fn, precomputed=True)
+        print(f"{name:<22}{lazy:>12.3f}{precomputed:>18.3f}{lazy / max(precomputed, 1e-9):>9.1f}x")
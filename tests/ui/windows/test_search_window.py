@@ -99,10 +99,12 @@ class TestSearchWindow:
         win.library_data_search = LibraryDataSearch(composer="beethoven", max_results=20)
         count = run_search_sync(win)
         assert count > 0
-        assert len(win.play_btn_list) == count
-        for play_btn in win.play_btn_list:
-            assert not play_btn.isEnabled()
-            assert "Beethoven" in play_btn.toolTip()
+        model = win.track_results_model
+        assert model.rowCount() == count
+        play_col = model.action_column("play")
+        for row in range(count):
+            assert not model.is_action_enabled(row, "play")
+            assert "Beethoven" in model.data(model.index(row, play_col), Qt.ItemDataRole.ToolTipRole)
         win.close()
 
     def test_non_excluded_result_play_button_stays_enabled(
@@ -119,8 +121,82 @@ class TestSearchWindow:
         win.library_data_search = LibraryDataSearch(composer="mozart", max_results=20)
         count = run_search_sync(win)
         assert count > 0
-        assert len(win.play_btn_list) == count
-        for play_btn in win.play_btn_list:
-            assert play_btn.isEnabled()
-            assert play_btn.toolTip() == ""
+        model = win.track_results_model
+        assert model.rowCount() == count
+        play_col = model.action_column("play")
+        for row in range(count):
+            assert model.is_action_enabled(row, "play")
+            assert not model.data(model.index(row, play_col), Qt.ItemDataRole.ToolTipRole)
         win.close()
+
+
+@pytest.mark.ui
+class TestResultTableView:
+    """Model/proxy/delegate behaviour with stub rows (no fixture library needed)."""
+
+    def _view(self, tracks):
+        from ui_qt.search_results_view import (
+            ResultAction, ResultColumn, ResultTableModel, ResultTableView,
+        )
+
+        model = ResultTableModel(
+            columns=[ResultColumn("Title", lambda t: t.title), ResultColumn("Artist", lambda t: t.artist)],
+            actions=[ResultAction("play", "Play", lambda t: t.artist != "Excluded")],
+            muted_reason=lambda t: "excluded" if t.artist == "Excluded" else None,
+        )
+        view = ResultTableView()
+        view.set_result_model(model)
+        model.set_items(tracks)
+        return model, view
+
+    def test_filter_matches_text_columns_only(self, qapp):
+        from types import SimpleNamespace
+
+        model, view = self._view([
+            SimpleNamespace(title="Symphony No. 5", artist="Beethoven"),
+            SimpleNamespace(title="Requiem", artist="Mozart"),
+        ])
+
+        view.set_filter_text("MOZ")
+        assert view.visible_row_count() == 1
+        view.set_filter_text("play")  # button label, not row text
+        assert view.visible_row_count() == 0
+        view.set_filter_text("")
+        assert view.visible_row_count() == 2
+        view.deleteLater()
+
+    def test_append_inserts_rows_without_reset(self, qapp):
+        from types import SimpleNamespace
+
+        model, view = self._view([SimpleNamespace(title="A", artist="X")])
+        resets, inserts = [], []
+        model.modelReset.connect(lambda: resets.append(1))
+        model.rowsInserted.connect(lambda parent, first, last: inserts.append((first, last)))
+
+        model.append_items([SimpleNamespace(title="B", artist="Y"), SimpleNamespace(title="C", artist="Z")])
+
+        assert resets == []
+        assert inserts == [(1, 2)]
+        assert view.visible_row_count() == 3
+        view.deleteLater()
+
+    def test_action_click_emits_item_and_respects_disabled_rows(self, qapp):
+        from types import SimpleNamespace
+
+        ok = SimpleNamespace(title="A", artist="X")
+        excluded = SimpleNamespace(title="B", artist="Excluded")
+        model, view = self._view([ok, excluded])
+        view.resize(600, 300)
+        view.show()
+        process_events_for(0.1)
+        triggered = []
+        view.action_triggered.connect(lambda key, item: triggered.append((key, item)))
+        play_col = model.action_column("play")
+
+        for row in (0, 1):
+            center = view.visualRect(view.proxy.index(row, play_col)).center()
+            QTest.mouseClick(view.viewport(), Qt.MouseButton.LeftButton, pos=center)
+
+        assert triggered == [("play", ok)]
+        assert model.data(model.index(1, 0), Qt.ItemDataRole.ToolTipRole) == "excluded"
+        view.close()
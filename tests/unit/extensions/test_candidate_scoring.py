@@ -0,0 +1,114 @@
+"""Unit tests for batch scoring of extension search results (ExtensionManager.rank_candidates)."""
+
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from extensions.extension_manager import ExtensionManager
+from utils.globals import TrackAttribute
+from utils.utils import Utils
+
+
+class _Candidate:
+    """Stands in for a LibraryExtender search result."""
+
+    def __init__(self, candidate_id, title, description="", seconds=300, unsupported=False):
+        self.w = candidate_id
+        self.n = title
+        self.d = description
+        self.y = unsupported
+        self.m = {}
+        self.seconds = seconds
+
+    def xfgi(self, minimum_seconds):
+        return self.seconds < minimum_seconds
+
+    def ggi(self):
+        return self.m["overall_quality"]
+
+    def x(self):
+        return f"https://example.com/{self.w}"
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    monkeypatch.setattr(ExtensionManager, "extensions", [])
+    monkeypatch.setattr(ExtensionManager, "compacted_ids", {})
+    monkeypatch.setattr(ExtensionManager, "rejected_ids", {"rejected"})
+    ExtensionManager._rebuild_indexes()
+    manager = ExtensionManager.__new__(ExtensionManager)
+    manager.library_checks = []
+
+    def is_in_library(title):
+        manager.library_checks.append(title)
+        return title == "owned"
+
+    manager.data_callbacks = SimpleNamespace(instance=SimpleNamespace(is_in_library=is_in_library))
+    return manager
+
+
+def _page():
+    return [
+        _Candidate("good1", "Bach - Partita No. 2 in C minor"),
+        _Candidate("short", "Bach - Partita No. 2 (excerpt)", seconds=30),
+        _Candidate("rejected", "Bach Partita 2"),
+        _Candidate("comp", "Best of Bach - 50 Most Beautiful Pieces"),
+        _Candidate("bio", "Bach", description="A biography of the composer"),
+        _Candidate("owned", "Bach: Partita No. 2"),
+        _Candidate("good2", "Partita no. 2 - Bach (harpsichord)"),
+        _Candidate("list", "Bach playlist", unsupported=True),
+    ]
+
+
+@pytest.mark.unit
+class TestRankCandidates:
+    def test_candidates_are_filtered_and_ranked_by_quality(self, manager):
+        ranking = manager.rank_candidates("Bach Partita No. 2", _page(), shuffle=False)
+
+        assert [b.w for b in ranking.candidates] == ["good1", "good2"]
+        assert {stage: [b.w for b in rejected] for stage, rejected in ranking.rejected.items()} == {
+            "unsupported": ["list"],
+            "too_short": ["short"],
+            "rejected": ["rejected"],
+            "compilation": ["comp"],
+            "not_music": ["bio"],
+            "in_library": ["owned"],
+        }
+
+    def test_library_is_only_searched_until_the_limit_is_reached(self, manager):
+        ranking = manager.rank_candidates("Bach Partita No. 2", _page(), limit=1, shuffle=False)
+
+        assert [b.w for b in ranking.candidates] == ["good1"]
+        assert manager.library_checks == ["good1"]
+
+    def test_every_stage_is_timed(self, manager):
+        ranking = manager.rank_candidates("Bach", _page(), strict="Bach", attr=TrackAttribute.TITLE)
+
+        assert {"metrics", "rank", "too_short", "compilation", "blacklisted", "strict", "in_library"} <= set(ranking.timings)
+        assert all(seconds >= 0 for seconds in ranking.timings.values())
+        assert ranking.slowest_stage() in ranking.timings
+
+    def test_worker_pool_gives_the_same_result(self, manager):
+        sequential = manager.rank_candidates("Bach Partita No. 2", _page(), shuffle=False)
+        pooled = manager.rank_candidates("Bach Partita No. 2", _page(), shuffle=False, workers=3)
+
+        assert [b.w for b in pooled.candidates] == [b.w for b in sequential.candidates]
+        assert pooled.rejected.keys() == sequential.rejected.keys()
+
+    def test_batch_metrics_match_single_metrics(self, manager):
+        titles = ["Bach - Partita No. 2 in C minor", "PARTITA @ THE HALL", "", "bach partita no. 2"]
+
+        batch = manager._m_batch("Bach Partita No. 2", titles)
+
+        assert batch == [manager._m("Bach Partita No. 2", t) for t in titles]
+        assert batch[3]["substring_match"] == 1.0
+
+
+@pytest.mark.unit
+def test_string_distances_match_string_distance():
+    rng = random.Random(3)
+    for _ in range(300):
+        s = "".join(rng.choices("abé ", k=rng.randint(0, 70)))
+        targets = ["".join(rng.choices("abé ", k=rng.randint(0, 70))) for _ in range(3)]
+        assert Utils.string_distances(s, targets) == [Utils.string_distance(s, t) for t in targets]
@@ -0,0 +1,91 @@
+"""Unit tests for the extension directory filename index (extensions.extension_dir_index)."""
+
+import os
+import random
+
+import pytest
+
+from extensions.extension_dir_index import DirectoryFilenameIndex
+from extensions.extension_filer import delete_extension_file
+from utils.utils import Utils
+
+
+def _touch(directory, *names):
+    for name in names:
+        (directory / name).write_bytes(b"")
+
+
+def _brute_force(directory, t):
+    for name in os.listdir(directory):
+        filepath = os.path.join(directory, name)
+        if os.path.isfile(filepath) and Utils.is_similar_strings(filepath, t):
+            return filepath
+    return None
+
+
+@pytest.mark.unit
+class TestDirectoryFilenameIndex:
+    def test_close_match_is_found_and_dissimilar_files_are_skipped(self, tmp_path):
+        _touch(tmp_path, "Bach - Partita No. 2 in D minor.mp3",
+               "Chopin - Nocturne Op. 9 No. 2 (Arthur Rubinstein, 1965 recording, remastered full concert).mp3")
+        index = DirectoryFilenameIndex(str(tmp_path))
+
+        match = index.find_close_match(str(tmp_path / "Bach - Partita No. 2 in D minor.webm"))
+
+        assert match == str(tmp_path / "Bach - Partita No. 2 in D minor.mp3")
+        assert index.stats["skipped"] == 1 and index.stats["compared"] == 1
+        assert index.find_close_match(str(tmp_path / "Debussy - Clair de lune.webm")) is None
+
+    def test_prefilter_agrees_with_the_full_distance_check(self, tmp_path):
+        rng = random.Random(7)
+        words = ["bach", "Partita", "no", "2", "Nocturne", "op", "9", "Clair", "de", "lune", "Live", "HD"]
+        names = {" ".join(rng.choices(words, k=rng.randint(1, 6))) + ".mp3" for _ in range(60)}
+        _touch(tmp_path, *names)
+        index = DirectoryFilenameIndex(str(tmp_path))
+
+        for _ in range(60):
+            t = str(tmp_path / (" ".join(rng.choices(words, k=rng.randint(1, 6))) + ".m4a"))
+            expected = _brute_force(tmp_path, t)
+            match = index.find_close_match(t)
+            assert (match is None) == (expected is None)
+            if match is not None:
+                assert Utils.is_similar_strings(match, t)
+
+    def test_directory_changes_are_picked_up_incrementally(self, tmp_path):
+        _touch(tmp_path, "Old track.mp3")
+        (tmp_path / "Subdir").mkdir()
+        index = DirectoryFilenameIndex(str(tmp_path))
+        index.refresh()
+        assert len(index) == 1
+
+        (tmp_path / "Old track.mp3").unlink()
+        _touch(tmp_path, "New track.mp3")
+        os.utime(tmp_path, ns=(0, index._mtime_ns + 1))
+        index.refresh()
+        index.refresh()
+
+        assert index.find_close_match(str(tmp_path / "New track.opus")) == str(tmp_path / "New track.mp3")
+        assert index.stats["scans"] == 2
+
+    def test_add_and_discard_do_not_wait_for_the_mtime(self, tmp_path):
+        index = DirectoryFilenameIndex(str(tmp_path))
+        index.refresh()
+        _touch(tmp_path, "Downloaded extension.mp3")
+        os.utime(tmp_path, ns=(0, index._mtime_ns))  # as on a filesystem with a coarse mtime
+
+        index.add(str(tmp_path / "Downloaded extension.mp3"))
+        index.add(str(tmp_path / "elsewhere" / "Other.mp3"))
+        assert len(index) == 1
+        index.discard(str(tmp_path / "Downloaded extension.mp3"))
+        assert len(index) == 0
+
+    def test_deleting_an_extension_file_updates_the_shared_index(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("extensions.extension_filer.config.directories", [str(tmp_path)])
+        _touch(tmp_path, "Extension.mp3")
+        index = DirectoryFilenameIndex.for_directory(str(tmp_path))
+        index.refresh()
+
+        delete_extension_file(str(tmp_path / "Extension.mp3"))
+
+        assert len(index) == 0
+        assert DirectoryFilenameIndex.for_directory(str(tmp_path) + os.sep) is index
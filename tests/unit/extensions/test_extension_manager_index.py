@@ -0,0 +1,145 @@
+"""Unit tests for the ExtensionManager record indexes and history compaction."""
+
+from types import SimpleNamespace
+
+import pytest
+
+import extensions.extension_manager as em
+from extensions.extension_manager import ExtensionManager
+from utils.globals import TrackAttribute
+from utils.persistent_data_manager import PersistentDataManager
+
+
+@pytest.fixture(autouse=True)
+def extension_history(monkeypatch):
+    monkeypatch.setattr(ExtensionManager, "extensions", [])
+    monkeypatch.setattr(ExtensionManager, "compacted_ids", {})
+    monkeypatch.setattr(ExtensionManager, "rejected_ids", set())
+    monkeypatch.setattr(ExtensionManager, "_compaction_floor", 0)
+    ExtensionManager._rebuild_indexes()
+    yield
+    ExtensionManager.extensions = []
+    ExtensionManager._rebuild_indexes()
+
+
+@pytest.fixture
+def manager():
+    return ExtensionManager.__new__(ExtensionManager)
+
+
+def _candidate(candidate_id, title="Partita No. 2 in D minor"):
+    return SimpleNamespace(u={"kind": "result"}, w=candidate_id, n=title)
+
+
+def _extend(manager, candidate_id, attr=TrackAttribute.COMPOSER, query="Bach", failed=False):
+    filename = None if failed else f"/music/{candidate_id}.mp3"
+    manager._append(_candidate(candidate_id), filename, attr, query, "network error" if failed else None)
+    return filename
+
+
+@pytest.mark.unit
+class TestExtensionIndexes:
+    def test_details_are_looked_up_by_filename(self, manager):
+        _extend(manager, "a1")
+        filename = _extend(manager, "b2")
+
+        details = ExtensionManager.get_extension_detailsfor_track(SimpleNamespace(filepath=filename))
+
+        assert details["candidate_id"] == "b2"
+        assert ExtensionManager.get_extension_detailsfor_track(SimpleNamespace(filepath="/music/other.mp3")) is None
+
+    def test_extended_candidates_are_bad_options(self, manager):
+        _extend(manager, "a1")
+        _extend(manager, "b2", failed=True)
+
+        assert ExtensionManager.was_extended("a1")
+        assert not ExtensionManager.was_extended("b2")  # failed downloads may be tried again
+        assert manager._was_extended(_candidate("a1"))
+
+    def test_records_are_grouped_by_attribute_and_value(self, manager):
+        _extend(manager, "a1", query="Bach")
+        _extend(manager, "b2", query="bach ")
+        _extend(manager, "c3", attr=TrackAttribute.GENRE, query="Bach")
+
+        records = ExtensionManager.get_extensions_for(TrackAttribute.COMPOSER, "BACH")
+
+        assert [r["candidate_id"] for r in records] == ["a1", "b2"]
+        assert [r["candidate_id"] for r in ExtensionManager.get_extensions_for("GENRE", "bach")] == ["c3"]
+
+    def test_indexes_follow_edits_to_the_list(self, manager):
+        first = _extend(manager, "a1")
+        _extend(manager, "b2")
+
+        ExtensionManager.remove_extension(ExtensionManager.extensions[0])
+        assert ExtensionManager.get_extension_detailsfor_track(SimpleNamespace(filepath=first)) is None
+        ExtensionManager.extensions = ExtensionManager.extensions + [
+            {"filename": "/music/c3.mp3", "candidate_id": "c3", "track_attr": "TITLE", "search_query": "x"}
+        ]
+        assert ExtensionManager.was_extended("c3")
+
+    def test_only_failed_and_missing_records_are_compacted(self, manager, monkeypatch, tmp_path):
+        monkeypatch.setattr(ExtensionManager, "max_extensions_length", 3)
+        present = tmp_path / "b2.mp3"
+        present.write_bytes(b"")
+        _extend(manager, "a1")  # its file does not exist
+        manager._append(_candidate("b2"), str(present), TrackAttribute.COMPOSER, "Bach", None)
+        _extend(manager, "c3", failed=True)
+        assert len(ExtensionManager.extensions) == 3
+
+        _extend(manager, "d4")
+
+        assert [r["candidate_id"] for r in ExtensionManager.extensions] == ["b2"]
+        assert ExtensionManager.get_extension_detailsfor_track(SimpleNamespace(filepath=str(present))) is not None
+        assert ExtensionManager.was_extended("a1") and ExtensionManager.was_extended("d4")
+        assert not ExtensionManager.was_extended("c3")
+
+    def test_records_of_present_files_are_never_compacted(self, manager, monkeypatch, tmp_path):
+        monkeypatch.setattr(ExtensionManager, "max_extensions_length", 1)
+        for candidate_id in ("a1", "b2", "c3"):
+            filepath = tmp_path / f"{candidate_id}.mp3"
+            filepath.write_bytes(b"")
+            manager._append(_candidate(candidate_id), str(filepath), TrackAttribute.COMPOSER, "Bach", None)
+
+        assert [r["candidate_id"] for r in ExtensionManager.extensions] == ["a1", "b2", "c3"]
+        assert ExtensionManager.compacted_ids == {}
+
+    def test_history_is_not_compacted_on_load(self, manager, monkeypatch):
+        _extend(manager, "a1")
+        _extend(manager, "b2", failed=True)
+        ExtensionManager.store_extensions()
+        monkeypatch.setattr(ExtensionManager, "max_extensions_length", 1)
+
+        ExtensionManager.load_extensions()
+
+        assert [r["candidate_id"] for r in ExtensionManager.extensions] == ["a1", "b2"]
+
+    def test_compacted_ids_are_persisted(self, manager, monkeypatch):
+        monkeypatch.setattr(ExtensionManager, "max_extensions_length", 1)
+        _extend(manager, "a1")
+        _extend(manager, "b2")
+        ExtensionManager.store_extensions()
+        ExtensionManager.extensions = []
+        ExtensionManager.compacted_ids = {}
+
+        ExtensionManager.load_extensions()
+
+        assert em.app_info_cache.get("compacted_extension_ids") == ["a1", "b2"]
+        assert ExtensionManager.was_extended("a1") and ExtensionManager.was_extended("b2")
+        assert ExtensionManager.extensions == []
+
+
+@pytest.mark.unit
+class TestExtensionHistoryIsStored:
+    def test_new_record_marks_the_history_for_storing(self, manager):
+        _extend(manager, "a1")
+
+        assert PersistentDataManager._get_service().is_dirty(PersistentDataManager.EXTENSIONS)
+        assert [e["candidate_id"] for e in em.app_info_cache.get("extensions")] == ["a1"]
+
+    def test_rejecting_the_pending_candidate_marks_the_history_for_storing(self, monkeypatch):
+        monkeypatch.setattr(ExtensionManager, "pending_candidate", {"id": "c3"})
+
+        assert ExtensionManager.reject_pending_candidate()
+
+        assert PersistentDataManager._get_service().is_dirty(PersistentDataManager.EXTENSIONS)
+        assert em.app_info_cache.get("rejected_extension_ids") == ["c3"]
@@ -0,0 +1,259 @@
+"""Unit tests for extensions.http_cache against a local HTTP stub.
+
+The stub serves pages with an ETag and/or Last-Modified header and answers
+conditional requests for an unchanged page with 304 Not Modified, as real
+servers do.  The cache itself lives in the isolated in-memory DB.
+"""
+
+import sqlite3
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from extensions.http_cache import HTTPCache, HTTPStatusError
+from extensions.soup_utils import SoupUtils, WebConnectionException
+
+LAST_MODIFIED = "Mon, 19 Oct 2026 08:00:00 GMT"
+
+
+class _Stub:
+    def __init__(self):
+        self.pages = {}
+        self.requests = []  # (path, If-None-Match, If-Modified-Since)
+        self.lock = threading.Lock()
+
+    def page(self, path, body, etag="", last_modified="", content_type="text/html; charset=utf-8"):
+        self.pages[path] = {"body": body.encode("utf-8"), "etag": etag,
+                            "last_modified": last_modified, "content_type": content_type}
+
+    def url(self, path):
+        return f"{self.base_url}{path}"
+
+    def requests_for(self, path):
+        return [r for r in self.requests if r[0] == path]
+
+
+@pytest.fixture
+def stub():
+    state = _Stub()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            if_none_match = self.headers.get("If-None-Match")
+            if_modified_since = self.headers.get("If-Modified-Since")
+            with state.lock:
+                state.requests.append((self.path, if_none_match, if_modified_since))
+            page = state.pages.get(self.path)
+            if page is None:
+                return self._send(404, b"not found", {"Content-Type": "text/plain"})
+            not_modified = (
+                (page["etag"] and if_none_match == page["etag"])
+                or (not page["etag"] and page["last_modified"] and if_modified_since == page["last_modified"])
+            )
+            headers = {}
+            if page["etag"]:
+                headers["ETag"] = page["etag"]
+            if page["last_modified"]:
+                headers["Last-Modified"] = page["last_modified"]
+            if not_modified:
+                return self._send(304, b"", headers)
+            headers["Content-Type"] = page["content_type"]
+            self._send(200, page["body"], headers)
+
+        def _send(self, status, body, headers):
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    state.base_url = f"http://127.0.0.1:{server.server_port}"
+    yield state
+    server.shutdown()
+    server.server_close()
+
+
+def _expire(cache, url):
+    """Age the cached entry for *url* past any TTL."""
+    from utils.db import write_transaction
+    with write_transaction() as conn:
+        conn.execute("UPDATE http_cache SET fetched_at = fetched_at - 1e6 WHERE key=?", (cache._key(url),))
+
+
+@pytest.mark.unit
+class TestHTTPCache:
+    def test_fresh_response_is_served_without_a_request(self, stub):
+        stub.page("/news", '{"articles": []}', content_type="application/json")
+        cache = HTTPCache()
+
+        first = cache.get(stub.url("/news"), ttl=60)
+        second = cache.get(stub.url("/news"), ttl=60)
+
+        assert not first.from_cache and second.from_cache
+        assert second.json() == {"articles": []}
+        assert len(stub.requests_for("/news")) == 1
+        assert cache.stats["hits"] == 1 and cache.stats["misses"] == 1
+
+    def test_expired_response_is_revalidated_with_its_etag(self, stub):
+        stub.page("/hn", "<p>front page</p>", etag='"v1"')
+        cache = HTTPCache()
+        url = stub.url("/hn")
+        cache.get(url, ttl=60)
+        _expire(cache, url)
+
+        response = cache.get(url, ttl=60)
+
+        assert response.text == "<p>front page</p>"
+        assert stub.requests_for("/hn")[-1] == ("/hn", '"v1"', None)
+        assert cache.stats["revalidated"] == 1
+        cache.get(url, ttl=60)
+        assert len(stub.requests_for("/hn")) == 2  # the 304 made the entry fresh again
+
+    def test_expired_response_is_revalidated_with_last_modified(self, stub):
+        stub.page("/wiki", "<p>article</p>", last_modified=LAST_MODIFIED)
+        cache = HTTPCache()
+
+        cache.get(stub.url("/wiki"), ttl=0)
+        response = cache.get(stub.url("/wiki"), ttl=0)
+
+        assert stub.requests_for("/wiki")[-1] == ("/wiki", None, LAST_MODIFIED)
+        assert response.from_cache and response.text == "<p>article</p>"
+
+    def test_changed_page_replaces_the_cached_copy(self, stub):
+        stub.page("/hn", "<p>old</p>", etag='"v1"')
+        cache = HTTPCache()
+        cache.get(stub.url("/hn"), ttl=0)
+        stub.page("/hn", "<p>new</p>", etag='"v2"')
+
+        assert cache.get(stub.url("/hn"), ttl=0).text == "<p>new</p>"
+        assert cache.get(stub.url("/hn"), ttl=60).etag == '"v2"'
+
+    def test_stale_copy_is_served_when_the_network_fails(self, stub, monkeypatch):
+        stub.page("/weather", '{"temp": 70}', content_type="application/json")
+        cache = HTTPCache()
+        cache.get(stub.url("/weather"), ttl=0)
+
+        def offline(*args, **kwargs):
+            raise requests.ConnectionError("network unreachable")
+
+        monkeypatch.setattr("extensions.http_cache.requests.get", offline)
+
+        assert cache.get_json(stub.url("/weather"), ttl=0) == {"temp": 70}
+        assert cache.stats["stale"] == 1
+        with pytest.raises(requests.ConnectionError):
+            cache.get(stub.url("/never-fetched"), ttl=0)
+
+    def test_error_responses_are_not_cached(self, stub):
+        cache = HTTPCache()
+
+        response = cache.get(stub.url("/missing"), ttl=60)
+        cache.get(stub.url("/missing"), ttl=60)
+
+        assert response.status == 404
+        with pytest.raises(HTTPStatusError):
+            response.raise_for_status()
+        assert len(stub.requests_for("/missing")) == 2
+
+    def test_least_recently_used_entries_are_evicted_over_the_size_bound(self, stub):
+        for path in ("/a", "/b", "/c"):
+            stub.page(path, "x" * 100)
+        cache = HTTPCache(max_bytes=250)
+        cache.get(stub.url("/a"), ttl=60)
+        cache.get(stub.url("/b"), ttl=60)
+        cache.get(stub.url("/a"), ttl=60)  # /b is now the least recently used
+
+        cache.get(stub.url("/c"), ttl=60)
+
+        assert cache.total_bytes() == 200
+        cache.get(stub.url("/a"), ttl=60)
+        cache.get(stub.url("/b"), ttl=60)
+        assert len(stub.requests_for("/a")) == 1
+        assert len(stub.requests_for("/b")) == 2
+
+    def test_cache_hits_write_their_time_of_use_in_batches(self, stub, monkeypatch):
+        from utils.db import get_connection
+
+        def last_used():
+            return [row[0] for row in get_connection().execute("SELECT last_used FROM http_cache ORDER BY fetched_at")]
+
+        cache = HTTPCache()
+        monkeypatch.setattr(cache, "TOUCH_BATCH_SIZE", 3)
+        for path in ("/a", "/b", "/c"):
+            stub.page(path, "x")
+            cache.get(stub.url(path), ttl=60)
+        stored = last_used()
+
+        cache.get(stub.url("/a"), ttl=60)
+        cache.get(stub.url("/b"), ttl=60)
+        assert last_used() == stored
+        cache.get(stub.url("/c"), ttl=60)
+        assert all(after > before for before, after in zip(stored, last_used()))
+
+    def test_urls_and_their_api_keys_are_not_stored(self, stub):
+        stub.page("/weather?appid=SECRET123&lat=1", '{"temp": 70}', content_type="application/json")
+        cache = HTTPCache()
+        url = stub.url("/weather?appid=SECRET123&lat=1")
+
+        cache.get(url, ttl=60)
+
+        from utils.db import get_connection
+        rows = [tuple(row) for row in get_connection().execute("SELECT * FROM http_cache")]
+        assert len(rows) == 1
+        assert not any(isinstance(value, str) and "SECRET123" in value for value in rows[0])
+        assert cache.get(url, ttl=60).url == url
+
+    def test_unchanged_page_is_parsed_once(self, stub):
+        stub.page("/hn", "<table><tr><td>story</td></tr></table>", etag='"v1"')
+        cache = HTTPCache()
+
+        first = cache.get_soup(stub.url("/hn"), ttl=0)
+        second = cache.get_soup(stub.url("/hn"), ttl=0)
+        stub.page("/hn", "<table><tr><td>new story</td></tr></table>", etag='"v2"')
+        third = cache.get_soup(stub.url("/hn"), ttl=0)
+
+        assert second is first
+        assert third.find("td").text == "new story"
+        assert cache.stats["parsed"] == 2
+
+
+@pytest.mark.unit
+class TestSoupUtilsGetSoup:
+    def test_get_soup_goes_through_the_cache(self, stub):
+        stub.page("/page", "<h1>Title</h1>")
+
+        soup = SoupUtils.get_soup(base_url=stub.base_url, extension="/page", ttl=60)
+        SoupUtils.get_soup(stub.url("/page"), ttl=60)
+
+        assert soup.find("h1").text == "Title"
+        assert len(stub.requests_for("/page")) == 1
+
+    def test_error_status_raises_web_connection_exception(self, stub):
+        with pytest.raises(WebConnectionException):
+            SoupUtils.get_soup(stub.url("/missing"))
+
+
+@pytest.mark.unit
+def test_url_keyed_table_is_dropped_on_migration():
+    import utils.db as db_mod
+
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE http_cache (url TEXT PRIMARY KEY, status INTEGER, body BLOB, fetched_at REAL)")
+    conn.execute("INSERT INTO http_cache VALUES ('https://api.example.com/?apiKey=SECRET', 200, x'', 0)")
+    conn.commit()
+
+    db_mod._drop_url_keyed_http_cache(conn)
+
+    columns = {r[1] for r in conn.execute("PRAGMA table_info(http_cache)")}
+    assert "key" in columns and "url" not in columns
+    assert conn.execute("SELECT COUNT(*) FROM http_cache").fetchone()[0] == 0
@@ -0,0 +1,207 @@
+"""Unit tests for extensions.lastfm_sync against a local stub Last.fm server.
+
+The stub serves ``user.getTopTracks`` pages from an in-memory library and
+``user.getRecentTracks`` totals from a scrobble counter.  Cache writes go to
+the in-memory database provided by the root conftest's ``isolated_singletons``.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from extensions.lastfm_api import LastFmLibraryCache, LastFmReadAPI
+from extensions.lastfm_sync import LastFmLibrarySync, TokenBucket
+
+USER = "stub_user"
+
+
+class _StubLastFm:
+    def __init__(self, track_count):
+        # Ordered by playcount, highest first, like user.getTopTracks
+        self.tracks = [
+            {"name": f"Track {i}", "artist": f"Artist {i}", "playcount": 1000 - 10 * i}
+            for i in range(track_count)
+        ]
+        self.new_scrobbles = 0
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def top_tracks(self, page, limit):
+        total_pages = max(1, -(-len(self.tracks) // limit))
+        start = (page - 1) * limit
+        return {
+            "toptracks": {
+                "@attr": {
+                    "user": USER,
+                    "page": str(page),
+                    "perPage": str(limit),
+                    "totalPages": str(total_pages),
+                    "total": str(len(self.tracks)),
+                },
+                "track": [
+                    {
+                        "name": t["name"],
+                        "artist": {"name": t["artist"]},
+                        "playcount": str(t["playcount"]),
+                        "@attr": {"rank": str(start + i + 1)},
+                    }
+                    for i, t in enumerate(self.tracks[start:start + limit])
+                ],
+            }
+        }
+
+    def handle(self, params):
+        method = params["method"]
+        with self.lock:
+            self.requests.append((method, params.get("page")))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(0.02)  # long enough for concurrent requests to overlap
+            if method == "user.getTopTracks":
+                return self.top_tracks(int(params["page"]), int(params["limit"]))
+            if method == "user.getRecentTracks":
+                return {"recenttracks": {"@attr": {"total": str(self.new_scrobbles)}, "track": []}}
+            return {"error": 3, "message": "Invalid Method"}
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+    def top_track_pages_requested(self):
+        return sorted(int(page) for method, page in self.requests if method == "user.getTopTracks")
+
+
+@pytest.fixture
+def stub():
+    state = _StubLastFm(track_count=20)
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            params = {k: v[0] for k, v in parse_qs(urlparse(self.path).query).items()}
+            body = json.dumps(state.handle(params)).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    state.api = LastFmReadAPI(api_key="test", api_root=f"http://127.0.0.1:{server.server_port}/")
+    yield state
+    server.shutdown()
+    server.server_close()
+
+
+def _engine(stub, **kwargs):
+    kwargs.setdefault("concurrency", 4)
+    kwargs.setdefault("requests_per_second", 1000)
+    kwargs.setdefault("page_limit", 2)
+    return LastFmLibrarySync(stub.api, cache=LastFmLibraryCache(), **kwargs)
+
+
+@pytest.mark.unit
+class TestFullSync:
+    def test_fetches_all_pages_concurrently(self, stub):
+        progress = []
+        result = _engine(stub).sync(USER, "tracks", progress_callback=lambda done, total: progress.append((done, total)))
+
+        assert result.total_pages == 10
+        assert result.pages_fetched == 10
+        assert stub.top_track_pages_requested() == list(range(1, 11))
+        assert stub.max_in_flight > 1
+        assert progress[-1] == (10, 10)
+        items = LastFmLibraryCache().get_scope(USER, "tracks")
+        assert [t["name"] for t in items] == [f"Track {i}" for i in range(20)]
+        assert items[0]["rank"] == 1
+
+    def test_concurrency_is_bounded(self, stub):
+        _engine(stub, concurrency=2).sync(USER, "tracks")
+        assert stub.max_in_flight <= 2
+
+    def test_full_pass_prunes_removed_items(self, stub):
+        cache = LastFmLibraryCache()
+        _engine(stub).sync(USER, "tracks")
+        del stub.tracks[5]
+
+        result = _engine(stub).sync(USER, "tracks")
+
+        assert result.pruned == 1
+        names = {t["name"] for t in cache.get_scope(USER, "tracks")}
+        assert "Track 5" not in names
+        assert len(names) == 19
+
+
+@pytest.mark.unit
+class TestIncrementalSync:
+    def test_no_new_scrobbles_skips_pages(self, stub):
+        cache = LastFmLibraryCache()
+        _engine(stub).sync(USER, "tracks")
+        before = cache.fetched_at(USER, "tracks")
+        stub.requests.clear()
+
+        result = _engine(stub).sync(USER, "tracks", incremental=True)
+
+        assert result.new_scrobbles == 0
+        assert result.pages_fetched == 0
+        assert stub.top_track_pages_requested() == []
+        assert cache.fetched_at(USER, "tracks") >= before
+
+    def test_stops_once_new_scrobbles_are_accounted_for(self, stub):
+        cache = LastFmLibraryCache()
+        _engine(stub).sync(USER, "tracks")
+        # Three plays of a track on page 2; it keeps its position
+        stub.tracks[3]["playcount"] += 3
+        stub.tracks.sort(key=lambda t: -t["playcount"])
+        stub.new_scrobbles = 3
+        stub.requests.clear()
+
+        result = _engine(stub, concurrency=1).sync(USER, "tracks", incremental=True)
+
+        assert result.stopped_early
+        assert result.pages_fetched == 2
+        assert stub.top_track_pages_requested() == [1, 2]
+        playcounts = cache.get_playcounts(USER, "tracks")
+        assert playcounts[("Artist 3", "Track 3")] == 973
+        # Rows past the stop point are kept as they were
+        assert len(playcounts) == 20
+
+    def test_falls_back_to_full_pass_when_changes_not_found(self, stub):
+        _engine(stub).sync(USER, "tracks")
+        stub.new_scrobbles = 5  # e.g. scrobbles the top list does not reflect yet
+        stub.requests.clear()
+
+        result = _engine(stub).sync(USER, "tracks", incremental=True)
+
+        assert not result.stopped_early
+        assert stub.top_track_pages_requested() == list(range(1, 11))
+
+
+@pytest.mark.unit
+class TestTokenBucket:
+    def test_limits_rate_after_burst(self):
+        now = [0.0]
+
+        def sleep(seconds):
+            now[0] += seconds
+
+        bucket = TokenBucket(rate=2, capacity=2, clock=lambda: now[0], sleep=sleep)
+        for _ in range(10):
+            bucket.acquire()
+
+        # Two tokens available up front, the other eight arrive at 2 per second
+        assert now[0] == pytest.approx(4.0)
+
+    def test_rejects_non_positive_rate(self):
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0)
@@ -0,0 +1,120 @@
+"""Unit tests for the append-only LLM prompt/response history (extensions.llm_history)."""
+
+import json
+from contextlib import contextmanager
+
+import pytest
+
+from extensions.llm import LLM
+from extensions.llm_history import PromptResponseLog
+
+
+def _entry(i):
+    return {"prompt": f"prompt {i}", "response": f"response {i}"}
+
+
+@pytest.mark.unit
+class TestPromptResponseLog:
+    def test_entries_are_appended_one_json_line_each(self, tmp_path):
+        log = PromptResponseLog(str(tmp_path / "history.jsonl"), max_items=10)
+
+        for i in range(3):
+            log.append(_entry(i))
+        log.flush()
+
+        lines = (tmp_path / "history.jsonl").read_text(encoding="utf-8").splitlines()
+        assert [json.loads(line) for line in lines] == [_entry(i) for i in range(3)]
+
+    def test_read_last_reconstructs_the_most_recent_items(self, tmp_path):
+        log = PromptResponseLog(str(tmp_path / "history.jsonl"), max_items=10)
+        for i in range(5):
+            log.append(_entry(i))
+        log.flush()
+
+        assert log.read_last(2) == [_entry(3), _entry(4)]
+        assert log.read_last() == [_entry(i) for i in range(5)]
+        assert PromptResponseLog(str(tmp_path / "missing.jsonl"), max_items=10).read_last() == []
+
+    def test_log_is_compacted_to_max_items(self, tmp_path):
+        path = tmp_path / "history.jsonl"
+        log = PromptResponseLog(str(path), max_items=3)
+
+        for i in range(7):
+            log.append(_entry(i))
+        log.flush()
+
+        assert len(path.read_text(encoding="utf-8").splitlines()) <= 3 * PromptResponseLog.COMPACT_FACTOR
+        assert log.read_last() == [_entry(4), _entry(5), _entry(6)]
+
+    def test_existing_lines_count_towards_compaction(self, tmp_path):
+        path = tmp_path / "history.jsonl"
+        path.write_text("".join(json.dumps(_entry(i)) + "\n" for i in range(6)), encoding="utf-8")
+        log = PromptResponseLog(str(path), max_items=3)
+
+        log.append(_entry(6))
+        log.flush()
+
+        assert len(path.read_text(encoding="utf-8").splitlines()) == 3
+
+    def test_a_line_cut_short_is_skipped(self, tmp_path):
+        path = tmp_path / "history.jsonl"
+        path.write_text(json.dumps(_entry(0)) + "\n" + '{"prompt": "cut sh', encoding="utf-8")
+
+        assert PromptResponseLog(str(path), max_items=10).read_last() == [_entry(0)]
+
+    def test_one_log_is_shared_per_file(self, tmp_path):
+        path = str(tmp_path / "history.jsonl")
+        assert PromptResponseLog.for_path(path, 10) is PromptResponseLog.for_path(path, 10)
+
+
+class _FakeClient:
+    """Stands in for the pooled Ollama client, answering every request with *words*."""
+
+    words = ["Good ", "evening."]
+
+    def post_json(self, path, payload, timeout):
+        return {"response": "".join(self.words), "done": True}
+
+    @contextmanager
+    def stream_json(self, path, payload, timeout):
+        events = [{"response": word, "done": False} for word in self.words]
+        events.append({"response": "", "done": True})
+        yield None, iter(events)
+
+
+@pytest.mark.unit
+class TestLLMPromptResponseTracking:
+    @pytest.fixture
+    def llm(self, monkeypatch, tmp_path, request):
+        monkeypatch.chdir(tmp_path)  # the history file is created in the working directory
+        monkeypatch.setattr(LLM, "_http_client", staticmethod(_FakeClient))
+        return LLM(model_name="llama3", state_key=f"history_{request.node.name}", track_prompts_and_responses=True)
+
+    def test_tracked_entries_include_latency_fields(self, llm):
+        llm.generate_response("Say hello", stream=True, redundancy_policy=None)
+        llm.generate_response("Say hello again", stream=False, redundancy_policy=None)
+
+        streamed, buffered = llm.get_prompt_response_history()
+
+        assert llm.prompt_response_history_file.endswith(".jsonl")
+        assert (streamed["prompt"], streamed["response"]) == ("Say hello", "Good evening.")
+        assert streamed["first_token_seconds"] is not None
+        assert buffered["first_token_seconds"] is None
+        for entry in (streamed, buffered):
+            assert 0 <= entry["queue_seconds"] <= entry["total_seconds"]
+
+    def test_async_generation_records_the_queue_time(self, llm):
+        llm.generate_response_async("Say hello", stream=False, redundancy_policy=None)
+
+        (entry,) = llm.get_prompt_response_history()
+        assert entry["queue_seconds"] >= 0
+        assert entry["state_key"] == llm.state_key
+
+    def test_nothing_is_written_when_tracking_is_off(self, monkeypatch, tmp_path):
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr(LLM, "_http_client", staticmethod(_FakeClient))
+        llm = LLM(model_name="llama3", state_key="history_off")
+
+        llm.generate_response("Say hello", stream=False, redundancy_policy=None)
+
+        assert not list(tmp_path.glob("temp_llm_prompt_response_history_*"))
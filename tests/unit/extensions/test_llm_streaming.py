@@ -219,14 +219,12 @@ class TestCancelOnSkip:
         # loop first calls should_skip() and triggers cancel_generation().
         unblock = threading.Event()
 
-        class _BlockingResp:
-            def read(self):
+        class _BlockingClient:
+            def post_json(self, path, payload, timeout):
                 unblock.wait(timeout=10)
-                return json.dumps({"response": "Hello", "done": True}).encode("utf-8")
+                return {"response": "Hello", "done": True}
 
-        monkeypatch.setattr(
-            _llm.request, "urlopen", lambda req, timeout=None: _BlockingResp()
-        )
+        monkeypatch.setattr(LLM, "_http_client", staticmethod(_BlockingClient))
 
         result = llm.generate_response_async("test prompt", stream=False, redundancy_policy=None)
         unblock.set()  # let the background daemon thread exit cleanly
@@ -237,24 +235,20 @@ class TestGenerateResponseBuffered:
     """Tests for the non-streaming (_generate_response_buffered) path."""
 
     @staticmethod
-    def _make_urlopen(response_dict):
-        """Return a urlopen stub that reads back *response_dict* as JSON bytes."""
-        body = json.dumps(response_dict).encode("utf-8")
-
-        class _FakeResp:
-            def read(self):
-                return body
+    def _make_client(response_dict):
+        """Return an LLM._http_client stub whose client answers with *response_dict*."""
 
-        def fake_urlopen(req, timeout=None):
-            return _FakeResp()
+        class _FakeClient:
+            def post_json(self, path, payload, timeout):
+                return dict(response_dict)
 
-        return fake_urlopen
+        return staticmethod(_FakeClient)
 
     def test_returns_correct_llmresult(self, monkeypatch):
         llm = LLM(model_name="llama3")
         monkeypatch.setattr(
-            _llm.request, "urlopen",
-            self._make_urlopen({
+            LLM, "_http_client",
+            self._make_client({
                 "response": "Hello world",
                 "done": True,
                 "done_reason": "stop",
@@ -277,8 +271,8 @@ class TestGenerateResponseBuffered:
         """Buffered path must not set truncated=True even when use_redundancy_elimination is on."""
         llm = LLM(model_name="llama3", use_redundancy_elimination=True)
         monkeypatch.setattr(
-            _llm.request, "urlopen",
-            self._make_urlopen({"response": "Some response text.", "done": True}),
+            LLM, "_http_client",
+            self._make_client({"response": "Some response text.", "done": True}),
         )
         result = llm.generate_response("test", stream=False, redundancy_policy=None)
         assert result.truncated is False
@@ -288,8 +282,8 @@ class TestGenerateResponseBuffered:
         llm = LLM(model_name="llama3")
         raw = THINKING_OPEN_TAG + "internal plan\n" + THINKING_CLOSE_TAG + "\n\nFinal answer."
         monkeypatch.setattr(
-            _llm.request, "urlopen",
-            self._make_urlopen({"response": raw, "done": True}),
+            LLM, "_http_client",
+            self._make_client({"response": raw, "done": True}),
         )
         result = llm.generate_response("test", stream=False, redundancy_policy=None)
         assert result.response == "Final answer."
@@ -300,8 +294,8 @@ class TestGenerateResponseBuffered:
         llm.increment_failure_count()
         assert llm.get_failure_count() == 1
         monkeypatch.setattr(
-            _llm.request, "urlopen",
-            self._make_urlopen({"response": "Good response.", "done": True}),
+            LLM, "_http_client",
+            self._make_client({"response": "Good response.", "done": True}),
         )
         llm.generate_response("test", stream=False, redundancy_policy=None)
         assert llm.get_failure_count() == 0
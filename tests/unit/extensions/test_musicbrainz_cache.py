@@ -0,0 +1,89 @@
+"""Unit tests for MusicBrainzCache bulk lookups and their use in enrich_recordings.
+
+The root conftest's autouse ``isolated_singletons`` fixture backs
+utils.db.get_connection with an in-memory database carrying the full schema,
+so mb_recordings and mb_failed_lookups are empty for every test.
+"""
+
+import pytest
+
+from extensions.musicbrainz_api import MusicBrainzCache, MusicBrainzReadAPI
+
+
+def _record(title):
+    return {
+        "mb_title": title,
+        "mb_artist": "Artist",
+        "mb_genres": ["classical"],
+        "composer": ["Composer A", "Composer B"],
+        "lyricist": [],
+        "arranger": [],
+        "orchestrator": [],
+        "writer": [],
+    }
+
+
+@pytest.mark.unit
+class TestBulkLookups:
+    def test_get_many_matches_get(self):
+        cache = MusicBrainzCache()
+        cache.set("a", _record("Title A"))
+        cache.set("b", _record("Title B"))
+
+        records = cache.get_many(["a", "b", "missing", "a", ""])
+
+        assert set(records) == {"a", "b"}
+        assert records["a"] == cache.get("a")
+        assert records["b"]["composer"] == ["Composer A", "Composer B"]
+
+    def test_contains_many_across_chunks(self, monkeypatch):
+        monkeypatch.setattr(MusicBrainzCache, "BULK_CHUNK_SIZE", 3)
+        cache = MusicBrainzCache()
+        stored = [f"mbid-{i}" for i in range(0, 10, 2)]
+        for mbid in stored:
+            cache.set(mbid, _record(mbid))
+
+        found = cache.contains_many(f"mbid-{i}" for i in range(10))
+
+        assert found == set(stored)
+
+    def test_failed_many(self):
+        cache = MusicBrainzCache()
+        cache.set_failed("bad-1", status_code=404)
+        cache.set_failed("bad-2")
+        cache.set("good", _record("Good"))
+
+        assert cache.failed_many(["bad-1", "bad-2", "good", "other"]) == {"bad-1", "bad-2"}
+
+    def test_empty_input(self):
+        cache = MusicBrainzCache()
+        assert cache.contains_many([]) == set()
+        assert cache.failed_many([]) == set()
+        assert cache.get_many([]) == {}
+
+
+@pytest.mark.unit
+class TestEnrichRecordingsSkipsKnown:
+    def test_only_unknown_mbids_are_requested(self, monkeypatch):
+        import extensions.musicbrainz_api as mb_api
+
+        monkeypatch.setattr(mb_api, "MIN_REQUEST_INTERVAL", 0)
+        cache = MusicBrainzCache()
+        cache.set("cached", _record("Cached"))
+        cache.set_failed("failed", status_code=404)
+        api = MusicBrainzReadAPI()
+        requested = []
+
+        def fake_request(endpoint, params):
+            requested.append(endpoint)
+            raise mb_api.MusicBrainzError("Not found", status_code=404)
+
+        monkeypatch.setattr(api, "_request", fake_request)
+        monkeypatch.setattr(cache, "has_failed", lambda mbid: pytest.fail("per-MBID lookup"))
+
+        api.enrich_recordings(["cached", "failed", "new", "new", ""], cache)
+
+        assert requested == ["recording/new"]
+        # The recording request failed, so it is recorded as a failed lookup
+        assert cache.failed_many(["new"]) == {"new"}
+        assert cache.get_failed("new")["status_code"] == 404
@@ -0,0 +1,195 @@
+"""Unit tests for MusicBrainzRequestScheduler and the pipelined enrich_recordings.
+
+HTTP is replaced by a MagicMock session whose get() serves canned payloads,
+records when each request starts, and tracks how many are in flight.
+"""
+
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+import extensions.musicbrainz_api as mb_api
+from extensions.musicbrainz_api import (
+    MusicBrainzCache,
+    MusicBrainzReadAPI,
+    MusicBrainzRequestScheduler,
+)
+
+INTERVAL = 0.05
+
+
+def _artist_rel(kind, name, mbid):
+    return {"target-type": "artist", "type": kind, "artist": {"id": mbid, "name": name}}
+
+
+def _work(work_id, composer):
+    return {
+        "id": work_id,
+        "title": f"Work {work_id}",
+        "relations": [_artist_rel("composer", composer, f"artist-{composer}")],
+        "genres": [{"name": "classical", "count": 3}],
+    }
+
+
+def _recording(mbid, work_ids, inline=True):
+    relations = []
+    for work_id in work_ids:
+        # Without work-level-rels data the work has to be fetched separately
+        relations.append({
+            "target-type": "work",
+            "work": _work(work_id, "Bach") if inline else {"id": work_id},
+        })
+    return {
+        "id": mbid,
+        "title": f"Recording {mbid}",
+        "artist-credit": [{"name": "Performer"}],
+        "genres": [{"name": "baroque", "count": 5}],
+        "relations": relations,
+    }
+
+
+class _FakeSession:
+    def __init__(self, payloads, latency=0.01):
+        self.payloads = payloads
+        self.latency = latency
+        self.starts = []
+        self.urls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+        self.headers = {}
+
+    def get(self, url, params=None, timeout=None):
+        with self.lock:
+            self.starts.append(time.monotonic())
+            self.urls.append(url)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.latency)
+            path = url[len(mb_api.API_ROOT):]
+            response = MagicMock()
+            if path in self.payloads:
+                response.status_code = 200
+                response.json.return_value = self.payloads[path]
+            else:
+                response.status_code = 404
+            return response
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+
+@pytest.fixture
+def fast_rate(monkeypatch):
+    monkeypatch.setattr(mb_api, "MIN_REQUEST_INTERVAL", INTERVAL)
+
+
+@pytest.mark.unit
+class TestRequestScheduler:
+    def test_spacing_dedupe_and_rate(self):
+        starts = []
+
+        def fetch(endpoint, params):
+            starts.append(time.monotonic())
+            return {"endpoint": endpoint}
+
+        scheduler = MusicBrainzRequestScheduler(fetch, min_interval=INTERVAL)
+        scheduler.start()
+        try:
+            for i in range(4):
+                assert scheduler.submit(("recording", i), f"recording/{i}", {})
+            assert not scheduler.submit(("recording", 0), "recording/0", {})
+            results = [scheduler.next_result(timeout=5) for _ in range(4)]
+        finally:
+            scheduler.close()
+
+        assert [key for key, _, _ in results] == [("recording", i) for i in range(4)]
+        assert scheduler.request_count == 4
+        gaps = [b - a for a, b in zip(starts, starts[1:])]
+        assert min(gaps) >= INTERVAL * 0.95
+        assert scheduler.requests_per_second == pytest.approx(1 / INTERVAL, rel=0.3)
+
+    def test_priority_requests_go_first(self):
+        gate = threading.Event()
+        order = []
+
+        def fetch(endpoint, params):
+            gate.wait(5)
+            order.append(endpoint)
+            return {}
+
+        scheduler = MusicBrainzRequestScheduler(fetch, min_interval=0)
+        scheduler.start()
+        try:
+            scheduler.submit("a", "a", {})
+            time.sleep(0.05)  # "a" is now in flight
+            scheduler.submit("b", "b", {})
+            scheduler.submit("c", "c", {}, priority=True)
+            gate.set()
+            for _ in range(3):
+                scheduler.next_result(timeout=5)
+        finally:
+            scheduler.close()
+
+        assert order == ["a", "c", "b"]
+
+    def test_errors_are_delivered_as_results(self):
+        def fetch(endpoint, params):
+            raise mb_api.MusicBrainzError("Not found", status_code=404)
+
+        scheduler = MusicBrainzRequestScheduler(fetch, min_interval=0)
+        scheduler.start()
+        try:
+            scheduler.submit("x", "recording/x", {})
+            key, payload, error = scheduler.next_result(timeout=5)
+        finally:
+            scheduler.close()
+
+        assert key == "x" and payload is None
+        assert error.status_code == 404
+
+
+@pytest.mark.unit
+class TestPipelinedEnrichment:
+    def test_one_request_in_flight_at_cadence(self, fast_rate):
+        payloads = {f"recording/r{i}": _recording(f"r{i}", [f"w{i}"]) for i in range(5)}
+        session = _FakeSession(payloads)
+        api = MusicBrainzReadAPI()
+        api._session = session
+        cache = MusicBrainzCache()
+        progress = []
+
+        api.enrich_recordings([f"r{i}" for i in range(5)], cache, lambda done, total: progress.append((done, total)))
+
+        assert session.max_in_flight == 1
+        gaps = [b - a for a, b in zip(session.starts, session.starts[1:])]
+        assert min(gaps) >= INTERVAL * 0.95
+        assert api.last_requests_per_second == pytest.approx(1 / INTERVAL, rel=0.3)
+        assert progress[-1] == (5, 5)
+        record = cache.get("r0")
+        assert record["composer"] == ["Bach"]
+        assert record["mb_genres"] == ["baroque", "classical"]
+
+    def test_shared_works_are_fetched_once(self, fast_rate):
+        payloads = {
+            "recording/r1": _recording("r1", ["shared"], inline=False),
+            "recording/r2": _recording("r2", ["shared", "solo"], inline=False),
+            "work/shared": _work("shared", "Handel"),
+            "work/solo": _work("solo", "Vivaldi"),
+        }
+        session = _FakeSession(payloads)
+        api = MusicBrainzReadAPI()
+        api._session = session
+        cache = MusicBrainzCache()
+
+        api.enrich_recordings(["r1", "r2", "missing"], cache)
+
+        paths = [url[len(mb_api.API_ROOT):] for url in session.urls]
+        assert paths.count("work/shared") == 1
+        assert sorted(paths) == ["recording/missing", "recording/r1", "recording/r2", "work/shared", "work/solo"]
+        assert cache.get("r1")["composer"] == ["Handel"]
+        assert cache.get("r2")["composer"] == ["Handel", "Vivaldi"]
+        assert cache.get_failed("missing")["status_code"] == 404
@@ -0,0 +1,166 @@
+"""Unit tests for extensions.ollama_client against a local fake Ollama server.
+
+The fake speaks HTTP/1.1 with keep-alive, answers ``/api/generate`` with a
+single JSON object or a chunked NDJSON stream, and treats a request without a
+prompt as a model load (warm-up), as Ollama does.
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from extensions.llm import LLM
+from extensions.ollama_client import LatencyHistogram, OllamaHTTPClient, OllamaHTTPError
+
+WORDS = ["Good ", "evening, ", "listeners."]
+
+
+class _FakeOllama:
+    def __init__(self):
+        self.payloads = []
+        self.client_ports = []
+        self.drop_connections = False  # close after responding, without telling the client
+        self.lock = threading.Lock()
+
+    def record(self, payload, port):
+        with self.lock:
+            self.payloads.append(payload)
+            self.client_ports.append(port)
+
+    @property
+    def connection_count(self):
+        return len(set(self.client_ports))
+
+
+@pytest.fixture
+def ollama():
+    state = _FakeOllama()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            state.record(payload, self.client_address[1])
+            if payload.get("model") == "missing":
+                self._send_json({"error": "model not found"}, status=404)
+            elif "prompt" not in payload:
+                self._send_json({"model": payload["model"], "response": "", "done": True, "done_reason": "load"})
+            elif payload.get("stream"):
+                self._send_stream(payload["model"])
+            else:
+                self._send_json({"model": payload["model"], "response": "".join(WORDS), "done": True})
+            if state.drop_connections:
+                self.close_connection = True
+
+        def _send_json(self, obj, status=200):
+            body = json.dumps(obj).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _send_stream(self, model):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            events = [{"model": model, "response": word, "done": False} for word in WORDS]
+            events.append({"model": model, "response": "", "done": True, "eval_count": len(WORDS)})
+            for event in events:
+                line = json.dumps(event).encode("utf-8") + b"\n"
+                self.wfile.write(f"{len(line):x}\r\n".encode("ascii") + line + b"\r\n")
+                self.wfile.flush()
+            self.wfile.write(b"0\r\n\r\n")
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    state.url = f"http://127.0.0.1:{server.server_port}/api/generate"
+    state.client = OllamaHTTPClient(state.url)
+    yield state
+    state.client.close()
+    OllamaHTTPClient.for_url(state.url).close()
+    server.shutdown()
+    server.server_close()
+
+
+def _stream_text(client, payload):
+    with client.stream_json("/api/generate", payload, timeout=5) as (_response, events):
+        return "".join(event["response"] for event in events)
+
+
+@pytest.mark.unit
+class TestOllamaHTTPClient:
+    def test_requests_reuse_one_keep_alive_connection(self, ollama):
+        for _ in range(3):
+            data = ollama.client.post_json("/api/generate", {"model": "m", "prompt": "hi", "stream": False}, timeout=5)
+            assert data["response"] == "Good evening, listeners."
+        assert _stream_text(ollama.client, {"model": "m", "prompt": "hi", "stream": True}) == "Good evening, listeners."
+
+        assert ollama.client.connections_opened == 1
+        assert ollama.connection_count == 1
+        assert ollama.client.latency["connect"].count == 4
+        assert ollama.client.latency["first_token"].count == 1
+        assert ollama.client.latency["total"].count == 4
+
+    def test_abandoned_stream_is_not_reused(self, ollama):
+        with ollama.client.stream_json("/api/generate", {"model": "m", "prompt": "hi", "stream": True}, timeout=5) as (_, events):
+            assert next(events)["response"] == "Good "
+
+        ollama.client.post_json("/api/generate", {"model": "m", "prompt": "hi", "stream": False}, timeout=5)
+
+        assert ollama.client.connections_opened == 2
+
+    def test_reconnects_when_the_server_dropped_a_pooled_connection(self, ollama):
+        ollama.drop_connections = True
+        ollama.client.post_json("/api/generate", {"model": "m", "prompt": "hi", "stream": False}, timeout=5)
+
+        data = ollama.client.post_json("/api/generate", {"model": "m", "prompt": "hi", "stream": False}, timeout=5)
+
+        assert data["done"] is True
+        assert ollama.client.connections_opened == 2
+
+    def test_error_status_raises(self, ollama):
+        with pytest.raises(OllamaHTTPError) as error:
+            ollama.client.post_json("/api/generate", {"model": "missing", "prompt": "hi"}, timeout=5)
+        assert error.value.status == 404
+
+    def test_warm_up_loads_the_model_without_a_prompt(self, ollama):
+        assert ollama.client.warm_up("/api/generate", "m", "30m", timeout=5)
+        assert ollama.payloads == [{"model": "m", "keep_alive": "30m"}]
+        assert not ollama.client.warm_up("/api/generate", "missing", None, timeout=5)
+
+
+@pytest.mark.unit
+def test_llm_streams_through_the_shared_client_with_keep_alive(ollama, monkeypatch):
+    monkeypatch.setattr(LLM, "ENDPOINT", ollama.url)
+    llm = LLM(model_name="llama3", keep_alive="10m")
+
+    assert llm.warm_up(timeout=5)
+    result = llm.generate_response("hello", timeout=5, stream=True, redundancy_policy=None)
+    llm.generate_response("hello", timeout=5, stream=False, redundancy_policy=None)
+
+    assert result.response == "Good evening, listeners."
+    assert [payload["keep_alive"] for payload in ollama.payloads] == ["10m"] * 3
+    assert ollama.connection_count == 1
+    assert "first_token: n=1" in llm.latency_summary()
+
+
+@pytest.mark.unit
+def test_latency_histogram_percentiles():
+    histogram = LatencyHistogram()
+    assert histogram.summary() == "no requests"
+    for seconds in (0.002, 0.03, 0.04, 0.2, 3.0):
+        histogram.observe(seconds)
+
+    assert histogram.count == 5
+    assert histogram.percentile(0.5) == 0.05
+    assert histogram.percentile(1.0) == 3.0
+    assert histogram.mean == pytest.approx(3.272 / 5)
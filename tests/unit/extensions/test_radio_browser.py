@@ -62,6 +62,12 @@ def _mock_response(data):
     return resp
 
 
+def _cached_response(data, status=200):
+    """Return an http_cache response holding JSON-encoded *data*."""
+    from extensions.http_cache import CachedResponse
+    return CachedResponse(url="", status=status, content=json.dumps(data).encode())
+
+
 # ── Server resolution ─────────────────────────────────────────────────────────
 
 def test_resolve_server_uses_dns():
@@ -102,7 +108,7 @@ def test_search_stations_returns_list():
             "votes": 42,
         }
     ]
-    with patch.object(rb.request, "urlopen", return_value=_mock_response(payload)):
+    with patch.object(rb.http_cache, "get", return_value=_cached_response(payload)):
         results = rb.search_stations(query="jazz")
     assert isinstance(results, list)
     assert len(results) == 1
@@ -113,11 +119,11 @@ def test_search_stations_passes_query_params():
     rb._cached_server = "https://test.example.com"
     captured_url = []
 
-    def fake_urlopen(req, timeout=None):
-        captured_url.append(req.full_url)
-        return _mock_response([])
+    def fake_get(url, **kwargs):
+        captured_url.append(url)
+        return _cached_response([])
 
-    with patch.object(rb.request, "urlopen", side_effect=fake_urlopen):
+    with patch.object(rb.http_cache, "get", side_effect=fake_get):
         rb.search_stations(query="Bach", tags="classical", country="AT", limit=25)
 
     assert len(captured_url) == 1
@@ -128,6 +134,14 @@ def test_search_stations_passes_query_params():
     assert "limit=25" in url
 
 
+def test_api_error_forces_server_re_resolution():
+    rb._cached_server = "https://test.example.com"
+    with patch.object(rb.http_cache, "get", return_value=_cached_response({}, status=503)):
+        with pytest.raises(rb.HTTPStatusError):
+            rb.search_stations(query="jazz")
+    assert rb._cached_server == ""
+
+
 # ── resolve_stream_url ────────────────────────────────────────────────────────
 
 def test_resolve_stream_url_passthrough_for_non_playlist():
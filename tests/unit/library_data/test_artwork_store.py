@@ -0,0 +1,137 @@
+"""Unit tests for library_data.artwork_store.ArtworkStore."""
+
+import os
+
+import pytest
+
+from library_data.artwork_store import ArtworkStore
+
+JPEG = b"\xff\xd8\xff\xe0" + b"jpeg-bytes"
+PNG = b"\x89PNG\r\n\x1a\n" + b"png-bytes"
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ArtworkStore(directory=str(tmp_path / "artwork"))
+
+
+@pytest.mark.unit
+class TestArtworkStore:
+    def test_identical_bytes_are_stored_once(self, store):
+        first = store.put(JPEG)
+        second = store.put(bytes(JPEG))
+
+        assert first == second
+        assert os.listdir(store.directory) == [first + ".jpg"]
+        assert store.read(first) == JPEG
+
+    def test_extension_follows_image_signature(self, store):
+        digest = store.put(PNG)
+
+        assert store.original_path(digest).endswith(".png")
+        # A fresh store over the same directory finds the file without the in-memory map
+        assert ArtworkStore(store.directory).original_path(digest) == store.original_path(digest)
+
+    def test_track_digest_is_memoized_until_file_changes(self, store, tmp_path):
+        track = tmp_path / "track.flac"
+        track.write_bytes(b"audio")
+        calls = []
+
+        def loader():
+            calls.append(1)
+            return JPEG
+
+        digest = store.digest_for_track(str(track), loader)
+        assert store.digest_for_track(str(track), loader) == digest
+        assert len(calls) == 1
+
+        os.utime(track, (1, 1))
+        store.digest_for_track(str(track), loader)
+        assert len(calls) == 2
+
+    def test_tracks_without_artwork_are_not_reread(self, store, tmp_path):
+        track = tmp_path / "track.flac"
+        track.write_bytes(b"audio")
+        calls = []
+
+        def loader():
+            calls.append(1)
+            return None
+
+        assert store.digest_for_track(str(track), loader) is None
+        assert store.digest_for_track(str(track), loader) is None
+        assert len(calls) == 1
+
+    def test_set_track_artwork_replaces_mapping(self, store, tmp_path):
+        track = tmp_path / "track.flac"
+        track.write_bytes(b"audio")
+        store.digest_for_track(str(track), lambda: JPEG)
+
+        digest = store.set_track_artwork(str(track), PNG)
+
+        assert store.digest_for_track(str(track), lambda: pytest.fail("reloaded")) == digest
+        assert store.read(digest) == PNG
+
+    def test_display_path_leaves_other_images_alone(self, store, tmp_path):
+        outside = str(tmp_path / "persona.png")
+        digest = store.put(JPEG)
+
+        assert store.display_path(outside, 300, 300) == outside
+        assert store.display_path(store.original_path(digest), 0, 0) == store.original_path(digest)
+
+    def test_thumbnails_are_scaled_once_and_reused(self, store):
+        Image = pytest.importorskip("PIL.Image")
+        import io
+
+        buf = io.BytesIO()
+        Image.new("RGB", (2000, 1000), "red").save(buf, format="PNG")
+        digest = store.put(buf.getvalue())
+        original = store.original_path(digest)
+
+        thumb = store.display_path(original, 400, 300)
+
+        assert thumb.endswith(f"{digest}_512.jpg")
+        with Image.open(thumb) as img:
+            assert max(img.size) == 512
+        assert store.display_path(original, 400, 300) == thumb
+        assert store.display_path(original, 4000, 3000) == original
+
+    def test_least_recently_used_images_are_evicted(self, store, monkeypatch):
+        monkeypatch.setattr(ArtworkStore, "max_cache_bytes", 250)
+        first = store.put(JPEG + b"1" * 90)
+        second = store.put(JPEG + b"2" * 90)
+        store.original_path(first)
+
+        third = store.put(JPEG + b"3" * 90)
+
+        assert store.original_path(second) is None
+        assert store.original_path(first) is not None and store.original_path(third) is not None
+        assert sorted(os.listdir(store.directory)) == sorted([first + ".jpg", third + ".jpg"])
+
+    def test_use_order_is_read_from_the_directory(self, store, monkeypatch):
+        first = store.put(JPEG + b"1" * 90)
+        second = store.put(JPEG + b"2" * 90)
+        os.utime(store.original_path(first), (2000, 2000))
+        os.utime(store.original_path(second), (1000, 1000))
+        monkeypatch.setattr(ArtworkStore, "max_cache_bytes", 250)
+
+        reopened = ArtworkStore(store.directory)
+        reopened.put(JPEG + b"3" * 90)
+
+        assert reopened.original_path(second) is None
+        assert reopened.original_path(first) is not None
+
+    def test_track_digests_are_bounded(self, store, tmp_path, monkeypatch):
+        monkeypatch.setattr(ArtworkStore, "max_tracked_files", 2)
+        tracks = []
+        for name in ("a.flac", "b.flac", "c.flac"):
+            track = tmp_path / name
+            track.write_bytes(b"audio")
+            tracks.append(str(track))
+            store.digest_for_track(str(track), lambda: JPEG)
+
+        calls = []
+        store.digest_for_track(tracks[2], lambda: calls.append(1) or JPEG)
+        store.digest_for_track(tracks[0], lambda: calls.append(1) or JPEG)
+
+        assert len(calls) == 1
@@ -0,0 +1,64 @@
+"""Unit tests for library_data.grouping_codes.GroupingCodes."""
+
+import numpy as np
+import pytest
+
+from library_data.grouping_codes import GroupingCodes
+from tests.conftest import MockMediaTrack
+
+
+def _track(filepath, composer, form="Sonata"):
+    return MockMediaTrack(
+        filepath=filepath, title=filepath, album="Album", artist="Artist",
+        composer=composer, _genre="Classical", _form=form, _instrument="Piano", _catalogue="Album",
+    )
+
+
+TRACKS = [
+    _track("a.mp3", "Bach"),
+    _track("b.mp3", "Vivaldi", form="Concerto"),
+    _track("c.mp3", "Bach"),
+    _track("d.mp3", None),
+    _track("e.mp3", "Handel", form="Concerto"),
+]
+
+
+@pytest.mark.unit
+class TestGroupingCodes:
+    def test_codes_follow_first_seen_order(self):
+        codes = GroupingCodes.from_tracks(TRACKS, "composer")
+        assert codes.values == ["Bach", "Vivaldi", None, "Handel"]
+        assert codes.codes.tolist() == [0, 1, 0, 2, 3]
+        assert codes.counts().tolist() == [2, 1, 1, 1]
+
+    def test_getter_methods_are_called(self):
+        codes = GroupingCodes.from_tracks(TRACKS, "get_form")
+        assert codes.values == ["Sonata", "Concerto"]
+        assert codes.count_of("Concerto") == 2
+        assert codes.count_of("Fugue") == 0
+
+    def test_mask_for_values(self):
+        codes = GroupingCodes.from_tracks(TRACKS, "composer")
+        mask = codes.mask_for_values({"Bach", None, "Mozart"})
+        assert mask.tolist() == [True, False, True, True, False]
+
+    def test_group_order_with_tiebreak(self):
+        tracks = list(reversed(TRACKS))
+        codes = GroupingCodes.from_tracks(tracks, "composer")
+        handel, none, bach, vivaldi = (codes.code_of(v) for v in ("Handel", None, "Bach", "Vivaldi"))
+        filepaths = np.array([t.filepath for t in tracks])
+
+        order = codes.group_order([vivaldi, bach, none, handel], tiebreak=filepaths)
+
+        assert [tracks[i].filepath for i in order] == ["b.mp3", "a.mp3", "c.mp3", "d.mp3", "e.mp3"]
+
+    def test_take_reorders_codes(self):
+        codes = GroupingCodes.from_tracks(TRACKS, "composer")
+        reordered = codes.take(np.array([4, 3, 2, 1, 0]))
+        assert [reordered.value_at(i) for i in range(5)] == ["Handel", None, "Bach", "Vivaldi", "Bach"]
+
+    def test_empty(self):
+        codes = GroupingCodes.from_tracks([], "composer")
+        assert len(codes) == 0
+        assert codes.values == []
+        assert codes.counts().tolist() == []
@@ -0,0 +1,64 @@
+"""Unit tests for LibraryData's media_tracks cache: derived attributes on load and store.
+
+Reads and writes go to the in-memory database provided by the root conftest's
+``isolated_singletons``.
+"""
+
+import pytest
+
+from library_data.library_data import LibraryData
+from library_data.media_track import MediaTrack
+from utils.db import get_connection, get_meta, set_meta, write_transaction
+
+
+def _insert_track(filepath, title, album, **fields):
+    cols = ["filepath", "title", "album", "scanned_at"] + list(fields.keys())
+    with write_transaction() as conn:
+        conn.execute(
+            f"INSERT INTO media_tracks ({', '.join(cols)}) VALUES ({', '.join('?' * len(cols))})",
+            [filepath, title, album, 0] + list(fields.values()),
+        )
+
+
+def _stored(filepath):
+    return get_connection().execute(
+        "SELECT form, instrument, catalogue FROM media_tracks WHERE filepath = ?", (filepath,)
+    ).fetchone()
+
+
+@pytest.mark.unit
+class TestDerivedAttributesOnLoad:
+    def test_missing_values_are_computed_and_written_back(self):
+        _insert_track("/m/a.flac", "Piano Sonata No. 14", "Beethoven Sonatas Vol. 1")
+
+        LibraryData.load_media_track_cache()
+
+        track = LibraryData.MEDIA_TRACK_CACHE["/m/a.flac"]
+        assert track.catalogue == "Beethoven Sonatas"
+        assert track.form is not None and track.instrument is not None
+        assert tuple(_stored("/m/a.flac")) == (track.form, track.instrument, track.catalogue)
+        assert get_meta(LibraryData.DERIVED_ATTRIBUTES_META_KEY) == MediaTrack.derived_attributes_fingerprint()
+
+    def test_current_values_are_read_as_stored(self):
+        # Deliberately not what compute_derived_attributes() would produce
+        _insert_track("/m/a.flac", "Nocturne", "Night Music", form="stored form",
+                      instrument="stored instrument", catalogue="stored catalogue")
+        with write_transaction() as conn:
+            set_meta(conn, LibraryData.DERIVED_ATTRIBUTES_META_KEY, MediaTrack.derived_attributes_fingerprint())
+
+        LibraryData.load_media_track_cache()
+
+        track = LibraryData.MEDIA_TRACK_CACHE["/m/a.flac"]
+        assert (track.get_form(), track.get_instrument(), track.get_catalogue()) == (
+            "stored form", "stored instrument", "stored catalogue")
+
+    def test_changed_fingerprint_recomputes_all_tracks(self):
+        _insert_track("/m/a.flac", "Nocturne", "Night Music Vol. 2", form="stored form",
+                      instrument="stored instrument", catalogue="stored catalogue")
+        with write_transaction() as conn:
+            set_meta(conn, LibraryData.DERIVED_ATTRIBUTES_META_KEY, "outdated")
+
+        LibraryData.load_media_track_cache()
+
+        assert LibraryData.MEDIA_TRACK_CACHE["/m/a.flac"].catalogue == "Night Music"
+        assert _stored("/m/a.flac")["catalogue"] == "Night Music"
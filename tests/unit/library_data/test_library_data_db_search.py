@@ -0,0 +1,150 @@
+"""End-to-end tests of LibraryData.do_search with and without the media_tracks search index.
+
+The library is a directory of empty media files, so titles, albums and
+artists come from the paths.  Tracks are written to the in-memory database
+provided by the root conftest's ``isolated_singletons`` with store_caches(),
+as the persistence worker does.
+"""
+
+import pytest
+
+import library_data.library_data as library_data_mod
+from library_data.library_data import LibraryData, LibraryDataSearch
+from library_data.media_track import MediaTrack
+from utils.db import _create_search_index, get_connection
+
+_FILES = (
+    "Royal Philharmonic/Dvořák Symphonies/Symphony No. 9 in E minor.mp3",
+    "Royal Philharmonic/Dvořák Symphonies/Slavonic Dance Op. 46.mp3",
+    "Royal Philharmonic/Beethoven Symphonies Vol. 2/Symphony No. 9 Choral.mp3",
+    "Glenn Gould/Goldberg Variations/Aria.mp3",
+    "Glenn Gould/Goldberg Variations/Variatio 1 a 1 Clav.mp3",
+    "Arthur Rubinstein/Chopin Nocturnes/Nocturne Op. 9 No. 2.mp3",
+    "Arthur Rubinstein/Chopin Nocturnes/It's a Nocturne (Live).mp3",
+    "Kronos Quartet/Café Music/Café Music I. Allegro.mp3",
+)
+
+_SEARCHES = (
+    {"all": "phony"},
+    {"all": "symphon"},
+    {"all": "dvorak"},
+    {"all": "dvořák"},
+    {"all": "cafe"},
+    {"all": "noc"},
+    {"all": "no"},
+    {"title": "no. 9"},
+    {"title": "it's"},
+    {"title": "symphony", "album": "dvo"},
+    {"title": "a", "artist": "gould"},
+    {"album": "goldberg"},
+    {"artist": "rubinstein", "title": "op. 9"},
+    {"catalogue": "beethoven symphonies"},
+    {"title": "nothing like this"},
+)
+
+
+def _search(fields, **kwargs):
+    search = LibraryDataSearch(**fields, **kwargs)
+    LibraryData.__new__(LibraryData).do_search(search)
+    return [track.filepath for track in search.results], search.total_matches_count
+
+
+def _scan(monkeypatch, fields, **kwargs):
+    with monkeypatch.context() as m:
+        m.setattr(LibraryData, "_search_in_db", staticmethod(lambda search: False))
+        return _search(fields, **kwargs)
+
+
+@pytest.fixture
+def library(tmp_path, monkeypatch):
+    root = tmp_path / "library"
+    for name in _FILES:
+        (root / name).parent.mkdir(parents=True, exist_ok=True)
+        (root / name).write_bytes(b"")
+    monkeypatch.setattr(library_data_mod.config, "directories", [str(root)])
+    monkeypatch.setattr(LibraryData, "all_tracks", [])
+    # get_all_tracks() writes tag read errors for the empty files to the working directory
+    monkeypatch.chdir(tmp_path)
+    _create_search_index(get_connection())
+    LibraryData.get_all_tracks()
+    LibraryData.store_caches()
+    return root
+
+
+@pytest.fixture
+def db_searches(monkeypatch):
+    """Record whether each search was run in the database."""
+    calls = []
+    search_in_db = LibraryData._search_in_db
+
+    def recording(search):
+        ran = search_in_db(search)
+        calls.append(ran)
+        return ran
+
+    monkeypatch.setattr(LibraryData, "_search_in_db", staticmethod(recording))
+    return calls
+
+
+@pytest.mark.unit
+class TestDatabaseSearch:
+    @pytest.mark.parametrize("fields", _SEARCHES)
+    def test_matches_and_totals_match_the_scan(self, library, monkeypatch, db_searches, fields):
+        paths, total = _search(fields)
+        scan_paths, scan_total = _scan(monkeypatch, fields)
+
+        assert db_searches == [True]
+        assert paths == sorted(scan_paths) and total == scan_total
+
+    def test_accents_are_folded(self, library, db_searches):
+        paths, _ = _search({"composer": "dvorak"})
+
+        assert db_searches == [True]
+        assert paths == sorted(str(library / name) for name in _FILES[:2])
+
+    @pytest.mark.parametrize("offset", [0, 1, 2, 3, 5])
+    def test_pages_are_fetched_without_gathering_the_library(self, library, monkeypatch, db_searches, offset):
+        fields = {"all": "symphon"}
+        matches, _ = _search(fields)
+        _, scan_total = _scan(monkeypatch, fields, offset=offset, max_results=1)
+        monkeypatch.setattr(LibraryData, "get_all_tracks", staticmethod(lambda *args, **kwargs: 1 / 0))
+
+        page, total = _search(fields, offset=offset, max_results=1)
+
+        assert all(db_searches) and len(matches) == 3
+        assert page == matches[offset:offset + 2]
+        assert total == scan_total
+
+    def test_results_are_the_cached_tracks(self, library):
+        search = LibraryDataSearch(album="goldberg")
+        LibraryData.__new__(LibraryData).do_search(search)
+
+        assert all(track is LibraryData.MEDIA_TRACK_CACHE[track.filepath] for track in search.results)
+        assert len(search.results) == 2
+
+    def test_stale_rows_fall_back_to_the_scan(self, library, monkeypatch, db_searches):
+        (library / "Glenn Gould" / "Goldberg Variations" / "Variatio 2 a 1 Clav.mp3").write_bytes(b"")
+        LibraryData.get_all_tracks(overwrite=True)
+
+        paths, total = _search({"title": "variatio"})
+
+        assert db_searches == [False] and total == 2
+        LibraryData.store_caches()
+        assert _search({"title": "variatio"}) == (sorted(paths), total)
+        assert db_searches[-1] is True
+        monkeypatch.setattr(MediaTrack, "metadata_updates", MediaTrack.metadata_updates + 1)
+        _search({"title": "variatio"})
+        assert db_searches[-1] is False
+
+    def test_rows_for_tracks_no_longer_in_the_library_are_not_returned(self, library, db_searches):
+        removed = library / "Glenn Gould" / "Goldberg Variations" / "Aria.mp3"
+        removed.unlink()
+        LibraryData.get_all_tracks(overwrite=True)
+        LibraryData.store_caches()
+
+        paths, total = _search({"album": "goldberg"})
+
+        assert db_searches == [True]
+        assert str(removed) not in paths and total == 1
+        assert get_connection().execute(
+            "SELECT in_library FROM media_tracks WHERE filepath = ?", (str(removed),)).fetchone()[0] == 0
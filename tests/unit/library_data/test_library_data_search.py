@@ -1,4 +1,4 @@
-"""Unit tests for the catalogue field on library_data.library_data.LibraryDataSearch."""
+"""Unit tests for library_data.library_data.LibraryDataSearch (catalogue field, FTS query building)."""
 
 from types import SimpleNamespace
 
@@ -61,3 +61,33 @@ def test_to_json_round_trip_includes_catalogue():
     assert data["catalogue"] == "beethoven sonatas"
     restored = LibraryDataSearch.from_json(data)
     assert restored.catalogue == "beethoven sonatas"
+
+
+def test_db_query_uses_a_substring_phrase_per_field():
+    search = LibraryDataSearch(title="Symphony No", composer="Dvořák")
+    assert search.to_db_query() == (
+        'searchable_title : "symphony no" AND searchable_composer : "dvořák"', [], [])
+
+
+def test_db_query_for_all_field_covers_the_fields_test_checks():
+    search = LibraryDataSearch(all="op. 27")
+    assert search.to_db_query() == (
+        "{searchable_title searchable_artist searchable_composer searchable_album searchable_genre "
+        'instrument form} : "op. 27"', [], [])
+
+
+def test_db_query_quotes_fts_syntax_characters():
+    search = LibraryDataSearch(title='"bach" OR *')
+    assert search.to_db_query() == ('searchable_title : """bach"" or *"', [], [])
+
+
+def test_catalogue_is_matched_against_the_catalogue_column():
+    search = LibraryDataSearch(catalogue="Beethoven Sonatas")
+    assert search.to_db_query() == ('catalogue : "beethoven sonatas"', [], [])
+
+
+def test_values_shorter_than_a_trigram_are_matched_with_instr():
+    assert LibraryDataSearch(title="bach", album="op").to_db_query() == (
+        'searchable_title : "bach"', ["instr(m.searchable_album, ?) > 0"], ["op"])
+    match, conditions, params = LibraryDataSearch(all="no").to_db_query()
+    assert match is None and len(conditions) == 1 and params == ["no"] * 7
@@ -1,4 +1,4 @@
-"""Unit tests for catalogue derivation on library_data.media_track.MediaTrack."""
+"""Unit tests for catalogue and derived attribute computation on library_data.media_track.MediaTrack."""
 
 import pytest
 
@@ -72,3 +72,70 @@ def test_from_db_row_track_does_not_crash_on_first_get_catalogue():
     track = MediaTrack.from_db_row(row)
     assert track.catalogue is None
     assert track.get_catalogue() == "Some Album"
+
+
+def _bare_track(title, album):
+    track = MediaTrack.__new__(MediaTrack)
+    track.title = title
+    track.album = album
+    track.form = None
+    track.instrument = None
+    track.catalogue = None
+    return track
+
+
+def test_compute_derived_attributes_matches_lazy_getters():
+    lazy = _bare_track("Piano Sonata No. 14", "Beethoven Sonatas Vol. 1")
+    expected = (lazy.get_form(), lazy.get_instrument(), lazy.get_catalogue())
+
+    track = _bare_track("Piano Sonata No. 14", "Beethoven Sonatas Vol. 1")
+    track.compute_derived_attributes()
+
+    assert (track.form, track.instrument, track.catalogue) == expected
+    assert track.catalogue == "Beethoven Sonatas"
+    assert (track.get_form(), track.get_instrument(), track.get_catalogue()) == expected
+
+
+def test_compute_derived_attributes_without_title_or_album():
+    track = _bare_track(None, None)
+    track.compute_derived_attributes()
+    assert (track.form, track.instrument, track.catalogue) == ("", "", "")
+
+
+def test_catalogue_round_trips_through_db_row():
+    track = _bare_track("Track", "Some Album Vol. 4")
+    track.compute_derived_attributes()
+    track_row = {
+        "filepath": "/music/a.flac",
+        "parent_filepath": None,
+        "tracktitle": None,
+        "artist": None,
+        "albumartist": None,
+        "composer": None,
+        "tracknumber": None,
+        "totaltracks": None,
+        "discnumber": None,
+        "totaldiscs": None,
+        "genre": None,
+        "year": None,
+        "compilation": 0,
+        "compilation_name": None,
+        "mean_volume": None,
+        "max_volume": None,
+        "length": None,
+        "is_video": None,
+        "title": track.title,
+        "album": track.album,
+        "form": track.form,
+        "instrument": track.instrument,
+        "catalogue": track.catalogue,
+    }
+
+    restored = MediaTrack.from_db_row(track_row)
+
+    assert restored.catalogue == "Some Album"
+    assert restored.get_catalogue() == "Some Album"
+
+
+def test_derived_attributes_fingerprint_is_stable():
+    assert MediaTrack.derived_attributes_fingerprint() == MediaTrack.derived_attributes_fingerprint()
@@ -0,0 +1,107 @@
+"""Tests for early-abort blacklist enforcement during LLM streaming (muse.blacklist_guard)."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from extensions.llm import StreamChunk
+from library_data.blacklist import Blacklist, BlacklistItem
+from muse.blacklist_guard import BlacklistStreamGuard
+from muse.muse import Muse
+
+
+@pytest.fixture(autouse=True)
+def _isolated_blacklist():
+    Blacklist.set_blacklist([
+        BlacklistItem("badword"),
+        BlacklistItem("crime", exception_pattern="crime novel"),
+    ])
+    yield
+    Blacklist.clear()
+
+
+def _stream(guard, text, step=3):
+    """Feed *text* in small deltas. Returns how many characters were generated when the guard stopped it, or None."""
+    for end in range(step, len(text) + step, step):
+        verdict = guard.on_chunk(StreamChunk(text=text[end - step:end], accumulated=text[:end], done=False))
+        if verdict.should_stop:
+            assert verdict.reason == "blacklist"
+            return min(end, len(text))
+    return None
+
+
+class _FakeLLM:
+    """Streams canned responses through the redundancy policy, recording how much of each was generated."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.generated = []
+
+    def get_redundancy_policy(self):
+        return None
+
+    def ask(self, prompt, redundancy_policy=None, **kwargs):
+        text = self.responses[len(self.generated)]
+        stopped_at = _stream(redundancy_policy, text)
+        self.generated.append(text[:stopped_at])
+        result = MagicMock()
+        result.response = text[:stopped_at]
+        result.truncated = stopped_at is not None
+        result.truncation_reason = "blacklist"
+        return result
+
+
+@pytest.mark.unit
+class TestBlacklistStreamGuard:
+    def test_stops_when_the_violating_clause_completes(self):
+        text = "A clean opening, then badword appears. The rest of a long response follows here."
+        guard = BlacklistStreamGuard()
+
+        stopped_at = _stream(guard, text)
+
+        assert stopped_at <= text.index("The rest")
+        assert set(guard.violations.values()) == {"badword"}
+
+    def test_clean_text_streams_to_the_end(self):
+        text = "Nothing objectionable, just music. Another sentence."
+        assert _stream(BlacklistStreamGuard(), text) is None
+
+    def test_ignored_tags_from_the_prompt(self):
+        text = "Talking about badword, as the prompt asked. More."
+        tags = Blacklist.find_blacklisted_items(text).keys()
+        assert _stream(BlacklistStreamGuard(ignored_tags=tags), text) is None
+
+    @pytest.mark.parametrize("text", [
+        "A crime novel, reviewed. Nothing else.",
+        "It was a crime, plainly. Nothing else.",
+        "Numbers like 3.5, then (badword). Done.",
+        "One clause only with badword inside but no delimiter",
+    ])
+    def test_agrees_with_the_full_text_check(self, text):
+        text += "."  # the final clause is checked once its delimiter arrives
+        stopped_at = _stream(BlacklistStreamGuard(), text)
+        assert (stopped_at is not None) == bool(Blacklist.find_blacklisted_items(text))
+
+    def test_defers_to_the_next_policy(self):
+        next_policy = MagicMock()
+        next_policy.on_chunk.return_value.should_stop = True
+        guard = BlacklistStreamGuard(next_policy=next_policy)
+
+        verdict = guard.on_chunk(StreamChunk(text="Clean, ", accumulated="Clean, ", done=False))
+
+        assert verdict is next_policy.on_chunk.return_value
+
+
+@pytest.mark.unit
+def test_generate_text_regenerates_without_finishing_the_violating_response():
+    violating = "Hello there, badword. " + "This response would have gone on for a long time. " * 20
+    muse = MagicMock()
+    muse.llm = _FakeLLM(violating, "A clean response.")
+    muse._prepare_generation.return_value = ("prompt", "system prompt", [])
+    muse._find_violations = Muse._find_violations
+    muse._new_blacklist_guard = lambda items: Muse._new_blacklist_guard(muse, items)
+
+    text = Muse.generate_text(muse, "prompt")
+
+    assert text == "A clean response."
+    assert len(muse.llm.generated[0]) < 30
@@ -176,7 +176,7 @@ class TestRunCancelGuard:
         from unittest.mock import MagicMock, patch
         from muse.run import Run
         from muse.run_config import RunConfig
-        with patch("muse.run.Muse", return_value=MagicMock()), \
+        with patch("muse.muse.Muse", return_value=MagicMock()), \
              patch("muse.run.LibraryData", return_value=MagicMock()):
             return Run(RunConfig(placeholder=True))
 
@@ -0,0 +1,180 @@
+"""Tests for pre-generating DJ topic spots in the background (muse.spot_pool)."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from muse.muse import Muse
+from muse.spot_pool import PooledSpot, SpotPool
+from utils.globals import Topic
+
+
+class _Generator:
+    """Stands in for the LLM and TTS, writing one speech file per spot."""
+
+    def __init__(self, tmp_path, fail_topics=()):
+        self.tmp_path = tmp_path
+        self.fail_topics = set(fail_topics)
+        self.key = ("Royston Min", "en")
+        self.generated = []
+
+    def generate(self, topic):
+        if topic in self.fail_topics:
+            raise Exception("service unavailable")
+        self.generated.append(topic)
+        return f"A {topic.value} spot."
+
+    def synthesize(self, text, topic):
+        path = self.tmp_path / f"spot_pool_{topic.value}_{len(self.generated)}.wav"
+        path.write_bytes(b"RIFF")
+        return [str(path)]
+
+    def get_key(self):
+        return self.key
+
+    def pool(self, topics=(Topic.JOKE, Topic.WEATHER), size=2):
+        return SpotPool(topics, size, self.generate, self.synthesize, self.get_key)
+
+
+@pytest.mark.unit
+class TestSpotPool:
+    def test_fills_topics_evenly_up_to_the_pool_size(self, tmp_path):
+        generator = _Generator(tmp_path)
+        pool = generator.pool()
+
+        pool.fill(lambda: True)
+
+        assert sorted(generator.generated, key=lambda t: t.value) == [Topic.JOKE, Topic.JOKE, Topic.WEATHER, Topic.WEATHER]
+        assert generator.generated[:2] in ([Topic.JOKE, Topic.WEATHER], [Topic.WEATHER, Topic.JOKE])
+        assert pool.ready_count() == 4
+
+    def test_take_returns_the_oldest_spot_once(self, tmp_path):
+        pool = _Generator(tmp_path).pool(topics=[Topic.JOKE])
+        pool.fill(lambda: True)
+
+        first = pool.take(Topic.JOKE)
+        second = pool.take(Topic.JOKE)
+
+        assert first.created_at <= second.created_at
+        assert pool.take(Topic.JOKE) is None
+        assert pool.take(Topic.FACT) is None
+
+    def test_filling_stops_when_no_longer_idle(self, tmp_path):
+        generator = _Generator(tmp_path)
+        pool = generator.pool()
+        idle_checks = iter([True, False])
+
+        pool.fill(lambda: next(idle_checks))
+
+        assert len(generator.generated) == 1
+
+    def test_expired_spots_are_discarded_with_their_audio(self, tmp_path):
+        pool = _Generator(tmp_path).pool(topics=[Topic.WEATHER], size=1)
+        pool.fill(lambda: True)
+        spot = pool._spots[Topic.WEATHER][0]
+        spot.expires_at = spot.created_at
+
+        assert pool.take(Topic.WEATHER) is None
+        assert not list(tmp_path.glob("spot_pool_*"))
+
+    def test_time_sensitive_topics_expire_sooner(self):
+        pool = SpotPool([], 1, None, None, lambda: None)
+        assert pool.max_age(Topic.WEATHER) < pool.max_age(Topic.NEWS) < pool.max_age(Topic.JOKE)
+
+    def test_persona_change_discards_pooled_spots(self, tmp_path):
+        generator = _Generator(tmp_path)
+        pool = generator.pool(topics=[Topic.JOKE])
+        pool.fill(lambda: True)
+
+        generator.key = ("Sofia", "es")
+
+        assert pool.take(Topic.JOKE) is None
+        assert not list(tmp_path.glob("spot_pool_*"))
+
+    def test_spot_generated_across_a_persona_change_is_discarded(self, tmp_path):
+        generator = _Generator(tmp_path)
+        pool = generator.pool(topics=[Topic.JOKE], size=1)
+
+        def generate_then_change_persona(topic):
+            generator.key = ("Sofia", "es")
+            return "A joke for the previous persona."
+
+        pool._generate = generate_then_change_persona
+        pool.fill_one()
+
+        assert pool.ready_count() == 0
+        assert not list(tmp_path.glob("spot_pool_*"))
+
+    def test_invalidate_empties_the_pool(self, tmp_path):
+        pool = _Generator(tmp_path).pool()
+        pool.fill(lambda: True)
+
+        pool.invalidate("voice changed")
+
+        assert pool.ready_count() == 0
+        assert not list(tmp_path.glob("spot_pool_*"))
+
+    def test_failing_topic_is_not_retried_right_away(self, tmp_path):
+        generator = _Generator(tmp_path, fail_topics=[Topic.WEATHER])
+        pool = generator.pool()
+
+        pool.fill(lambda: True)
+
+        assert generator.generated == [Topic.JOKE, Topic.JOKE]
+        assert pool.next_topic() is None
+
+    def test_disabled_pool_never_starts(self, tmp_path):
+        pool = _Generator(tmp_path).pool(size=0)
+        assert not pool.start_filling(lambda: True)
+
+
+def _spot(topic=Topic.JOKE, paths=("a.wav", "b.wav")):
+    return PooledSpot(topic, "A joke.", list(paths), key=None, expires_at=float("inf"))
+
+
+@pytest.mark.unit
+class TestMuseSpotPool:
+    def test_topic_spot_airs_from_the_pool(self):
+        muse = MagicMock()
+        muse.spot_pool.take.return_value = _spot()
+        spot_profile = MagicMock(topic=Topic.JOKE, has_already_spoken=True)
+
+        with patch("muse.muse.random.random", return_value=0.99):
+            assert Muse.talk_about_something(muse, spot_profile)
+
+        muse._say_pooled_spot.assert_called_once_with(muse.spot_pool.take.return_value, spot_profile)
+        muse._wrap_function.assert_not_called()
+        muse.memory.update_last_topic.assert_called_once_with(Topic.JOKE)
+
+    def test_topic_without_pooled_spot_is_generated(self):
+        muse = MagicMock()
+        muse.spot_pool.take.return_value = None
+        spot_profile = MagicMock(topic=Topic.JOKE, has_already_spoken=True)
+
+        with patch("muse.muse.random.random", return_value=0.99):
+            Muse.talk_about_something(muse, spot_profile)
+
+        muse._wrap_function.assert_called_once()
+
+    def test_pooled_spot_is_queued_and_spoken_now_when_immediate(self):
+        muse = MagicMock()
+
+        with patch("muse.muse.Prompter.update_history") as update_history:
+            Muse._say_pooled_spot(muse, _spot(), MagicMock(immediate=True))
+
+        update_history.assert_called_once_with(Topic.JOKE)
+        assert [c.args[0] for c in muse.voice.add_speech_file_to_queue.call_args_list] == ["a.wav", "b.wav"]
+        muse.voice.finish_speaking.assert_called_once()
+
+    @pytest.mark.parametrize("has_started_prep, ms_remaining, fills", [
+        (False, 10 * 60 * 1000, True),
+        (True, 10 * 60 * 1000, False),
+        (False, Muse.preparation_starts_minutes_from_end * 60 * 1000 + 30 * 1000, False),
+    ])
+    def test_pool_fills_only_well_before_preparation(self, has_started_prep, ms_remaining, fills):
+        muse = MagicMock(has_started_prep=has_started_prep)
+        muse._is_idle_for_spot_pool = lambda: Muse._is_idle_for_spot_pool(muse)
+
+        Muse.maybe_fill_spot_pool(muse, ms_remaining)
+
+        assert muse.spot_pool.start_filling.called == fills
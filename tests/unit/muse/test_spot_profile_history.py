@@ -0,0 +1,148 @@
+"""Tests for the SQLite-backed spot profile history (muse.muse_memory.SpotProfileHistory)."""
+
+import pickle
+import time
+from unittest.mock import patch
+
+import pytest
+
+import muse.muse_memory as mm
+from muse.muse_memory import MuseMemory, SpotProfileSnapshot
+from muse.muse_spot_profile import MuseSpotProfile
+from utils.globals import TrackResult
+
+
+@pytest.fixture(autouse=True)
+def clear_spot_session():
+    MuseSpotProfile.clear_session()
+    yield
+    MuseSpotProfile.clear_session()
+
+
+def _spots(memory, tracks, spoken=(), group_transitions=()):
+    """Create one spot per track; indexes in *spoken* were spoken."""
+    profiles = []
+    previous = None
+    with patch("muse.muse_spot_profile.random.random", return_value=0.99):
+        for i, track in enumerate(tracks):
+            result = TrackResult(track, "Bach", "Handel") if i in group_transitions else TrackResult(track)
+            profile = memory.get_spot_profile(previous_track=previous, track_result=result)
+            if i in spoken:
+                profile.was_spoken = True
+                memory.record_spot_profile(profile)
+            profiles.append(profile)
+            previous = track
+            time.sleep(0.002)
+    return profiles
+
+
+def _restart(memory):
+    """Save *memory* and load it again as a new session would."""
+    memory.save()
+    return MuseMemory()
+
+
+@pytest.mark.unit
+class TestSpotProfileHistory:
+    def test_every_spot_is_recorded_with_track_paths(self, mock_tracks):
+        memory = mm.muse_memory
+        _spots(memory, mock_tracks[:3], spoken=[1])
+
+        newest, spoken, first = memory.spot_profile_history.recent()
+
+        assert memory.spot_profile_history.count() == 3
+        assert (newest.previous_track_path, newest.current_track_path) == ("track2.mp3", mock_tracks[2].filepath)
+        assert spoken.was_spoken and not first.was_spoken
+        assert first.previous_track_path == ""
+
+    def test_last_spoken_profile_comes_from_the_live_session(self, mock_tracks):
+        memory = mm.muse_memory
+        profiles = _spots(memory, mock_tracks[:4], spoken=[1])
+
+        assert profiles[3].get_last_spoken_profile() is profiles[1]
+        assert profiles[1].get_last_spoken_profile() is None
+
+    def test_last_spoken_profile_is_queried_from_history_after_a_restart(self, mock_tracks):
+        profiles = _spots(mm.muse_memory, mock_tracks[:3], spoken=[1])
+        profiles[1].preparation_time = profiles[1].creation_time + 5
+        mm.muse_memory.record_spot_profile(profiles[1])
+
+        memory = _restart(mm.muse_memory)
+        (profile,) = _spots(memory, mock_tracks[3:4])
+        last = profile.get_last_spoken_profile()
+
+        assert memory.current_session_spot_profiles[0] is profile
+        assert isinstance(last, SpotProfileSnapshot)
+        assert last.creation_time == profiles[1].creation_time
+        assert last.get_time() == profiles[1].creation_time + 5
+        assert not profile.last_spot_profile_more_than_seconds(60)
+
+    def test_live_profiles_are_restored_after_a_restart(self, mock_tracks):
+        profiles = _spots(mm.muse_memory, mock_tracks[:3])
+
+        memory = _restart(mm.muse_memory)
+        (profile,) = _spots(memory, mock_tracks[3:4])
+
+        assert [p.creation_time for p in memory.current_session_spot_profiles[1:]] == [
+            p.creation_time for p in reversed(profiles)
+        ]
+        assert profile.get_spot_index() == 3
+        assert memory.get_previous_session_spot_profile(idx=2).creation_time == profiles[1].creation_time
+
+    def test_group_transition_lookup(self, mock_tracks):
+        memory = mm.muse_memory
+        _spots(memory, mock_tracks[:3], spoken=[0, 1, 2], group_transitions=[1])
+
+        last_gt = memory.get_last_spoken_profile(group_transition=True)
+
+        assert last_gt.is_group_transition
+        assert last_gt.new_grouping == "Handel"
+        assert memory.spot_profile_history.get_last_spoken(group_transition=True).creation_time == last_gt.creation_time
+
+    def test_history_is_trimmed_to_the_newest_rows(self, mock_tracks):
+        memory = mm.muse_memory
+        memory.max_historical_snapshots = 2
+
+        profiles = _spots(memory, mock_tracks[:4])
+
+        assert [s.creation_time for s in memory.spot_profile_history.recent()] == [
+            profiles[3].creation_time, profiles[2].creation_time
+        ]
+
+    def test_spot_profiles_are_not_pickled(self, mock_tracks):
+        memory = mm.muse_memory
+        _spots(memory, mock_tracks[:2])
+        memory.tracks_since_last_spoke = 3
+
+        state = pickle.loads(pickle.dumps(memory)).__dict__
+
+        assert "current_session_spot_profiles" not in state
+        assert "spot_profile_history" not in state
+        assert state["tracks_since_last_spoke"] == 3
+
+    def test_pickled_history_from_older_versions_is_imported(self, mock_tracks):
+        profiles = _spots(mm.muse_memory, mock_tracks[:2], spoken=[0])
+        mm.muse_memory.spot_profile_history.purge_older_than(time.time())
+        legacy = MuseMemory.__new__(MuseMemory)
+        legacy.__dict__.update(
+            all_spot_profiles=list(reversed(profiles)),
+            current_session_spot_profiles=list(reversed(profiles)),
+            _historical_snapshots={1.0: SpotProfileSnapshot(
+                creation_time=1.0, previous_track_title=None, current_track_title="Old", was_spoken=True,
+                topic=None, topic_translated=None, grouping_type=None, old_grouping=None, new_grouping=None,
+            )},
+            persona_manager=mm.muse_memory.persona_manager,
+            tracks_since_last_topic=4,
+        )
+        with patch.object(MuseMemory, "__getstate__", lambda self: self.__dict__.copy()):
+            with open(mm.muse_memory._memory_path, "wb") as f:
+                pickle.dump(legacy, f)
+
+        memory = MuseMemory()
+
+        assert memory.spot_profile_history.count() == 3
+        assert [p.creation_time for p in memory.current_session_spot_profiles] == [
+            profiles[1].creation_time, profiles[0].creation_time, 1.0
+        ]
+        assert memory.tracks_since_last_topic == 4
+        assert memory.get_last_spoken_profile().creation_time == profiles[0].creation_time
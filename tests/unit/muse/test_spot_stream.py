@@ -0,0 +1,162 @@
+"""Tests for streaming DJ spot text into TTS one sentence at a time (muse.spot_stream)."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from extensions.llm import StreamChunk
+from library_data.blacklist import Blacklist, BlacklistException, BlacklistItem
+from muse.muse import Muse
+from muse.spot_stream import SentenceStream, SpotStreamMetrics
+
+
+@pytest.fixture(autouse=True)
+def _isolated_blacklist():
+    Blacklist.set_blacklist([BlacklistItem("badword")])
+    yield
+    Blacklist.clear()
+
+
+def _find_violations(sentence):
+    return Muse._find_violations(sentence, [])
+
+
+def _feed(stream, text, step=7):
+    """Feed *text* to *stream* in small deltas, as a streaming LLM would. Returns the stopping verdict, if any."""
+    for end in range(step, len(text) + step, step):
+        verdict = stream.on_chunk(StreamChunk(text=text[end - step:end], accumulated=text[:end], done=False))
+        if verdict.should_stop:
+            return verdict
+    return None
+
+
+class _FakeLLM:
+    """Streams canned responses through the redundancy policy passed to ask()."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = 0
+
+    def get_redundancy_policy(self):
+        return None
+
+    def ask(self, prompt, redundancy_policy=None, **kwargs):
+        text = self.responses[self.calls]
+        self.calls += 1
+        verdict = _feed(redundancy_policy, text)
+        result = MagicMock()
+        result.response = text if verdict is None or verdict.truncate_to is None else verdict.truncate_to
+        return result
+
+
+def _make_muse(*responses):
+    muse = MagicMock()
+    muse.llm = _FakeLLM(*responses)
+    muse._prepare_generation.return_value = ("prompt", "system prompt", [])
+    muse._find_violations = Muse._find_violations
+    muse._get_speech_options = Muse._get_speech_options
+    muse.spoken = []
+
+    def say_stream(texts, topic, save_mp3, locale, on_speech_queued):
+        for text in texts:
+            muse.spoken.append(text)
+            on_speech_queued("speech.wav")
+
+    muse.say_stream.side_effect = say_stream
+    return muse
+
+
+@pytest.mark.unit
+class TestSentenceStream:
+    def test_releases_completed_sentences_and_trailing_text(self):
+        stream = SentenceStream(_find_violations)
+
+        assert _feed(stream, "The first sentence is here. Then a second one follows! And the end") is None
+        assert stream.released == ["The first sentence is here.", "Then a second one follows!"]
+
+        stream.finish("The first sentence is here. Then a second one follows! And the end.")
+        assert list(stream) == ["The first sentence is here. Then a second one follows! And the end."]
+        assert stream.released_text == "The first sentence is here. Then a second one follows! And the end."
+
+    def test_short_pieces_wait_for_the_next_sentence(self):
+        stream = SentenceStream(_find_violations)
+        _feed(stream, "Hi. I am Dr. Smith, your host tonight. ")
+        assert stream.released == ["Hi. I am Dr. Smith, your host tonight."]
+
+    def test_paragraph_breaks_are_kept(self):
+        stream = SentenceStream(_find_violations)
+        _feed(stream, "A first paragraph of text.\n\nA second paragraph here. ")
+        stream.finish()
+        assert stream.released_text == "A first paragraph of text.\n\nA second paragraph here."
+
+    def test_violation_stops_generation_at_the_last_clean_sentence(self):
+        stream = SentenceStream(_find_violations)
+
+        verdict = _feed(stream, "A perfectly clean opening. This one says badword out loud. More text follows.")
+
+        assert verdict.should_stop and verdict.reason == "blacklist"
+        assert verdict.truncate_to == "A perfectly clean opening."
+        assert set(stream.violations.values()) == {"badword"}
+        assert stream.violating_sentence == "This one says badword out loud."
+        assert list(stream) == ["A perfectly clean opening."]
+
+    def test_iteration_batches_what_arrived_since_the_last_read(self):
+        stream = SentenceStream(_find_violations)
+        batches = iter(stream)
+
+        _feed(stream, "The first sentence to be spoken. ")
+        first = next(batches)
+        _feed(stream, "The first sentence to be spoken. Second sentence arrives. Third sentence arrives too. ")
+        stream.finish()
+
+        assert first == "The first sentence to be spoken."
+        assert list(batches) == ["Second sentence arrives. Third sentence arrives too."]
+
+
+@pytest.mark.unit
+class TestStreamTextToVoice:
+    def test_clean_response_is_spoken_as_it_streams(self):
+        muse = _make_muse("Good evening, everyone listening. Here is tonight's fact.")
+        spot_profile = MagicMock(immediate=True)
+
+        text = Muse.stream_text_to_voice(muse, "prompt", spot_profile, None)
+
+        assert text == "Good evening, everyone listening. Here is tonight's fact."
+        assert " ".join(muse.spoken) == text
+        metrics = muse.last_spot_stream_metrics
+        assert metrics.attempts == 1 and metrics.sentences == 2
+        assert metrics.time_to_first_sentence is not None
+        assert metrics.time_to_first_audio >= metrics.time_to_first_sentence
+
+    def test_violation_before_anything_is_spoken_regenerates(self):
+        muse = _make_muse("The badword appears right away here. More.", "A clean second attempt at this spot.")
+
+        text = Muse.stream_text_to_voice(muse, "prompt", MagicMock(immediate=True), None)
+
+        assert text == "A clean second attempt at this spot."
+        assert muse.spoken == ["A clean second attempt at this spot."]
+        assert muse.last_spot_stream_metrics.attempts == 2
+
+    def test_violation_after_speaking_ends_the_spot(self):
+        muse = _make_muse("An opening line that is clean. Then badword slips in. Never spoken.")
+
+        text = Muse.stream_text_to_voice(muse, "prompt", MagicMock(immediate=False), None)
+
+        assert text == "An opening line that is clean."
+        assert muse.llm.calls == 1
+        muse.prepare_to_say_stream.assert_called_once()
+
+    def test_repeated_violations_raise(self):
+        muse = _make_muse(*["This badword opening is never spoken."] * 4)
+
+        with pytest.raises(BlacklistException):
+            Muse.stream_text_to_voice(muse, "prompt", MagicMock(immediate=True), None)
+        assert muse.llm.calls == 4
+        assert muse.spoken == []
+
+
+@pytest.mark.unit
+def test_metrics_summary_without_audio():
+    metrics = SpotStreamMetrics()
+    metrics.mark_finished()
+    assert "first audio n/a" in metrics.summary()
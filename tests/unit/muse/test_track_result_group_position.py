@@ -179,3 +179,31 @@ class TestGroupPositionComposerShuffle:
         assert by_group["Bach"][0].group_total == 2
         assert by_group["Vivaldi"][0].group_position == 1
         assert by_group["Vivaldi"][0].group_total == 1
+
+
+@pytest.mark.unit
+class TestGroupCountsFollowPlaylistChanges:
+    def test_counts_and_next_grouping_after_inserted_tracks(self):
+        tracks = _make_tracks(
+            ("b1.mp3", "Bach", "WTC"),
+            ("b2.mp3", "Bach", "WTC"),
+            ("v1.mp3", "Vivaldi", "Four Seasons"),
+        )
+        pl = Playlist(
+            tracks=[t.filepath for t in tracks],
+            _type=PlaylistSortType.COMPOSER_SHUFFLE,
+            data_callbacks=MockDataCallbacks(tracks),
+            start_track=tracks[0],
+        )
+        first = pl.next_track()
+        assert first.current_grouping == "Bach"
+        assert pl.get_group_count("Bach") == 2
+        assert pl.get_next_grouping() == "Vivaldi"
+
+        extra = _make_tracks(("h1.mp3", "Handel", "Messiah"))[0]
+        pl.insert_upcoming_tracks([extra], overwrite_existing_at_index=False)
+
+        assert pl.get_group_count("Handel") == 1
+        assert pl.get_next_grouping() == "Handel"
+        result = pl.next_track()
+        assert (result.current_grouping, result.group_position, result.group_total) == ("Handel", 1, 1)
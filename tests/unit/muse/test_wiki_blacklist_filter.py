@@ -20,7 +20,8 @@ def _make_muse(*responses) -> MagicMock:
     muse.wiki_search = MagicMock()
     muse.wiki_search.random_wiki.side_effect = list(responses)
     muse.get_prompt.return_value = "{ARTICLE}"
-    muse.generate_text.return_value = "summary"
+    muse.say_generated_text.return_value = "summary"
+    muse._get_wiki_article_prompt = lambda *args, **kwargs: Muse._get_wiki_article_prompt(muse, *args, **kwargs)
     return muse
 
 
@@ -43,7 +44,7 @@ class TestWikiBlacklistFilter:
 
         Muse.talk_about_random_wiki_article(muse, MagicMock())
 
-        prompt = muse.generate_text.call_args.args[0]
+        prompt = muse.say_generated_text.call_args.args[0]
         assert "badword" not in prompt
         assert "omitted" in prompt.lower()
 
@@ -56,6 +57,6 @@ class TestWikiBlacklistFilter:
         Muse.talk_about_random_wiki_article(muse, MagicMock())
 
         assert muse.wiki_search.random_wiki.call_count == 2
-        prompt = muse.generate_text.call_args.args[0]
+        prompt = muse.say_generated_text.call_args.args[0]
         assert "badword" not in prompt
         assert "omitted" not in prompt.lower()
@@ -32,7 +32,12 @@ class TestRemovableTestOutputFiles:
         assert is_removable_output_file("tts_test12.wav")
         assert is_removable_output_file("tts_test3.mp3")
 
+    def test_matches_unaired_spot_pool_files(self):
+        assert is_removable_output_file("spot_pool_Joke_1734567890_0.wav")
+        assert is_removable_output_file("spot_pool_Hacker_News_1734567890_12.wav")
+
     def test_does_not_match_unrelated_files(self):
+        assert not is_removable_output_file("spot_pool_Joke_1734567890_ - TTS.mp3")
         assert not is_removable_output_file("tts_test.wav")
         assert not is_removable_output_file("my_tts_test0.wav")
 
@@ -39,7 +39,7 @@ def isolated_db(monkeypatch):
     conn = sqlite3.connect(":memory:")
     conn.row_factory = sqlite3.Row
     conn.executescript(_MINI_SCHEMA)
-    conn.commit()
+    db_mod.ensure_path_key_columns(conn)
 
     monkeypatch.setattr(db_mod, "get_connection", lambda: conn)
     monkeypatch.setattr(db_mod, "_connection", conn)
@@ -0,0 +1,180 @@
+"""Unit tests for AppInfoCache journal persistence.
+
+Encryption is replaced with a reversible fake so the tests never touch the
+host keyring; the journal/snapshot bookkeeping is what is under test.
+"""
+import importlib
+import json
+import os
+
+import pytest
+
+cache_module = importlib.import_module("utils.app_info_cache")
+AppInfoCache = cache_module.AppInfoCache
+
+_FAKE_PREFIX = b"ENC:"
+
+
+def _fake_encrypt_to_file(data, service_name, app_identifier, output_path, *args, **kwargs):
+    with open(output_path, "wb") as f:
+        f.write(_FAKE_PREFIX + data)
+
+
+def _fake_decrypt_from_file(path, service_name, app_identifier):
+    with open(path, "rb") as f:
+        data = f.read()
+    assert data.startswith(_FAKE_PREFIX)
+    return data[len(_FAKE_PREFIX):]
+
+
+def _fake_encrypt_to_bytes(data, service_name, app_identifier, compress=True, compression_level=9):
+    return _FAKE_PREFIX + data
+
+
+def _fake_decrypt_list(blobs, service_name, app_identifier):
+    return [blob[len(_FAKE_PREFIX):] for blob in blobs]
+
+
+@pytest.fixture
+def fake_encryption(monkeypatch, tmp_path):
+    monkeypatch.setenv("MUSE_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(cache_module, "encrypt_data_to_file", _fake_encrypt_to_file)
+    monkeypatch.setattr(cache_module, "decrypt_data_from_file", _fake_decrypt_from_file)
+    monkeypatch.setattr(cache_module, "encrypt_data_to_bytes", _fake_encrypt_to_bytes)
+    monkeypatch.setattr(cache_module, "decrypt_data_from_bytes_list", _fake_decrypt_list)
+    return tmp_path
+
+
+def _journal_entries(cache):
+    records, _ = cache._read_journal_records()
+    return [json.loads(r[len(_FAKE_PREFIX):].decode("utf-8"))["entries"] for r in records]
+
+
+@pytest.mark.unit
+class TestAppInfoCacheJournal:
+    def test_first_store_writes_snapshot(self, fake_encryption):
+        cache = AppInfoCache()
+        cache.set("a", 1)
+
+        assert cache.store() is True
+
+        assert os.path.exists(cache._cache_loc)
+        assert not os.path.exists(cache._journal_loc)
+
+    def test_subsequent_store_appends_only_dirty_entries(self, fake_encryption):
+        cache = AppInfoCache()
+        cache.set("a", 1)
+        cache.set("big", list(range(1000)))
+        cache.store()
+        snapshot_mtime = os.path.getmtime(cache._cache_loc)
+
+        cache.set("a", 2)
+        cache.set_directory(str(fake_encryption), "volume", 50)
+        assert cache.store() is True
+
+        assert os.path.getmtime(cache._cache_loc) == snapshot_mtime
+        entries = _journal_entries(cache)
+        assert len(entries) == 1
+        keys = sorted((section, key) for section, key, _ in entries[0])
+        assert keys == [
+            ("directories", AppInfoCache.normalize_directory_key(str(fake_encryption))),
+            ("info", "a"),
+        ]
+
+    def test_store_without_changes_writes_nothing(self, fake_encryption):
+        cache = AppInfoCache()
+        cache.set("a", 1)
+        cache.store()
+
+        cache.store()
+
+        assert not os.path.exists(cache._journal_loc)
+
+    def test_reload_replays_journal_over_snapshot(self, fake_encryption):
+        cache = AppInfoCache()
+        cache.set("a", 1)
+        cache.set("b", "keep")
+        cache.store()
+        cache.set("a", 2)
+        cache.increment_tracker("spots")
+        cache.store()
+
+        reloaded = AppInfoCache()
+
+        assert reloaded.get("a") == 2
+        assert reloaded.get("b") == "keep"
+        assert reloaded.get_tracker("spots")["count"] == 1
+
+    def test_journal_left_behind_by_a_crash_is_not_replayed_over_a_newer_snapshot(self, fake_encryption, monkeypatch):
+        cache = AppInfoCache()
+        cache.set("k", "v0")
+        cache.store()
+        cache.set("k", "v1")
+        cache.store()
+        cache.set("k", "v2")
+        monkeypatch.setattr(cache, "_remove_journal", lambda: None)  # crash before the journal is removed
+
+        cache.store(compact=True)
+
+        reloaded = AppInfoCache()
+        assert reloaded.get("k") == "v2"
+        assert AppInfoCache.JOURNAL_SEQ_KEY not in reloaded._cache
+        reloaded.set("k", "v3")
+        reloaded.store()
+        assert AppInfoCache().get("k") == "v3"
+
+    def test_journal_records_without_sequence_numbers_are_replayed(self, fake_encryption):
+        cache = AppInfoCache()
+        cache.set("k", "v0")
+        cache.store()
+        record = _FAKE_PREFIX + json.dumps([["info", "k", "legacy"]]).encode("utf-8")
+        with open(cache._journal_loc, "wb") as f:
+            f.write(AppInfoCache._RECORD_HEADER.pack(len(record)) + record)
+
+        assert AppInfoCache().get("k") == "legacy"
+
+    def test_truncated_trailing_record_is_ignored(self, fake_encryption):
+        cache = AppInfoCache()
+        cache.set("a", 1)
+        cache.store()
+        cache.set("a", 2)
+        cache.store()
+        with open(cache._journal_loc, "ab") as f:
+            f.write(b"\x00\x00\x10\x00partial")
+
+        reloaded = AppInfoCache()
+
+        assert reloaded.get("a") == 2
+        reloaded.set("a", 3)
+        reloaded.store()
+        assert AppInfoCache().get("a") == 3
+
+    def test_compacts_after_max_records(self, fake_encryption, monkeypatch):
+        monkeypatch.setattr(AppInfoCache, "JOURNAL_MAX_RECORDS", 3)
+        cache = AppInfoCache()
+        cache.set("n", 0)
+        cache.store()
+
+        for i in range(1, 4):
+            cache.set("n", i)
+            cache.store()
+        assert cache._journal_records == 3
+
+        cache.set("n", 4)
+        cache.store()
+
+        assert not os.path.exists(cache._journal_loc)
+        assert AppInfoCache().get("n") == 4
+
+    def test_wipe_instance_forces_snapshot(self, fake_encryption):
+        cache = AppInfoCache()
+        cache.set("a", 1)
+        cache.store()
+        cache.set("a", 2)
+        cache.store()
+
+        cache.wipe_instance()
+        cache.store()
+
+        assert not os.path.exists(cache._journal_loc)
+        assert AppInfoCache().get("a") is None
@@ -0,0 +1,236 @@
+"""Unit tests for the utils.db connection layer and media_tracks full-text index.
+
+Each test points DB_PATH at a temporary file and resets the module globals so
+the real muse_library.db is never opened.
+"""
+import sqlite3
+import threading
+
+import pytest
+
+import utils.db as db_mod
+
+# The root conftest redirects get_connection to an in-memory DB; keep the real one
+_get_connection = db_mod.get_connection
+
+
+@pytest.fixture
+def temp_db(monkeypatch, tmp_path):
+    monkeypatch.setattr(db_mod, "get_connection", _get_connection)
+    monkeypatch.setattr(db_mod, "DB_PATH", tmp_path / "test_library.db")
+    monkeypatch.setattr(db_mod, "_connection", None)
+    monkeypatch.setattr(db_mod, "_readers", None)
+    # Skip seeding/migration; only the connection layer is under test
+    monkeypatch.setattr(db_mod, "_seed_if_needed", lambda conn: None)
+    monkeypatch.setattr(db_mod, "_migrate_gzip_caches", lambda conn: None)
+    db_mod.reset_query_stats()
+    conn = db_mod.get_connection()
+    yield conn
+    db_mod.close_read_connections()
+    conn.close()
+
+
+@pytest.mark.unit
+class TestConnectionLayer:
+    def test_writer_applies_tuning_pragmas(self, temp_db):
+        assert temp_db.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert temp_db.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert temp_db.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+
+    def test_read_connection_is_per_thread_and_read_only(self, temp_db):
+        reader = db_mod.get_read_connection()
+        assert reader is not temp_db
+        assert db_mod.get_read_connection() is reader
+
+        other = []
+        thread = threading.Thread(target=lambda: other.append(db_mod.get_read_connection()))
+        thread.start()
+        thread.join()
+        assert other[0] is not reader
+
+        with pytest.raises(sqlite3.OperationalError):
+            reader.execute("DELETE FROM media_tracks")
+
+    def test_reader_sees_committed_writes_only(self, temp_db):
+        reader = db_mod.get_read_connection()
+        temp_db.execute("INSERT INTO db_meta (key, value) VALUES ('pending', '1')")
+        assert reader.execute("SELECT 1 FROM db_meta WHERE key='pending'").fetchone() is None
+
+        temp_db.commit()
+        assert reader.execute("SELECT 1 FROM db_meta WHERE key='pending'").fetchone() is not None
+
+    def test_write_transaction_commits_and_rolls_back(self, temp_db):
+        with db_mod.write_transaction() as conn:
+            conn.execute("INSERT INTO db_meta (key, value) VALUES ('kept', '1')")
+
+        with pytest.raises(RuntimeError):
+            with db_mod.write_transaction() as conn:
+                conn.execute("INSERT INTO db_meta (key, value) VALUES ('dropped', '1')")
+                raise RuntimeError("abort")
+
+        keys = {r[0] for r in db_mod.get_read_connection().execute("SELECT key FROM db_meta")}
+        assert "kept" in keys
+        assert "dropped" not in keys
+
+    def test_nested_write_transaction_commits_with_the_outer_block(self, temp_db):
+        reader = db_mod.get_read_connection()
+        with db_mod.write_transaction() as conn:
+            with db_mod.write_transaction() as nested:
+                nested.execute("INSERT INTO db_meta (key, value) VALUES ('inner', '1')")
+            assert reader.execute("SELECT 1 FROM db_meta WHERE key='inner'").fetchone() is None
+            conn.execute("INSERT INTO db_meta (key, value) VALUES ('outer', '1')")
+
+        keys = {r[0] for r in reader.execute("SELECT key FROM db_meta")}
+        assert {"inner", "outer"} <= keys
+
+    def test_failed_nested_write_transaction_only_rolls_back_itself(self, temp_db):
+        with db_mod.write_transaction() as conn:
+            conn.execute("INSERT INTO db_meta (key, value) VALUES ('before', '1')")
+            with pytest.raises(RuntimeError):
+                with db_mod.write_transaction() as nested:
+                    nested.execute("INSERT INTO db_meta (key, value) VALUES ('inner', '1')")
+                    raise RuntimeError("abort")
+            conn.execute("INSERT INTO db_meta (key, value) VALUES ('after', '1')")
+
+        with pytest.raises(RuntimeError):
+            with db_mod.write_transaction():
+                with db_mod.write_transaction() as nested:
+                    nested.execute("INSERT INTO db_meta (key, value) VALUES ('discarded', '1')")
+                raise RuntimeError("abort")
+
+        keys = {r[0] for r in db_mod.get_read_connection().execute("SELECT key FROM db_meta")}
+        assert {"before", "after"} <= keys
+        assert not {"inner", "discarded"} & keys
+
+    def test_concurrent_write_transactions_do_not_interleave(self, temp_db):
+        errors = []
+
+        def writer(n):
+            try:
+                for i in range(20):
+                    with db_mod.write_transaction() as conn:
+                        conn.execute(
+                            "INSERT INTO db_meta (key, value) VALUES (?, ?)", (f"{n}-{i}", "x")
+                        )
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=writer, args=(n,)) for n in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert errors == []
+        count = temp_db.execute("SELECT COUNT(*) FROM db_meta WHERE value='x'").fetchone()[0]
+        assert count == 80
+
+    def test_query_stats_group_by_normalized_sql(self, temp_db):
+        db_mod.reset_query_stats()
+        for key in ("a", "b", "c"):
+            temp_db.execute("SELECT   value FROM db_meta\n WHERE key=?", (key,)).fetchall()
+
+        stats = {s["sql"]: s for s in db_mod.get_query_stats()}
+        entry = stats["SELECT value FROM db_meta WHERE key=?"]
+        assert entry["count"] == 3
+        assert entry["total"] >= entry["max"] >= 0
+
+    def test_patched_writer_is_used_for_reads(self, temp_db, monkeypatch):
+        memory = sqlite3.connect(":memory:")
+        monkeypatch.setattr(db_mod, "get_connection", lambda: memory)
+
+        assert db_mod.get_read_connection() is memory
+        memory.close()
+
+
+def _insert_track(conn, filepath, **fields):
+    cols = ["filepath", "scanned_at"] + list(fields.keys())
+    conn.execute(
+        f"INSERT INTO media_tracks ({', '.join(cols)}) VALUES ({', '.join('?' * len(cols))})",
+        [filepath, 0] + list(fields.values()),
+    )
+
+
+def _fts_paths(conn, query):
+    return sorted(
+        r[0] for r in conn.execute(
+            "SELECT m.filepath FROM media_tracks_fts f JOIN media_tracks m ON m.rowid = f.rowid "
+            "WHERE media_tracks_fts MATCH ?",
+            (query,),
+        )
+    )
+
+
+@pytest.mark.unit
+class TestSearchIndex:
+    def test_index_matches_substrings_of_the_stored_text(self, temp_db):
+        _insert_track(temp_db, "/m/a.flac", searchable_title="symphony no. 9",
+                      searchable_composer="antonin dvorak", form="Symphony")
+        temp_db.commit()
+
+        assert db_mod.has_search_index(temp_db)
+        assert _fts_paths(temp_db, 'searchable_composer : "dvorak"') == ["/m/a.flac"]
+        assert _fts_paths(temp_db, 'searchable_title : "phony no"') == ["/m/a.flac"]
+        assert _fts_paths(temp_db, 'searchable_composer : "phony"') == []
+        # Case is not folded, as test() compares the lower-cased query to the raw form
+        assert _fts_paths(temp_db, 'form : "Symph"') == ["/m/a.flac"]
+        assert _fts_paths(temp_db, 'form : "symph"') == []
+
+    def test_triggers_follow_updates_replaces_and_deletes(self, temp_db):
+        _insert_track(temp_db, "/m/a.flac", searchable_title="nocturne")
+        _insert_track(temp_db, "/m/b.flac", searchable_title="prelude")
+        temp_db.execute("UPDATE media_tracks SET searchable_title='etude' WHERE filepath='/m/a.flac'")
+        temp_db.execute(
+            "INSERT OR REPLACE INTO media_tracks (filepath, searchable_title, scanned_at) VALUES ('/m/b.flac', 'ballade', 1)"
+        )
+        temp_db.commit()
+
+        assert _fts_paths(temp_db, 'searchable_title : "nocturne"') == []
+        assert _fts_paths(temp_db, 'searchable_title : "etude"') == ["/m/a.flac"]
+        assert _fts_paths(temp_db, 'searchable_title : "prelude"') == []
+        assert _fts_paths(temp_db, 'searchable_title : "ballade"') == ["/m/b.flac"]
+
+        temp_db.execute("DELETE FROM media_tracks WHERE filepath='/m/a.flac'")
+        temp_db.commit()
+        assert _fts_paths(temp_db, 'searchable_title : "etude"') == []
+        temp_db.execute("INSERT INTO media_tracks_fts(media_tracks_fts) VALUES('integrity-check')")
+
+    def test_index_is_built_for_existing_rows(self, temp_db, monkeypatch):
+        _insert_track(temp_db, "/m/a.flac", searchable_album="goldberg variations")
+        temp_db.commit()
+        monkeypatch.setattr(db_mod, "SEARCH_INDEX_VERSION", "test-rebuild")
+        temp_db.executescript(db_mod._DROP_SEARCH_INDEX)
+
+        db_mod._create_search_index(temp_db)
+
+        assert _fts_paths(temp_db, 'searchable_album : "goldberg"') == ["/m/a.flac"]
+
+    def test_added_columns_are_added_and_indexed(self, monkeypatch, tmp_path):
+        # A database created before media_tracks had the catalogue and searchable_* columns
+        path = tmp_path / "older.db"
+        old = sqlite3.connect(path)
+        added = [column for table, column, _ in db_mod._ADDED_COLUMNS if table == "media_tracks"]
+        old.executescript("\n".join(
+            line for line in db_mod._SCHEMA.splitlines()
+            if line.split()[:1] not in [[column] for column in added]
+        ))
+        old.execute("INSERT INTO media_tracks (filepath, album, scanned_at) VALUES ('/m/a.flac', 'Goldberg', 0)")
+        old.commit()
+        old.close()
+        monkeypatch.setattr(db_mod, "get_connection", _get_connection)
+        monkeypatch.setattr(db_mod, "DB_PATH", path)
+        monkeypatch.setattr(db_mod, "_connection", None)
+        monkeypatch.setattr(db_mod, "_readers", None)
+        monkeypatch.setattr(db_mod, "_seed_if_needed", lambda conn: None)
+        monkeypatch.setattr(db_mod, "_migrate_gzip_caches", lambda conn: None)
+        conn = db_mod.get_connection()
+        try:
+            conn.execute("UPDATE media_tracks SET catalogue='Goldberg Variations', searchable_album='goldberg' "
+                         "WHERE filepath='/m/a.flac'")
+            conn.commit()
+            assert _fts_paths(conn, 'catalogue : "Variations"') == ["/m/a.flac"]
+            assert _fts_paths(conn, 'searchable_album : "gold"') == ["/m/a.flac"]
+            assert conn.execute("SELECT in_library FROM media_tracks").fetchone()[0] == 0
+        finally:
+            db_mod.close_read_connections()
+            conn.close()
@@ -0,0 +1,192 @@
+"""Unit tests for the chunked streaming container in utils.encryptor.
+
+Keys are generated in-process with PersonalStandardEncryptor.generate_keypair()
+so nothing touches the host keyring.
+"""
+import os
+import struct
+
+import pytest
+
+import utils.encryptor as encryptor
+from utils.encryptor import (
+    STREAM_MAGIC,
+    PersonalStandardEncryptor,
+    SymmetricEncryptor,
+    is_stream_file,
+    symmetric_decrypt_file,
+    symmetric_decrypt_file_iter,
+    symmetric_encrypt_file,
+)
+
+_PASSPHRASE = b"unit-test-passphrase"
+
+
+@pytest.fixture(scope="module")
+def keypair():
+    return PersonalStandardEncryptor.generate_keypair()
+
+
+@pytest.fixture
+def plaintext_file(tmp_path):
+    path = tmp_path / "plain.bin"
+    # Mix of compressible text and random bytes spanning several chunks
+    data = b"".join(f"line {i}\n".encode() for i in range(5000)) + os.urandom(20000)
+    path.write_bytes(data)
+    return path, data
+
+
+@pytest.mark.unit
+class TestAsymmetricStreaming:
+    def test_round_trip_to_file(self, keypair, plaintext_file, tmp_path):
+        public_key, private_key = keypair
+        path, data = plaintext_file
+        encrypted = tmp_path / "out.enc"
+        decrypted = tmp_path / "out.bin"
+
+        PersonalStandardEncryptor.encrypt_file(public_key, str(path), str(encrypted), chunk_size=4096)
+        PersonalStandardEncryptor.decrypt_to_file(private_key, str(encrypted), str(decrypted))
+
+        assert is_stream_file(str(encrypted))
+        assert decrypted.read_bytes() == data
+
+    def test_iterator_yields_multiple_pieces(self, keypair, plaintext_file, tmp_path):
+        public_key, private_key = keypair
+        path, data = plaintext_file
+        encrypted = tmp_path / "out.enc"
+
+        PersonalStandardEncryptor.encrypt_file(
+            public_key, str(path), str(encrypted), compress=False, chunk_size=4096
+        )
+        pieces = list(PersonalStandardEncryptor.iter_decrypted_file(private_key, str(encrypted)))
+
+        assert len(pieces) > 1
+        assert max(len(p) for p in pieces) <= 4096
+        assert b"".join(pieces) == data
+
+    def test_empty_input(self, keypair, tmp_path):
+        public_key, private_key = keypair
+        path = tmp_path / "empty.bin"
+        path.write_bytes(b"")
+        encrypted = tmp_path / "empty.enc"
+
+        PersonalStandardEncryptor.encrypt_file(public_key, str(path), str(encrypted))
+
+        assert PersonalStandardEncryptor.decrypt_data_from_file(private_key, str(encrypted)) == b""
+
+    def test_legacy_single_message_file_still_decrypts(self, keypair, tmp_path):
+        public_key, private_key = keypair
+        encrypted = tmp_path / "legacy.enc"
+        decrypted = tmp_path / "legacy.bin"
+
+        PersonalStandardEncryptor.encrypt_data(b"legacy payload" * 10, public_key, str(encrypted))
+        PersonalStandardEncryptor.decrypt_to_file(private_key, str(encrypted), str(decrypted))
+
+        assert not is_stream_file(str(encrypted))
+        assert decrypted.read_bytes() == b"legacy payload" * 10
+        assert list(PersonalStandardEncryptor.iter_decrypted_file(private_key, str(encrypted))) == [
+            b"legacy payload" * 10
+        ]
+
+    def test_truncated_stream_is_rejected(self, keypair, plaintext_file, tmp_path):
+        public_key, private_key = keypair
+        path, _ = plaintext_file
+        encrypted = tmp_path / "out.enc"
+        decrypted = tmp_path / "out.bin"
+        PersonalStandardEncryptor.encrypt_file(
+            public_key, str(path), str(encrypted), compress=False, chunk_size=4096
+        )
+        raw = encrypted.read_bytes()
+        encrypted.write_bytes(raw[: len(raw) // 2])
+
+        with pytest.raises(Exception):
+            PersonalStandardEncryptor.decrypt_to_file(private_key, str(encrypted), str(decrypted))
+        assert not decrypted.exists()
+
+    def test_tampered_chunk_is_rejected(self, keypair, plaintext_file, tmp_path):
+        public_key, private_key = keypair
+        path, _ = plaintext_file
+        encrypted = tmp_path / "out.enc"
+        PersonalStandardEncryptor.encrypt_file(public_key, str(path), str(encrypted), chunk_size=4096)
+        raw = bytearray(encrypted.read_bytes())
+        raw[-20] ^= 0xFF
+        encrypted.write_bytes(bytes(raw))
+
+        with pytest.raises(Exception):
+            PersonalStandardEncryptor.decrypt_data_from_file(private_key, str(encrypted))
+
+
+    def test_highly_compressible_chunks_decompress_in_bounded_pieces(self, keypair, tmp_path):
+        public_key, private_key = keypair
+        path = tmp_path / "zeros.bin"
+        path.write_bytes(bytes(2 * 1024 * 1024))
+        encrypted = tmp_path / "zeros.enc"
+
+        PersonalStandardEncryptor.encrypt_file(public_key, str(path), str(encrypted), chunk_size=4096)
+        pieces = list(PersonalStandardEncryptor.iter_decrypted_file(private_key, str(encrypted)))
+
+        assert max(len(p) for p in pieces) <= 4096
+        assert b"".join(pieces) == bytes(2 * 1024 * 1024)
+
+    def test_chunk_length_beyond_the_chunk_size_is_rejected(self, keypair, plaintext_file, tmp_path):
+        public_key, private_key = keypair
+        path, _ = plaintext_file
+        encrypted = tmp_path / "out.enc"
+        PersonalStandardEncryptor.encrypt_file(public_key, str(path), str(encrypted), chunk_size=4096)
+        with open(encrypted, "rb") as f:
+            header = encryptor._read_stream_header(f)[0]
+        raw = bytearray(encrypted.read_bytes())
+        struct.pack_into(">I", raw, len(header) + 1, 0xFFFFFFFF)
+        encrypted.write_bytes(bytes(raw))
+
+        with pytest.raises(ValueError, match="larger than the chunk size"):
+            PersonalStandardEncryptor.decrypt_data_from_file(private_key, str(encrypted))
+
+    def test_failed_encryption_leaves_the_existing_output(self, keypair, plaintext_file, tmp_path, monkeypatch):
+        public_key, _ = keypair
+        path, _ = plaintext_file
+        encrypted = tmp_path / "out.enc"
+        encrypted.write_bytes(b"previous")
+
+        def fail(*args, **kwargs):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(encryptor, "_stream_encrypt", fail)
+        with pytest.raises(OSError):
+            PersonalStandardEncryptor.encrypt_file(public_key, str(path), str(encrypted))
+
+        assert encrypted.read_bytes() == b"previous"
+        assert list(tmp_path.glob("*.part")) == []
+
+
+@pytest.mark.unit
+class TestSymmetricStreaming:
+    def test_round_trip(self, plaintext_file, tmp_path):
+        path, data = plaintext_file
+        encrypted = tmp_path / "sym.enc"
+        decrypted = tmp_path / "sym.bin"
+
+        symmetric_encrypt_file(str(path), str(encrypted), _PASSPHRASE, chunk_size=4096)
+        symmetric_decrypt_file(str(encrypted), str(decrypted), _PASSPHRASE)
+
+        assert encrypted.read_bytes().startswith(STREAM_MAGIC)
+        assert decrypted.read_bytes() == data
+        assert b"".join(symmetric_decrypt_file_iter(str(encrypted), _PASSPHRASE)) == data
+        assert SymmetricEncryptor.decrypt_data(str(encrypted), _PASSPHRASE) == data
+
+    def test_legacy_file_still_decrypts(self, tmp_path):
+        encrypted = tmp_path / "legacy.enc"
+        decrypted = tmp_path / "legacy.bin"
+        SymmetricEncryptor.encrypt_data(b"blacklist data", _PASSPHRASE, str(encrypted))
+
+        symmetric_decrypt_file(str(encrypted), str(decrypted), _PASSPHRASE)
+
+        assert decrypted.read_bytes() == b"blacklist data"
+
+    def test_wrong_passphrase_is_rejected(self, plaintext_file, tmp_path):
+        path, _ = plaintext_file
+        encrypted = tmp_path / "sym.enc"
+        symmetric_encrypt_file(str(path), str(encrypted), _PASSPHRASE)
+
+        with pytest.raises(Exception):
+            SymmetricEncryptor.decrypt_data(str(encrypted), b"wrong")
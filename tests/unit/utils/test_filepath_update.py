@@ -90,7 +90,7 @@ class TestRemapUnder:
 
 
 # ---------------------------------------------------------------------------
-# Gap #1: _db_directory re-keys nested directories rows
+# Gap #1: propagate_directory_rename re-keys nested directories rows
 # ---------------------------------------------------------------------------
 
 class TestDbDirectory:
@@ -99,8 +99,8 @@ class TestDbDirectory:
         conn.execute("INSERT INTO directories VALUES (?, ?, ?)", (P_ARTIST, "[]", 1.0))
         conn.commit()
 
-        from utils.filepath_update import _db_directory
-        _db_directory(P_ARTIST, P_ARTIST2)
+        from utils.filepath_update import propagate_directory_rename
+        propagate_directory_rename(P_ARTIST, P_ARTIST2)
 
         paths = _all_paths(conn)
         assert os.path.normpath(P_ARTIST2) in paths
@@ -112,8 +112,8 @@ class TestDbDirectory:
         conn.execute("INSERT INTO directories VALUES (?, ?, ?)", (P_ALBUM, "[]", 1.0))
         conn.commit()
 
-        from utils.filepath_update import _db_directory
-        _db_directory(P_ARTIST, P_ARTIST2)
+        from utils.filepath_update import propagate_directory_rename
+        propagate_directory_rename(P_ARTIST, P_ARTIST2)
 
         paths = _all_paths(conn)
         assert os.path.normpath("/music/Artist2/Album") in paths
@@ -127,8 +127,8 @@ class TestDbDirectory:
         )
         conn.commit()
 
-        from utils.filepath_update import _db_directory
-        _db_directory(P_ARTIST, P_ARTIST2)
+        from utils.filepath_update import propagate_directory_rename
+        propagate_directory_rename(P_ARTIST, P_ARTIST2)
 
         new_album = os.path.normpath("/music/Artist2/Album")
         files = _dir_files(conn, new_album)
@@ -143,8 +143,8 @@ class TestDbDirectory:
         conn.execute("INSERT INTO directories VALUES (?, ?, ?)", (other, "[]", 1.0))
         conn.commit()
 
-        from utils.filepath_update import _db_directory
-        _db_directory(P_ARTIST, P_ARTIST2)
+        from utils.filepath_update import propagate_directory_rename
+        propagate_directory_rename(P_ARTIST, P_ARTIST2)
 
         assert other in _all_paths(conn)
 
@@ -153,8 +153,8 @@ class TestDbDirectory:
         conn.execute("INSERT INTO directories VALUES (?, ?, ?)", (P_ARTIST, "[]", 1.0))
         conn.commit()
 
-        from utils.filepath_update import _db_directory
-        _db_directory(P_ARTIST, P_ARTIST2)
+        from utils.filepath_update import propagate_directory_rename
+        propagate_directory_rename(P_ARTIST, P_ARTIST2)
 
         new_artist = os.path.normpath(P_ARTIST2)
         files = _dir_files(conn, new_artist)
@@ -162,53 +162,53 @@ class TestDbDirectory:
 
 
 # ---------------------------------------------------------------------------
-# Gap #2: _patch_descriptor_dict_* (pure function — no fixtures needed)
+# Gap #2: _remap_descriptor (pure function — no fixtures needed)
 # ---------------------------------------------------------------------------
 
 class TestPatchDescriptorDict:
     def test_file_updates_matching_filepath(self):
-        from utils.filepath_update import _patch_descriptor_dict_file
+        from utils.filepath_update import PathRemapper, _remap_descriptor
 
         data = {"track_filepaths": [P_TRACK, "/other/track.flac"]}
-        changed = _patch_descriptor_dict_file(data, P_TRACK, P_TRACK_NEW)
+        changed = _remap_descriptor(data, PathRemapper({P_TRACK: P_TRACK_NEW}))
         assert changed
         assert data["track_filepaths"] == [P_TRACK_NEW, "/other/track.flac"]
 
     def test_file_no_match_leaves_data_unchanged(self):
-        from utils.filepath_update import _patch_descriptor_dict_file
+        from utils.filepath_update import PathRemapper, _remap_descriptor
 
         data = {"track_filepaths": ["/other/track.flac"]}
-        changed = _patch_descriptor_dict_file(data, P_TRACK, P_TRACK_NEW)
+        changed = _remap_descriptor(data, PathRemapper({P_TRACK: P_TRACK_NEW}))
         assert not changed
         assert data["track_filepaths"] == ["/other/track.flac"]
 
     def test_file_missing_track_filepaths_key_returns_false(self):
-        from utils.filepath_update import _patch_descriptor_dict_file
+        from utils.filepath_update import PathRemapper, _remap_descriptor
 
         data = {}
-        assert not _patch_descriptor_dict_file(data, P_TRACK, P_TRACK_NEW)
+        assert not _remap_descriptor(data, PathRemapper({P_TRACK: P_TRACK_NEW}))
 
     def test_dir_remaps_track_filepaths(self):
-        from utils.filepath_update import _patch_descriptor_dict_dir
+        from utils.filepath_update import PathRemapper, _remap_descriptor
 
         data = {"track_filepaths": [P_TRACK]}
-        changed = _patch_descriptor_dict_dir(data, P_ARTIST, P_ARTIST2)
+        changed = _remap_descriptor(data, PathRemapper({P_ARTIST: P_ARTIST2}))
         assert changed
         assert any("Artist2" in f for f in data["track_filepaths"])
 
     def test_dir_remaps_source_directories(self):
-        from utils.filepath_update import _patch_descriptor_dict_dir
+        from utils.filepath_update import PathRemapper, _remap_descriptor
 
         data = {"source_directories": [P_ARTIST]}
-        changed = _patch_descriptor_dict_dir(data, P_ARTIST, P_ARTIST2)
+        changed = _remap_descriptor(data, PathRemapper({P_ARTIST: P_ARTIST2}))
         assert changed
         assert any("Artist2" in d for d in data["source_directories"])
 
     def test_dir_no_match_returns_false(self):
-        from utils.filepath_update import _patch_descriptor_dict_dir
+        from utils.filepath_update import PathRemapper, _remap_descriptor
 
         data = {"track_filepaths": ["/other/Artist/track.flac"]}
-        assert not _patch_descriptor_dict_dir(data, P_ARTIST, P_ARTIST2)
+        assert not _remap_descriptor(data, PathRemapper({P_ARTIST: P_ARTIST2}))
 
 
 # ---------------------------------------------------------------------------
@@ -218,60 +218,60 @@ class TestPatchDescriptorDict:
 class TestPlaylistDescriptorsCache:
     def test_file_rename_updates_playlist_descriptor(self):
         from utils.app_info_cache import app_info_cache
-        from utils.filepath_update import _playlist_descriptors_file
+        from utils.filepath_update import propagate_file_rename
 
         desc = {"track_filepaths": [P_TRACK]}
         app_info_cache.set("playlist_descriptors", {"list_a": desc})
 
-        _playlist_descriptors_file(P_TRACK, P_TRACK_NEW)
+        propagate_file_rename(P_TRACK, P_TRACK_NEW)
 
         raw = app_info_cache.get("playlist_descriptors", {})
         assert raw["list_a"]["track_filepaths"] == [P_TRACK_NEW]
 
     def test_file_rename_updates_recent_descriptor(self):
         from utils.app_info_cache import app_info_cache
-        from utils.filepath_update import _playlist_descriptors_file
+        from utils.filepath_update import propagate_file_rename
 
         recent = [{"track_filepaths": [P_TRACK]}]
         app_info_cache.set("recent_playlist_descriptors", recent)
 
-        _playlist_descriptors_file(P_TRACK, P_TRACK_NEW)
+        propagate_file_rename(P_TRACK, P_TRACK_NEW)
 
         stored = app_info_cache.get("recent_playlist_descriptors", [])
         assert stored[0]["track_filepaths"] == [P_TRACK_NEW]
 
     def test_directory_rename_updates_track_filepaths(self):
         from utils.app_info_cache import app_info_cache
-        from utils.filepath_update import _playlist_descriptors_directory
+        from utils.filepath_update import propagate_directory_rename
 
         desc = {"track_filepaths": [P_TRACK]}
         app_info_cache.set("playlist_descriptors", {"list_a": desc})
 
-        _playlist_descriptors_directory(P_ARTIST, P_ARTIST2)
+        propagate_directory_rename(P_ARTIST, P_ARTIST2)
 
         raw = app_info_cache.get("playlist_descriptors", {})
         assert any("Artist2" in f for f in raw["list_a"]["track_filepaths"])
 
     def test_directory_rename_updates_source_directories(self):
         from utils.app_info_cache import app_info_cache
-        from utils.filepath_update import _playlist_descriptors_directory
+        from utils.filepath_update import propagate_directory_rename
 
         desc = {"source_directories": [P_ARTIST]}
         app_info_cache.set("playlist_descriptors", {"list_a": desc})
 
-        _playlist_descriptors_directory(P_ARTIST, P_ARTIST2)
+        propagate_directory_rename(P_ARTIST, P_ARTIST2)
 
         raw = app_info_cache.get("playlist_descriptors", {})
         assert any("Artist2" in d for d in raw["list_a"]["source_directories"])
 
     def test_no_match_does_not_mutate_descriptor(self):
         from utils.app_info_cache import app_info_cache
-        from utils.filepath_update import _playlist_descriptors_file
+        from utils.filepath_update import propagate_file_rename
 
         desc = {"track_filepaths": ["/some/other/track.flac"]}
         app_info_cache.set("playlist_descriptors", {"list_a": desc})
 
-        _playlist_descriptors_file(P_TRACK, P_TRACK_NEW)
+        propagate_file_rename(P_TRACK, P_TRACK_NEW)
 
         raw = app_info_cache.get("playlist_descriptors", {})
         assert raw["list_a"]["track_filepaths"] == ["/some/other/track.flac"]
@@ -291,40 +291,40 @@ class TestSessionDescriptor:
 
     def test_file_rename_patches_session_descriptor(self):
         from utils.app_info_cache import app_info_cache
-        from utils.filepath_update import _session_file
+        from utils.filepath_update import propagate_file_rename
 
         session = self._make_session({"track_filepaths": [P_TRACK]})
         app_info_cache.set("last_playback_session", session)
 
-        _session_file(P_TRACK, P_TRACK_NEW)
+        propagate_file_rename(P_TRACK, P_TRACK_NEW)
 
         stored = app_info_cache.get("last_playback_session")
         assert stored["descriptor"]["track_filepaths"] == [P_TRACK_NEW]
 
     def test_directory_rename_patches_session_descriptor(self):
         from utils.app_info_cache import app_info_cache
-        from utils.filepath_update import _session_directory
+        from utils.filepath_update import propagate_directory_rename
 
         session = self._make_session({"track_filepaths": [P_TRACK]})
         app_info_cache.set("last_playback_session", session)
 
-        _session_directory(P_ARTIST, P_ARTIST2)
+        propagate_directory_rename(P_ARTIST, P_ARTIST2)
 
         stored = app_info_cache.get("last_playback_session")
         assert any("Artist2" in f for f in stored["descriptor"]["track_filepaths"])
 
     def test_no_descriptor_key_does_not_raise(self):
         from utils.app_info_cache import app_info_cache
-        from utils.filepath_update import _session_file
+        from utils.filepath_update import propagate_file_rename
 
         session = {"current_track_filepath": P_TRACK, "resolved_tracks": []}
         app_info_cache.set("last_playback_session", session)
 
-        _session_file(P_TRACK, P_TRACK_NEW)  # must not raise
+        propagate_file_rename(P_TRACK, P_TRACK_NEW)  # must not raise
 
 
 # ---------------------------------------------------------------------------
-# Gap #3: _db_dir_json_file — same-dir rename and cross-dir move
+# Gap #3: propagate_file_rename — same-dir rename and cross-dir move
 # ---------------------------------------------------------------------------
 
 class TestDbDirJsonFile:
@@ -336,8 +336,8 @@ class TestDbDirJsonFile:
         )
         conn.commit()
 
-        from utils.filepath_update import _db_dir_json_file
-        _db_dir_json_file(P_TRACK, P_TRACK_NEW)
+        from utils.filepath_update import propagate_file_rename
+        propagate_file_rename(P_TRACK, P_TRACK_NEW)
 
         files = _dir_files(conn, P_ALBUM)
         assert P_TRACK_NEW in files
@@ -352,8 +352,8 @@ class TestDbDirJsonFile:
         conn.execute("INSERT INTO directories VALUES (?, ?, ?)", (P_ALBUM2, "[]", 1.0))
         conn.commit()
 
-        from utils.filepath_update import _db_dir_json_file
-        _db_dir_json_file(P_TRACK, P_TRACK_XDIR)
+        from utils.filepath_update import propagate_file_rename
+        propagate_file_rename(P_TRACK, P_TRACK_XDIR)
 
         files = _dir_files(conn, P_ALBUM)
         assert P_TRACK not in files
@@ -371,8 +371,8 @@ class TestDbDirJsonFile:
         )
         conn.commit()
 
-        from utils.filepath_update import _db_dir_json_file
-        _db_dir_json_file(P_TRACK, P_TRACK_XDIR)
+        from utils.filepath_update import propagate_file_rename
+        propagate_file_rename(P_TRACK, P_TRACK_XDIR)
 
         files = _dir_files(conn, P_ALBUM2)
         assert P_TRACK_XDIR in files
@@ -387,8 +387,8 @@ class TestDbDirJsonFile:
         conn.commit()
         # P_ALBUM2 has no directories row yet
 
-        from utils.filepath_update import _db_dir_json_file
-        _db_dir_json_file(P_TRACK, P_TRACK_XDIR)
+        from utils.filepath_update import propagate_file_rename
+        propagate_file_rename(P_TRACK, P_TRACK_XDIR)
 
         files = _dir_files(conn, P_ALBUM2)
         assert files is not None
@@ -406,25 +406,25 @@ class TestDbDirJsonFile:
         )
         conn.commit()
 
-        from utils.filepath_update import _db_dir_json_file
-        _db_dir_json_file(P_TRACK, P_TRACK_XDIR)
+        from utils.filepath_update import propagate_file_rename
+        propagate_file_rename(P_TRACK, P_TRACK_XDIR)
 
         files = _dir_files(conn, P_ALBUM2)
         assert files.count(P_TRACK_XDIR) == 1
 
 
 # ---------------------------------------------------------------------------
-# Gap #3: _lib_file — DIRECTORIES_CACHE updates (no DB fixture needed)
+# Gap #3: propagate_file_rename — DIRECTORIES_CACHE updates (no DB fixture needed)
 # ---------------------------------------------------------------------------
 
 class TestLibFileCross:
     def test_same_dir_rename_updates_cache_entry(self):
         from library_data.library_data import LibraryData
-        from utils.filepath_update import _lib_file
+        from utils.filepath_update import propagate_file_rename
 
         LibraryData.DIRECTORIES_CACHE[P_ALBUM] = [P_TRACK]
 
-        _lib_file(P_TRACK, P_TRACK_NEW)
+        propagate_file_rename(P_TRACK, P_TRACK_NEW)
 
         files = LibraryData.DIRECTORIES_CACHE[P_ALBUM]
         assert P_TRACK_NEW in files
@@ -432,24 +432,24 @@ class TestLibFileCross:
 
     def test_cross_dir_removes_from_source_cache(self):
         from library_data.library_data import LibraryData
-        from utils.filepath_update import _lib_file
+        from utils.filepath_update import propagate_file_rename
 
         LibraryData.DIRECTORIES_CACHE[P_ALBUM] = [P_TRACK]
         LibraryData.DIRECTORIES_CACHE[P_ALBUM2] = []
 
-        _lib_file(P_TRACK, P_TRACK_XDIR)
+        propagate_file_rename(P_TRACK, P_TRACK_XDIR)
 
         assert P_TRACK not in LibraryData.DIRECTORIES_CACHE[P_ALBUM]
 
     def test_cross_dir_appends_to_existing_dest_cache(self):
         from library_data.library_data import LibraryData
-        from utils.filepath_update import _lib_file
+        from utils.filepath_update import propagate_file_rename
 
         other = "/music/Artist/Album2/other.flac"
         LibraryData.DIRECTORIES_CACHE[P_ALBUM] = [P_TRACK]
         LibraryData.DIRECTORIES_CACHE[P_ALBUM2] = [other]
 
-        _lib_file(P_TRACK, P_TRACK_XDIR)
+        propagate_file_rename(P_TRACK, P_TRACK_XDIR)
 
         files = LibraryData.DIRECTORIES_CACHE[P_ALBUM2]
         assert P_TRACK_XDIR in files
@@ -457,12 +457,12 @@ class TestLibFileCross:
 
     def test_cross_dir_creates_dest_cache_entry_when_absent(self):
         from library_data.library_data import LibraryData
-        from utils.filepath_update import _lib_file
+        from utils.filepath_update import propagate_file_rename
 
         LibraryData.DIRECTORIES_CACHE[P_ALBUM] = [P_TRACK]
         # P_ALBUM2 deliberately absent
 
-        _lib_file(P_TRACK, P_TRACK_XDIR)
+        propagate_file_rename(P_TRACK, P_TRACK_XDIR)
 
         assert P_ALBUM2 in LibraryData.DIRECTORIES_CACHE
         assert P_TRACK_XDIR in LibraryData.DIRECTORIES_CACHE[P_ALBUM2]
@@ -553,6 +553,26 @@ class TestLibFileDelete:
         assert P_TRACK not in LibraryData.DIRECTORIES_CACHE[P_ALBUM]
         assert other in LibraryData.DIRECTORIES_CACHE[P_ALBUM]
 
+    def test_cached_track_is_removed_without_comparing_other_paths(self, monkeypatch):
+        from types import SimpleNamespace
+        from library_data.library_data import LibraryData
+        from utils import filepath_update
+        from utils.path_index import PathIndexedDict
+
+        track = SimpleNamespace(filepath=P_TRACK)
+        others = [SimpleNamespace(filepath=f"/music/Other/Album/{i:02d} Track.flac") for i in range(3)]
+        LibraryData.MEDIA_TRACK_CACHE = PathIndexedDict({t.filepath: t for t in others + [track]})
+        LibraryData.all_tracks = [others[0], track, others[1], others[2]]
+        normalized = []
+        norm = filepath_update._norm
+        monkeypatch.setattr(filepath_update, "_norm", lambda p: normalized.append(p) or norm(p))
+
+        filepath_update._lib_file_delete(P_TRACK)
+
+        assert LibraryData.all_tracks == [others[0], others[1], others[2]]
+        assert P_TRACK not in LibraryData.MEDIA_TRACK_CACHE and len(LibraryData.MEDIA_TRACK_CACHE) == 3
+        assert not any(o.filepath in normalized for o in others)
+
     def test_absent_path_is_noop(self):
         from library_data.library_data import LibraryData
         from utils.filepath_update import _lib_file_delete
@@ -719,3 +739,282 @@ class TestPlaylistDescriptorsFileDelete:
 
         raw = app_info_cache.get("playlist_descriptors", {})
         assert raw["list_a"]["track_filepaths"] == [P_TRACK_NEW]
+
+
+# ---------------------------------------------------------------------------
+# Subtree-only propagation (path_key index / PathIndexedDict)
+# ---------------------------------------------------------------------------
+
+class TestSubtreePropagation:
+    def test_db_directory_remaps_track_and_parent_paths(self, isolated_db):
+        conn = isolated_db
+        split_parent = "/music/Artist/Album/long.flac"
+        conn.execute(
+            "INSERT INTO media_tracks (filepath, parent_filepath, scanned_at) VALUES (?, ?, 1)",
+            (P_TRACK, None),
+        )
+        conn.execute(
+            "INSERT INTO media_tracks (filepath, parent_filepath, scanned_at) VALUES (?, ?, 1)",
+            ("/tmp/split/part1.flac", split_parent),
+        )
+        conn.execute(
+            "INSERT INTO media_tracks (filepath, parent_filepath, scanned_at) VALUES (?, ?, 1)",
+            ("/music/ArtistX/Album/track.flac", None),
+        )
+        conn.commit()
+
+        from utils.filepath_update import propagate_directory_rename
+        propagate_directory_rename(P_ARTIST, P_ARTIST2)
+
+        paths = {r["filepath"] for r in conn.execute("SELECT filepath FROM media_tracks")}
+        assert os.path.normpath("/music/Artist2/Album/track.flac") in paths
+        assert "/music/ArtistX/Album/track.flac" in paths
+        parent = conn.execute(
+            "SELECT parent_filepath FROM media_tracks WHERE filepath='/tmp/split/part1.flac'"
+        ).fetchone()[0]
+        assert parent == os.path.normpath("/music/Artist2/Album/long.flac")
+
+    def test_db_directory_uses_path_key_index(self, isolated_db):
+        from utils.db import path_prefix_range
+
+        low, high = path_prefix_range(P_ARTIST)
+        plan = " ".join(
+            r[3] for r in isolated_db.execute(
+                "EXPLAIN QUERY PLAN SELECT filepath FROM media_tracks "
+                "WHERE path_key >= ? AND path_key < ?",
+                (low, high),
+            )
+        )
+        assert "idx_media_tracks_path_key" in plan
+
+    def test_lib_directory_visits_indexed_subtree_only(self):
+        from types import SimpleNamespace
+        from library_data.library_data import LibraryData
+        from utils.filepath_update import propagate_directory_rename
+        from utils.path_index import PathIndexedDict
+
+        moved = SimpleNamespace(filepath=P_TRACK)
+        other = SimpleNamespace(filepath="/music/ArtistX/Album/track.flac")
+        LibraryData.MEDIA_TRACK_CACHE = PathIndexedDict({
+            P_TRACK: moved, other.filepath: other,
+        })
+        LibraryData.DIRECTORIES_CACHE = PathIndexedDict({
+            P_ALBUM: [P_TRACK], "/music/ArtistX/Album": [other.filepath],
+        })
+
+        propagate_directory_rename(P_ARTIST, P_ARTIST2)
+
+        new_track = os.path.normpath("/music/Artist2/Album/track.flac")
+        assert LibraryData.MEDIA_TRACK_CACHE[new_track] is moved
+        assert moved.filepath == new_track
+        assert other.filepath == "/music/ArtistX/Album/track.flac"
+        assert LibraryData.DIRECTORIES_CACHE[os.path.normpath("/music/Artist2/Album")] == [new_track]
+        assert "/music/ArtistX/Album" in LibraryData.DIRECTORIES_CACHE
+
+
+    def _library(self, tracks):
+        from library_data.library_data import LibraryData
+        from utils.path_index import PathIndexedDict
+
+        LibraryData.MEDIA_TRACK_CACHE = PathIndexedDict({t.filepath: t for t in tracks})
+        LibraryData.all_tracks = list(tracks)
+        LibraryData.DIRECTORIES_CACHE = PathIndexedDict()
+
+    def _remapped_paths(self, monkeypatch):
+        from utils.filepath_update import PathRemapper
+
+        remapped = []
+        remap = PathRemapper.remap
+        monkeypatch.setattr(PathRemapper, "remap", lambda self, p: remapped.append(p) or remap(self, p))
+        return remapped
+
+    def test_cached_file_rename_does_not_scan_all_tracks(self, monkeypatch):
+        from types import SimpleNamespace
+        from utils.filepath_update import PathRemapper, _bulk_lib
+
+        track = SimpleNamespace(filepath=P_TRACK)
+        others = [SimpleNamespace(filepath=f"/music/ArtistX/Album/{i}.flac") for i in range(3)]
+        self._library([track] + others)
+        remapped = self._remapped_paths(monkeypatch)
+
+        assert _bulk_lib(PathRemapper({P_TRACK: P_TRACK_NEW}), dry_run=False) == 1
+
+        assert track.filepath == os.path.normpath(P_TRACK_NEW)
+        assert remapped == [P_TRACK]
+
+    def test_directory_rename_remaps_only_tracks_under_it(self, monkeypatch):
+        from types import SimpleNamespace
+        from library_data.library_data import LibraryData
+        from utils.filepath_update import PathRemapper, _bulk_lib
+
+        track = SimpleNamespace(filepath=P_TRACK)
+        uncached = SimpleNamespace(filepath="/music/Artist/Album2/track.flac")
+        others = [SimpleNamespace(filepath=f"/music/ArtistX/Album/{i}.flac") for i in range(3)]
+        self._library([track] + others)
+        LibraryData.all_tracks.append(uncached)
+        remapped = self._remapped_paths(monkeypatch)
+
+        _bulk_lib(PathRemapper({P_ARTIST: P_ARTIST2}), dry_run=False)
+
+        assert uncached.filepath == os.path.normpath("/music/Artist2/Album2/track.flac")
+        assert track.filepath == os.path.normpath("/music/Artist2/Album/track.flac")
+        assert not any(o.filepath in remapped for o in others)
+
+
+# ---------------------------------------------------------------------------
+# Bulk renames (propagate_renames)
+# ---------------------------------------------------------------------------
+
+class TestPropagateRenames:
+    def _seed_db(self, conn):
+        conn.execute(
+            "INSERT INTO media_tracks (filepath, parent_filepath, scanned_at) VALUES (?, NULL, 1)",
+            (P_TRACK,),
+        )
+        conn.execute(
+            "INSERT INTO media_tracks (filepath, parent_filepath, scanned_at) VALUES (?, NULL, 1)",
+            ("/music/Other/Album/a.flac",),
+        )
+        conn.execute("INSERT INTO directories VALUES (?, ?, ?)", (P_ALBUM, json.dumps([P_TRACK]), 1.0))
+        conn.execute(
+            "INSERT INTO directories VALUES (?, ?, ?)",
+            ("/music/Other/Album", json.dumps(["/music/Other/Album/a.flac"]), 1.0),
+        )
+        conn.commit()
+
+    def test_remapper_prefers_exact_match_then_nearest_ancestor(self):
+        from utils.filepath_update import PathRemapper
+
+        remapper = PathRemapper({P_ARTIST: P_ARTIST2, P_TRACK: "/music/Moved/track.flac"})
+
+        assert remapper.remap(P_TRACK) == os.path.normpath("/music/Moved/track.flac")
+        assert remapper.remap("/music/Artist/Album/b.flac") == os.path.normpath("/music/Artist2/Album/b.flac")
+        unrelated = "/music/Artist3/x.flac"
+        assert remapper.remap(unrelated) is unrelated
+
+    def test_file_and_directory_renames_applied_to_db_in_one_pass(self, isolated_db):
+        from utils.filepath_update import propagate_renames
+
+        self._seed_db(isolated_db)
+        report = propagate_renames({
+            P_TRACK: P_TRACK_XDIR,
+            "/music/Other": "/music/Renamed",
+        })
+
+        assert report.errors == {}
+        paths = {r["filepath"] for r in isolated_db.execute("SELECT filepath FROM media_tracks")}
+        assert paths == {os.path.normpath(P_TRACK_XDIR), os.path.normpath("/music/Renamed/Album/a.flac")}
+        assert _dir_files(isolated_db, P_ALBUM) == []
+        assert _dir_files(isolated_db, os.path.normpath(P_ALBUM2)) == [os.path.normpath(P_TRACK_XDIR)]
+        assert _dir_files(isolated_db, os.path.normpath("/music/Renamed/Album")) == [
+            os.path.normpath("/music/Renamed/Album/a.flac")
+        ]
+        assert "/music/Other/Album" not in _all_paths(isolated_db)
+
+    def test_db_failure_rolls_back_every_change(self, isolated_db):
+        from utils.filepath_update import propagate_renames
+
+        self._seed_db(isolated_db)
+        # Second rename targets an existing primary key, so the batch must fail as a whole
+        report = propagate_renames({
+            "/music/Other/Album/a.flac": "/music/Other/Album/b.flac",
+            P_TRACK: "/music/Other/Album/b.flac",
+        })
+
+        assert "db" in report.errors
+        paths = {r["filepath"] for r in isolated_db.execute("SELECT filepath FROM media_tracks")}
+        assert paths == {P_TRACK, "/music/Other/Album/a.flac"}
+
+    def test_dry_run_reports_changes_without_writing(self, isolated_db, monkeypatch):
+        from library_data.library_data import LibraryData
+        from types import SimpleNamespace
+        from utils.app_info_cache import app_info_cache
+        from utils.filepath_update import propagate_renames
+        from utils.path_index import PathIndexedDict
+
+        self._seed_db(isolated_db)
+        track = SimpleNamespace(filepath=P_TRACK)
+        LibraryData.MEDIA_TRACK_CACHE = PathIndexedDict({P_TRACK: track})
+        favorites = [{"filepath": P_TRACK}]
+        app_info_cache.set("favorites", favorites)
+        stores = []
+        monkeypatch.setattr(app_info_cache, "store", lambda: stores.append(1))
+
+        report = propagate_renames({P_ARTIST: P_ARTIST2}, dry_run=True)
+
+        assert report.dry_run
+        assert report.changes["db"] > 0
+        assert report.changes["LibraryData"] == 1
+        assert report.changes["Favorites"] == 1
+        assert {r["filepath"] for r in isolated_db.execute("SELECT filepath FROM media_tracks")} == {
+            P_TRACK, "/music/Other/Album/a.flac"
+        }
+        assert track.filepath == P_TRACK
+        assert app_info_cache.get("favorites") == [{"filepath": P_TRACK}]
+        assert stores == []
+
+    def test_dry_run_reads_without_taking_the_write_lock(self, isolated_db, monkeypatch):
+        import utils.db as db_mod
+        from utils.filepath_update import propagate_renames
+
+        self._seed_db(isolated_db)
+
+        def no_writes():
+            raise AssertionError("dry run opened a write transaction")
+
+        monkeypatch.setattr(db_mod, "write_transaction", no_writes)
+
+        report = propagate_renames({P_ARTIST: P_ARTIST2}, dry_run=True)
+
+        assert report.errors == {}
+        assert report.changes["db"] == 3  # track, album row removed, album row added
+
+    def test_single_path_functions_go_through_propagate_renames(self, monkeypatch):
+        import utils.filepath_update as fu
+
+        calls = []
+        monkeypatch.setattr(fu, "propagate_renames", lambda mapping: calls.append(mapping))
+
+        fu.propagate_file_rename(P_TRACK, P_TRACK_NEW)
+        fu.propagate_directory_rename(P_ARTIST, P_ARTIST2)
+
+        assert calls == [{P_TRACK: P_TRACK_NEW}, {P_ARTIST: P_ARTIST2}]
+
+    def test_app_info_cache_stored_once_for_many_renames(self, monkeypatch):
+        from muse.playlist import Playlist
+        from utils.app_info_cache import app_info_cache
+        from utils.filepath_update import propagate_renames
+
+        mapping = {f"/music/A/Album/{i}.flac": f"/music/A/Album/renamed_{i}.flac" for i in range(5)}
+        Playlist.recently_played_filepaths = list(mapping)
+        app_info_cache.set("favorites", [{"filepath": p} for p in mapping])
+        stores = []
+        monkeypatch.setattr(app_info_cache, "store", lambda: stores.append(1))
+
+        report = propagate_renames(mapping)
+
+        assert stores == [1]
+        assert report.changes["Favorites"] == 5
+        assert Playlist.recently_played_filepaths == [os.path.normpath(p) for p in mapping.values()]
+        assert [f["filepath"] for f in app_info_cache.get("favorites")] == [
+            os.path.normpath(p) for p in mapping.values()
+        ]
+
+    def test_lib_caches_swap_names_without_losing_tracks(self):
+        from types import SimpleNamespace
+        from library_data.library_data import LibraryData
+        from utils.filepath_update import propagate_renames
+        from utils.path_index import PathIndexedDict
+
+        a = "/music/Artist/Album/a.flac"
+        b = "/music/Artist/Album/b.flac"
+        track_a, track_b = SimpleNamespace(filepath=a), SimpleNamespace(filepath=b)
+        LibraryData.MEDIA_TRACK_CACHE = PathIndexedDict({a: track_a, b: track_b})
+        LibraryData.all_tracks = [track_a, track_b]
+        LibraryData.DIRECTORIES_CACHE = PathIndexedDict({P_ALBUM: [a, b]})
+
+        propagate_renames({a: b, b: a})
+
+        assert LibraryData.MEDIA_TRACK_CACHE[b] is track_a
+        assert LibraryData.MEDIA_TRACK_CACHE[a] is track_b
+        assert LibraryData.DIRECTORIES_CACHE[P_ALBUM] == [b, a]
@@ -0,0 +1,63 @@
+"""Unit tests for utils.path_index.PathIndexedDict."""
+import copy
+import os
+import pickle
+
+import pytest
+
+from utils.path_index import PathIndexedDict
+
+
+def _p(*parts):
+    return os.path.join(os.sep, *parts)
+
+
+@pytest.mark.unit
+class TestPathIndexedDict:
+    def test_keys_under_returns_only_the_subtree(self):
+        d = PathIndexedDict({
+            _p("music", "Artist"): 1,
+            _p("music", "Artist", "Album", "a.flac"): 2,
+            _p("music", "Artist", "Album2", "b.flac"): 3,
+            _p("music", "Artist2", "Album", "c.flac"): 4,
+        })
+
+        under = sorted(d.keys_under(_p("music", "Artist")))
+
+        assert under == sorted([
+            _p("music", "Artist"),
+            _p("music", "Artist", "Album", "a.flac"),
+            _p("music", "Artist", "Album2", "b.flac"),
+        ])
+        assert list(d.keys_under(_p("music", "Missing"))) == []
+
+    def test_index_follows_mutations_after_first_lookup(self):
+        d = PathIndexedDict({_p("m", "A", "x.flac"): 1})
+        assert list(d.keys_under(_p("m", "A"))) == [_p("m", "A", "x.flac")]
+
+        d[_p("m", "A", "y.flac")] = 2
+        d.pop(_p("m", "A", "x.flac"))
+        del d[_p("m", "A", "y.flac")]
+        d.setdefault(_p("m", "B", "z.flac"), 3)
+
+        assert list(d.keys_under(_p("m", "A"))) == []
+        assert list(d.keys_under(_p("m"))) == [_p("m", "B", "z.flac")]
+
+    def test_unnormalized_keys_are_found(self):
+        sep = os.sep
+        d = PathIndexedDict({
+            _p("m", "A") + sep + sep + "x.flac": 1,
+            _p("m", "A") + sep + "." + sep + "y.flac": 2,
+        })
+
+        assert len(list(d.keys_under(_p("m", "A")))) == 2
+
+    def test_pickle_and_deepcopy_keep_the_index(self):
+        d = PathIndexedDict({_p("m", "A", "x.flac"): [1]})
+        list(d.keys_under(_p("m")))
+
+        for clone in (pickle.loads(pickle.dumps(d)), copy.deepcopy(d), d.copy()):
+            assert isinstance(clone, PathIndexedDict)
+            assert clone == d
+            clone[_p("m", "A", "y.flac")] = [2]
+            assert len(list(clone.keys_under(_p("m", "A")))) == 2
@@ -0,0 +1,199 @@
+"""Unit tests for utils.persistence_service.PersistenceService."""
+import threading
+import time
+
+import pytest
+
+from utils.persistence_service import PersistenceService
+
+
+class _Recorder:
+    def __init__(self, delay=0.0, fail_times=0):
+        self.calls = 0
+        self.threads = []
+        self.delay = delay
+        self.fail_times = fail_times
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            self.calls += 1
+            self.threads.append(threading.current_thread().name)
+            should_fail = self.calls <= self.fail_times
+        if self.delay:
+            time.sleep(self.delay)
+        if should_fail:
+            raise RuntimeError("store failed")
+
+
+def _service(**kwargs):
+    kwargs.setdefault("debounce_seconds", 0.05)
+    kwargs.setdefault("max_delay_seconds", 1.0)
+    return PersistenceService(name="TestPersistence", **kwargs)
+
+
+@pytest.mark.unit
+class TestPersistenceService:
+    def test_marks_coalesce_into_single_store(self):
+        service = _service()
+        recorder = _Recorder()
+        service.register("a", recorder)
+
+        for _ in range(10):
+            service.mark_dirty("a")
+        assert service.flush(timeout=5)
+
+        assert recorder.calls == 1
+        assert recorder.threads == ["TestPersistence"]
+        assert not service.is_dirty()
+
+    def test_only_dirty_components_are_stored(self):
+        service = _service()
+        a, b = _Recorder(), _Recorder()
+        service.register("a", a)
+        service.register("b", b)
+
+        service.mark_dirty("b")
+        service.flush(timeout=5)
+
+        assert a.calls == 0
+        assert b.calls == 1
+
+    def test_group_finalizer_runs_after_group_members(self):
+        service = _service()
+        order = []
+        service.register("x", lambda: order.append("x"), group="cache")
+        service.register("y", lambda: order.append("y"), group="cache")
+        service.register_group_finalizer("cache", lambda: order.append("finalize"))
+
+        service.store_now()
+
+        assert order == ["x", "y", "finalize"]
+
+    def test_independent_groups_run_in_parallel(self):
+        service = _service(max_workers=3)
+        for name in ("a", "b", "c"):
+            service.register(name, _Recorder(delay=0.2))
+
+        start = time.monotonic()
+        service.store_now()
+
+        assert time.monotonic() - start < 0.5
+
+    def test_flush_timeout_returns_false(self):
+        service = _service()
+        service.register("slow", _Recorder(delay=0.5))
+
+        service.mark_dirty("slow")
+
+        assert service.flush(timeout=0.1) is False
+        assert service.flush(timeout=5) is True
+
+    def test_failed_component_is_retried(self):
+        service = _service()
+        recorder = _Recorder(fail_times=1)
+        service.register("flaky", recorder)
+
+        service.mark_dirty("flaky")
+        service.flush(timeout=5)
+        service.flush(timeout=5)
+
+        assert recorder.calls == 2
+        timings = service.get_timings()["flaky"]
+        assert timings["count"] == 2
+        assert timings["failures"] == 1
+
+    def test_failed_component_backs_off_before_retrying(self):
+        service = _service(debounce_seconds=0.1)
+        recorder = _Recorder(fail_times=2)
+        service.register("flaky", recorder)
+
+        service.mark_dirty("flaky")
+        time.sleep(0.15)
+        while recorder.calls < 1:
+            time.sleep(0.01)
+        service.mark_dirty("flaky")
+        time.sleep(0.1)
+        assert recorder.calls == 1  # marks during the backoff wait for it
+
+        deadline = time.monotonic() + 5
+        while recorder.calls < 3 and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert recorder.calls == 3
+        assert service.retry_delay(2) == 2 * service.retry_delay(1)
+        assert not service.is_dirty()
+
+    def test_retry_delay_is_capped(self):
+        service = _service(debounce_seconds=5, max_retry_delay_seconds=60)
+
+        assert service.retry_delay(1) == 10
+        assert service.retry_delay(10) == 60
+
+    def test_mark_without_names_marks_nothing(self):
+        service = _service()
+        recorder = _Recorder()
+        service.register("a", recorder)
+
+        service.mark_dirty()
+
+        assert not service.is_dirty()
+        assert recorder.calls == 0
+
+    def test_capture_runs_on_the_marking_thread(self):
+        service = _service()
+        state = ["first"]
+        stored, capture_threads = [], []
+
+        def capture():
+            capture_threads.append(threading.current_thread().name)
+            return list(state)
+
+        service.register("a", stored.append, capture=capture)
+        service.mark_dirty("a")
+        state.append("changed after the mark")
+        service.flush(timeout=5)
+
+        assert capture_threads == [threading.current_thread().name]
+        assert stored == [["first"]]
+        assert service.get_timings()["a:capture"]["count"] == 1
+
+    def test_capture_only_components_run_the_group_finalizer(self):
+        service = _service()
+        order = []
+        service.register("x", None, group="cache", capture=lambda: order.append("capture x"))
+        service.register("y", None, group="cache", capture=lambda: order.append("capture y"))
+        service.register_group_finalizer("cache", lambda: order.append("finalize"))
+
+        service.mark_dirty("x")
+        service.flush(timeout=5)
+
+        assert order == ["capture x", "finalize"]
+
+    def test_timings_recorded_per_component(self):
+        service = _service()
+        service.register("a", _Recorder(delay=0.02))
+
+        service.store_now(["a"])
+
+        timing = service.get_timings()["a"]
+        assert timing["count"] == 1
+        assert timing["last"] >= 0.02
+
+    def test_unknown_component_raises(self):
+        service = _service()
+        service.register("a", _Recorder())
+
+        with pytest.raises(ValueError):
+            service.mark_dirty("missing")
+
+    def test_shutdown_flushes_and_ignores_later_marks(self):
+        service = _service(debounce_seconds=10)
+        recorder = _Recorder()
+        service.register("a", recorder)
+        service.mark_dirty("a")
+
+        assert service.shutdown(timeout=5)
+        service.mark_dirty("a")
+
+        assert recorder.calls == 1
+        assert not service.is_dirty()
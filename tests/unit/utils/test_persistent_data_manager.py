@@ -0,0 +1,33 @@
+"""Unit tests for the deferred load in utils.persistent_data_manager.PersistentDataManager."""
+
+import pytest
+
+import extensions.extension_manager as em
+from extensions.extension_manager import ExtensionManager
+from utils.persistent_data_manager import PersistentDataManager
+
+
+@pytest.fixture
+def not_yet_painted(monkeypatch):
+    monkeypatch.setattr(PersistentDataManager, "_is_deferred_loaded", False)
+    monkeypatch.setattr(ExtensionManager, "extensions", [])
+    em.app_info_cache.set("extensions", [{"filename": "/music/a1.mp3", "candidate_id": "a1"}])
+
+
+@pytest.mark.unit
+class TestDeferredLoad:
+    def test_deferred_components_are_not_stored_before_they_are_loaded(self, not_yet_painted):
+        PersistentDataManager.request_store(PersistentDataManager.EXTENSIONS)
+
+        assert em.app_info_cache.get("extensions") == [{"filename": "/music/a1.mp3", "candidate_id": "a1"}]
+
+    def test_load_deferred_loads_once(self, not_yet_painted):
+        PersistentDataManager.load_deferred()
+        assert ExtensionManager.was_extended("a1")
+
+        ExtensionManager.extensions = []
+        PersistentDataManager.load_deferred()
+        PersistentDataManager.request_store(PersistentDataManager.EXTENSIONS)
+
+        assert ExtensionManager.extensions == []
+        assert em.app_info_cache.get("extensions") == []
@@ -0,0 +1,82 @@
+"""Unit tests for lib.startup_trace.
+
+Each test uses its own StartupTrace rather than the module singleton, and
+imports a throwaway module written to tmp_path so there is always something
+new for the import hook to record.
+"""
+
+import builtins
+import sys
+
+import pytest
+
+from lib.startup_trace import StartupTrace
+
+
+@pytest.fixture
+def fresh_module(tmp_path, monkeypatch):
+    name = "startup_trace_probe_module"
+    (tmp_path / f"{name}.py").write_text("import time\ntime.sleep(0.01)\nVALUE = 1\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield name
+    sys.modules.pop(name, None)
+
+
+@pytest.mark.unit
+class TestStartupTrace:
+    def test_disabled_by_default(self, monkeypatch):
+        monkeypatch.delenv("MUSE_STARTUP_TRACE", raising=False)
+        trace = StartupTrace()
+        original_import = builtins.__import__
+
+        assert not trace.install_if_enabled()
+        with trace.step("noop"):
+            pass
+        trace.mark("noop")
+
+        assert builtins.__import__ is original_import
+        assert trace.steps == []
+        assert trace.finish() is None
+
+    def test_records_imports_and_steps(self, fresh_module, tmp_path, monkeypatch):
+        monkeypatch.setenv("MUSE_STARTUP_TRACE", "1")
+        trace = StartupTrace()
+        original_import = builtins.__import__
+        assert trace.install_if_enabled()
+        try:
+            with trace.step("outer"):
+                with trace.step("inner"):
+                    __import__(fresh_module)
+            trace.mark("done")
+        finally:
+            trace.uninstall()
+
+        assert builtins.__import__ is original_import
+        assert [(s.name, s.depth) for s in trace.steps] == [("outer", 0), ("inner", 1), ("done", 0)]
+        assert trace.steps[0].duration >= trace.steps[1].duration >= 0.01
+        assert trace.steps[2].duration is None
+        record = next(r for r in trace.imports if r.name == fresh_module)
+        assert record.cumulative >= record.self_time >= 0.005
+        # Already-loaded modules are not recorded again
+        count = len(trace.imports)
+        trace.install()
+        try:
+            __import__(fresh_module)
+        finally:
+            trace.uninstall()
+        assert len(trace.imports) == count
+
+    def test_finish_writes_report(self, fresh_module, tmp_path):
+        trace = StartupTrace()
+        trace.install()
+        with trace.step("load: probe"):
+            __import__(fresh_module)
+        report_path = str(tmp_path / "trace.txt")
+
+        assert trace.finish(report_path) == report_path
+
+        report = (tmp_path / "trace.txt").read_text(encoding="utf-8")
+        assert "load: probe" in report
+        assert fresh_module in report
+        assert "trace finished" in report
+        assert not trace.enabled
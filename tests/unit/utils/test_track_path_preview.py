@@ -140,3 +140,44 @@ class TestComputeProposedFilepath:
         )
         # With NONE, artist dir is unchanged even if the metadata field differs.
         assert os.path.normpath("/music/Artist") in result
+
+
+class TestBatchRenamePreview:
+    def test_mapping_omits_unchanged_tracks(self):
+        from utils.track_path_preview import compute_rename_mapping
+
+        renamed = make_track()
+        unchanged = make_track(filepath="/music/Artist/Album/other.flac", basename="other.flac", title="other")
+
+        mapping = compute_rename_mapping(
+            [renamed, unchanged],
+            {TRACK_PATH: {"title": "New Title"}},
+            rename_track_file=True,
+        )
+
+        assert mapping == {TRACK_PATH: os.path.normpath("/music/Artist/Album/New Title.flac")}
+
+    def test_conflicts_flag_duplicate_and_occupied_targets(self, tmp_path):
+        from utils.track_path_preview import find_rename_conflicts
+
+        occupied = tmp_path / "exists.flac"
+        occupied.write_bytes(b"")
+        a, b, c = (str(tmp_path / n) for n in ("a.flac", "b.flac", "c.flac"))
+
+        conflicts = find_rename_conflicts({
+            a: str(tmp_path / "same.flac"),
+            b: str(tmp_path / "same.flac"),
+            c: str(occupied),
+        })
+
+        reasons = {old: reason for old, _, reason in conflicts}
+        assert reasons == {a: "duplicate target", b: "duplicate target", c: "destination exists"}
+
+    def test_chained_rename_into_vacated_path_is_not_a_conflict(self, tmp_path):
+        from utils.track_path_preview import find_rename_conflicts
+
+        a, b = tmp_path / "a.flac", tmp_path / "b.flac"
+        a.write_bytes(b"")
+        b.write_bytes(b"")
+
+        assert find_rename_conflicts({str(a): str(b), str(b): str(tmp_path / "c.flac")}) == []
@@ -16,6 +16,9 @@ _ORPHANED_OUTPUT_WAV_RE = re.compile(
 # Interim outputs from integration tests using filepath="tts_test" in TextToSpeechRunner.
 _TEST_OUTPUT_FILE_RE = re.compile(r"^tts_test\d+\.(?:wav|mp3)$")
 
+# Pre-synthesized DJ spots (muse.spot_pool) that were never aired.
+_SPOT_POOL_FILE_RE = re.compile(r"^spot_pool_.*_\d+_\d+\.wav$")
+
 
 def is_orphaned_output_wav(filename: str) -> bool:
     """Return True if *filename* looks like an unnamed interim TTS WAV."""
@@ -24,7 +27,11 @@ def is_orphaned_output_wav(filename: str) -> bool:
 
 def is_removable_output_file(filename: str) -> bool:
     """Return True if *filename* is a disposable TTS output artifact."""
-    return is_orphaned_output_wav(filename) or bool(_TEST_OUTPUT_FILE_RE.match(filename))
+    return (
+        is_orphaned_output_wav(filename)
+        or bool(_TEST_OUTPUT_FILE_RE.match(filename))
+        or bool(_SPOT_POOL_FILE_RE.match(filename))
+    )
 
 
 def cleanup_orphaned_output_files(directory: str) -> int:
@@ -53,6 +53,7 @@ class TTSSpeakInvocation:
         self.chunker = Chunker(skip_cjk=config.skip_cjk, skip_redundant=config.skip_redundant)
         self.speak_callback = speak_callback
         self.config = config  # Store config to access run_context
+        self.on_speech_queued: Optional[Callable[[str], None]] = None
         self._tracking[invocation_id] = self
 
     def increment_error(self):
@@ -111,6 +112,22 @@ class TTSSpeakInvocation:
             self.chunker.get_str_chunks(text, locale=locale)
         )
 
+    def process_stream(self, texts, locale=None):
+        """
+        Process text that arrives in pieces (e.g. sentences of a streaming LLM
+        response), generating speech for each piece as soon as it is available.
+
+        Args:
+            texts: Iterable of text pieces, read until exhausted
+            locale: Optional locale for text processing
+
+        Returns:
+            str: The full processed text
+        """
+        return self._process_chunks(
+            chunk for text in texts for chunk in self.chunker.get_str_chunks(text, locale=locale)
+        )
+
     def process_file(self, filepath, split_on_each_line=False, locale=None):
         """
         Process a file through the chunker and generate speech for each chunk.
@@ -287,6 +304,8 @@ class TextToSpeechRunner:
             self.generate_speech_file(text, output_path)
             self.audio_paths.append(output_path)
             self.add_speech_file_to_queue(output_path)
+            if invocation.on_speech_queued is not None:
+                invocation.on_speech_queued(output_path)
         except Exception as e:
             invocation.increment_error()
             logger.error(f"TTS generation error: {str(e)}")
@@ -298,6 +317,50 @@ class TextToSpeechRunner:
                     pass
 
     def speak(self, text, save_mp3=False, locale=None):
+        return self._run_invocation(
+            lambda invocation: invocation.process_text(text, locale), save_mp3)
+
+    def speak_stream(self, texts, save_mp3=False, locale=None, on_speech_queued=None):
+        """
+        Speak text that is still being produced. *texts* is read until exhausted
+        and each piece is synthesized as it arrives; *on_speech_queued* is called
+        with the path of each speech file once it is queued for playback.
+        """
+        def process(invocation):
+            invocation.on_speech_queued = on_speech_queued
+            return invocation.process_stream(texts, locale)
+
+        return self._run_invocation(process, save_mp3)
+
+    def synthesize(self, text, locale=None):
+        """
+        Generate speech files for *text* without queueing or playing them.
+        Returns the paths of the chunk files in speaking order.
+        """
+        audio_paths = []
+
+        def generate(chunk, invocation):
+            output_path = self.generate_output_path()
+            try:
+                self.generate_speech_file(chunk, output_path)
+                audio_paths.append(output_path)
+            except Exception as e:
+                invocation.increment_error()
+                logger.error(f"TTS generation error: {str(e)}")
+                if os.path.exists(output_path):
+                    try:
+                        os.remove(output_path)
+                    except:
+                        pass
+
+        invocation = TTSSpeakInvocation.create(generate, self.config)
+        try:
+            invocation.process_text(text, locale)
+        finally:
+            invocation.cleanup()
+        return audio_paths
+
+    def _run_invocation(self, process, save_mp3):
         if self.run_context and self.run_context.should_skip():
             # Clear the speech queue when skipping
             return self.speech_queue.cancel()
@@ -308,7 +371,10 @@ class TextToSpeechRunner:
         invocation = TTSSpeakInvocation.create(self._speak, self.config)
 
         try:
-            full_text = invocation.process_text(text, locale)
+            full_text = process(invocation)
+            if not full_text:
+                # A stream can end before producing any text
+                return None
 
             while self.speech_queue.job_running:
                 if self.run_context and self.run_context.should_skip():
@@ -25,6 +25,7 @@ from utils.audio_device_manager import (
     set_verbose_audio_logging,
 )
 from utils.logging_setup import get_logger
+from utils.persistent_data_manager import PersistentDataManager
 
 _ = I18N._
 logger = get_logger(__name__)
@@ -325,14 +326,14 @@ class AudioDeviceWindow(SmartWindow):
                 success = self.audio_manager.start_monitoring()
                 if success:
                     self.app_actions.toast(_("Audio device monitoring started"))
-                    AudioDeviceManager.store_settings()
+                    PersistentDataManager.request_store(PersistentDataManager.AUDIO_DEVICE_SETTINGS)
                 else:
                     self.monitoring_checkbox.setChecked(False)
                     self.app_actions.alert(_("Error"), _("Failed to start monitoring"), kind="error")
             else:
                 self.audio_manager.stop_monitoring()
                 self.app_actions.toast(_("Audio device monitoring stopped"))
-                AudioDeviceManager.store_settings()
+                PersistentDataManager.request_store(PersistentDataManager.AUDIO_DEVICE_SETTINGS)
         except Exception as e:
             self.monitoring_checkbox.setChecked(False)
             self.app_actions.alert(_("Error"), str(e), kind="error")
@@ -31,6 +31,7 @@ from ui_qt.auth.password_utils import require_password
 from utils.app_info_cache import app_info_cache
 from utils.globals import ProtectedActions
 from utils.logging_setup import get_logger
+from utils.persistent_data_manager import PersistentDataManager
 from utils.translations import I18N
 
 logger = get_logger(__name__)
@@ -574,6 +575,7 @@ class ComposersWindow(SmartWindow):
         app_info_cache.set("recent_composer_searches", json_searches)
 
     def __init__(self, master: QWidget, app_actions, dimensions: str = "600x600"):
+        PersistentDataManager.load_deferred()
         super().__init__(
             persistent_parent=master,
             position_parent=master,
@@ -841,6 +843,7 @@ class ComposersWindow(SmartWindow):
             ComposersWindow.recent_searches = ComposersWindow.recent_searches[
                 : ComposersWindow.MAX_RECENT_SEARCHES
             ]
+        PersistentDataManager.request_store(PersistentDataManager.RECENT_COMPOSER_SEARCHES)
         self._refresh_widgets()
 
     def add_widgets_for_results(self):
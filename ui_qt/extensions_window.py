@@ -27,6 +27,7 @@ from ui_qt.app_style import AppStyle
 from ui_qt.auth.password_utils import require_password
 from utils.globals import ExtensionStrategy, ProtectedActions
 from utils.logging_setup import get_logger
+from utils.persistent_data_manager import PersistentDataManager
 from utils.translations import I18N
 
 _ = I18N._
@@ -42,6 +43,7 @@ class ExtensionsWindow(SmartWindow):
     top_level = None
 
     def __init__(self, master, app_actions, library_data):
+        PersistentDataManager.load_deferred()
         super().__init__(
             persistent_parent=master,
             position_parent=master,
@@ -304,7 +306,7 @@ class ExtensionsWindow(SmartWindow):
             new_strategy = ExtensionStrategy.get_from_translation(text)
             ExtensionManager.strategy = new_strategy
             logger.info("Extension strategy changed to: %s", new_strategy.name)
-            ExtensionManager.store_extensions()
+            PersistentDataManager.request_store(PersistentDataManager.EXTENSIONS)
             self.library_data.extension_manager.reset_extension()
             self._refresh_extension_list()
         except Exception as e:
@@ -319,8 +321,8 @@ class ExtensionsWindow(SmartWindow):
             master=self,
         )
         if res:
-            ExtensionManager.extensions = []
-            ExtensionManager.store_extensions()
+            ExtensionManager.clear_extensions()
+            PersistentDataManager.request_store(PersistentDataManager.EXTENSIONS)
             self._refresh_extension_list()
 
     def closeEvent(self, event):
@@ -357,9 +359,8 @@ class ExtensionsWindow(SmartWindow):
             if filepath:
                 from extensions.extension_filer import delete_extension_file
                 delete_extension_file(filepath)
-            if extension in ExtensionManager.extensions:
-                ExtensionManager.extensions.remove(extension)
-                ExtensionManager.store_extensions()
+            if ExtensionManager.remove_extension(extension):
+                PersistentDataManager.request_store(PersistentDataManager.EXTENSIONS)
                 self._refresh_extension_list()
 
     def _play_extension(self, extension):
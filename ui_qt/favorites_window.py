@@ -27,6 +27,7 @@ from ui_qt.app_style import AppStyle
 from ui_qt.auth.password_utils import require_password
 from utils.app_info_cache import app_info_cache
 from utils.logging_setup import get_logger
+from utils.persistent_data_manager import PersistentDataManager
 from utils.translations import I18N
 from utils.globals import ProtectedActions, TrackAttribute
 
@@ -236,6 +237,7 @@ class FavoritesWindow(SmartWindow):
         return True
 
     def __init__(self, master, app_actions, library_data, dimensions="1050x600"):
+        PersistentDataManager.load_deferred()
         super().__init__(
             persistent_parent=master,
             position_parent=master,
@@ -460,7 +462,7 @@ class FavoritesWindow(SmartWindow):
             track = self._find_track_by_metadata(favorite)
             if track:
                 if favorite.update_from_track(track):
-                    FavoritesWindow.store_favorites()
+                    PersistentDataManager.request_store(PersistentDataManager.FAVORITES)
                     logger.info(
                         "Updated favorite for track %s with new filepath %s",
                         favorite.value,
@@ -473,7 +475,7 @@ class FavoritesWindow(SmartWindow):
         track = self._find_track_by_metadata(favorite)
         if track:
             if favorite.update_from_track(track):
-                FavoritesWindow.store_favorites()
+                PersistentDataManager.request_store(PersistentDataManager.FAVORITES)
                 logger.info(
                     "Updated favorite for track %s with new filepath %s",
                     favorite.value,
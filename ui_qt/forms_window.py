@@ -21,6 +21,7 @@ from ui_qt.auth.password_utils import require_password
 from utils.app_info_cache import app_info_cache
 from utils.globals import ProtectedActions
 from utils.logging_setup import get_logger
+from utils.persistent_data_manager import PersistentDataManager
 from utils.translations import I18N
 
 logger = get_logger(__name__)
@@ -304,6 +305,7 @@ class FormsWindow(SmartWindow):
         )
 
     def __init__(self, master: QWidget, app_actions, dimensions: str = "650x600"):
+        PersistentDataManager.load_deferred()
         super().__init__(
             persistent_parent=master,
             position_parent=master,
@@ -456,6 +458,7 @@ class FormsWindow(SmartWindow):
             FormsWindow.recent_searches = FormsWindow.recent_searches[
                 : FormsWindow.MAX_RECENT_SEARCHES
             ]
+        PersistentDataManager.request_store(PersistentDataManager.RECENT_FORM_SEARCHES)
         self.setWindowTitle(
             _("Form Search") + " - " + self.form_data_search.get_title()
         )
@@ -12,6 +12,7 @@ import os
 
 from PySide6.QtCore import Qt, Signal
 from PySide6.QtWidgets import (
+    QCheckBox,
     QFileDialog,
     QGridLayout,
     QHBoxLayout,
@@ -26,6 +27,7 @@ from PySide6.QtWidgets import (
 )
 
 from extensions.lastfm_api import LastFmAPIError, LastFmReadAPI, get_lastfm_cache
+from extensions.lastfm_sync import LastFmLibrarySync
 from extensions.musicbrainz_api import MusicBrainzReadAPI, get_mb_cache
 from lib.multi_display_qt import SmartWindow
 from ui_qt.app_style import AppStyle
@@ -61,6 +63,7 @@ class LastFmLibraryWindow(SmartWindow):
         self.master = master
         self.app_actions = app_actions
         self.api = LastFmReadAPI()
+        self.sync_engine = LastFmLibrarySync(self.api)
         self._mb_api: Optional[MusicBrainzReadAPI] = None  # created on first enrichment
         self._build_ui()
         self._connect_signals()
@@ -117,6 +120,12 @@ class LastFmLibraryWindow(SmartWindow):
             ]
         )
         dl_row.addWidget(self.unique_combo)
+        self.incremental_check = QCheckBox(_("Incremental refresh"), self)
+        self.incremental_check.setChecked(True)
+        self.incremental_check.setToolTip(
+            _("Only fetch pages that changed since the last download of this library view.")
+        )
+        dl_row.addWidget(self.incremental_check)
         self.download_btn = QPushButton(_("Download Unique Entries"), self)
         self.download_btn.clicked.connect(self.download_unique_entries)
         dl_row.addWidget(self.download_btn)
@@ -253,22 +262,25 @@ class LastFmLibraryWindow(SmartWindow):
 
         scope = self._normalize_scope(self.scope_combo.currentText())
         unique_mode = self.unique_combo.currentText()
+        incremental = self.incremental_check.isChecked()
         self.progress_bar.setValue(0)
         self._set_busy.emit(True)
         self._status.emit(_("Downloading unique entries..."))
         Utils.start_thread(
-            lambda: self._download_unique_worker(username, scope, unique_mode, file_path, export_kind),
+            lambda: self._download_unique_worker(username, scope, unique_mode, file_path, export_kind, incremental),
             use_asyncio=False,
         )
 
-    def _download_unique_worker(self, username: str, scope: str, unique_mode: str, file_path: str, export_kind: str):
+    def _download_unique_worker(self, username: str, scope: str, unique_mode: str, file_path: str,
+                                export_kind: str, incremental: bool = True):
         try:
+            items = self._sync_scope(username, scope, incremental)
             if scope == "tracks":
-                headers, rows, total = self._collect_unique_tracks(username, unique_mode)
+                headers, rows, total = self._collect_unique_tracks(items, unique_mode)
             elif scope == "albums":
-                headers, rows, total = self._collect_unique_albums(username, unique_mode)
+                headers, rows, total = self._collect_unique_albums(items, unique_mode)
             else:
-                headers, rows, total = self._collect_unique_artists(username)
+                headers, rows, total = self._collect_unique_artists(items)
 
             delimiter = "\t" if export_kind == "tsv" else ","
             self._write_rows(file_path, headers, rows, delimiter)
@@ -294,56 +306,42 @@ class LastFmLibraryWindow(SmartWindow):
             self._error.emit(str(exc))
             self._set_busy.emit(False)
 
-    def _collect_unique_tracks(self, username: str, unique_mode: str):
+    def _sync_scope(self, username: str, scope: str, incremental: bool) -> list[dict]:
+        """Bring the Last.fm cache for *scope* up to date and return its items."""
+        def progress(done: int, total: int) -> None:
+            self._download_progress.emit(int((done / total) * 100), _("Fetched page {0}/{1}").format(done, total))
+
+        result = self.sync_engine.sync(username, scope, incremental=incremental, progress_callback=progress)
+        if result.new_scrobbles == 0:
+            self._download_progress.emit(100, _("No new scrobbles since the last download; using cached data."))
+        elif result.stopped_early:
+            self._download_progress.emit(
+                100, _("Updated {0} of {1} pages; the rest are unchanged.").format(result.pages_fetched, result.total_pages)
+            )
+        return get_lastfm_cache().get_scope(username, scope) or []
+
+    def _collect_unique_tracks(self, items: list[dict], unique_mode: str):
         track_rows: dict[tuple, dict] = {}
         artists: set[str] = set()
         titles: set[str] = set()
         albums: set[str] = set()
 
-        def collect(page):
-            for t in page.tracks:
-                key = (t.artist.lower(), t.name.lower())
-                if key not in track_rows:
-                    track_rows[key] = {
-                        "rank": t.rank if t.rank is not None else "",
-                        "playcount": t.playcount,
-                        "artist": t.artist,
-                        "title": t.name,
-                        "_mbid": t.mbid or "",
-                        "_album": t.album or "",
-                    }
-                if t.artist:
-                    artists.add(t.artist)
-                if t.name:
-                    titles.add(t.name)
-                if t.album:
-                    albums.add(t.album)
-
-        page_num = 1
-        first_page = self._call_with_retry(lambda: self.api.get_library_tracks(username, page=1, limit=200))
-        total_pages = max(first_page.pagination.total_pages, 1)
-        collect(first_page)
-        self._download_progress.emit(int((page_num / total_pages) * 100), _("Fetched page {0}/{1}").format(page_num, total_pages))
-        for page_num in range(2, total_pages + 1):
-            page = self._call_with_retry(lambda p=page_num: self.api.get_library_tracks(username, page=p, limit=200))
-            collect(page)
-            self._download_progress.emit(int((page_num / total_pages) * 100), _("Fetched page {0}/{1}").format(page_num, total_pages))
-            time.sleep(0.2)
-
-        # Persist to Last.fm cache so MB enrichment can run as a separate step
-        lfm_cache = get_lastfm_cache()
-        lfm_cache.set_scope(username, "tracks", [
-            {
-                "name": r["title"],
-                "artist": r["artist"],
-                "playcount": r["playcount"],
-                "rank": r["rank"] if isinstance(r["rank"], int) else None,
-                "mbid": r["_mbid"],
-                "album": r["_album"] or None,
-            }
-            for r in track_rows.values()
-        ])
-        lfm_cache.save()
+        for t in items:
+            artist, name, album = t.get("artist") or "", t.get("name") or "", t.get("album") or ""
+            key = (artist.lower(), name.lower())
+            if key not in track_rows:
+                track_rows[key] = {
+                    "rank": t["rank"] if t.get("rank") is not None else "",
+                    "playcount": t.get("playcount") or 0,
+                    "artist": artist,
+                    "title": name,
+                }
+            if artist:
+                artists.add(artist)
+            if name:
+                titles.add(name)
+            if album:
+                albums.add(album)
 
         if unique_mode == _("Artists"):
             headers = ["artist"]
@@ -363,50 +361,31 @@ class LastFmLibraryWindow(SmartWindow):
         # All fields: pure Last.fm data only. MusicBrainz enrichment runs
         # automatically afterwards as a separate pass and writes its own file.
         headers = ["rank", "playcount", "artist", "title"]
-        rows = [
-            {"rank": r["rank"], "playcount": r["playcount"], "artist": r["artist"], "title": r["title"]}
-            for r in sorted(
-                track_rows.values(),
-                key=lambda r: (r["rank"] if isinstance(r["rank"], int) else 999999, -r["playcount"]),
-            )
-        ]
+        rows = sorted(
+            track_rows.values(),
+            key=lambda r: (r["rank"] if isinstance(r["rank"], int) else 999999, -r["playcount"]),
+        )
         return headers, rows, len(rows)
 
-    def _collect_unique_albums(self, username: str, unique_mode: str):
+    def _collect_unique_albums(self, items: list[dict], unique_mode: str):
         album_rows: dict[tuple, dict] = {}
         artists: set[str] = set()
         album_names: set[str] = set()
 
-        def collect(page):
-            for a in page.albums:
-                key = (a.artist.lower(), a.name.lower())
-                if key not in album_rows:
-                    album_rows[key] = {
-                        "playcount": a.playcount,
-                        "artist": a.artist,
-                        "album": a.name,
-                        "mbid": a.mbid or "",
-                    }
-                if a.artist:
-                    artists.add(a.artist)
-                if a.name:
-                    album_names.add(a.name)
-
-        page_num = 1
-        first_page = self._call_with_retry(lambda: self.api.get_library_albums(username, page=1, limit=200))
-        total_pages = max(first_page.pagination.total_pages, 1)
-        collect(first_page)
-        self._download_progress.emit(int((page_num / total_pages) * 100), _("Fetched page {0}/{1}").format(page_num, total_pages))
-        for page_num in range(2, total_pages + 1):
-            page = self._call_with_retry(lambda p=page_num: self.api.get_library_albums(username, page=p, limit=200))
-            collect(page)
-            self._download_progress.emit(int((page_num / total_pages) * 100), _("Fetched page {0}/{1}").format(page_num, total_pages))
-            time.sleep(0.2)
-
-        # Persist to Last.fm cache
-        lfm_cache = get_lastfm_cache()
-        lfm_cache.set_scope(username, "albums", list(album_rows.values()))
-        lfm_cache.save()
+        for a in items:
+            artist, name = a.get("artist") or "", a.get("name") or ""
+            key = (artist.lower(), name.lower())
+            if key not in album_rows:
+                album_rows[key] = {
+                    "playcount": a.get("playcount") or 0,
+                    "artist": artist,
+                    "album": name,
+                    "mbid": a.get("mbid") or "",
+                }
+            if artist:
+                artists.add(artist)
+            if name:
+                album_names.add(name)
 
         if unique_mode == _("Artists"):
             headers = ["artist"]
@@ -419,34 +398,18 @@ class LastFmLibraryWindow(SmartWindow):
             rows = sorted(album_rows.values(), key=lambda r: -r["playcount"])
         return headers, rows, len(rows)
 
-    def _collect_unique_artists(self, username: str):
+    def _collect_unique_artists(self, items: list[dict]):
         artist_rows: dict[str, dict] = {}
 
-        def collect(page):
-            for a in page.artists:
-                if a.name and a.name.lower() not in artist_rows:
-                    artist_rows[a.name.lower()] = {
-                        "rank": a.rank if a.rank is not None else "",
-                        "playcount": a.playcount,
-                        "artist": a.name,
-                        "mbid": a.mbid or "",
-                    }
-
-        page_num = 1
-        first_page = self._call_with_retry(lambda: self.api.get_library_artists(username, page=1, limit=200))
-        total_pages = max(first_page.pagination.total_pages, 1)
-        collect(first_page)
-        self._download_progress.emit(int((page_num / total_pages) * 100), _("Fetched page {0}/{1}").format(page_num, total_pages))
-        for page_num in range(2, total_pages + 1):
-            page = self._call_with_retry(lambda p=page_num: self.api.get_library_artists(username, page=p, limit=200))
-            collect(page)
-            self._download_progress.emit(int((page_num / total_pages) * 100), _("Fetched page {0}/{1}").format(page_num, total_pages))
-            time.sleep(0.2)
-
-        # Persist to Last.fm cache
-        lfm_cache = get_lastfm_cache()
-        lfm_cache.set_scope(username, "artists", list(artist_rows.values()))
-        lfm_cache.save()
+        for a in items:
+            name = a.get("name") or ""
+            if name and name.lower() not in artist_rows:
+                artist_rows[name.lower()] = {
+                    "rank": a["rank"] if a.get("rank") is not None else "",
+                    "playcount": a.get("playcount") or 0,
+                    "artist": name,
+                    "mbid": a.get("mbid") or "",
+                }
 
         headers = ["rank", "playcount", "artist", "mbid"]
         rows = sorted(
@@ -500,10 +463,11 @@ class LastFmLibraryWindow(SmartWindow):
 
         self._mb_api.enrich_recordings(mbids, mb_cache, mb_progress)
 
+        records = mb_cache.get_many(mbids)
         headers = ["lfm_rank", "lfm_playcount", "lfm_artist", "lfm_title", "mb_title", "mb_artist", "mb_genres", "mb_composer", "mb_lyricist", "mb_arranger"]
         rows = []
         for t in sorted(cached, key=lambda t: (t.get("rank") or 999999, -t.get("playcount", 0))):
-            mb = mb_cache.get(t.get("mbid", "")) if t.get("mbid") else None
+            mb = records.get(t.get("mbid") or "")
             rows.append({
                 "lfm_rank": t.get("rank") or "",
                 "lfm_playcount": t.get("playcount", 0),
@@ -547,6 +511,7 @@ class LastFmLibraryWindow(SmartWindow):
             self._download_progress.emit(pct, _("MusicBrainz: {0}/{1} recordings").format(completed, total))
 
         self._mb_api.enrich_recordings(all_mbids, mb_cache, mb_progress)
+        records = mb_cache.get_many(all_mbids)
 
         headers = ["lfm_artist", "lfm_album", "mb_genres", "mb_composers", "mb_lyricists", "mb_arrangers"]
         rows = []
@@ -554,7 +519,7 @@ class LastFmLibraryWindow(SmartWindow):
             genres, composers, lyricists, arrangers = [], [], [], []
             seen: dict[str, set] = {"g": set(), "c": set(), "l": set(), "a": set()}
             for mbid in entry["mbids"]:
-                mb = mb_cache.get(mbid)
+                mb = records.get(mbid)
                 if not mb:
                     continue
                 for v in mb.get("mb_genres", []):
@@ -608,6 +573,7 @@ class LastFmLibraryWindow(SmartWindow):
             self._download_progress.emit(pct, _("MusicBrainz: {0}/{1} recordings").format(completed, total))
 
         self._mb_api.enrich_recordings(all_mbids, mb_cache, mb_progress)
+        records = mb_cache.get_many(all_mbids)
 
         headers = ["lfm_artist", "mb_genres", "mb_composers", "mb_lyricists", "mb_arrangers"]
         rows = []
@@ -615,7 +581,7 @@ class LastFmLibraryWindow(SmartWindow):
             genres, composers, lyricists, arrangers = [], [], [], []
             seen: dict[str, set] = {"g": set(), "c": set(), "l": set(), "a": set()}
             for mbid in entry["mbids"]:
-                mb = mb_cache.get(mbid)
+                mb = records.get(mbid)
                 if not mb:
                     continue
                 for v in mb.get("mb_genres", []):
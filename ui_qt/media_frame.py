@@ -3,6 +3,7 @@ Media frame (PySide6): album art and in-window video.
 Uses QGraphicsView for images (pan/zoom), VLC for video.
 """
 
+from collections import OrderedDict
 import os
 import platform
 import time
@@ -22,6 +23,7 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Qt, QRectF, QSize, QPoint, QRect, QEvent, QTimer, Signal
 from PySide6.QtGui import QImage, QPixmap, QImageReader, QPainter, QCursor
 
+from library_data.artwork_store import artwork_store
 from ui_qt.app_style import AppStyle
 from ui_qt.media_controls_overlay import MediaControlsOverlay
 from utils.config import config
@@ -50,6 +52,40 @@ except ImportError:
 DEFAULT_VIDEO_TYPES = (".mp4", ".mkv", ".avi", ".webm", ".mov", ".m4v", ".ogv")
 
 
+class DecodedImageCache:
+    """Small LRU of decoded QImages keyed by path and mtime.
+
+    Resizes and repeated tracks from the same album redisplay the same file;
+    keeping the decoded image avoids reading and decoding it again.
+    """
+
+    def __init__(self, maxsize=16):
+        self.maxsize = maxsize
+        self._images = OrderedDict()
+
+    def get(self, path, loader):
+        try:
+            key = (path, os.path.getmtime(path))
+        except OSError:
+            return loader(path)
+        image = self._images.get(key)
+        if image is not None:
+            self._images.move_to_end(key)
+            return image
+        image = loader(path)
+        if not image.isNull():
+            self._images[key] = image
+            if len(self._images) > self.maxsize:
+                self._images.popitem(last=False)
+        return image
+
+    def clear(self):
+        self._images.clear()
+
+
+_decoded_images = DecodedImageCache()
+
+
 class VideoUI:
     """Placeholder for video state (path, active)."""
 
@@ -200,15 +236,17 @@ class MediaFrame(QFrame):
         """Load image from path, scale to fit view, display in QGraphicsView."""
         if not path or path == "." or not os.path.exists(path):
             return
-        qimg = self._load_image_to_qimage(path)
+        view_size = self._graphics_view.viewport().size()
+        cw, ch = view_size.width(), view_size.height()
+        # Stored album artwork has pre-scaled renditions; decode the smallest that fills the view
+        display_path = artwork_store.display_path(path, cw, ch)
+        qimg = _decoded_images.get(display_path, self._load_image_to_qimage)
         if qimg.isNull():
             return
         self._image = qimg
         self.imwidth = qimg.width()
         self.imheight = qimg.height()
 
-        view_size = self._graphics_view.viewport().size()
-        cw, ch = view_size.width(), view_size.height()
         fit_w, fit_h = scale_dims(
             (self.imwidth, self.imheight), (cw, ch), maximize=self.fill_canvas
         )
@@ -43,6 +43,7 @@ from utils.app_info_cache import app_info_cache
 from utils.config import config
 from utils.globals import PlaylistSortType, PlaybackMasterStrategy
 from utils.logging_setup import get_logger
+from utils.persistent_data_manager import PersistentDataManager
 from utils.translations import I18N
 
 _ = I18N._
@@ -439,6 +440,7 @@ class MasterPlaylistWindow(SmartWindow):
                 result = None
             self._override_sort_config = result
             PlaybackStateManager.set_override_sort_config(result)
+            PersistentDataManager.request_store(PersistentDataManager.SORT_CONFIG)
             self._sort_cfg_label.setText(
                 _("(custom)") if result else _("(defaults)")
             )
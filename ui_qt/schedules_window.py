@@ -25,6 +25,7 @@ from tts.speakers import speakers
 from ui_qt.app_style import AppStyle
 from ui_qt.auth.password_utils import require_password
 from utils.globals import ProtectedActions
+from utils.persistent_data_manager import PersistentDataManager
 from utils.translations import I18N
 
 _ = I18N._
@@ -291,6 +292,7 @@ class SchedulesWindow(SmartWindow):
 
     def refresh_schedules(self, schedule):
         schedules_manager.refresh_schedule(schedule)
+        PersistentDataManager.request_store(PersistentDataManager.SCHEDULES)
         self.filtered_schedules = list(schedules_manager.recent_schedules)
         self.refresh()
 
@@ -301,11 +303,13 @@ class SchedulesWindow(SmartWindow):
     @require_password(ProtectedActions.EDIT_SCHEDULES)
     def delete_schedule(self, schedule=None):
         schedules_manager.delete_schedule(schedule)
+        PersistentDataManager.request_store(PersistentDataManager.SCHEDULES)
         self.refresh()
 
     @require_password(ProtectedActions.EDIT_SCHEDULES)
     def clear_recent_schedules(self):
         schedules_manager.recent_schedules.clear()
+        PersistentDataManager.request_store(PersistentDataManager.SCHEDULES)
         self.filtered_schedules.clear()
         self._add_schedule_widgets()
 
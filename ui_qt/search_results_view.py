@@ -0,0 +1,305 @@
+"""
+Virtualized result table for SearchWindow (PySide6).
+
+Rows live in a QAbstractTableModel and are painted on demand by a QTableView,
+so hundreds of results cost no widgets. Per-row actions (Play, Details, ...)
+are drawn by ActionButtonDelegate rather than being real QPushButtons, and the
+filter box drives a proxy model instead of rebuilding the rows.
+"""
+
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+from PySide6.QtCore import (
+    QAbstractTableModel,
+    QEvent,
+    QModelIndex,
+    QPersistentModelIndex,
+    QSortFilterProxyModel,
+    Qt,
+    Signal,
+)
+from PySide6.QtGui import QColor
+from PySide6.QtWidgets import (
+    QAbstractItemView,
+    QApplication,
+    QHeaderView,
+    QStyle,
+    QStyledItemDelegate,
+    QStyleOptionButton,
+    QTableView,
+)
+
+
+@dataclass
+class ResultColumn:
+    header: str
+    text: Callable[[object], str]
+
+
+@dataclass
+class ResultAction:
+    key: str
+    label: str
+    # Row items for which the button is drawn disabled (e.g. excluded tracks)
+    enabled: Optional[Callable[[object], bool]] = None
+
+
+class ResultTableModel(QAbstractTableModel):
+    """Text columns followed by one column per action button."""
+
+    ItemRole = Qt.ItemDataRole.UserRole + 1
+    ActionKeyRole = Qt.ItemDataRole.UserRole + 2
+    ActionEnabledRole = Qt.ItemDataRole.UserRole + 3
+    FilterTextRole = Qt.ItemDataRole.UserRole + 4
+
+    MUTED_COLOR = QColor("grey")
+
+    def __init__(self, columns: List[ResultColumn], actions: List[ResultAction],
+                 muted_reason: Optional[Callable[[object], Optional[str]]] = None, parent=None):
+        """
+        Args:
+            columns: Text columns, in display order.
+            actions: Button columns appended after the text columns.
+            muted_reason: Returns a tooltip for rows that should be greyed out,
+                or None. It is also the tooltip of that row's disabled buttons.
+        """
+        super().__init__(parent)
+        self.columns = columns
+        self.actions = actions
+        self._muted_reason = muted_reason
+        self._items: list = []
+        # Per-row values computed on first paint, so a large page costs nothing until scrolled to
+        self._texts: list = []
+        self._muted: list = []
+
+    # --- Qt model interface ---
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._items)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns) + len(self.actions)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole or orientation != Qt.Orientation.Horizontal:
+            return None
+        if section < len(self.columns):
+            return self.columns[section].header
+        return ""
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row, col = index.row(), index.column()
+        item = self._items[row]
+        if role == ResultTableModel.ItemRole:
+            return item
+        if role == ResultTableModel.FilterTextRole:
+            return "\n".join(self._row_texts(row)).lower()
+        action = self.action_at(col)
+        if action is not None:
+            if role == Qt.ItemDataRole.DisplayRole:
+                return action.label
+            if role == ResultTableModel.ActionKeyRole:
+                return action.key
+            if role == ResultTableModel.ActionEnabledRole:
+                return self.is_action_enabled(row, action.key)
+            if role == Qt.ItemDataRole.ToolTipRole:
+                return self.muted_reason(row) if not self.is_action_enabled(row, action.key) else None
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self._row_texts(row)[col]
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return self.muted_reason(row)
+        if role == Qt.ItemDataRole.ForegroundRole and self.muted_reason(row):
+            return ResultTableModel.MUTED_COLOR
+        return None
+
+    # --- Row management ---
+
+    def set_items(self, items: list) -> None:
+        self.beginResetModel()
+        self._items = list(items)
+        self._texts = [None] * len(self._items)
+        self._muted = [None] * len(self._items)
+        self.endResetModel()
+
+    def append_items(self, items: list) -> None:
+        """Add rows at the end without resetting the view (keeps scroll position and selection)."""
+        if not items:
+            return
+        start = len(self._items)
+        self.beginInsertRows(QModelIndex(), start, start + len(items) - 1)
+        self._items.extend(items)
+        self._texts.extend([None] * len(items))
+        self._muted.extend([None] * len(items))
+        self.endInsertRows()
+
+    def items(self) -> list:
+        return list(self._items)
+
+    def item(self, row: int):
+        return self._items[row]
+
+    def action_at(self, column: int) -> Optional[ResultAction]:
+        i = column - len(self.columns)
+        return self.actions[i] if 0 <= i < len(self.actions) else None
+
+    def action_column(self, key: str) -> int:
+        for i, action in enumerate(self.actions):
+            if action.key == key:
+                return len(self.columns) + i
+        raise KeyError(key)
+
+    def muted_reason(self, row: int) -> Optional[str]:
+        if self._muted_reason is None:
+            return None
+        if self._muted[row] is None:
+            self._muted[row] = self._muted_reason(self._items[row]) or ""
+        return self._muted[row] or None
+
+    def is_action_enabled(self, row: int, key: str) -> bool:
+        action = self.actions[self.action_column(key) - len(self.columns)]
+        if action.enabled is None:
+            return True
+        return action.enabled(self._items[row])
+
+    def _row_texts(self, row: int) -> list:
+        if self._texts[row] is None:
+            item = self._items[row]
+            self._texts[row] = [column.text(item) or "" for column in self.columns]
+        return self._texts[row]
+
+
+class ResultFilterProxyModel(QSortFilterProxyModel):
+    """Case-insensitive substring filter over the text columns only (not button labels)."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._needle = ""
+
+    def set_filter_text(self, text: str) -> None:
+        needle = (text or "").strip().lower()
+        if needle == self._needle:
+            return
+        if hasattr(self, "beginFilterChange"):  # Qt >= 6.9; invalidateFilter is deprecated there
+            self.beginFilterChange()
+            self._needle = needle
+            self.endFilterChange(QSortFilterProxyModel.Direction.Rows)
+        else:
+            self._needle = needle
+            self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if not self._needle:
+            return True
+        model = self.sourceModel()
+        haystack = model.data(model.index(source_row, 0, source_parent), ResultTableModel.FilterTextRole)
+        return self._needle in (haystack or "")
+
+
+class ActionButtonDelegate(QStyledItemDelegate):
+    """Paints a push button in each cell of an action column and reports clicks."""
+
+    clicked = Signal(QPersistentModelIndex)
+
+    MARGIN = 2
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._pressed = None
+
+    def _button_option(self, option, index) -> QStyleOptionButton:
+        button = QStyleOptionButton()
+        button.rect = option.rect.adjusted(self.MARGIN, self.MARGIN, -self.MARGIN, -self.MARGIN)
+        button.text = index.data(Qt.ItemDataRole.DisplayRole) or ""
+        button.state = QStyle.StateFlag.State_Raised
+        if index.data(ResultTableModel.ActionEnabledRole):
+            button.state |= QStyle.StateFlag.State_Enabled
+            if self._pressed is not None and QPersistentModelIndex(index) == self._pressed:
+                button.state |= QStyle.StateFlag.State_Sunken
+        return button
+
+    def paint(self, painter, option, index):
+        widget = option.widget
+        style = widget.style() if widget is not None else QApplication.style()
+        style.drawControl(QStyle.ControlElement.CE_PushButton, self._button_option(option, index), painter, widget)
+
+    def sizeHint(self, option, index):
+        widget = option.widget
+        style = widget.style() if widget is not None else QApplication.style()
+        button = self._button_option(option, index)
+        text_size = option.fontMetrics.size(Qt.TextFlag.TextShowMnemonic, button.text)
+        return style.sizeFromContents(QStyle.ContentsType.CT_PushButton, button, text_size, widget)
+
+    def editorEvent(self, event, model, option, index):
+        if not index.data(ResultTableModel.ActionEnabledRole):
+            return False
+        etype = event.type()
+        if etype == QEvent.Type.MouseButtonPress and event.button() == Qt.MouseButton.LeftButton:
+            self._pressed = QPersistentModelIndex(index)
+            return True
+        if etype == QEvent.Type.MouseButtonRelease and event.button() == Qt.MouseButton.LeftButton:
+            pressed, self._pressed = self._pressed, None
+            if pressed is not None and pressed == QPersistentModelIndex(index) \
+                    and option.rect.contains(event.position().toPoint()):
+                self.clicked.emit(QPersistentModelIndex(index))
+            return True
+        return False
+
+
+class ResultTableView(QTableView):
+    """QTableView wired to a ResultTableModel through a filter proxy.
+
+    Emits action_triggered(action_key, item) when a delegate-drawn button is clicked.
+    """
+
+    action_triggered = Signal(str, object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.proxy = ResultFilterProxyModel(self)
+        self.setModel(self.proxy)
+        self._delegate = ActionButtonDelegate(self)
+        self._delegate.clicked.connect(self._on_action_clicked)
+        self.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.setWordWrap(False)
+        self.setShowGrid(False)
+        self.setMouseTracking(True)
+        self.verticalHeader().hide()
+        # Fixed row height lets the view lay out any number of rows without measuring them
+        self.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.verticalHeader().setDefaultSectionSize(self.fontMetrics().height() + 14)
+
+    def set_result_model(self, model: ResultTableModel) -> None:
+        self.proxy.setSourceModel(model)
+        header = self.horizontalHeader()
+        for col in range(model.columnCount()):
+            if model.action_at(col) is not None:
+                self.setItemDelegateForColumn(col, self._delegate)
+                header.setSectionResizeMode(col, QHeaderView.ResizeMode.Fixed)
+                label = model.action_at(col).label
+                self.setColumnWidth(col, self.fontMetrics().horizontalAdvance(label) + 32)
+            else:
+                self.setItemDelegateForColumn(col, None)
+                header.setSectionResizeMode(col, QHeaderView.ResizeMode.Stretch)
+
+    def result_model(self) -> Optional[ResultTableModel]:
+        return self.proxy.sourceModel()
+
+    def set_filter_text(self, text: str) -> None:
+        self.proxy.set_filter_text(text)
+
+    def visible_row_count(self) -> int:
+        return self.proxy.rowCount()
+
+    def _on_action_clicked(self, proxy_index: QPersistentModelIndex) -> None:
+        if not proxy_index.isValid():
+            return
+        source_index = self.proxy.mapToSource(self.proxy.index(proxy_index.row(), proxy_index.column()))
+        model = self.result_model()
+        self.action_triggered.emit(model.action_at(source_index.column()).key, model.item(source_index.row()))
@@ -12,9 +12,6 @@ from PySide6.QtWidgets import (
     QPushButton,
     QComboBox,
     QCheckBox,
-    QScrollArea,
-    QSizePolicy,
-    QWidget,
     QFrame,
     QInputDialog,
 )
@@ -25,11 +22,13 @@ from library_data.library_data import LibraryDataSearch
 from muse.playlist import get_exclusion_match
 from ui_qt.app_style import AppStyle
 from ui_qt.auth.password_utils import require_password
+from ui_qt.search_results_view import ResultAction, ResultColumn, ResultTableModel, ResultTableView
 from utils.app_info_cache import app_info_cache
 from utils.config import config
 from utils.globals import PlaylistSortType, ProtectedActions
 from utils.translations import I18N
 from utils.logging_setup import get_logger
+from utils.persistent_data_manager import PersistentDataManager
 from utils.utils import Utils
 
 _ = I18N._
@@ -148,6 +147,7 @@ class SearchWindow(SmartWindow):
             del SearchWindow.recent_searches[-1]
 
     def __init__(self, master, app_actions, library_data, dimensions="1100x820"):
+        PersistentDataManager.load_deferred()
         super().__init__(
             persistent_parent=master,
             position_parent=master,
@@ -163,15 +163,9 @@ class SearchWindow(SmartWindow):
         self.library_data = library_data
         self.library_data_search = None
 
-        self.title_list = []
-        self.album_list = []
-        self.artist_list = []
-        self.composer_list = []
-        self.open_details_btn_list = []
-        self.play_btn_list = []
-        self.add_to_playlist_btn_list = []
-        self.remove_btn_list = []
         self.current_offset = 0
+        # Row count already shown when a "Find More" page is appended instead of redrawn
+        self._append_from = None
         self.pagination_warning_label = None
         self.pagination_next_btn = None
         self.has_closed = False
@@ -180,14 +174,46 @@ class SearchWindow(SmartWindow):
         outer = QVBoxLayout(self)
         outer.setContentsMargins(5, 5, 5, 5)
 
-        self.results_scroll = QScrollArea(self)
-        self.results_scroll.setWidgetResizable(True)
-        self.results_scroll.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
-        self.results_scroll.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
-        self.results_widget = QWidget(self.results_scroll)
-        self.results_layout = QGridLayout(self.results_widget)
-        self.results_scroll.setWidget(self.results_widget)
-        outer.addWidget(self.results_scroll, 7)
+        self.searching_label = QLabel("", self)
+        self.searching_label.setWordWrap(True)
+        self.searching_label.hide()
+        outer.addWidget(self.searching_label)
+
+        self.track_results_model = ResultTableModel(
+            columns=[
+                ResultColumn(_("Title"), lambda t: t.title),
+                ResultColumn(_("Artist"), lambda t: t.artist),
+                ResultColumn(_("Album"), lambda t: t.album),
+                ResultColumn(_("Composer"), lambda t: t.composer),
+            ],
+            actions=[
+                ResultAction("details", _("Details")),
+                ResultAction("play", _("Play"), lambda t: self._get_exclusion_match(t) is None),
+                ResultAction("add_to_playlist", _("+ Playlist")),
+            ],
+            muted_reason=SearchWindow._exclusion_tooltip,
+            parent=self,
+        )
+        # Recent searches rows are (LibraryDataSearch, selected track or None)
+        self.recent_searches_model = ResultTableModel(
+            columns=[
+                ResultColumn(_("Title"), lambda r: (r[1].title or "") if r[1] is not None else _("(No track selected)")),
+                ResultColumn(_("Album"), lambda r: (r[1].album or "") if r[1] is not None else "--"),
+                ResultColumn(_("Search"), lambda r: str(r[0])),
+                ResultColumn(_("Results"), lambda r: r[0].get_readable_stored_results_count()),
+            ],
+            actions=[
+                ResultAction("search", _("Search")),
+                ResultAction("play", _("Play"), lambda r: self._get_exclusion_match(r[1]) is None),
+                ResultAction("remove", _("Remove")),
+            ],
+            muted_reason=lambda r: SearchWindow._exclusion_tooltip(r[1]),
+            parent=self,
+        )
+        self.results_view = ResultTableView(self)
+        self.results_view.action_triggered.connect(self._on_result_action)
+        self.results_view.hide()
+        outer.addWidget(self.results_view, 7)
 
         self.pagination_frame = QFrame(self)
         self.pagination_layout = QHBoxLayout(self.pagination_frame)
@@ -314,112 +340,61 @@ class SearchWindow(SmartWindow):
         QTimer.singleShot(0, self.show_recent_searches)
 
     def show_recent_searches(self):
+        self._append_from = None
         if len(SearchWindow.recent_searches) == 0:
-            self.clear_widget_lists()
-            self.searching_label = QLabel(_("No recent searches found."), self.results_widget)
-            self.searching_label.setWordWrap(True)
-            self.results_layout.addWidget(self.searching_label, 1, 1)
-            self.title_list.append(self.searching_label)
+            self._show_message(_("No recent searches found."))
             return
-        self.clear_widget_lists()
-        for i in range(len(SearchWindow.recent_searches)):
-            row = i + 1
-            search = SearchWindow.recent_searches[i]
-            track = self.library_data.get_track(search.selected_track_path)
-            if track is not None:
-                title = track.title or ""
-                album = track.album or ""
-            else:
-                title = _("(No track selected)")
-                album = "--"
-
-            title_label = QLabel(title, self.results_widget)
-            title_label.setWordWrap(True)
-            title_label.setMinimumWidth(200)
-            title_label.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Preferred)
-            self.results_layout.addWidget(title_label, row, 1)
-            self.title_list.append(title_label)
-
-            album_label = QLabel(album, self.results_widget)
-            album_label.setWordWrap(True)
-            album_label.setMinimumWidth(200)
-            album_label.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Preferred)
-            self.results_layout.addWidget(album_label, row, 2)
-            self.album_list.append(album_label)
-
-            search_label = QLabel(str(search), self.results_widget)
-            search_label.setWordWrap(True)
-            search_label.setMinimumWidth(200)
-            search_label.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Preferred)
-            self.results_layout.addWidget(search_label, row, 3)
-            self.artist_list.append(search_label)
-
-            results_count_label = QLabel(
-                search.get_readable_stored_results_count(), self.results_widget
+        rows = [
+            (search, self.library_data.get_track(search.selected_track_path))
+            for search in SearchWindow.recent_searches
+        ]
+        self._show_rows(self.recent_searches_model, rows)
+
+    def _show_message(self, text):
+        """Replace the results table with a status/info message."""
+        self.results_view.hide()
+        self.searching_label.setText(text)
+        self.searching_label.show()
+
+    def _show_rows(self, model, rows):
+        if self.results_view.result_model() is not model:
+            self.results_view.set_result_model(model)
+        model.set_items(rows)
+        self.searching_label.hide()
+        self.results_view.show()
+
+    def _on_result_action(self, key, item):
+        if self.results_view.result_model() is self.recent_searches_model:
+            search, track = item
+            if key == "search":
+                self.load_stored_search(library_data_search=search)
+                self._do_search(overwrite=self.overwrite_cache_check.isChecked())
+            elif key == "play":
+                self._play_recent_search(search, track)
+            elif key == "remove":
+                self.remove_search(search)
+            return
+        if key == "details":
+            self.open_details(item)
+        elif key == "play":
+            logger.info("User selected audio track: %s", item)
+            self.run_play_callback(item)
+        elif key == "add_to_playlist":
+            self._add_track_to_playlist(item)
+
+    def _play_recent_search(self, lib_search, track):
+        self.load_stored_search(library_data_search=lib_search)
+        self._do_search(overwrite=False)
+        if track is None:
+            logger.info(
+                "No specific track defined on search, using first available track."
             )
-            self.results_layout.addWidget(results_count_label, row, 4)
-            self.composer_list.append(results_count_label)
-
-            excluded_by = self._get_exclusion_match(track)
-            if excluded_by:
-                exclusion_tooltip = _(
-                    "Won't be played: matches playlist exclusion filter \"{0}\"."
-                ).format(excluded_by)
-                for lbl in (title_label, album_label):
-                    lbl.setStyleSheet("color: grey;")
-                    lbl.setToolTip(exclusion_tooltip)
-
-            search_btn = QPushButton(_("Search"), self.results_widget)
-            search_btn.setSizePolicy(QSizePolicy.Policy.Fixed, QSizePolicy.Policy.Fixed)
-            self.open_details_btn_list.append(search_btn)
-            self.results_layout.addWidget(search_btn, row, 5)
-
-            def make_search_handler(lib_search):
-                def handler():
-                    self.load_stored_search(library_data_search=lib_search)
-                    self._do_search(overwrite=self.overwrite_cache_check.isChecked())
-                return handler
-
-            search_btn.clicked.connect(make_search_handler(search))
-
-            play_btn = QPushButton(_("Play"), self.results_widget)
-            play_btn.setSizePolicy(QSizePolicy.Policy.Fixed, QSizePolicy.Policy.Fixed)
-            if excluded_by:
-                play_btn.setEnabled(False)
-                play_btn.setToolTip(exclusion_tooltip)
-            self.play_btn_list.append(play_btn)
-            self.results_layout.addWidget(play_btn, row, 6)
-
-            def make_play_handler(lib_search, tr):
-                def handler():
-                    self.load_stored_search(library_data_search=lib_search)
-                    self._do_search(overwrite=False)
-                    t = tr
-                    if t is None:
-                        logger.info(
-                            "No specific track defined on search, using first available track."
-                        )
-                        t = lib_search.get_first_available_track()
-                        if t is None:
-                            raise Exception("No tracks available on search.")
-                    elif t.is_invalid():
-                        raise Exception("Invalid track: {}".format(t))
-                    self.run_play_callback(t)
-                return handler
-
-            play_btn.clicked.connect(make_play_handler(search, track))
-
-            remove_btn = QPushButton(_("Remove"), self.results_widget)
-            remove_btn.setSizePolicy(QSizePolicy.Policy.Fixed, QSizePolicy.Policy.Fixed)
-            self.remove_btn_list.append(remove_btn)
-            self.results_layout.addWidget(remove_btn, row, 7)
-
-            def make_remove_handler(lib_search):
-                def handler():
-                    self.remove_search(lib_search)
-                return handler
-
-            remove_btn.clicked.connect(make_remove_handler(search))
+            track = lib_search.get_first_available_track()
+            if track is None:
+                raise Exception("No tracks available on search.")
+        elif track.is_invalid():
+            raise Exception("Invalid track: {}".format(track))
+        self.run_play_callback(track)
 
     @require_password(ProtectedActions.RUN_SEARCH)
     def do_search(self):
@@ -474,15 +449,19 @@ class SearchWindow(SmartWindow):
         self.library_data_search.total_matches_count = 0
         self.library_data_search.results = []
 
-        self._refresh_widgets(add_results=False)
-        self.searching_label = QLabel(
+        status_text = (
             _("Please wait, overwriting cache and searching...")
             if overwrite
-            else _("Searching..."),
-            self.results_widget,
+            else _("Searching...")
         )
-        self.results_layout.addWidget(self.searching_label, 1, 1)
-        self.title_list.append(self.searching_label)
+        if existing_results and self.results_view.result_model() is self.track_results_model:
+            # Next page: keep the rows already shown and append the new ones when they arrive
+            self._append_from = len(existing_results)
+            self.searching_label.setText(status_text)
+            self.searching_label.show()
+        else:
+            self._append_from = None
+            self._show_message(status_text)
 
         def search_complete(_search_results):
             self._search_complete.emit()
@@ -499,6 +478,8 @@ class SearchWindow(SmartWindow):
                     search_status_callback=update_status,
                 )
                 if existing_results:
+                    # Sort the new page on its own so the rows already displayed keep their place
+                    self.library_data_search.sort_results_by()
                     self.library_data_search.results = (
                         existing_results + self.library_data_search.results
                     )
@@ -511,116 +492,72 @@ class SearchWindow(SmartWindow):
 
     def _update_ui_after_search(self):
         SearchWindow.update_recent_searches(self.library_data_search)
+        PersistentDataManager.request_store(PersistentDataManager.RECENT_SEARCHES)
         self.filter_entry.show()
         # Uncheck "Overwrite cache" after search completes so that playing a result
         # does not unintentionally overwrite the cache again.
         if self.overwrite_cache_check.isChecked():
             self.overwrite_cache_check.setChecked(False)
-        self._refresh_widgets()
+        append_from, self._append_from = self._append_from, None
+        if append_from is not None and self.track_results_model.rowCount() == append_from:
+            results = self.library_data_search.get_results()
+            self.track_results_model.append_items(results[append_from:])
+            self._update_result_status()
+        else:
+            self._refresh_widgets()
 
     def _show_search_error(self, error_msg):
-        self._refresh_widgets(add_results=False)
-        error_label = QLabel(error_msg, self.results_widget)
-        error_label.setWordWrap(True)
-        self.results_layout.addWidget(error_label, 1, 1)
-        self.title_list.append(error_label)
+        self._append_from = None
+        self._show_message(error_msg)
 
     def _update_search_status(self, status_text):
         """Update the search status label with progress information."""
-        if hasattr(self, "searching_label") and self.searching_label.isVisible():
+        if self.searching_label.isVisible():
             self.searching_label.setText(status_text)
 
-    def clear_widget_lists(self):
-        for w in self.title_list:
-            w.setParent(None)
-            w.deleteLater()
-        for w in self.artist_list:
-            w.setParent(None)
-            w.deleteLater()
-        for w in self.album_list:
-            w.setParent(None)
-            w.deleteLater()
-        for w in self.composer_list:
-            w.setParent(None)
-            w.deleteLater()
-        for w in self.open_details_btn_list:
-            w.setParent(None)
-            w.deleteLater()
-        for w in self.play_btn_list:
-            w.setParent(None)
-            w.deleteLater()
-        for w in self.add_to_playlist_btn_list:
-            w.setParent(None)
-            w.deleteLater()
-        for w in self.remove_btn_list:
-            w.setParent(None)
-            w.deleteLater()
-        # Note: Pagination widgets are in pagination_frame (not scrollable), so they persist
-        # They are managed in add_widgets_for_results() with setVisible
-        self.title_list = []
-        self.artist_list = []
-        self.album_list = []
-        self.composer_list = []
-        self.open_details_btn_list = []
-        self.play_btn_list = []
-        self.add_to_playlist_btn_list = []
-        self.remove_btn_list = []
-
     def _refresh_widgets(self, add_results=True):
-        self.clear_widget_lists()
         if add_results:
-            self.add_widgets_for_results()
-        # Qt: no master.update() equivalent; layout handles refresh
+            self.show_results()
+        else:
+            self.track_results_model.set_items([])
+            self._show_message("")
 
-    def add_widgets_for_results(self):
+    def show_results(self):
+        """Redraw the whole result table from library_data_search (new search, sort)."""
         assert self.library_data_search is not None
         if len(self.library_data_search.results) == 0:
-            self.searching_label = QLabel(_("No results found."), self.results_widget)
-            self.searching_label.setWordWrap(True)
-            self.results_layout.addWidget(self.searching_label, 1, 1)
-            self.title_list.append(self.searching_label)
-            # Add cache reminder
-            cache_reminder = QLabel(
-                _(
+            self._show_message(
+                _("No results found.")
+                + "\n\n"
+                + _(
                     "Tip: If you've recently added or moved files, try checking 'Overwrite Cache' in the search options below."
-                ),
-                self.results_widget,
+                )
             )
-            cache_reminder.setWordWrap(True)
-            self.results_layout.addWidget(cache_reminder, 2, 1)
-            self.title_list.append(cache_reminder)
+            self._update_pagination_controls()
             return
         self.library_data_search.sort_results_by()
-        results = self.library_data_search.get_results()
+        self._show_rows(self.track_results_model, self.library_data_search.get_results())
+        self.results_view.set_filter_text(self.filter_entry.text())
+        self._update_result_status()
+
+    def _update_result_status(self):
+        """Filter message and pagination controls for the rows currently in the table."""
+        filter_text = self.filter_entry.text().strip()
+        if filter_text and self.results_view.visible_row_count() == 0:
+            self.searching_label.setText(
+                _("No results match the filter '{0}'.").format(self.filter_entry.text())
+            )
+            self.searching_label.show()
+        else:
+            self.searching_label.hide()
+        self._update_pagination_controls()
+
+    def _update_pagination_controls(self):
+        results = self.library_data_search.get_results() if self.library_data_search else []
         total_results = len(results)
-        stored_count = self.library_data_search.stored_results_count
-        # Apply filter if filter text is provided
+        stored_count = self.library_data_search.stored_results_count if self.library_data_search else 0
         filter_text = self.filter_entry.text().strip().lower()
-        if filter_text:
-            # Filter results based on filter text matching any displayed field
-            filtered = [
-                t
-                for t in results
-                if filter_text in (t.title or "").lower()
-                or filter_text in (t.artist or "").lower()
-                or filter_text in (t.album or "").lower()
-                or filter_text in (t.composer or "").lower()
-            ]
-            display_results = filtered
-        else:
-            # No filter, show all results
-            display_results = results
-        display_count = len(display_results)
-        # Show message if filter returns no results
-        if filter_text and display_count == 0:
-            self.searching_label = QLabel(
-                _("No results match the filter '{0}'.").format(self.filter_entry.text()),
-                self.results_widget,
-            )
-            self.searching_label.setWordWrap(True)
-            self.results_layout.addWidget(self.searching_label, 1, 1)
-            self.title_list.append(self.searching_label)
-            return
+        display_count = self.results_view.visible_row_count() if filter_text else total_results
         # Check if there are more results available.
         # The current page loaded (total_results - current_offset) new items;
         # if that exceeds the page size it means more exist beyond this page.
@@ -636,7 +573,7 @@ class SearchWindow(SmartWindow):
         has_more_total = stored_count > (self.current_offset + display_count)
         has_loaded_more = self.current_offset > 0
         # Add warning and load more controls in the fixed frame (not scrollable)
-        if has_more_detected or has_more_total or has_loaded_more:
+        if total_results > 0 and (has_more_detected or has_more_total or has_loaded_more):
             # Create warning label if it doesn't exist
             if self.pagination_warning_label is None:
                 self.pagination_warning_label = QLabel(self.pagination_frame)
@@ -648,7 +585,6 @@ class SearchWindow(SmartWindow):
             # Update warning text
             # Note: Results accumulate (showing all results loaded so far, not just current batch)
             # Show both values only if they are different
-            filter_text = self.filter_entry.text().strip().lower()
             if filter_text:
                 # Show filtered count vs total count when filtering is active
                 if stored_count != display_count:
@@ -684,83 +620,15 @@ class SearchWindow(SmartWindow):
                 self.pagination_warning_label.setVisible(False)
             if self.pagination_next_btn is not None:
                 self.pagination_next_btn.setVisible(False)
-        # Display results (only show first max_results, not the extra one used for detection)
-        # Results start at row 1 (row 0 is for any header if needed)
-        results_start_row = 1
-        for i, track in enumerate(display_results):
-            row = results_start_row + i
-            title_label = QLabel(track.title or "", self.results_widget)
-            title_label.setWordWrap(True)
-            title_label.setMinimumWidth(200)
-            title_label.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Preferred)
-            self.results_layout.addWidget(title_label, row, 1)
-            self.title_list.append(title_label)
-            artist_label = QLabel(track.artist or "", self.results_widget)
-            artist_label.setWordWrap(True)
-            artist_label.setMinimumWidth(200)
-            artist_label.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Preferred)
-            self.results_layout.addWidget(artist_label, row, 2)
-            self.artist_list.append(artist_label)
-            album_label = QLabel(track.album or "", self.results_widget)
-            album_label.setWordWrap(True)
-            album_label.setMinimumWidth(200)
-            album_label.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Preferred)
-            self.results_layout.addWidget(album_label, row, 3)
-            self.album_list.append(album_label)
-            composer_label = QLabel(track.composer or "", self.results_widget)
-            composer_label.setWordWrap(True)
-            composer_label.setMinimumWidth(200)
-            composer_label.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Preferred)
-            self.results_layout.addWidget(composer_label, row, 4)
-            self.composer_list.append(composer_label)
-
-            excluded_by = self._get_exclusion_match(track)
-            if excluded_by:
-                exclusion_tooltip = _(
-                    "Won't be played: matches playlist exclusion filter \"{0}\"."
-                ).format(excluded_by)
-                for lbl in (title_label, artist_label, album_label, composer_label):
-                    lbl.setStyleSheet("color: grey;")
-                    lbl.setToolTip(exclusion_tooltip)
-
-            details_btn = QPushButton(_("Details"), self.results_widget)
-            details_btn.setSizePolicy(QSizePolicy.Policy.Fixed, QSizePolicy.Policy.Fixed)
-            self.open_details_btn_list.append(details_btn)
-            self.results_layout.addWidget(details_btn, row, 5)
-
-            def make_details_handler(tr):
-                def handler():
-                    self.open_details(tr)
-                return handler
-
-            details_btn.clicked.connect(make_details_handler(track))
-            play_btn = QPushButton(_("Play"), self.results_widget)
-            play_btn.setSizePolicy(QSizePolicy.Policy.Fixed, QSizePolicy.Policy.Fixed)
-            if excluded_by:
-                play_btn.setEnabled(False)
-                play_btn.setToolTip(exclusion_tooltip)
-            self.play_btn_list.append(play_btn)
-            self.results_layout.addWidget(play_btn, row, 6)
-
-            def make_play_handler(tr):
-                def handler():
-                    logger.info("User selected audio track: %s", tr)
-                    self.run_play_callback(tr)
-                return handler
-
-            play_btn.clicked.connect(make_play_handler(track))
-
-            add_pl_btn = QPushButton(_("+ Playlist"), self.results_widget)
-            add_pl_btn.setSizePolicy(QSizePolicy.Policy.Fixed, QSizePolicy.Policy.Fixed)
-            self.add_to_playlist_btn_list.append(add_pl_btn)
-            self.results_layout.addWidget(add_pl_btn, row, 7)
-
-            def make_add_to_playlist_handler(tr):
-                def handler():
-                    self._add_track_to_playlist(tr)
-                return handler
-
-            add_pl_btn.clicked.connect(make_add_to_playlist_handler(track))
+
+    @staticmethod
+    def _exclusion_tooltip(track):
+        excluded_by = SearchWindow._get_exclusion_match(track)
+        if not excluded_by:
+            return None
+        return _(
+            "Won't be played: matches playlist exclusion filter \"{0}\"."
+        ).format(excluded_by)
 
     @staticmethod
     def _get_exclusion_match(track):
@@ -787,6 +655,7 @@ class SearchWindow(SmartWindow):
         SearchWindow.update_recent_searches(
             library_data_search, remove_searches_with_no_selected_filepath=True
         )
+        PersistentDataManager.request_store(PersistentDataManager.RECENT_SEARCHES)
         playlist_sort_type = self.get_playlist_sort_type()
         self.app_actions.start_play_callback(
             track=track,
@@ -910,7 +779,6 @@ class SearchWindow(SmartWindow):
             s for s in SearchWindow.recent_searches if s != search
         ]
         SearchWindow.store_recent_searches()
-        self.clear_widget_lists()
         self.show_recent_searches()
 
     @staticmethod
@@ -937,7 +805,10 @@ class SearchWindow(SmartWindow):
 
     def apply_filter(self, text=""):
         """Apply filter to search results."""
-        self._refresh_widgets()
+        if self.results_view.result_model() is not self.track_results_model:
+            return
+        self.results_view.set_filter_text(text)
+        self._update_result_status()
 
     def keyPressEvent(self, event):
         if event.key() == Qt.Key.Key_Escape:
@@ -2,11 +2,17 @@ import datetime
 import json
 import os
 import shutil
+import struct
 import threading
 
 from lib.position_data_qt import PositionData
 from utils.cache_paths import muse_cache_dir
-from utils.encryptor import encrypt_data_to_file, decrypt_data_from_file
+from utils.encryptor import (
+    encrypt_data_to_file,
+    decrypt_data_from_file,
+    encrypt_data_to_bytes,
+    decrypt_data_from_bytes_list,
+)
 from utils.globals import AppInfo
 from utils.logging_setup import get_logger
 from utils.runner_app_config import RunnerAppConfig
@@ -21,12 +27,28 @@ class AppInfoCache:
     HISTORY_KEY = "history"
     DIRECTORIES_KEY = "directories"
     TRACKERS_KEY = "trackers"
+    JOURNAL_LOC = os.path.join(os.path.dirname(os.path.abspath(os.path.dirname(__file__))), "app_info_cache.journal.enc")
     MAX_HISTORY_ENTRIES = 50
     NUM_BACKUPS = 4  # Number of backup files to maintain
+    # Journal records only hold the changed entries, so favour speed over ratio;
+    # the full snapshot written on compaction keeps the best compression.
+    JOURNAL_COMPRESSION_LEVEL = 1
+    JOURNAL_MAX_RECORDS = 100
+    JOURNAL_MIN_COMPACT_BYTES = 256 * 1024
+    _RECORD_HEADER = struct.Struct(">I")
+    # Snapshot key holding the sequence number of the last journal record it includes
+    JOURNAL_SEQ_KEY = "__journal_seq__"
 
     def __init__(self):
         self._lock = threading.RLock()
+        self._store_lock = threading.Lock()
         self._cache = {AppInfoCache.INFO_KEY: {}, AppInfoCache.HISTORY_KEY: [], AppInfoCache.DIRECTORIES_KEY: {}}
+        # (section, key) pairs changed since the last store; key is None when the whole section is dirty
+        self._dirty = set()
+        self._compaction_pending = False
+        self._journal_records = 0
+        self._journal_size = 0
+        self._journal_seq = 0
         _override = muse_cache_dir()
         self._cache_loc = (
             os.path.join(_override, "app_info_cache.enc") if _override else self.CACHE_LOC
@@ -34,38 +56,206 @@ class AppInfoCache:
         self._json_loc = (
             os.path.join(_override, "app_info_cache.json") if _override else self.JSON_LOC
         )
+        self._journal_loc = (
+            os.path.join(_override, "app_info_cache.journal.enc") if _override else self.JOURNAL_LOC
+        )
         self.load()
         self.validate()
 
     def wipe_instance(self):
         with self._lock:
             self._cache = {AppInfoCache.INFO_KEY: {}, AppInfoCache.HISTORY_KEY: [], AppInfoCache.DIRECTORIES_KEY: {}}
+            self._dirty.clear()
+            self._compaction_pending = True
+
+    def store(self, compact=False):
+        """
+        Persist cache changes. Returns True on success, False if encrypted store failed but JSON fallback succeeded.
+        Raises on encoding or JSON fallback failure.
+
+        Normally only the entries changed since the last store are appended to an encrypted journal.
+        The journal is folded into a full encrypted snapshot when `compact` is set or it grows past
+        JOURNAL_MAX_RECORDS / the size of the snapshot.
+        """
+        with self._store_lock:
+            if compact or self._should_compact():
+                return self._store_snapshot()
+
+            with self._lock:
+                dirty = set(self._dirty)
+                if not dirty:
+                    return True
+                seq = self._journal_seq + 1
+                try:
+                    record_data = json.dumps({"seq": seq, "entries": self._collect_entries(dirty)}).encode('utf-8')
+                except Exception as e:
+                    raise Exception(f"Error compiling application cache: {e}")
+                self._dirty.clear()
 
-    def store(self):
-        """Persist cache to encrypted file. Returns True on success, False if encrypted store failed but JSON fallback succeeded. Raises on encoding or JSON fallback failure."""
-        with self._lock:
             try:
-                cache_data = json.dumps(self._cache).encode('utf-8')
-            except Exception as e:
-                raise Exception(f"Error compiling application cache: {e}")
-
-            try:
-                encrypt_data_to_file(
-                    cache_data,
+                record = encrypt_data_to_bytes(
+                    record_data,
                     AppInfo.SERVICE_NAME,
                     AppInfo.APP_IDENTIFIER,
-                    self._cache_loc,
+                    compression_level=AppInfoCache.JOURNAL_COMPRESSION_LEVEL,
                 )
-                return True  # Encryption successful
+                with open(self._journal_loc, "ab") as f:
+                    f.write(AppInfoCache._RECORD_HEADER.pack(len(record)))
+                    f.write(record)
+                self._journal_seq = seq
+                self._journal_records += 1
+                self._journal_size += AppInfoCache._RECORD_HEADER.size + len(record)
+                return True
             except Exception as e:
-                logger.error(f"Error encrypting cache: {e}")
+                logger.error(f"Error appending to cache journal, storing full snapshot: {e}")
+                with self._lock:
+                    self._dirty |= dirty
+                return self._store_snapshot()
 
+    def _should_compact(self):
+        if self._compaction_pending or os.path.exists(self._json_loc) or not os.path.exists(self._cache_loc):
+            return True
+        if self._journal_records >= AppInfoCache.JOURNAL_MAX_RECORDS:
+            return True
+        try:
+            snapshot_size = os.path.getsize(self._cache_loc)
+        except OSError:
+            return True
+        return self._journal_size > max(AppInfoCache.JOURNAL_MIN_COMPACT_BYTES, snapshot_size)
+
+    def _store_snapshot(self):
+        """
+        Write the full cache as a single encrypted snapshot and discard the journal. Caller holds _store_lock.
+
+        The snapshot records the sequence number of the last journal record it includes, so if the
+        journal survives a crash before it is removed, those records are not replayed over the snapshot.
+        """
+        with self._lock:
             try:
-                with open(self._json_loc, "w", encoding="utf-8") as f:
-                    json.dump(self._cache, f)
-                return False  # Encryption failed, but JSON fallback succeeded
+                cache_data = json.dumps({**self._cache, AppInfoCache.JOURNAL_SEQ_KEY: self._journal_seq}).encode('utf-8')
             except Exception as e:
-                raise Exception(f"Error storing application cache: {e}")
+                raise Exception(f"Error compiling application cache: {e}")
+            dirty = set(self._dirty)
+            self._dirty.clear()
+            self._compaction_pending = False
+
+        try:
+            encrypt_data_to_file(
+                cache_data,
+                AppInfo.SERVICE_NAME,
+                AppInfo.APP_IDENTIFIER,
+                self._cache_loc,
+            )
+            self._remove_journal()
+            return True  # Encryption successful
+        except Exception as e:
+            logger.error(f"Error encrypting cache: {e}")
+
+        try:
+            temp_path = self._json_loc + ".part"
+            with open(temp_path, "wb") as f:
+                f.write(cache_data)
+            os.replace(temp_path, self._json_loc)
+            return False  # Encryption failed, but JSON fallback succeeded
+        except Exception as e:
+            with self._lock:
+                self._dirty |= dirty
+                self._compaction_pending = True
+            raise Exception(f"Error storing application cache: {e}")
+
+    def _mark_dirty(self, section, key=None):
+        """Must be called from within a locked context."""
+        self._dirty.add((section, key))
+
+    def _collect_entries(self, dirty):
+        """Build journal entries for the given dirty pairs. Must be called from within a locked context."""
+        entries = []
+        for section, key in dirty:
+            if key is None:
+                entries.append([section, None, self._cache.get(section)])
+            else:
+                entries.append([section, key, self._cache.get(section, {}).get(key)])
+        return entries
+
+    def _apply_entries(self, entries):
+        """Replay journal entries onto the loaded cache. Must be called from within a locked context."""
+        for section, key, value in entries:
+            if key is None:
+                self._cache[section] = value
+            else:
+                if not isinstance(self._cache.get(section), dict):
+                    self._cache[section] = {}
+                self._cache[section][key] = value
+
+    def _read_journal_records(self):
+        """Read raw encrypted journal records, ignoring a truncated trailing record."""
+        records = []
+        with open(self._journal_loc, "rb") as f:
+            data = f.read()
+        index = 0
+        header_size = AppInfoCache._RECORD_HEADER.size
+        while index + header_size <= len(data):
+            record_len = AppInfoCache._RECORD_HEADER.unpack_from(data, index)[0]
+            start = index + header_size
+            if start + record_len > len(data):
+                logger.warning(f"Ignoring truncated record at end of cache journal {self._journal_loc}")
+                break
+            records.append(data[start:start + record_len])
+            index = start + record_len
+        return records, index
+
+    def _take_snapshot_seq(self):
+        """Remove the journal sequence number from a loaded snapshot. Must be called from within a locked context."""
+        self._journal_seq = self._cache.pop(AppInfoCache.JOURNAL_SEQ_KEY, 0)
+
+    def _replay_journal(self):
+        """
+        Apply journal records written since the loaded snapshot. Records at or below the snapshot's
+        sequence number are already in it. Must be called from within a locked context.
+        """
+        self._journal_records = 0
+        self._journal_size = 0
+        if not os.path.exists(self._journal_loc):
+            return
+        try:
+            records, valid_size = self._read_journal_records()
+            decrypted_records = decrypt_data_from_bytes_list(
+                records,
+                AppInfo.SERVICE_NAME,
+                AppInfo.APP_IDENTIFIER
+            )
+        except Exception as e:
+            logger.error(f"Failed to read cache journal {self._journal_loc}: {e}")
+            self._compaction_pending = True
+            return
+        snapshot_seq = self._journal_seq
+        skipped = 0
+        for decrypted in decrypted_records:
+            record = json.loads(decrypted.decode('utf-8'))
+            if isinstance(record, list):
+                # Records written before sequence numbers were added
+                self._apply_entries(record)
+            elif record["seq"] <= snapshot_seq:
+                skipped += 1
+            else:
+                self._apply_entries(record["entries"])
+                self._journal_seq = max(self._journal_seq, record["seq"])
+        if skipped:
+            logger.warning(f"Skipped {skipped} cache journal records already included in the snapshot")
+        if valid_size < os.path.getsize(self._journal_loc):
+            # Drop the partial record so later appends stay aligned
+            with open(self._journal_loc, "r+b") as f:
+                f.truncate(valid_size)
+        self._journal_records = len(records)
+        self._journal_size = valid_size
+        if records:
+            logger.info(f"Replayed {len(records)} cache journal records from {self._journal_loc}")
+
+    def _remove_journal(self):
+        self._journal_records = 0
+        self._journal_size = 0
+        if os.path.exists(self._journal_loc):
+            os.remove(self._journal_loc)
 
     def _try_load_cache_from_file(self, path):
         """Attempt to load and decrypt the cache from the given file path. Raises on failure."""
@@ -83,7 +273,8 @@ class AppInfoCache:
                     logger.info(f"Detected JSON-format application cache, will attempt migration to encrypted store")
                     with open(self._json_loc, "r", encoding="utf-8") as f:
                         self._cache = json.load(f)
-                    if self.store():
+                    self._take_snapshot_seq()
+                    if self.store(compact=True):
                         logger.info(f"Migrated application cache from {self._json_loc} to encrypted store")
                         os.remove(self._json_loc)
                     else:
@@ -95,12 +286,14 @@ class AppInfoCache:
                 any_exist = any(os.path.exists(path) for path in cache_paths)
                 if not any_exist:
                     logger.info(f"No cache file found at {self._cache_loc}, creating new cache")
+                    self._replay_journal()
                     return
 
                 for path in cache_paths:
                     if os.path.exists(path):
                         try:
                             self._cache = self._try_load_cache_from_file(path)
+                            self._take_snapshot_seq()
                             # Only shift backups if we loaded from the main file
                             if path == self._cache_loc:
                                 message = f"Loaded cache from {self._cache_loc}"
@@ -110,6 +303,7 @@ class AppInfoCache:
                                 logger.info(message)
                             else:
                                 logger.warning(f"Loaded cache from backup: {path}")
+                            self._replay_journal()
                             return
                         except Exception as e:
                             logger.error(f"Failed to load cache from {path}: {e}")
@@ -146,6 +340,7 @@ class AppInfoCache:
             if AppInfoCache.INFO_KEY not in self._cache:
                 self._cache[AppInfoCache.INFO_KEY] = {}
             self._cache[AppInfoCache.INFO_KEY][key] = value
+            self._mark_dirty(AppInfoCache.INFO_KEY, key)
 
     def get(self, key, default_val=None):
         with self._lock:
@@ -188,6 +383,7 @@ class AppInfoCache:
             # Remove the oldest entry from history if over the limit of entries
             while len(history) >= AppInfoCache.MAX_HISTORY_ENTRIES:
                 history = history[0:-1]
+            self._mark_dirty(AppInfoCache.HISTORY_KEY)
             return True
 
     def get_last_history_index(self):
@@ -218,6 +414,7 @@ class AppInfoCache:
             if directory not in directory_info:
                 directory_info[directory] = {}
             directory_info[directory][key] = value
+            self._mark_dirty(AppInfoCache.DIRECTORIES_KEY, directory)
 
     def get_directory(self, directory, key, default_val=None):
         with self._lock:
@@ -232,10 +429,12 @@ class AppInfoCache:
             trackers = self._get_trackers()
             if tracker not in trackers:
                 trackers[tracker] = {"count": 0, "last": datetime.datetime.now().strftime("%Y-%m-%d %H:%M")}
+                self._mark_dirty(AppInfoCache.TRACKERS_KEY, tracker)
             return trackers[tracker]
 
     def increment_tracker(self, tracker):
         with self._lock:
+            self._mark_dirty(AppInfoCache.TRACKERS_KEY, tracker)
             tracker = self.get_tracker(tracker)
             now = datetime.datetime.now()
             last_track = datetime.datetime.strptime(tracker["last"], "%Y-%m-%d %H:%M")
@@ -51,6 +51,8 @@ class Config:
             Globals.ConfigKeys.CHANCE_SPEAK_BEFORE_TRACK: 0.3,
             Globals.ConfigKeys.TOPIC_DISCUSSION_CHANCE_FACTOR: 0.2,
             Globals.ConfigKeys.MIN_SECONDS_BETWEEN_SPOTS: 500,
+            Globals.ConfigKeys.STREAM_SPOTS: False,
+            Globals.ConfigKeys.SPOT_POOL_SIZE: 0,
         }
         self.save_tts_output_topics = [Topic.LANGUAGE_LEARNING.value, Topic.POEM.value, Topic.RANDOM_WIKI_ARTICLE.value, Topic.APHORISM.value]
         self.prompts_directory = Globals.DEFAULT_PROMPTS_DIRECTORY
@@ -75,6 +77,7 @@ class Config:
         self.llm_use_streaming = False
         self.llm_stream_redundancy = False
         self.llm_thinking_budget_chars = None
+        self.llm_keep_alive = None
 
         self.text_cleaner_ruleset = []
         self.number_words = {}  # Locale-specific number word configurations
@@ -191,6 +194,9 @@ class Config:
             "llm_thinking_budget_chars",
             "radio_watchlist_enabled",
         )
+        self.set_values(None,
+            "llm_keep_alive",  # Ollama duration string ("30m") or seconds (-1 keeps the model loaded)
+        )
         self.set_values(dict,
             "muse_config",
             "news_api_source_trustworthiness",
@@ -1,10 +1,33 @@
 """
 SQLite persistence layer for Muse.
 
-Single entry point: get_connection() returns the process-wide singleton
-connection to configs/muse_library.db.  The schema is created and seed data
-is imported automatically on the first call; subsequent calls return the
-already-open connection.
+get_connection() returns the process-wide singleton (writer) connection to
+configs/muse_library.db.  The schema is created and seed data is imported
+automatically on the first call; subsequent calls return the already-open
+connection.
+
+Connection layer:
+  - get_read_connection() returns a per-thread read-only connection so
+    readers on background threads run concurrently under WAL instead of
+    queueing behind the shared writer connection.
+  - write_transaction() serializes writers on one lock and commits (or rolls
+    back) the block as a single transaction.  Every write goes through it,
+    including the schema setup and migrations run when the connection opens;
+    a nested block runs in a SAVEPOINT and only the outermost block commits.
+  - Every connection applies the tuning pragmas in _TUNING_PRAGMAS and records
+    per-statement timings, see get_query_stats().
+
+Path prefix lookups: media_tracks.path_key / parent_key and directories.path_key
+are indexed, generated copies of the path columns (lower-cased ASCII, forward
+slashes).  path_prefix_range() turns a directory into a key range, so finding
+everything under a directory is an index range scan rather than a table scan.
+
+Full-text search: media_tracks_fts is an external-content FTS5 index over the
+SEARCH_COLUMNS of media_tracks, kept in sync by triggers (see
+_search_index_sql).  The searchable_* columns hold the accent-folded,
+lower-cased text MediaTrack matches searches against, and the index uses the
+case-sensitive trigram tokenizer, so a phrase matches exactly the substrings
+LibraryDataSearch.test() does.
 
 Seeding order (one-time, on fresh DB):
   1. *_example.json files  → canonical seed data for each table
@@ -20,9 +43,13 @@ import gzip
 import json
 import logging
 import sqlite3
+import re
+import string
 import threading
+import time
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, Iterator, List, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +62,51 @@ DELIM = "; "
 
 _connection: Optional[sqlite3.Connection] = None
 _lock = threading.Lock()
+# Held by write_transaction(); re-entrant so helpers can nest transactions
+_write_lock = threading.RLock()
+# Nesting depth of _transaction() blocks on the thread holding _write_lock
+_write_depth = 0
+_readers: Optional["_ReaderPool"] = None
+
+BUSY_TIMEOUT_MS = 10000
+MAX_READ_CONNECTIONS = 8
+
+# synchronous=NORMAL is durable across application crashes in WAL mode (only
+# an OS crash can lose the last transactions) and avoids an fsync per commit.
+_TUNING_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA temp_store=MEMORY",
+    f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}",
+)
+
+# Columns of media_tracks mirrored into the media_tracks_fts index.  Bump
+# SEARCH_INDEX_VERSION when this changes so the index is rebuilt.
+SEARCH_COLUMNS = ("searchable_title", "searchable_album", "searchable_artist", "searchable_composer",
+                  "searchable_genre", "form", "instrument", "catalogue")
+SEARCH_INDEX_VERSION = "4"
+
+# Columns added to existing tables after their CREATE TABLE first shipped;
+# _add_missing_columns() brings older databases up to date.
+_ADDED_COLUMNS = (
+    ("media_tracks", "catalogue", "TEXT"),
+    ("media_tracks", "searchable_title", "TEXT"),
+    ("media_tracks", "searchable_album", "TEXT"),
+    ("media_tracks", "searchable_artist", "TEXT"),
+    ("media_tracks", "searchable_composer", "TEXT"),
+    ("media_tracks", "searchable_genre", "TEXT"),
+    ("media_tracks", "in_library", "INTEGER NOT NULL DEFAULT 0"),
+)
+
+# (table, generated column, source column) for the path prefix index
+_PATH_KEY_COLUMNS = (
+    ("media_tracks", "path_key", "filepath"),
+    ("media_tracks", "parent_key", "parent_filepath"),
+    ("directories", "path_key", "path"),
+)
+# SQLite's built-in lower() only folds ASCII; path_key() must match it exactly
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
 
 _SCHEMA = """
 CREATE TABLE IF NOT EXISTS db_meta (
@@ -122,7 +194,15 @@ CREATE TABLE IF NOT EXISTS media_tracks (
     length           REAL,
     form             TEXT,
     instrument       TEXT,
+    catalogue        TEXT,
     is_video         INTEGER,
+    searchable_title    TEXT,
+    searchable_album    TEXT,
+    searchable_artist   TEXT,
+    searchable_composer TEXT,
+    searchable_genre    TEXT,
+    -- 1 for the tracks in LibraryData.all_tracks when store_caches last ran
+    in_library       INTEGER NOT NULL DEFAULT 0,
     scanned_at       REAL NOT NULL
 );
 CREATE INDEX IF NOT EXISTS idx_media_tracks_artist   ON media_tracks(artist);
@@ -192,6 +272,46 @@ CREATE TABLE IF NOT EXISTS mb_failed_lookups (
     status_code INTEGER,                   -- HTTP status if available, else NULL
     failed_at   REAL NOT NULL              -- unix timestamp
 );
+
+-- ─── HTTP response cache (extensions.http_cache) ─────────────────────────────
+
+-- Keyed by the SHA-256 of the URL: query strings can carry API keys, so the
+-- URL itself is not stored.
+
+CREATE TABLE IF NOT EXISTS http_cache (
+    key           TEXT PRIMARY KEY,
+    status        INTEGER NOT NULL,
+    body          BLOB NOT NULL,
+    content_type  TEXT NOT NULL DEFAULT '',
+    etag          TEXT NOT NULL DEFAULT '',
+    last_modified TEXT NOT NULL DEFAULT '',
+    fetched_at    REAL NOT NULL,   -- unix timestamp of the last download or 304
+    last_used     REAL NOT NULL,   -- for least-recently-used eviction
+    size          INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_http_cache_last_used ON http_cache(last_used);
+
+-- ─── DJ spot profile history (muse.muse_memory) ──────────────────────────────
+-- One row per spot profile, written as the spot is created, prepared and
+-- spoken.  Tracks are referenced by filepath.
+
+CREATE TABLE IF NOT EXISTS muse_spot_profiles (
+    creation_time        REAL PRIMARY KEY,
+    preparation_time     REAL,
+    previous_track_path  TEXT NOT NULL DEFAULT '',
+    track_path           TEXT NOT NULL DEFAULT '',
+    previous_track_title TEXT,
+    track_title          TEXT,
+    was_spoken           INTEGER NOT NULL DEFAULT 0,
+    is_group_transition  INTEGER NOT NULL DEFAULT 0,
+    speaking_duration    REAL NOT NULL DEFAULT 0,
+    topic                TEXT,
+    topic_translated     TEXT,
+    grouping_type        TEXT,
+    old_grouping         TEXT,
+    new_grouping         TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_msp_spoken ON muse_spot_profiles(creation_time) WHERE was_spoken = 1;
 """
 
 
@@ -201,21 +321,175 @@ CREATE TABLE IF NOT EXISTS mb_failed_lookups (
 
 def get_connection() -> sqlite3.Connection:
     """Return the process-wide singleton DB connection, initializing on first call."""
-    global _connection
+    global _connection, _readers
     with _lock:
         if _connection is None:
             DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-            conn = sqlite3.connect(str(DB_PATH), check_same_thread=False, timeout=10)
+            conn = sqlite3.connect(
+                str(DB_PATH), check_same_thread=False, timeout=10, factory=TimedConnection
+            )
             conn.row_factory = sqlite3.Row
             conn.execute("PRAGMA journal_mode=WAL")
             conn.execute("PRAGMA foreign_keys=ON")
+            # INSERT OR REPLACE must fire delete triggers to keep the FTS index in sync
+            conn.execute("PRAGMA recursive_triggers=ON")
+            _apply_tuning_pragmas(conn)
+            # Schema changes and migrations run once here, before the connection is shared
             _create_schema(conn)
+            _add_missing_columns(conn)
+            ensure_path_key_columns(conn)
+            _create_search_index(conn)
             _seed_if_needed(conn)
             _migrate_gzip_caches(conn)
+            _drop_url_keyed_http_cache(conn)
             _connection = conn
+            _readers = _ReaderPool(DB_PATH, conn)
     return _connection
 
 
+def get_read_connection() -> sqlite3.Connection:
+    """
+    Return a read-only connection owned by the calling thread.
+
+    Reads through it see the latest committed data and never wait on the
+    writer.  Uncommitted writes made on the writer connection are not
+    visible, so code that reads back its own pending writes should keep
+    using get_connection().  Falls back to the writer connection when the
+    pool is unavailable (e.g. an in-memory connection swapped in by tests).
+    """
+    writer = get_connection()
+    readers = _readers
+    if readers is None or readers.writer is not writer:
+        return writer
+    try:
+        return readers.get()
+    except sqlite3.Error as e:
+        logger.warning(f"Falling back to writer connection for read: {e}")
+        return writer
+
+
+@contextmanager
+def write_transaction() -> Iterator[sqlite3.Connection]:
+    """
+    Run a block of writes as one transaction on the writer connection.
+
+    Writers are serialized on a single lock, so statements from different
+    threads cannot interleave inside each other's transactions.  Commits on
+    success and rolls back if the block raises.  A block nested inside another
+    runs in a SAVEPOINT: it rolls back only its own writes if it raises, and
+    its writes are committed with the outermost block.
+    """
+    with _transaction(get_connection()) as conn:
+        yield conn
+
+
+@contextmanager
+def _transaction(conn: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+    """write_transaction() on a given connection (also used to set up a new connection)."""
+    global _write_depth
+    with _write_lock:
+        if _write_depth == 0:
+            if not conn.in_transaction:
+                # Open the transaction now so a nested SAVEPOINT cannot start (and commit) its own
+                conn.execute("BEGIN")
+            _write_depth += 1
+            try:
+                yield conn
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+            finally:
+                _write_depth -= 1
+        else:
+            savepoint = f"write_transaction_{_write_depth}"
+            conn.execute(f"SAVEPOINT {savepoint}")
+            _write_depth += 1
+            try:
+                yield conn
+            except BaseException:
+                conn.execute(f"ROLLBACK TO {savepoint}")
+                raise
+            finally:
+                _write_depth -= 1
+                conn.execute(f"RELEASE {savepoint}")
+
+
+def get_query_stats(limit: Optional[int] = None) -> List[dict]:
+    """
+    Return accumulated per-statement timings, slowest (by total time) first.
+
+    Each entry has the normalized sql, the number of executions, and the
+    total/average/max seconds spent executing and fetching.
+    """
+    return _query_stats.snapshot(limit)
+
+
+def reset_query_stats() -> None:
+    _query_stats.reset()
+
+
+def path_key(path: str) -> str:
+    """The path_key value SQLite computes for *path* (see _PATH_KEY_COLUMNS)."""
+    return path.replace("\\", "/").translate(_ASCII_LOWER)
+
+
+def path_prefix_range(directory: str) -> tuple:
+    """
+    Return (low, high) such that ``path_key >= low AND path_key < high`` selects
+    every path strictly under *directory*.  The match is case-insensitive, so
+    callers should confirm candidates with an exact path comparison.
+    """
+    key = path_key(directory).rstrip("/")
+    # "0" is the character after "/", so the range covers exactly "<key>/..."
+    return key + "/", key + "0"
+
+
+def ensure_path_key_columns(conn: sqlite3.Connection) -> None:
+    """
+    Add the indexed path_key columns to an existing database (idempotent).
+    Run by get_connection() when it opens the database.
+    """
+    with _transaction(conn):
+        for table, column, source in _PATH_KEY_COLUMNS:
+            existing = {r[1] for r in conn.execute(f"PRAGMA table_xinfo({table})")}
+            if column not in existing:
+                conn.execute(
+                    f"ALTER TABLE {table} ADD COLUMN {column} TEXT "
+                    f"GENERATED ALWAYS AS (lower(replace({source}, '\\', '/'))) VIRTUAL"
+                )
+            conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_{column} ON {table}({column})")
+
+
+def get_meta(key: str) -> Optional[str]:
+    """Read a db_meta value (version and migration markers stored with the data)."""
+    return _get_meta(get_read_connection(), key)
+
+
+def set_meta(conn: sqlite3.Connection, key: str, value: str) -> None:
+    """Write a db_meta value on *conn*, typically inside the caller's write_transaction()."""
+    _set_meta(conn, key, value)
+
+
+def has_search_index(conn: sqlite3.Connection) -> bool:
+    """True if *conn* has the media_tracks_fts index (FTS5 may be missing from the SQLite build)."""
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name='media_tracks_fts'"
+    ).fetchone() is not None
+
+
+def rebuild_search_index(conn: Optional[sqlite3.Connection] = None) -> None:
+    """Repopulate media_tracks_fts from media_tracks (needed after e.g. VACUUM renumbers rowids)."""
+    with _transaction(conn or get_connection()) as conn:
+        conn.execute("INSERT INTO media_tracks_fts(media_tracks_fts) VALUES('rebuild')")
+
+
+def close_read_connections() -> None:
+    """Close every pooled read connection (they are reopened on demand)."""
+    if _readers is not None:
+        _readers.close_all()
+
+
 def list_to_delim(values) -> str:
     """Join a list of strings with DELIM.  Returns '' for empty/None input."""
     if not values:
@@ -230,6 +504,182 @@ def delim_to_list(value: str) -> List[str]:
     return [x for x in value.split(DELIM) if x]
 
 
+# ---------------------------------------------------------------------------
+# Connection pool and query timing
+# ---------------------------------------------------------------------------
+
+class _QueryStats:
+    """Thread-safe accumulator of execution times keyed by normalized SQL."""
+
+    _WHITESPACE = re.compile(r"\s+")
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stats: Dict[str, List[float]] = {}
+
+    def record(self, sql: Optional[str], seconds: float, executed: bool = True) -> None:
+        if not sql:
+            return
+        key = self._WHITESPACE.sub(" ", sql).strip()
+        with self._lock:
+            entry = self._stats.get(key)
+            if entry is None:
+                # [count, total, max]
+                entry = self._stats[key] = [0, 0.0, 0.0]
+            if executed:
+                entry[0] += 1
+            entry[1] += seconds
+            entry[2] = max(entry[2], seconds)
+
+    def snapshot(self, limit: Optional[int] = None) -> List[dict]:
+        with self._lock:
+            items = [(sql, list(entry)) for sql, entry in self._stats.items()]
+        items.sort(key=lambda item: item[1][1], reverse=True)
+        if limit is not None:
+            items = items[:limit]
+        return [
+            {
+                "sql": sql,
+                "count": count,
+                "total": total,
+                "average": total / count if count else 0.0,
+                "max": max_seconds,
+            }
+            for sql, (count, total, max_seconds) in items
+        ]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+_query_stats = _QueryStats()
+
+
+class _TimedCursor(sqlite3.Cursor):
+    """Cursor that attributes execute and fetch time to the statement it ran."""
+
+    _sql: Optional[str] = None
+
+    def execute(self, sql, parameters=()):
+        self._sql = sql
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            _query_stats.record(sql, time.perf_counter() - start)
+
+    def executemany(self, sql, seq_of_parameters):
+        self._sql = sql
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            _query_stats.record(sql, time.perf_counter() - start)
+
+    def fetchone(self):
+        start = time.perf_counter()
+        try:
+            return super().fetchone()
+        finally:
+            _query_stats.record(self._sql, time.perf_counter() - start, executed=False)
+
+    def fetchmany(self, size=None):
+        start = time.perf_counter()
+        try:
+            return super().fetchmany(self.arraysize if size is None else size)
+        finally:
+            _query_stats.record(self._sql, time.perf_counter() - start, executed=False)
+
+    def fetchall(self):
+        start = time.perf_counter()
+        try:
+            return super().fetchall()
+        finally:
+            _query_stats.record(self._sql, time.perf_counter() - start, executed=False)
+
+
+class TimedConnection(sqlite3.Connection):
+    """
+    sqlite3 connection whose cursors record per-statement timings.
+
+    Connection.execute() in CPython does not go through cursor(), so the
+    shortcut methods are overridden as well.
+    """
+
+    def cursor(self, factory=_TimedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+class _ReaderPool:
+    """Read-only connections to the database file, one per thread."""
+
+    def __init__(self, path: Path, writer: sqlite3.Connection) -> None:
+        self.path = path
+        self.writer = writer
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: Dict[int, tuple] = {}
+
+    def get(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            return conn
+        with self._lock:
+            if len(self._connections) >= MAX_READ_CONNECTIONS:
+                self._close_dead_threads()
+            if len(self._connections) >= MAX_READ_CONNECTIONS:
+                # Too many live reader threads; share the writer rather than grow unbounded
+                return self.writer
+            conn = sqlite3.connect(
+                f"{self.path.as_uri()}?mode=ro",
+                uri=True,
+                check_same_thread=False,
+                timeout=BUSY_TIMEOUT_MS / 1000,
+                factory=TimedConnection,
+            )
+            conn.row_factory = sqlite3.Row
+            _apply_tuning_pragmas(conn)
+            thread = threading.current_thread()
+            self._connections[thread.ident] = (thread, conn)
+        self._local.conn = conn
+        return conn
+
+    def _close_dead_threads(self) -> None:
+        """Must be called while holding _lock."""
+        for ident, (thread, conn) in list(self._connections.items()):
+            if not thread.is_alive():
+                del self._connections[ident]
+                _close_quietly(conn)
+
+    def close_all(self) -> None:
+        with self._lock:
+            connections = list(self._connections.values())
+            self._connections.clear()
+        # Threads holding a closed connection reopen on their next get()
+        self._local = threading.local()
+        for _, conn in connections:
+            _close_quietly(conn)
+
+
+def _apply_tuning_pragmas(conn: sqlite3.Connection) -> None:
+    for pragma in _TUNING_PRAGMAS:
+        conn.execute(pragma)
+
+
+def _close_quietly(conn: sqlite3.Connection) -> None:
+    try:
+        conn.close()
+    except sqlite3.Error:
+        pass
+
+
 # ---------------------------------------------------------------------------
 # Internal helpers
 # ---------------------------------------------------------------------------
@@ -238,6 +688,66 @@ def _create_schema(conn: sqlite3.Connection) -> None:
     conn.executescript(_SCHEMA)
 
 
+def _add_missing_columns(conn: sqlite3.Connection) -> None:
+    with _transaction(conn):
+        for table, column, decl in _ADDED_COLUMNS:
+            existing = {r[1] for r in conn.execute(f"PRAGMA table_xinfo({table})")}
+            if column not in existing:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {decl}")
+
+
+def _search_index_sql() -> str:
+    cols = ", ".join(SEARCH_COLUMNS)
+    new_vals = ", ".join(f"new.{c}" for c in SEARCH_COLUMNS)
+    old_vals = ", ".join(f"old.{c}" for c in SEARCH_COLUMNS)
+    changed = " OR ".join(f"old.{c} IS NOT new.{c}" for c in SEARCH_COLUMNS)
+    return f"""
+CREATE VIRTUAL TABLE IF NOT EXISTS media_tracks_fts USING fts5(
+    {cols},
+    content='media_tracks',
+    content_rowid='rowid',
+    tokenize='trigram case_sensitive 1'
+);
+CREATE TRIGGER IF NOT EXISTS media_tracks_fts_insert AFTER INSERT ON media_tracks BEGIN
+    INSERT INTO media_tracks_fts(rowid, {cols}) VALUES (new.rowid, {new_vals});
+END;
+CREATE TRIGGER IF NOT EXISTS media_tracks_fts_delete AFTER DELETE ON media_tracks BEGIN
+    INSERT INTO media_tracks_fts(media_tracks_fts, rowid, {cols}) VALUES ('delete', old.rowid, {old_vals});
+END;
+CREATE TRIGGER IF NOT EXISTS media_tracks_fts_update AFTER UPDATE OF {cols} ON media_tracks
+WHEN {changed} BEGIN
+    INSERT INTO media_tracks_fts(media_tracks_fts, rowid, {cols}) VALUES ('delete', old.rowid, {old_vals});
+    INSERT INTO media_tracks_fts(rowid, {cols}) VALUES (new.rowid, {new_vals});
+END;
+"""
+
+
+_DROP_SEARCH_INDEX = """
+DROP TRIGGER IF EXISTS media_tracks_fts_insert;
+DROP TRIGGER IF EXISTS media_tracks_fts_delete;
+DROP TRIGGER IF EXISTS media_tracks_fts_update;
+DROP TABLE IF EXISTS media_tracks_fts;
+"""
+
+
+def _create_search_index(conn: sqlite3.Connection) -> None:
+    """Create (or, on a version change, recreate and repopulate) the FTS index."""
+    try:
+        if _get_meta(conn, "search_index_version") == SEARCH_INDEX_VERSION and has_search_index(conn):
+            return
+        # executescript() commits first, so the DDL runs outside the transaction
+        with _write_lock:
+            conn.executescript(_DROP_SEARCH_INDEX)
+            conn.executescript(_search_index_sql())
+        with _transaction(conn):
+            conn.execute("INSERT INTO media_tracks_fts(media_tracks_fts) VALUES('rebuild')")
+            _set_meta(conn, "search_index_version", SEARCH_INDEX_VERSION)
+        logger.info("Built full-text search index over media_tracks")
+    except sqlite3.OperationalError as e:
+        # SQLite builds without FTS5 keep working; searches fall back to scanning in memory
+        logger.warning(f"Full-text search index unavailable: {e}")
+
+
 def _get_meta(conn: sqlite3.Connection, key: str) -> Optional[str]:
     row = conn.execute("SELECT value FROM db_meta WHERE key=?", (key,)).fetchone()
     return row[0] if row else None
@@ -257,15 +767,15 @@ def _seed_if_needed(conn: sqlite3.Connection) -> None:
     if _get_meta(conn, "seeded") == "1":
         return
     logger.info("Fresh database — seeding from example files...")
-    _seed_forms(conn)
-    _seed_genres(conn)
-    _seed_instruments(conn)
-    _seed_composers(conn)
-    _seed_artists(conn)
-    _seed_blacklist(conn)
-    _seed_blacklist_music(conn)
-    _set_meta(conn, "seeded", "1")
-    conn.commit()
+    with _transaction(conn):
+        _seed_forms(conn)
+        _seed_genres(conn)
+        _seed_instruments(conn)
+        _seed_composers(conn)
+        _seed_artists(conn)
+        _seed_blacklist(conn)
+        _seed_blacklist_music(conn)
+        _set_meta(conn, "seeded", "1")
     logger.info("Seed complete — migrating legacy JSON files...")
     _migrate_legacy_json(conn)
     logger.info("Legacy JSON migration complete.")
@@ -441,11 +951,11 @@ def _migrate_legacy_forms(conn: sqlite3.Connection) -> None:
         (v["name"], list_to_delim(v.get("transliterations", [])), json.dumps(v.get("notes", {})))
         for v in data.values()
     ]
-    conn.executemany(
-        "INSERT OR IGNORE INTO forms (name, transliterations, notes) VALUES (?, ?, ?)",
-        rows,
-    )
-    conn.commit()
+    with _transaction(conn):
+        conn.executemany(
+            "INSERT OR IGNORE INTO forms (name, transliterations, notes) VALUES (?, ?, ?)",
+            rows,
+        )
 
 
 def _migrate_legacy_genres(conn: sqlite3.Connection) -> None:
@@ -458,11 +968,11 @@ def _migrate_legacy_genres(conn: sqlite3.Connection) -> None:
         (v["name"], list_to_delim(v.get("transliterations", [])), json.dumps(v.get("notes", {})))
         for v in data.values()
     ]
-    conn.executemany(
-        "INSERT OR IGNORE INTO genres (name, transliterations, notes) VALUES (?, ?, ?)",
-        rows,
-    )
-    conn.commit()
+    with _transaction(conn):
+        conn.executemany(
+            "INSERT OR IGNORE INTO genres (name, transliterations, notes) VALUES (?, ?, ?)",
+            rows,
+        )
 
 
 def _migrate_legacy_instruments(conn: sqlite3.Connection) -> None:
@@ -471,11 +981,11 @@ def _migrate_legacy_instruments(conn: sqlite3.Connection) -> None:
         return
     with open(path, "r", encoding="utf-8") as f:
         data = json.load(f)
-    conn.executemany(
-        "INSERT OR IGNORE INTO instruments (name) VALUES (?)",
-        [(name,) for name in data],
-    )
-    conn.commit()
+    with _transaction(conn):
+        conn.executemany(
+            "INSERT OR IGNORE INTO instruments (name) VALUES (?)",
+            [(name,) for name in data],
+        )
 
 
 def _migrate_legacy_composers(conn: sqlite3.Connection) -> None:
@@ -505,14 +1015,14 @@ def _migrate_legacy_composers(conn: sqlite3.Connection) -> None:
         )
         for v in data.values()
     ]
-    conn.executemany(
-        """INSERT OR IGNORE INTO composers
-           (id, name, mbid, indicators, start_date, end_date,
-            dates_are_lifespan, dates_uncertain, genres, works, notes, date_added)
-           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-        rows,
-    )
-    conn.commit()
+    with _transaction(conn):
+        conn.executemany(
+            """INSERT OR IGNORE INTO composers
+               (id, name, mbid, indicators, start_date, end_date,
+                dates_are_lifespan, dates_uncertain, genres, works, notes, date_added)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            rows,
+        )
     logger.info("Legacy composer migration: %d records processed", len(rows))
 
 
@@ -537,14 +1047,14 @@ def _migrate_legacy_artists(conn: sqlite3.Connection) -> None:
         )
         for v in data.values()
     ]
-    conn.executemany(
-        """INSERT OR IGNORE INTO artists
-           (id, name, indicators, start_date, end_date,
-            dates_are_lifespan, dates_uncertain, genres, albums, notes)
-           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-        rows,
-    )
-    conn.commit()
+    with _transaction(conn):
+        conn.executemany(
+            """INSERT OR IGNORE INTO artists
+               (id, name, indicators, start_date, end_date,
+                dates_are_lifespan, dates_uncertain, genres, albums, notes)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            rows,
+        )
     logger.info("Legacy artist migration: %d records processed", len(rows))
 
 
@@ -557,14 +1067,28 @@ def _migrate_gzip_caches(conn: sqlite3.Connection) -> None:
     _migrate_gzip_lfm(conn)
 
 
+def _drop_url_keyed_http_cache(conn: sqlite3.Connection) -> None:
+    """Drop an http_cache table keyed by plain URL, with any API keys in its rows."""
+    columns = {r[1] for r in conn.execute("PRAGMA table_info(http_cache)")}
+    if "url" not in columns:
+        return
+    with _write_lock:
+        # Overwrite the freed pages so the dropped URLs do not linger in the file
+        conn.execute("PRAGMA secure_delete=ON")
+        conn.executescript("DROP TABLE http_cache;")
+        conn.execute("PRAGMA secure_delete=OFF")
+        _create_schema(conn)
+    logger.info("Recreated the HTTP cache keyed by URL hash")
+
+
 def _migrate_gzip_mb(conn: sqlite3.Connection) -> None:
     import time
 
     if _get_meta(conn, "gzip_mb_migrated") == "1":
         return
     if not _GZIP_MB.exists():
-        _set_meta(conn, "gzip_mb_migrated", "1")
-        conn.commit()
+        with _transaction(conn):
+            _set_meta(conn, "gzip_mb_migrated", "1")
         return
     logger.info("Migrating MusicBrainz gzip cache to SQLite...")
     try:
@@ -589,15 +1113,15 @@ def _migrate_gzip_mb(conn: sqlite3.Connection) -> None:
             )
             for mbid, record in data.items()
         ]
-        conn.executemany(
-            """INSERT OR IGNORE INTO mb_recordings
-               (mbid, mb_title, mb_artist, mb_genres, composer,
-                lyricist, arranger, orchestrator, writer, fetched_at)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-            rows,
-        )
-        _set_meta(conn, "gzip_mb_migrated", "1")
-        conn.commit()
+        with _transaction(conn):
+            conn.executemany(
+                """INSERT OR IGNORE INTO mb_recordings
+                   (mbid, mb_title, mb_artist, mb_genres, composer,
+                    lyricist, arranger, orchestrator, writer, fetched_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                rows,
+            )
+            _set_meta(conn, "gzip_mb_migrated", "1")
         logger.info("MB gzip migration complete: %d records", len(rows))
     except Exception as exc:
         logger.error("Failed to migrate MB gzip cache: %s", exc)
@@ -609,8 +1133,8 @@ def _migrate_gzip_lfm(conn: sqlite3.Connection) -> None:
     if _get_meta(conn, "gzip_lfm_migrated") == "1":
         return
     if not _GZIP_LFM.exists():
-        _set_meta(conn, "gzip_lfm_migrated", "1")
-        conn.commit()
+        with _transaction(conn):
+            _set_meta(conn, "gzip_lfm_migrated", "1")
         return
     logger.info("Migrating Last.fm gzip cache to SQLite...")
     try:
@@ -639,18 +1163,18 @@ def _migrate_gzip_lfm(conn: sqlite3.Connection) -> None:
                         item.get("album"),
                         fetched_at,
                     ))
-        conn.executemany(
-            "INSERT OR IGNORE INTO lfm_scopes (username, scope, fetched_at) VALUES (?, ?, ?)",
-            scope_rows,
-        )
-        conn.executemany(
-            """INSERT OR IGNORE INTO lfm_tracks
-               (username, scope, mbid, name, artist, playcount, rank, album, fetched_at)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-            track_rows,
-        )
-        _set_meta(conn, "gzip_lfm_migrated", "1")
-        conn.commit()
+        with _transaction(conn):
+            conn.executemany(
+                "INSERT OR IGNORE INTO lfm_scopes (username, scope, fetched_at) VALUES (?, ?, ?)",
+                scope_rows,
+            )
+            conn.executemany(
+                """INSERT OR IGNORE INTO lfm_tracks
+                   (username, scope, mbid, name, artist, playcount, rank, album, fetched_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                track_rows,
+            )
+            _set_meta(conn, "gzip_lfm_migrated", "1")
         logger.info("LFM gzip migration complete: %d track/album/artist records", len(track_rows))
     except Exception as exc:
         logger.error("Failed to migrate LFM gzip cache: %s", exc)
@@ -1,7 +1,8 @@
+from contextlib import contextmanager
 import os
 import struct
 import sys
-from typing import Optional
+from typing import Iterator, Optional
 import zlib
 
 from cryptography.hazmat.backends import default_backend
@@ -9,6 +10,7 @@ from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.primitives.asymmetric import ec
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 import keyring
@@ -33,6 +35,179 @@ def get_key_base(app_identifier, key, encryptor_type=None):
         base = namespaced_key(base, encryptor_type)
     return namespaced_key(base, key) if key else base
 
+# =============================================================================
+# Streaming container
+# =============================================================================
+#
+# Layout (all integers big-endian):
+#   magic(8) version(1) flags(1) chunk_size(4) nonce_prefix(7) key_material_len(4) key_material
+#   then repeated chunks: final_flag(1) length(4) ciphertext+tag(length)
+#
+# Each chunk is a separate AES-GCM message whose nonce is nonce_prefix || counter(4) || final_flag(1)
+# and whose associated data is the full header, so chunks cannot be reordered, dropped, moved
+# between files, or truncated without failing authentication. The legacy single-message
+# formats never start with STREAM_MAGIC, which is how the readers tell them apart.
+
+STREAM_MAGIC = b"\x89MUSESC\n"
+STREAM_VERSION = 1
+STREAM_CHUNK_SIZE = 1024 * 1024
+# Largest chunk size a reader accepts from a header, bounding the memory one chunk can take
+STREAM_MAX_CHUNK_SIZE = 64 * 1024 * 1024
+_STREAM_TAG_LEN = 16
+_STREAM_FLAG_COMPRESSED = 0x01
+_STREAM_NONCE_PREFIX_LEN = 7
+_STREAM_CHUNK_HEADER = struct.Struct('>BI')
+_STREAM_FIXED_HEADER = struct.Struct('>8sBBI7sI')
+
+
+def is_stream_file(path: str) -> bool:
+    """Whether the file uses the chunked streaming container"""
+    with open(path, 'rb') as f:
+        return f.read(len(STREAM_MAGIC)) == STREAM_MAGIC
+
+
+def _build_stream_header(compress: bool, chunk_size: int, key_material: bytes) -> tuple[bytes, bytes]:
+    nonce_prefix = os.urandom(_STREAM_NONCE_PREFIX_LEN)
+    flags = _STREAM_FLAG_COMPRESSED if compress else 0
+    header = _STREAM_FIXED_HEADER.pack(
+        STREAM_MAGIC, STREAM_VERSION, flags, chunk_size, nonce_prefix, len(key_material)
+    ) + key_material
+    return header, nonce_prefix
+
+
+def _read_stream_header(f) -> tuple[bytes, bool, int, bytes, bytes]:
+    """Read the container header, returning (header, compressed, chunk_size, nonce_prefix, key_material)"""
+    fixed = f.read(_STREAM_FIXED_HEADER.size)
+    if len(fixed) < _STREAM_FIXED_HEADER.size:
+        raise ValueError("Encrypted stream header is truncated")
+    magic, version, flags, chunk_size, nonce_prefix, key_material_len = _STREAM_FIXED_HEADER.unpack(fixed)
+    if magic != STREAM_MAGIC:
+        raise ValueError("Not an encrypted stream file")
+    if version != STREAM_VERSION:
+        raise ValueError(f"Unsupported encrypted stream version: {version}")
+    if not 0 < chunk_size <= STREAM_MAX_CHUNK_SIZE:
+        raise ValueError(f"Invalid encrypted stream chunk size: {chunk_size}")
+    key_material = f.read(key_material_len)
+    if len(key_material) < key_material_len:
+        raise ValueError("Encrypted stream header is truncated")
+    return fixed + key_material, bool(flags & _STREAM_FLAG_COMPRESSED), chunk_size, nonce_prefix, key_material
+
+
+def _stream_nonce(nonce_prefix: bytes, counter: int, final: bool) -> bytes:
+    return nonce_prefix + struct.pack('>I', counter) + (b'\x01' if final else b'\x00')
+
+
+def _stream_encrypt(
+    in_f,
+    out_f,
+    key: bytes,
+    header: bytes,
+    nonce_prefix: bytes,
+    compress: bool,
+    chunk_size: int,
+    compression_level: int = zlib.Z_BEST_COMPRESSION
+):
+    """Compress and encrypt in_f to out_f one chunk at a time"""
+    aesgcm = AESGCM(key)
+    compressor = zlib.compressobj(compression_level) if compress else None
+    counter = 0
+    pending = bytearray()
+
+    def write_chunk(data: bytes, final: bool):
+        nonlocal counter
+        if counter >= 0xFFFFFFFF:
+            raise ValueError("Encrypted stream exceeds the maximum number of chunks")
+        ciphertext = aesgcm.encrypt(_stream_nonce(nonce_prefix, counter, final), data, header)
+        out_f.write(_STREAM_CHUNK_HEADER.pack(1 if final else 0, len(ciphertext)))
+        out_f.write(ciphertext)
+        counter += 1
+
+    out_f.write(header)
+    while True:
+        block = in_f.read(chunk_size)
+        if not block:
+            break
+        pending += compressor.compress(block) if compressor else block
+        # Hold back at least one byte so the final chunk is never empty unless the input is
+        while len(pending) > chunk_size:
+            write_chunk(bytes(pending[:chunk_size]), False)
+            del pending[:chunk_size]
+    if compressor:
+        pending += compressor.flush()
+    while len(pending) > chunk_size:
+        write_chunk(bytes(pending[:chunk_size]), False)
+        del pending[:chunk_size]
+    write_chunk(bytes(pending), True)
+
+
+def _stream_decrypt_iter(
+    f,
+    key: bytes,
+    header: bytes,
+    chunk_size: int,
+    nonce_prefix: bytes,
+    compressed: bool
+) -> Iterator[bytes]:
+    """
+    Authenticate, decrypt and decompress chunks from f, which is positioned after the header.
+    Each yielded piece is at most chunk_size bytes, however far a chunk decompresses.
+    """
+    aesgcm = AESGCM(key)
+    decompressor = zlib.decompressobj() if compressed else None
+    counter = 0
+    while True:
+        chunk_header = f.read(_STREAM_CHUNK_HEADER.size)
+        if len(chunk_header) < _STREAM_CHUNK_HEADER.size:
+            raise ValueError("Encrypted stream is truncated")
+        final_flag, length = _STREAM_CHUNK_HEADER.unpack(chunk_header)
+        if length > chunk_size + _STREAM_TAG_LEN:
+            raise ValueError("Encrypted stream chunk is larger than the chunk size")
+        ciphertext = f.read(length)
+        if len(ciphertext) < length:
+            raise ValueError("Encrypted stream is truncated")
+        final = final_flag == 1
+        plaintext = aesgcm.decrypt(_stream_nonce(nonce_prefix, counter, final), ciphertext, header)
+        counter += 1
+        if decompressor:
+            data = plaintext
+            while True:
+                piece = decompressor.decompress(data, chunk_size)
+                if piece:
+                    yield piece
+                data = decompressor.unconsumed_tail
+                if not data and len(piece) < chunk_size:
+                    break
+            if final:
+                piece = decompressor.flush()
+                if piece:
+                    yield piece
+        elif plaintext:
+            yield plaintext
+        if final:
+            break
+    if f.read(1):
+        raise ValueError("Unexpected data after final encrypted chunk")
+
+
+@contextmanager
+def _replace_on_success(output_path: str):
+    """Open a temp file for writing, replacing output_path with it only if the block completes"""
+    temp_path = output_path + ".part"
+    try:
+        with open(temp_path, 'wb') as f:
+            yield f
+        os.replace(temp_path, output_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def _write_stream_output(pieces: Iterator[bytes], output_path: str):
+    """Write decrypted pieces to a temp file, only replacing output_path once every chunk authenticated"""
+    with _replace_on_success(output_path) as f:
+        for piece in pieces:
+            f.write(piece)
+
 # =============================================================================
 # Passphrases and Passwords
 # =============================================================================
@@ -522,12 +697,14 @@ class BaseEncryptor:
         public_key: bytes,
         input_path: str,
         output_path: str,
-        compress: bool = True
+        compress: bool = True,
+        chunk_size: int = STREAM_CHUNK_SIZE
     ):
-        """Encrypt file with optional compression"""
-        with open(input_path, 'rb') as f:
-            plaintext = f.read()
-        return cls.encrypt_data(plaintext, public_key, output_path, compress)
+        """Encrypt file with optional compression, streaming it in authenticated chunks"""
+        encapsulated_key, aes_key = cls.encapsulate_secret(public_key)
+        header, nonce_prefix = _build_stream_header(compress, chunk_size, encapsulated_key)
+        with open(input_path, 'rb') as in_f, _replace_on_success(output_path) as out_f:
+            _stream_encrypt(in_f, out_f, aes_key, header, nonce_prefix, compress, chunk_size)
 
     @classmethod
     def encrypt_data(
@@ -535,10 +712,23 @@ class BaseEncryptor:
         data: bytes,
         public_key: bytes,
         output_path: str,
-        compress: bool = True
+        compress: bool = True,
+        compression_level: int = zlib.Z_BEST_COMPRESSION
     ):
         encapsulated_key, aes_key = cls.encapsulate_secret(public_key)
-        return cls._do_encrypt(data, output_path, compress, aes_key, encapsulated_key)
+        return cls._do_encrypt(data, output_path, compress, aes_key, encapsulated_key, compression_level)
+
+    @classmethod
+    def encrypt_data_to_bytes(
+        cls,
+        data: bytes,
+        public_key: bytes,
+        compress: bool = True,
+        compression_level: int = zlib.Z_BEST_COMPRESSION
+    ) -> bytes:
+        """Encrypt data to an in-memory blob using the same layout as the file format"""
+        encapsulated_key, aes_key = cls.encapsulate_secret(public_key)
+        return cls._encrypt_to_bytes(data, compress, aes_key, encapsulated_key, compression_level)
 
     @classmethod
     def decrypt_data_from_file(
@@ -546,10 +736,40 @@ class BaseEncryptor:
         private_key: bytes,
         encrypted_file: str
     ) -> bytes:
+        if is_stream_file(encrypted_file):
+            return b''.join(cls.iter_decrypted_file(private_key, encrypted_file))
         encapsulated_key, nonce, tag, compression_flag, ciphertext = cls._read_encrypted_file_attributes(encrypted_file)
         aes_key = cls.decapsulate_secret(private_key, encapsulated_key)
         return cls._do_decrypt(None, aes_key, nonce, tag, compression_flag, ciphertext)
 
+    @classmethod
+    def iter_decrypted_file(
+        cls,
+        private_key: bytes,
+        input_path: str
+    ) -> Iterator[bytes]:
+        """Yield decrypted plaintext pieces; legacy single-message files yield a single piece"""
+        with open(input_path, 'rb') as f:
+            if f.read(len(STREAM_MAGIC)) != STREAM_MAGIC:
+                f.close()
+                yield cls.decrypt_data_from_file(private_key, input_path)
+                return
+            f.seek(0)
+            header, compressed, chunk_size, nonce_prefix, encapsulated_key = _read_stream_header(f)
+            aes_key = cls.decapsulate_secret(private_key, encapsulated_key)
+            yield from _stream_decrypt_iter(f, aes_key, header, chunk_size, nonce_prefix, compressed)
+
+    @classmethod
+    def decrypt_data_from_bytes(
+        cls,
+        private_key: bytes,
+        encrypted_data: bytes
+    ) -> bytes:
+        """Decrypt an in-memory blob produced by encrypt_data_to_bytes"""
+        encapsulated_key, nonce, tag, compression_flag, ciphertext = cls._parse_encrypted_attributes(encrypted_data)
+        aes_key = cls.decapsulate_secret(private_key, encapsulated_key)
+        return cls._do_decrypt(None, aes_key, nonce, tag, compression_flag, ciphertext)
+
     @classmethod
     def decrypt_to_file(
         cls,
@@ -557,6 +777,9 @@ class BaseEncryptor:
         input_path: str,
         output_path: str
     ):
+        if is_stream_file(input_path):
+            _write_stream_output(cls.iter_decrypted_file(private_key, input_path), output_path)
+            return
         encapsulated_key, nonce, tag, compression_flag, ciphertext = cls._read_encrypted_file_attributes(input_path)
         # Decapsulate the shared secret (AES key)
         aes_key = cls.decapsulate_secret(private_key, encapsulated_key)
@@ -643,12 +866,27 @@ class BaseEncryptor:
         output_path: str,
         compress: bool,
         aes_key: bytes,
-        encapsulated_key: bytes
+        encapsulated_key: bytes,
+        compression_level: int = zlib.Z_BEST_COMPRESSION
     ):
         """Encrypt file"""
+        encrypted = cls._encrypt_to_bytes(plaintext, compress, aes_key, encapsulated_key, compression_level)
+        with _replace_on_success(output_path) as f:
+            f.write(encrypted)
+
+    @classmethod
+    def _encrypt_to_bytes(
+        cls,
+        plaintext: bytes,
+        compress: bool,
+        aes_key: bytes,
+        encapsulated_key: bytes,
+        compression_level: int = zlib.Z_BEST_COMPRESSION
+    ) -> bytes:
+        """Encrypt to the single-message layout used by encrypted files"""
         # Apply compression if requested and beneficial
         if compress:
-            compressed = zlib.compress(plaintext, level=zlib.Z_BEST_COMPRESSION)
+            compressed = zlib.compress(plaintext, level=compression_level)
             # Only use if it actually reduces size
             if len(compressed) < len(plaintext):
                 plaintext = compressed
@@ -664,14 +902,14 @@ class BaseEncryptor:
         encryptor = cipher.encryptor()
         ciphertext = encryptor.update(plaintext) + encryptor.finalize()
         
-        # Write to output file
-        with open(output_path, 'wb') as f:
-            f.write(struct.pack('>I', len(encapsulated_key)))  # Key length
-            f.write(encapsulated_key)
-            f.write(nonce)
-            f.write(encryptor.tag)
-            f.write(compression_flag)  # Compression marker
-            f.write(ciphertext)        
+        return b''.join((
+            struct.pack('>I', len(encapsulated_key)),  # Key length
+            encapsulated_key,
+            nonce,
+            encryptor.tag,
+            compression_flag,  # Compression marker
+            ciphertext,
+        ))
 
     @classmethod
     def _read_encrypted_file_attributes(
@@ -689,6 +927,23 @@ class BaseEncryptor:
 
             return encapsulated_key, nonce, tag, compression_flag, ciphertext
 
+    @classmethod
+    def _parse_encrypted_attributes(
+        cls, encrypted_data: bytes
+    ) -> tuple[bytes, bytes, bytes, bytes, bytes]:
+        """Split an in-memory encrypted blob into its attributes"""
+        key_len = struct.unpack('>I', encrypted_data[:4])[0]
+        index = 4
+        encapsulated_key = encrypted_data[index:index+key_len]
+        index += key_len
+        nonce = encrypted_data[index:index+12]
+        index += 12
+        tag = encrypted_data[index:index+16]
+        index += 16
+        compression_flag = encrypted_data[index:index+1]
+        index += 1
+        return encapsulated_key, nonce, tag, compression_flag, encrypted_data[index:]
+
     @classmethod
     def _do_decrypt(
         cls,
@@ -717,7 +972,7 @@ class BaseEncryptor:
                 print("Warning: Decompression failed. Saving as-is.")
         
         if output_path:
-            with open(output_path, 'wb') as f:
+            with _replace_on_success(output_path) as f:
                 f.write(plaintext)
         else:
             return plaintext
@@ -973,19 +1228,63 @@ class SymmetricEncryptor:
         tag = encryptor.tag
 
         # Write to file
-        with open(output_path, 'wb') as f:
+        with _replace_on_success(output_path) as f:
             f.write(salt)
             f.write(nonce)
             f.write(tag)
             f.write(compression_flag)
             f.write(ciphertext)
 
+    @staticmethod
+    def _derive_key(passphrase: bytes, salt: bytes) -> bytes:
+        kdf = PBKDF2HMAC(
+            algorithm=hashes.SHA256(),
+            length=32,
+            salt=salt,
+            iterations=100000,
+            backend=default_backend()
+        )
+        return kdf.derive(passphrase)
+
+    @staticmethod
+    def encrypt_file(
+        input_path: str,
+        passphrase: bytes,
+        output_path: str,
+        compress: bool = True,
+        chunk_size: int = STREAM_CHUNK_SIZE
+    ):
+        """Encrypt file using provided symmetric passphrase, streaming it in authenticated chunks"""
+        salt = os.urandom(16)
+        key = SymmetricEncryptor._derive_key(passphrase, salt)
+        header, nonce_prefix = _build_stream_header(compress, chunk_size, salt)
+        with open(input_path, 'rb') as in_f, _replace_on_success(output_path) as out_f:
+            _stream_encrypt(in_f, out_f, key, header, nonce_prefix, compress, chunk_size)
+
+    @staticmethod
+    def iter_decrypted_file(
+        encrypted_file: str,
+        passphrase: bytes
+    ) -> Iterator[bytes]:
+        """Yield decrypted plaintext pieces; legacy single-message files yield a single piece"""
+        with open(encrypted_file, 'rb') as f:
+            if f.read(len(STREAM_MAGIC)) != STREAM_MAGIC:
+                f.close()
+                yield SymmetricEncryptor.decrypt_data(encrypted_file, passphrase)
+                return
+            f.seek(0)
+            header, compressed, chunk_size, nonce_prefix, salt = _read_stream_header(f)
+            key = SymmetricEncryptor._derive_key(passphrase, salt)
+            yield from _stream_decrypt_iter(f, key, header, chunk_size, nonce_prefix, compressed)
+
     @staticmethod
     def decrypt_data(
         encrypted_file: str,
         passphrase: bytes
     ) -> bytes:
         """Decrypt data using provided symmetric passphrase"""
+        if is_stream_file(encrypted_file):
+            return b''.join(SymmetricEncryptor.iter_decrypted_file(encrypted_file, passphrase))
         with open(encrypted_file, 'rb') as f:
             salt = f.read(16)
             nonce = f.read(12)
@@ -1125,7 +1424,8 @@ def encrypt_data_to_file(
     app_identifier: str,
     output_path: str,
     compress: bool = True,
-    reset_keys: bool = False
+    reset_keys: bool = False,
+    compression_level: int = zlib.Z_BEST_COMPRESSION
 ) -> bytes:
     encryptor = get_encryptor(service_name, app_identifier)
     """Encrypt data with public key"""
@@ -1134,7 +1434,7 @@ def encrypt_data_to_file(
     private_key = encryptor.load_private_key(
         service_name=service_name, app_identifier=app_identifier)
     encryptor.verify_keys(public_key, private_key)
-    return encryptor.encrypt_data(data, public_key, output_path, compress)
+    return encryptor.encrypt_data(data, public_key, output_path, compress, compression_level)
 
 def decrypt_data_from_file(encrypted_file: str, service_name: str, app_identifier: str) -> bytes:
     """Decrypt data with private key"""
@@ -1143,6 +1443,36 @@ def decrypt_data_from_file(encrypted_file: str, service_name: str, app_identifie
         service_name=service_name, app_identifier=app_identifier)
     return encryptor.decrypt_data_from_file(private_key, encrypted_file)
 
+def encrypt_data_to_bytes(
+    data: bytes,
+    service_name: str,
+    app_identifier: str,
+    compress: bool = True,
+    compression_level: int = zlib.Z_BEST_COMPRESSION
+) -> bytes:
+    """
+    Encrypt data with public key to an in-memory blob.
+    Only the public key is needed, so this skips the private key derivation
+    done by encrypt_data_to_file and is cheap enough for frequent small writes.
+    """
+    encryptor = get_encryptor(service_name, app_identifier)
+    public_key = encryptor.generate_and_store_keys(
+        service_name=service_name, app_identifier=app_identifier)
+    return encryptor.encrypt_data_to_bytes(data, public_key, compress, compression_level)
+
+def decrypt_data_from_bytes_list(
+    encrypted_data: list[bytes],
+    service_name: str,
+    app_identifier: str
+) -> list[bytes]:
+    """Decrypt several in-memory blobs, loading the private key only once"""
+    if not encrypted_data:
+        return []
+    encryptor = get_encryptor(service_name, app_identifier)
+    private_key = encryptor.load_private_key(
+        service_name=service_name, app_identifier=app_identifier)
+    return [encryptor.decrypt_data_from_bytes(private_key, blob) for blob in encrypted_data]
+
 def encrypt_file(
     input_file: str,
     output_file: str,
@@ -1178,6 +1508,16 @@ def decrypt_to_file(
         output_path=output_file
     )
 
+def decrypt_file_iter(
+    input_file: str,
+    service_name: str,
+    app_identifier: str
+) -> Iterator[bytes]:
+    """Decrypt file with private key, yielding plaintext pieces as chunks are authenticated"""
+    encryptor = get_encryptor(service_name, app_identifier)
+    private_key = encryptor.load_private_key(service_name=service_name, app_identifier=app_identifier)
+    return encryptor.iter_decrypted_file(private_key, input_file)
+
 # =============================================================================
 # Password Interfaces
 # =============================================================================
@@ -1352,12 +1692,11 @@ def symmetric_encrypt_file(
     input_path: str, 
     output_path: str, 
     passphrase: bytes,
-    compress: bool = True
+    compress: bool = True,
+    chunk_size: int = STREAM_CHUNK_SIZE
 ):
     """Encrypt file using symmetric key (portable across installations)"""
-    with open(input_path, 'rb') as f:
-        data = f.read()
-    SymmetricEncryptor.encrypt_data(data, passphrase, output_path, compress)
+    SymmetricEncryptor.encrypt_file(input_path, passphrase, output_path, compress, chunk_size)
 
 def symmetric_decrypt_file(
     input_path: str, 
@@ -1365,9 +1704,14 @@ def symmetric_decrypt_file(
     passphrase: bytes
 ):
     """Decrypt file using symmetric key"""
-    data = SymmetricEncryptor.decrypt_data(input_path, passphrase)
-    with open(output_path, 'wb') as f:
-        f.write(data)
+    _write_stream_output(SymmetricEncryptor.iter_decrypted_file(input_path, passphrase), output_path)
+
+def symmetric_decrypt_file_iter(
+    input_path: str,
+    passphrase: bytes
+) -> Iterator[bytes]:
+    """Decrypt file using symmetric key, yielding plaintext pieces as chunks are authenticated"""
+    return SymmetricEncryptor.iter_decrypted_file(input_path, passphrase)
 
 
 
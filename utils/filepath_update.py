@@ -5,6 +5,7 @@ After a successful on-disk rename/move (``utils.path_move.move_on_disk``), call:
     propagate_file_rename(old_path, new_path)
     propagate_directory_rename(old_dir, new_dir)
 
+Both are thin wrappers over propagate_renames({old: new}), described below.
 These functions are best-effort: each cache update is wrapped in its own
 try/except so a failure in one cache does not abort the others.  Errors are
 logged as warnings rather than raised.
@@ -12,6 +13,9 @@ logged as warnings rather than raised.
 Directory renames are handled recursively: renaming an artist directory (two
 levels above a track file) correctly rewrites all album-level and file-level
 paths beneath it, not just paths whose immediate parent matches old_dir.
+Only the affected subtree is visited: the DB side range-scans the indexed
+path_key columns (utils.db.path_prefix_range) and the LibraryData caches are
+PathIndexedDicts (utils.path_index) that can list the keys under a directory.
 
 Caches covered
 --------------
@@ -34,13 +38,21 @@ Caches covered
 
 propagate_file_delete covers the same set of stores, removing every reference to the
 deleted path rather than remapping it.
+
+For many renames at once (a batch retag/rename from the track path preview),
+call propagate_renames({old: new, ...}) instead of looping over the single-path
+functions: every store is read and rewritten once, the DB changes commit in a
+single transaction, and app_info_cache is stored once.  dry_run=True reports
+what would change without writing anything, reading the DB through the
+read-only connection.
 """
 
 from __future__ import annotations
 
+from dataclasses import dataclass, field
 import json
 import os
-from typing import Callable
+from typing import Callable, Dict, List
 
 from utils.logging_setup import get_logger
 
@@ -51,11 +63,6 @@ def _norm(path: str) -> str:
     return os.path.normpath(path)
 
 
-def _is_cross_directory_move(old_path: str, new_path: str) -> bool:
-    """True when *new_path* is in a different parent directory than *old_path*."""
-    return _norm(os.path.dirname(old_path)) != _norm(os.path.dirname(new_path))
-
-
 def _remap_under(old_dir: str, new_dir: str, path: str) -> str:
     """Return *path* with its *old_dir* prefix replaced by *new_dir*.
 
@@ -100,23 +107,12 @@ def _guarded(label: str, fn: Callable) -> None:
 
 def propagate_file_rename(old_path: str, new_path: str) -> None:
     """Update every filepath-keyed cache after a single file has been renamed."""
-    _guarded("db:media_tracks",      lambda: _db_file(old_path, new_path))
-    _guarded("db:directories.files", lambda: _db_dir_json_file(old_path, new_path))
-    _guarded("LibraryData",          lambda: _lib_file(old_path, new_path))
-    _guarded("Playlist.history",     lambda: _playlist_file(old_path, new_path))
-    _guarded("PlaybackSession",      lambda: _session_file(old_path, new_path))
-    _guarded("Favorites",            lambda: _favorites_file(old_path, new_path))
-    _guarded("PlaylistDescriptors",  lambda: _playlist_descriptors_file(old_path, new_path))
+    propagate_renames({old_path: new_path})
 
 
 def propagate_directory_rename(old_dir: str, new_dir: str) -> None:
     """Update every filepath-keyed cache after a directory has been renamed."""
-    _guarded("db:media_tracks+dirs", lambda: _db_directory(old_dir, new_dir))
-    _guarded("LibraryData",          lambda: _lib_directory(old_dir, new_dir))
-    _guarded("Playlist.history",     lambda: _playlist_directory(old_dir, new_dir))
-    _guarded("PlaybackSession",      lambda: _session_directory(old_dir, new_dir))
-    _guarded("Favorites",            lambda: _favorites_directory(old_dir, new_dir))
-    _guarded("PlaylistDescriptors",  lambda: _playlist_descriptors_directory(old_dir, new_dir))
+    propagate_renames({old_dir: new_dir})
 
 
 def propagate_file_delete(filepath: str) -> None:
@@ -131,259 +127,88 @@ def propagate_file_delete(filepath: str) -> None:
 
 
 # ---------------------------------------------------------------------------
-# DB helpers
+# Delete helpers — remove all references to a deleted filepath
 # ---------------------------------------------------------------------------
 
-def _db_file(old_path: str, new_path: str) -> None:
-    from utils.db import get_connection
-    conn = get_connection()
-    conn.execute(
-        "UPDATE media_tracks SET filepath=? WHERE filepath=?",
-        (new_path, old_path),
-    )
-    conn.execute(
-        "UPDATE media_tracks SET parent_filepath=? WHERE parent_filepath=?",
-        (new_path, old_path),
-    )
-    conn.commit()
-
-
-def _db_dir_append_file(conn, dir_path: str, file_path: str) -> bool:
-    """Append *file_path* to ``directories.files`` for *dir_path*.
-
-    Used only for cross-directory moves. Returns True if the DB was mutated.
-    """
-    import time
-
-    row = conn.execute(
-        "SELECT files, scanned_at FROM directories WHERE path=?", (dir_path,)
-    ).fetchone()
-    if row:
-        try:
-            files: list = json.loads(row["files"] or "[]")
-        except json.JSONDecodeError:
-            files = []
-        if any(_norm(f) == _norm(file_path) for f in files):
-            return False
-        files.append(file_path)
-        conn.execute(
-            "UPDATE directories SET files=? WHERE path=?",
-            (json.dumps(files), dir_path),
-        )
-        return True
-
-    conn.execute(
-        "INSERT OR REPLACE INTO directories (path, files, scanned_at) "
-        "VALUES (?, ?, ?)",
-        (dir_path, json.dumps([file_path]), time.time()),
-    )
-    return True
-
-
-def _db_dir_json_file(old_path: str, new_path: str) -> None:
-    """Update ``directories.files`` for a single-file rename or cross-dir move."""
-    from utils.db import get_connection
-
-    old_dir = os.path.dirname(old_path)
-    cross = _is_cross_directory_move(old_path, new_path)
-    conn = get_connection()
-    changed = False
-
-    row = conn.execute(
-        "SELECT files FROM directories WHERE path=?", (old_dir,)
-    ).fetchone()
-    if row:
-        try:
-            files: list = json.loads(row["files"] or "[]")
-            if cross:
-                updated = [f for f in files if _norm(f) != _norm(old_path)]
-            else:
-                updated = [
-                    new_path if _norm(f) == _norm(old_path) else f for f in files
-                ]
-            if updated != files:
-                conn.execute(
-                    "UPDATE directories SET files=? WHERE path=?",
-                    (json.dumps(updated), old_dir),
-                )
-                changed = True
-        except json.JSONDecodeError:
-            pass
-
-    if cross and _db_dir_append_file(conn, os.path.dirname(new_path), new_path):
-        changed = True
-
-    if changed:
-        conn.commit()
-
-
-def _db_directory(old_dir: str, new_dir: str) -> None:
-    """Rename a directory in the DB: bulk-update all track paths and re-key
-    every ``directories`` row at or under *old_dir* (mirrors ``_lib_directory``).
-    """
-    from utils.db import get_connection
-    # Use forward-slash normalised prefix for the SQL replace() call so it
-    # works reliably on Windows where paths may mix separators.
-    old_prefix_fwd = old_dir.replace("\\", "/") + "/"
-    new_prefix_fwd = new_dir.replace("\\", "/") + "/"
-
-    conn = get_connection()
-    conn.execute(
-        "UPDATE media_tracks "
-        "SET filepath = replace(replace(filepath,'\\\\','/'), ?, ?) "
-        "WHERE replace(replace(filepath,'\\\\','/'), '\\\\', '/') LIKE ?",
-        (old_prefix_fwd, new_prefix_fwd, old_prefix_fwd + "%"),
-    )
-    conn.execute(
-        "UPDATE media_tracks "
-        "SET parent_filepath = replace(replace(parent_filepath,'\\\\','/'), ?, ?) "
-        "WHERE replace(replace(parent_filepath,'\\\\','/'), '\\\\', '/') LIKE ?",
-        (old_prefix_fwd, new_prefix_fwd, old_prefix_fwd + "%"),
-    )
-
-    # Re-key every directories row whose path is old_dir or a descendant.
-    rows = conn.execute(
-        "SELECT path, files, scanned_at FROM directories"
-    ).fetchall()
-    to_rekey = [
-        row for row in rows
-        if _remap_under(old_dir, new_dir, row["path"]) != row["path"]
-    ]
-    for row in to_rekey:
-        old_path = row["path"]
-        new_path = _remap_under(old_dir, new_dir, old_path)
-        try:
-            files: list = json.loads(row["files"] or "[]")
-            updated_files = [_remap_under(old_dir, new_dir, f) for f in files]
-        except json.JSONDecodeError:
-            updated_files = []
-        conn.execute(
-            "INSERT OR REPLACE INTO directories (path, files, scanned_at) "
-            "VALUES (?, ?, ?)",
-            (new_path, json.dumps(updated_files), row["scanned_at"]),
-        )
-        conn.execute("DELETE FROM directories WHERE path=?", (old_path,))
+def _db_file_delete(filepath: str) -> None:
+    from utils.db import write_transaction
+    with write_transaction() as conn:
+        conn.execute("DELETE FROM media_tracks WHERE filepath=?", (filepath,))
 
-    conn.commit()
 
+def _db_dir_json_file_delete(filepath: str) -> None:
+    from utils.db import write_transaction
+    old_dir = os.path.dirname(filepath)
+    with write_transaction() as conn:
+        row = conn.execute(
+            "SELECT files FROM directories WHERE path=?", (old_dir,)
+        ).fetchone()
+        if row:
+            try:
+                files: list = json.loads(row["files"] or "[]")
+                updated = [f for f in files if _norm(f) != _norm(filepath)]
+                if updated != files:
+                    conn.execute(
+                        "UPDATE directories SET files=? WHERE path=?",
+                        (json.dumps(updated), old_dir),
+                    )
+            except json.JSONDecodeError:
+                pass
 
-# ---------------------------------------------------------------------------
-# In-memory LibraryData caches
-# ---------------------------------------------------------------------------
 
-def _lib_file(old_path: str, new_path: str) -> None:
+def _lib_file_delete(filepath: str) -> None:
     from library_data.library_data import LibraryData
+    from utils.path_index import PathIndexedDict
+
+    cache = LibraryData.MEDIA_TRACK_CACHE
+    if isinstance(cache, PathIndexedDict):
+        # Only the file's node of the prefix index is visited; it also holds the
+        # same path spelled with other separators or case
+        key = PathRemapper._key(filepath)
+        keys = [k for k in cache.keys_under(filepath) if PathRemapper._key(k) == key]
+    else:
+        keys = [filepath] if filepath in cache else []
+    track_ids = {id(cache.pop(k)) for k in keys}
+
+    # all_tracks holds the same MediaTrack objects as MEDIA_TRACK_CACHE, so a cached
+    # track is found by identity; only a track missing from the cache needs its path
+    # compared, and the basename check skips normalizing unrelated paths.
+    all_tracks = LibraryData.all_tracks
+    if track_ids:
+        indices = [i for i, t in enumerate(all_tracks) if id(t) in track_ids]
+    else:
+        norm_path = _norm(filepath)
+        basename = os.path.basename(norm_path)
+        indices = [i for i, t in enumerate(all_tracks)
+                   if t.filepath.endswith(basename) and _norm(t.filepath) == norm_path]
+    for i in reversed(indices):
+        del all_tracks[i]
 
-    # MEDIA_TRACK_CACHE
-    track = LibraryData.MEDIA_TRACK_CACHE.pop(old_path, None)
-    if track is not None:
-        track.filepath = new_path
-        LibraryData.MEDIA_TRACK_CACHE[new_path] = track
-
-    # all_tracks flat list (values may overlap with MEDIA_TRACK_CACHE)
-    for t in LibraryData.all_tracks:
-        if _norm(t.filepath) == _norm(old_path):
-            t.filepath = new_path
-            break
-
-    # DIRECTORIES_CACHE: same-dir rename updates path in place; cross-dir move
-    # removes from source and appends to destination.
-    old_dir = os.path.dirname(old_path)
-    cross = _is_cross_directory_move(old_path, new_path)
+    old_dir = os.path.dirname(filepath)
     if old_dir in LibraryData.DIRECTORIES_CACHE:
-        files = LibraryData.DIRECTORIES_CACHE[old_dir]
-        if cross:
-            LibraryData.DIRECTORIES_CACHE[old_dir] = [
-                f for f in files if _norm(f) != _norm(old_path)
-            ]
-        else:
-            LibraryData.DIRECTORIES_CACHE[old_dir] = [
-                new_path if _norm(f) == _norm(old_path) else f for f in files
-            ]
-
-    if cross:
-        new_dir = os.path.dirname(new_path)
-        dest_files = LibraryData.DIRECTORIES_CACHE.get(new_dir)
-        if dest_files is None:
-            LibraryData.DIRECTORIES_CACHE[new_dir] = [new_path]
-        elif not any(_norm(f) == _norm(new_path) for f in dest_files):
-            LibraryData.DIRECTORIES_CACHE[new_dir] = list(dest_files) + [new_path]
-
-
-def _lib_directory(old_dir: str, new_dir: str) -> None:
-    from library_data.library_data import LibraryData
-
-    # Re-key MEDIA_TRACK_CACHE for every file anywhere under old_dir
-    # (handles both album renames and artist renames recursively).
-    to_move = {k: v for k, v in LibraryData.MEDIA_TRACK_CACHE.items()
-               if _remap_under(old_dir, new_dir, k) != k}
-    for old_p, track in to_move.items():
-        new_p = _remap_under(old_dir, new_dir, old_p)
-        del LibraryData.MEDIA_TRACK_CACHE[old_p]
-        track.filepath = new_p
-        LibraryData.MEDIA_TRACK_CACHE[new_p] = track
-
-    for t in LibraryData.all_tracks:
-        remapped = _remap_under(old_dir, new_dir, t.filepath)
-        if remapped != t.filepath:
-            t.filepath = remapped
-
-    # Re-key every DIRECTORIES_CACHE entry at or under old_dir
-    to_rekeye = {k: v for k, v in LibraryData.DIRECTORIES_CACHE.items()
-                 if _remap_under(old_dir, new_dir, k) != k}
-    for old_k, files in to_rekeye.items():
-        del LibraryData.DIRECTORIES_CACHE[old_k]
-        new_k = _remap_under(old_dir, new_dir, old_k)
-        LibraryData.DIRECTORIES_CACHE[new_k] = [
-            _remap_under(old_dir, new_dir, f) for f in files
+        LibraryData.DIRECTORIES_CACHE[old_dir] = [
+            f for f in LibraryData.DIRECTORIES_CACHE[old_dir]
+            if _norm(f) != _norm(filepath)
         ]
 
 
-# ---------------------------------------------------------------------------
-# Playlist history (in-memory + app_info_cache)
-# ---------------------------------------------------------------------------
-
-def _playlist_file(old_path: str, new_path: str) -> None:
+def _playlist_file_delete(filepath: str) -> None:
     from muse.playlist import Playlist
     from utils.globals import HistoryType
-    key = HistoryType.TRACKS.value
-
-    # Update the live in-memory list
-    Playlist.recently_played_filepaths = [
-        new_path if _norm(f) == _norm(old_path) else f
-        for f in Playlist.recently_played_filepaths
-    ]
-    # Persist the change so it survives restart
     from utils.app_info_cache import app_info_cache
-    cached = app_info_cache.get(key, [])
-    updated = [new_path if _norm(f) == _norm(old_path) else f for f in cached]
-    if updated != cached:
-        app_info_cache.set(key, updated)
-        app_info_cache.store()
-
-
-def _playlist_directory(old_dir: str, new_dir: str) -> None:
-    from muse.playlist import Playlist
-    from utils.globals import HistoryType
     key = HistoryType.TRACKS.value
 
     Playlist.recently_played_filepaths = [
-        _remap_under(old_dir, new_dir, f) for f in Playlist.recently_played_filepaths
+        f for f in Playlist.recently_played_filepaths if _norm(f) != _norm(filepath)
     ]
-
-    from utils.app_info_cache import app_info_cache
     cached = app_info_cache.get(key, [])
-    updated = [_remap_under(old_dir, new_dir, f) for f in cached]
+    updated = [f for f in cached if _norm(f) != _norm(filepath)]
     if updated != cached:
         app_info_cache.set(key, updated)
         app_info_cache.store()
 
 
-# ---------------------------------------------------------------------------
-# PlaybackSession
-# ---------------------------------------------------------------------------
-
-def _session_file(old_path: str, new_path: str) -> None:
+def _session_file_delete(filepath: str) -> None:
     from muse.playback_session import LAST_SESSION_KEY
     from utils.app_info_cache import app_info_cache
 
@@ -392,316 +217,498 @@ def _session_file(old_path: str, new_path: str) -> None:
         return
 
     changed = False
-    if _norm(session.get("current_track_filepath", "")) == _norm(old_path):
-        session["current_track_filepath"] = new_path
+    if _norm(session.get("current_track_filepath", "")) == _norm(filepath):
+        session["current_track_filepath"] = ""
         changed = True
 
     tracks = session.get("resolved_tracks", [])
-    new_tracks = [new_path if _norm(t) == _norm(old_path) else t for t in tracks]
-    if new_tracks != tracks:
-        session["resolved_tracks"] = new_tracks
+    updated = [t for t in tracks if _norm(t) != _norm(filepath)]
+    if updated != tracks:
+        session["resolved_tracks"] = updated
         changed = True
 
     desc = session.get("descriptor")
-    if isinstance(desc, dict) and _patch_descriptor_dict_file(desc, old_path, new_path):
-        changed = True
+    if isinstance(desc, dict):
+        fps = desc.get("track_filepaths")
+        if isinstance(fps, list):
+            new_fps = [f for f in fps if _norm(f) != _norm(filepath)]
+            if new_fps != fps:
+                desc["track_filepaths"] = new_fps
+                changed = True
 
     if changed:
         app_info_cache.set(LAST_SESSION_KEY, session)
         app_info_cache.store()
 
 
-def _session_directory(old_dir: str, new_dir: str) -> None:
-    from muse.playback_session import LAST_SESSION_KEY
+def _favorites_file_delete(filepath: str) -> None:
     from utils.app_info_cache import app_info_cache
-
-    session = app_info_cache.get(LAST_SESSION_KEY)
-    if not isinstance(session, dict):
+    favs = app_info_cache.get("favorites", [])
+    if not isinstance(favs, list):
         return
-
-    changed = False
-    cur = session.get("current_track_filepath", "")
-    new_cur = _remap_under(old_dir, new_dir, cur)
-    if new_cur != cur:
-        session["current_track_filepath"] = new_cur
-        changed = True
-
-    tracks = session.get("resolved_tracks", [])
-    new_tracks = [_remap_under(old_dir, new_dir, t) for t in tracks]
-    if new_tracks != tracks:
-        session["resolved_tracks"] = new_tracks
-        changed = True
-
-    desc = session.get("descriptor")
-    if isinstance(desc, dict) and _patch_descriptor_dict_dir(desc, old_dir, new_dir):
-        changed = True
-
-    if changed:
-        app_info_cache.set(LAST_SESSION_KEY, session)
+    updated = [
+        f for f in favs
+        if not (isinstance(f, dict) and _norm(f.get("filepath", "")) == _norm(filepath))
+    ]
+    if len(updated) != len(favs):
+        app_info_cache.set("favorites", updated)
         app_info_cache.store()
 
 
-# ---------------------------------------------------------------------------
-# Playlist descriptors (app_info_cache)
-# ---------------------------------------------------------------------------
-
-def _patch_descriptor_dict_file(data: dict, old_path: str, new_path: str) -> bool:
-    """Update a serialised :class:`PlaylistDescriptor` after a file rename."""
-    changed = False
-    fps = data.get("track_filepaths")
-    if isinstance(fps, list):
-        new_fps = [new_path if _norm(f) == _norm(old_path) else f for f in fps]
-        if new_fps != fps:
-            data["track_filepaths"] = new_fps
-            changed = True
-    return changed
-
-
-def _patch_descriptor_dict_dir(data: dict, old_dir: str, new_dir: str) -> bool:
-    """Update a serialised :class:`PlaylistDescriptor` after a directory rename."""
-    changed = False
-    fps = data.get("track_filepaths")
-    if isinstance(fps, list):
-        new_fps = [_remap_under(old_dir, new_dir, f) for f in fps]
-        if new_fps != fps:
-            data["track_filepaths"] = new_fps
-            changed = True
-    dirs = data.get("source_directories")
-    if isinstance(dirs, list):
-        new_dirs = [_remap_under(old_dir, new_dir, d) for d in dirs]
-        if new_dirs != dirs:
-            data["source_directories"] = new_dirs
-            changed = True
-    return changed
-
-
-def _patch_descriptor_list_file(descriptors: list, old_path: str, new_path: str) -> bool:
-    changed = False
-    for desc in descriptors:
-        if isinstance(desc, dict) and _patch_descriptor_dict_file(desc, old_path, new_path):
-            changed = True
-    return changed
-
-
-def _patch_descriptor_list_dir(descriptors: list, old_dir: str, new_dir: str) -> bool:
-    changed = False
-    for desc in descriptors:
-        if isinstance(desc, dict) and _patch_descriptor_dict_dir(desc, old_dir, new_dir):
-            changed = True
-    return changed
-
-
-def _playlist_descriptors_file(old_path: str, new_path: str) -> None:
+def _playlist_descriptors_file_delete(filepath: str) -> None:
     from muse.playlist_descriptor import PLAYLIST_DESCRIPTORS_CACHE_KEY
     from muse.playback_session import RECENT_DESCRIPTORS_KEY
     from utils.app_info_cache import app_info_cache
 
+    def _remove_from_desc(data: dict) -> bool:
+        fps = data.get("track_filepaths")
+        if not isinstance(fps, list):
+            return False
+        updated = [f for f in fps if _norm(f) != _norm(filepath)]
+        if updated != fps:
+            data["track_filepaths"] = updated
+            return True
+        return False
+
     raw = app_info_cache.get(PLAYLIST_DESCRIPTORS_CACHE_KEY, {})
     if isinstance(raw, dict):
-        changed = _patch_descriptor_list_file(list(raw.values()), old_path, new_path)
+        changed = any(_remove_from_desc(v) for v in raw.values() if isinstance(v, dict))
         if changed:
             app_info_cache.set(PLAYLIST_DESCRIPTORS_CACHE_KEY, raw)
             app_info_cache.store()
 
     recents = app_info_cache.get(RECENT_DESCRIPTORS_KEY, []) or []
-    if isinstance(recents, list) and _patch_descriptor_list_file(recents, old_path, new_path):
-        app_info_cache.set(RECENT_DESCRIPTORS_KEY, recents)
-        app_info_cache.store()
-
-
-def _playlist_descriptors_directory(old_dir: str, new_dir: str) -> None:
-    from muse.playlist_descriptor import PLAYLIST_DESCRIPTORS_CACHE_KEY
-    from muse.playback_session import RECENT_DESCRIPTORS_KEY
-    from utils.app_info_cache import app_info_cache
-
-    raw = app_info_cache.get(PLAYLIST_DESCRIPTORS_CACHE_KEY, {})
-    if isinstance(raw, dict):
-        changed = _patch_descriptor_list_dir(list(raw.values()), old_dir, new_dir)
+    if isinstance(recents, list):
+        changed = any(_remove_from_desc(d) for d in recents if isinstance(d, dict))
         if changed:
-            app_info_cache.set(PLAYLIST_DESCRIPTORS_CACHE_KEY, raw)
+            app_info_cache.set(RECENT_DESCRIPTORS_KEY, recents)
             app_info_cache.store()
 
-    recents = app_info_cache.get(RECENT_DESCRIPTORS_KEY, []) or []
-    if isinstance(recents, list) and _patch_descriptor_list_dir(recents, old_dir, new_dir):
-        app_info_cache.set(RECENT_DESCRIPTORS_KEY, recents)
-        app_info_cache.store()
-
 
 # ---------------------------------------------------------------------------
-# Favorites
+# Bulk renames — many path changes applied in one pass per store
 # ---------------------------------------------------------------------------
 
-def _favorites_file(old_path: str, new_path: str) -> None:
-    from utils.app_info_cache import app_info_cache
-    favs = app_info_cache.get("favorites", [])
-    if not isinstance(favs, list):
-        return
-    changed = False
-    for fav in favs:
-        if isinstance(fav, dict) and _norm(fav.get("filepath", "")) == _norm(old_path):
-            fav["filepath"] = new_path
-            changed = True
-    if changed:
-        app_info_cache.set("favorites", favs)
-        app_info_cache.store()
+@dataclass
+class RenameReport:
+    """Outcome of propagate_renames: entries changed (or that would change) per store."""
+    dry_run: bool
+    changes: Dict[str, int] = field(default_factory=dict)
+    errors: Dict[str, str] = field(default_factory=dict)
 
+    @property
+    def total_changes(self) -> int:
+        return sum(self.changes.values())
 
-def _favorites_directory(old_dir: str, new_dir: str) -> None:
-    from utils.app_info_cache import app_info_cache
-    favs = app_info_cache.get("favorites", [])
-    if not isinstance(favs, list):
-        return
-    changed = False
-    for fav in favs:
-        if isinstance(fav, dict):
-            fp = fav.get("filepath", "")
-            if fp:
-                new_fp = _remap_under(old_dir, new_dir, fp)
-                if new_fp != fp:
-                    fav["filepath"] = new_fp
-                    changed = True
-    if changed:
-        app_info_cache.set("favorites", favs)
-        app_info_cache.store()
 
+class PathRemapper:
+    """Map any path through a set of file and/or directory renames.
 
-# ---------------------------------------------------------------------------
-# Delete helpers — remove all references to a deleted filepath
-# ---------------------------------------------------------------------------
+    An exact match on a renamed path wins; otherwise the nearest renamed
+    ancestor directory is rebased with ``_remap_under``.  Paths not affected
+    are returned unchanged (the same object), so ``remap(p) != p`` is a
+    cheap "was it renamed" test.
+    """
 
-def _db_file_delete(filepath: str) -> None:
-    from utils.db import get_connection
-    conn = get_connection()
-    conn.execute("DELETE FROM media_tracks WHERE filepath=?", (filepath,))
-    conn.commit()
+    def __init__(self, mapping: Dict[str, str]):
+        self._entries: Dict[str, tuple] = {}
+        for old, new in mapping.items():
+            if old and new and _norm(old) != _norm(new):
+                self._entries[self._key(old)] = (_norm(old), _norm(new))
 
+    @staticmethod
+    def _key(path: str) -> str:
+        return os.path.normcase(_norm(path))
 
-def _db_dir_json_file_delete(filepath: str) -> None:
-    from utils.db import get_connection
-    old_dir = os.path.dirname(filepath)
-    conn = get_connection()
-    row = conn.execute(
-        "SELECT files FROM directories WHERE path=?", (old_dir,)
-    ).fetchone()
-    if row:
+    def __bool__(self) -> bool:
+        return bool(self._entries)
+
+    def old_paths(self) -> List[str]:
+        return [old for old, _ in self._entries.values()]
+
+    def pairs(self) -> List[tuple]:
+        return list(self._entries.values())
+
+    def remap(self, path: str) -> str:
+        if not path or not isinstance(path, str):
+            return path
+        key = self._key(path)
+        hit = self._entries.get(key)
+        if hit is not None:
+            return hit[1]
+        parent = os.path.dirname(key)
+        while parent and parent != key:
+            hit = self._entries.get(parent)
+            if hit is not None:
+                return _remap_under(hit[0], hit[1], path)
+            key, parent = parent, os.path.dirname(parent)
+        return path
+
+
+def propagate_renames(mapping: Dict[str, str], dry_run: bool = False) -> RenameReport:
+    """Propagate many file and/or directory renames to every filepath-keyed cache.
+
+    *mapping* is ``{old_path: new_path}``; entries may be files or directories
+    and are applied together, so each store is read and written once: one
+    SQLite transaction, one pass over each in-memory cache, and a single
+    app_info_cache.store() at the end.  With *dry_run* nothing is written and
+    the report counts the entries that would change (see
+    ``utils.track_path_preview.preview_renames``).
+    """
+    report = RenameReport(dry_run=dry_run)
+    remapper = PathRemapper(mapping)
+    if not remapper:
+        return report
+
+    def run(label: str, fn: Callable[[], int]) -> None:
+        try:
+            report.changes[label] = fn()
+        except Exception as exc:
+            report.errors[label] = str(exc)
+            logger.warning("Cache update skipped (%s): %s", label, exc)
+
+    run("db",                  lambda: _bulk_db(remapper, dry_run))
+    run("LibraryData",         lambda: _bulk_lib(remapper, dry_run))
+    run("Playlist.history",    lambda: _bulk_playlist(remapper, dry_run))
+    run("PlaybackSession",     lambda: _bulk_session(remapper, dry_run))
+    run("Favorites",           lambda: _bulk_favorites(remapper, dry_run))
+    run("PlaylistDescriptors", lambda: _bulk_playlist_descriptors(remapper, dry_run))
+
+    app_info_changes = sum(
+        report.changes.get(label, 0)
+        for label in ("Playlist.history", "PlaybackSession", "Favorites", "PlaylistDescriptors")
+    )
+    if app_info_changes and not dry_run:
+        from utils.app_info_cache import app_info_cache
         try:
-            files: list = json.loads(row["files"] or "[]")
-            updated = [f for f in files if _norm(f) != _norm(filepath)]
-            if updated != files:
-                conn.execute(
-                    "UPDATE directories SET files=? WHERE path=?",
-                    (json.dumps(updated), old_dir),
-                )
-                conn.commit()
+            app_info_cache.store()
+        except Exception as exc:
+            report.errors["app_info_cache.store"] = str(exc)
+            logger.warning("Cache update skipped (app_info_cache.store): %s", exc)
+
+    logger.info(
+        "%s %d path renames: %s",
+        "Previewed" if dry_run else "Propagated", len(remapper.pairs()), report.changes,
+    )
+    return report
+
+
+def _remap_directory_entries(entries: Dict[str, list], remapper: PathRemapper) -> tuple:
+    """Apply renames to a ``{directory: [filepaths]}`` mapping.
+
+    *entries* must contain every affected row: directories at or under a
+    renamed path, and the source and destination directories of renamed files.
+    Same-directory renames are rewritten in place, cross-directory moves are
+    removed from the source list and appended to the destination list.
+
+    Returns ``(updated, removed)``: rows to write keyed by their (new)
+    directory, and old directory keys that no longer exist.
+    """
+    updated: Dict[str, list] = {}
+    removed: set = set()
+    moved_in: Dict[str, list] = {}
+    for dir_path, files in entries.items():
+        new_dir = remapper.remap(dir_path)
+        new_files = []
+        for f in files:
+            new_f = remapper.remap(f)
+            new_parent = os.path.dirname(_norm(new_f))
+            if new_f != f and PathRemapper._key(new_parent) != PathRemapper._key(new_dir):
+                moved_in.setdefault(new_parent, []).append(new_f)
+            else:
+                new_files.append(new_f)
+        if new_dir != dir_path:
+            removed.add(dir_path)
+        if new_dir != dir_path or new_files != files:
+            updated[new_dir] = new_files
+
+    by_key = {PathRemapper._key(d): d for d in updated}
+    for d in entries:
+        by_key.setdefault(PathRemapper._key(d), d)
+    for dest_dir, files in moved_in.items():
+        existing_dir = by_key.get(PathRemapper._key(dest_dir), dest_dir)
+        dest_files = updated.get(existing_dir)
+        if dest_files is None:
+            dest_files = list(entries.get(existing_dir, []))
+        present = {_norm(f) for f in dest_files}
+        for f in files:
+            if _norm(f) not in present:
+                dest_files.append(f)
+                present.add(_norm(f))
+        updated[existing_dir] = dest_files
+        removed.discard(existing_dir)
+    return updated, removed
+
+
+def _affected_directories(remapper: PathRemapper) -> List[str]:
+    """Directories whose file lists a rename can touch (besides those under a renamed dir)."""
+    dirs = []
+    for old, new in remapper.pairs():
+        dirs.append(os.path.dirname(old))
+        dirs.append(os.path.dirname(new))
+    return dirs
+
+
+def _db_rename_plan(conn, remapper: PathRemapper) -> tuple:
+    """Read the media_tracks and directories rows a set of renames changes.
+
+    Returns ``(file_updates, parent_updates, updated, removed, scanned_at)``:
+    old -> new filepaths and parent filepaths, directory rows to write keyed by
+    their new path, old directory keys to delete, and the scan time of each
+    original directory row keyed by its new path.
+    """
+    from utils.db import path_key, path_prefix_range
+
+    file_updates = {}
+    parent_updates = {}
+    dir_rows = {}
+    for old, _ in remapper.pairs():
+        low, high = path_prefix_range(old)
+        params = (path_key(old), low, high)
+        for row in conn.execute(
+            "SELECT filepath FROM media_tracks WHERE path_key = ? OR (path_key >= ? AND path_key < ?)",
+            params,
+        ):
+            new_fp = remapper.remap(row["filepath"])
+            if new_fp != row["filepath"]:
+                file_updates[row["filepath"]] = new_fp
+        for row in conn.execute(
+            "SELECT DISTINCT parent_filepath FROM media_tracks "
+            "WHERE parent_key = ? OR (parent_key >= ? AND parent_key < ?)",
+            params,
+        ):
+            new_parent = remapper.remap(row["parent_filepath"])
+            if new_parent != row["parent_filepath"]:
+                parent_updates[row["parent_filepath"]] = new_parent
+        for row in conn.execute(
+            "SELECT path, files, scanned_at FROM directories "
+            "WHERE path_key = ? OR (path_key >= ? AND path_key < ?)",
+            params,
+        ):
+            dir_rows[row["path"]] = row
+    for d in _affected_directories(remapper):
+        for row in conn.execute(
+            "SELECT path, files, scanned_at FROM directories WHERE path_key = ?", (path_key(d),)
+        ):
+            if _norm(row["path"]) == _norm(d):
+                dir_rows[row["path"]] = row
+
+    entries = {}
+    scanned_at = {}
+    for dir_path, row in dir_rows.items():
+        try:
+            entries[dir_path] = json.loads(row["files"] or "[]")
         except json.JSONDecodeError:
-            pass
+            entries[dir_path] = []
+        scanned_at[remapper.remap(dir_path)] = row["scanned_at"]
+    updated, removed = _remap_directory_entries(entries, remapper)
+    return file_updates, parent_updates, updated, removed, scanned_at
 
 
-def _lib_file_delete(filepath: str) -> None:
-    from library_data.library_data import LibraryData
+def _bulk_db(remapper: PathRemapper, dry_run: bool) -> int:
+    import time
+    from utils.db import get_read_connection, path_key, write_transaction
 
-    LibraryData.MEDIA_TRACK_CACHE.pop(filepath, None)
+    if dry_run:
+        file_updates, parent_updates, updated, removed, _ = _db_rename_plan(get_read_connection(), remapper)
+        return len(file_updates) + len(parent_updates) + len(updated) + len(removed)
 
-    LibraryData.all_tracks = [
-        t for t in LibraryData.all_tracks if _norm(t.filepath) != _norm(filepath)
-    ]
+    with write_transaction() as conn:
+        file_updates, parent_updates, updated, removed, scanned_at = _db_rename_plan(conn, remapper)
+        changes = len(file_updates) + len(parent_updates) + len(updated) + len(removed)
+        if changes == 0:
+            return 0
 
-    old_dir = os.path.dirname(filepath)
-    if old_dir in LibraryData.DIRECTORIES_CACHE:
-        LibraryData.DIRECTORIES_CACHE[old_dir] = [
-            f for f in LibraryData.DIRECTORIES_CACHE[old_dir]
-            if _norm(f) != _norm(filepath)
+        conn.executemany(
+            "UPDATE media_tracks SET filepath=? WHERE filepath=?",
+            [(new, old) for old, new in file_updates.items()],
+        )
+        conn.executemany(
+            "UPDATE media_tracks SET parent_filepath=? WHERE parent_key=? AND parent_filepath=?",
+            [(new, path_key(old), old) for old, new in parent_updates.items()],
+        )
+        conn.executemany("DELETE FROM directories WHERE path=?", [(d,) for d in removed])
+        now = time.time()
+        rows = [
+            (new_dir, json.dumps(files), scanned_at.get(new_dir, now))
+            for new_dir, files in updated.items()
         ]
+        conn.executemany(
+            "INSERT OR REPLACE INTO directories (path, files, scanned_at) VALUES (?, ?, ?)", rows
+        )
+    return changes
 
 
-def _playlist_file_delete(filepath: str) -> None:
+def _bulk_lib(remapper: PathRemapper, dry_run: bool) -> int:
+    from library_data.library_data import LibraryData
+    from utils.path_index import PathIndexedDict
+
+    def candidates(mapping: dict) -> set:
+        if not isinstance(mapping, PathIndexedDict):
+            return set(mapping.keys())
+        keys = set()
+        for old in remapper.old_paths():
+            keys.update(mapping.keys_under(old))
+        return keys
+
+    cache = LibraryData.MEDIA_TRACK_CACHE
+    track_moves = {}
+    for old_p in candidates(cache):
+        new_p = remapper.remap(old_p)
+        if new_p != old_p:
+            track_moves[old_p] = new_p
+
+    # all_tracks holds the same MediaTrack objects as MEDIA_TRACK_CACHE, so a renamed
+    # file whose track was re-keyed above needs no scan.  For the other renamed
+    # paths (directories, files missing from the cache) a normcase prefix check
+    # skips unrelated tracks before the full remap.
+    moved_keys = {remapper._key(p) for p in track_moves}
+    unresolved = {key for key in map(remapper._key, remapper.old_paths()) if key not in moved_keys}
+    prefixes = tuple(key.rstrip(os.sep) + os.sep for key in unresolved)
+    list_moves = []
+    if unresolved:
+        moved_ids = {id(cache[p]) for p in track_moves}
+        for t in LibraryData.all_tracks:
+            key = os.path.normcase(t.filepath)
+            if not (key.startswith(prefixes) or key in unresolved) or id(t) in moved_ids:
+                continue
+            new_fp = remapper.remap(t.filepath)
+            if new_fp != t.filepath:
+                list_moves.append((t, new_fp))
+
+    dirs = LibraryData.DIRECTORIES_CACHE
+    entry_keys = candidates(dirs)
+    for d in _affected_directories(remapper):
+        if d in dirs:
+            entry_keys.add(d)
+    updated, removed = _remap_directory_entries({k: dirs[k] for k in entry_keys}, remapper)
+
+    changes = len(track_moves) + len(list_moves) + len(updated) + len(removed)
+    if dry_run:
+        return changes
+
+    # Pop everything first so swapped names cannot overwrite each other
+    moved = {old_p: cache.pop(old_p) for old_p in track_moves}
+    for old_p, track in moved.items():
+        new_p = track_moves[old_p]
+        track.filepath = new_p
+        cache[new_p] = track
+    for t, new_fp in list_moves:
+        t.filepath = new_fp
+    for d in removed:
+        dirs.pop(d, None)
+    for d, files in updated.items():
+        dirs[d] = files
+    return changes
+
+
+def _remap_list(paths: list, remapper: PathRemapper) -> list:
+    return [remapper.remap(p) for p in paths]
+
+
+def _bulk_playlist(remapper: PathRemapper, dry_run: bool) -> int:
     from muse.playlist import Playlist
-    from utils.globals import HistoryType
     from utils.app_info_cache import app_info_cache
+    from utils.globals import HistoryType
     key = HistoryType.TRACKS.value
 
-    Playlist.recently_played_filepaths = [
-        f for f in Playlist.recently_played_filepaths if _norm(f) != _norm(filepath)
-    ]
+    live = _remap_list(Playlist.recently_played_filepaths, remapper)
     cached = app_info_cache.get(key, [])
-    updated = [f for f in cached if _norm(f) != _norm(filepath)]
-    if updated != cached:
-        app_info_cache.set(key, updated)
-        app_info_cache.store()
-
-
-def _session_file_delete(filepath: str) -> None:
+    updated = _remap_list(cached, remapper)
+    changes = sum(a != b for a, b in zip(live, Playlist.recently_played_filepaths))
+    changes += sum(a != b for a, b in zip(updated, cached))
+    if not dry_run:
+        Playlist.recently_played_filepaths = live
+        if updated != cached:
+            app_info_cache.set(key, updated)
+    return changes
+
+
+def _remap_descriptor(desc: dict, remapper: PathRemapper) -> int:
+    changes = 0
+    for field_name in ("track_filepaths", "source_directories"):
+        values = desc.get(field_name)
+        if isinstance(values, list):
+            new_values = _remap_list(values, remapper)
+            changed = sum(a != b for a, b in zip(new_values, values))
+            if changed:
+                desc[field_name] = new_values
+                changes += changed
+    return changes
+
+
+def _bulk_session(remapper: PathRemapper, dry_run: bool) -> int:
+    import copy
     from muse.playback_session import LAST_SESSION_KEY
     from utils.app_info_cache import app_info_cache
 
     session = app_info_cache.get(LAST_SESSION_KEY)
     if not isinstance(session, dict):
-        return
-
-    changed = False
-    if _norm(session.get("current_track_filepath", "")) == _norm(filepath):
-        session["current_track_filepath"] = ""
-        changed = True
+        return 0
+    session = copy.deepcopy(session)
 
+    changes = 0
+    cur = session.get("current_track_filepath", "")
+    new_cur = remapper.remap(cur)
+    if new_cur != cur:
+        session["current_track_filepath"] = new_cur
+        changes += 1
     tracks = session.get("resolved_tracks", [])
-    updated = [t for t in tracks if _norm(t) != _norm(filepath)]
-    if updated != tracks:
-        session["resolved_tracks"] = updated
-        changed = True
-
+    new_tracks = _remap_list(tracks, remapper)
+    changed = sum(a != b for a, b in zip(new_tracks, tracks))
+    if changed:
+        session["resolved_tracks"] = new_tracks
+        changes += changed
     desc = session.get("descriptor")
     if isinstance(desc, dict):
-        fps = desc.get("track_filepaths")
-        if isinstance(fps, list):
-            new_fps = [f for f in fps if _norm(f) != _norm(filepath)]
-            if new_fps != fps:
-                desc["track_filepaths"] = new_fps
-                changed = True
+        changes += _remap_descriptor(desc, remapper)
 
-    if changed:
+    if changes and not dry_run:
         app_info_cache.set(LAST_SESSION_KEY, session)
-        app_info_cache.store()
+    return changes
 
 
-def _favorites_file_delete(filepath: str) -> None:
+def _bulk_favorites(remapper: PathRemapper, dry_run: bool) -> int:
+    import copy
     from utils.app_info_cache import app_info_cache
+
     favs = app_info_cache.get("favorites", [])
     if not isinstance(favs, list):
-        return
-    updated = [
-        f for f in favs
-        if not (isinstance(f, dict) and _norm(f.get("filepath", "")) == _norm(filepath))
-    ]
-    if len(updated) != len(favs):
-        app_info_cache.set("favorites", updated)
-        app_info_cache.store()
+        return 0
+    favs = copy.deepcopy(favs)
+    changes = 0
+    for fav in favs:
+        if isinstance(fav, dict):
+            fp = fav.get("filepath", "")
+            new_fp = remapper.remap(fp)
+            if new_fp != fp:
+                fav["filepath"] = new_fp
+                changes += 1
+    if changes and not dry_run:
+        app_info_cache.set("favorites", favs)
+    return changes
 
 
-def _playlist_descriptors_file_delete(filepath: str) -> None:
+def _bulk_playlist_descriptors(remapper: PathRemapper, dry_run: bool) -> int:
+    import copy
     from muse.playlist_descriptor import PLAYLIST_DESCRIPTORS_CACHE_KEY
     from muse.playback_session import RECENT_DESCRIPTORS_KEY
     from utils.app_info_cache import app_info_cache
 
-    def _remove_from_desc(data: dict) -> bool:
-        fps = data.get("track_filepaths")
-        if not isinstance(fps, list):
-            return False
-        updated = [f for f in fps if _norm(f) != _norm(filepath)]
-        if updated != fps:
-            data["track_filepaths"] = updated
-            return True
-        return False
-
+    changes = 0
     raw = app_info_cache.get(PLAYLIST_DESCRIPTORS_CACHE_KEY, {})
     if isinstance(raw, dict):
-        changed = any(_remove_from_desc(v) for v in raw.values() if isinstance(v, dict))
-        if changed:
+        raw = copy.deepcopy(raw)
+        changed = sum(_remap_descriptor(d, remapper) for d in raw.values() if isinstance(d, dict))
+        if changed and not dry_run:
             app_info_cache.set(PLAYLIST_DESCRIPTORS_CACHE_KEY, raw)
-            app_info_cache.store()
+        changes += changed
 
     recents = app_info_cache.get(RECENT_DESCRIPTORS_KEY, []) or []
     if isinstance(recents, list):
-        changed = any(_remove_from_desc(d) for d in recents if isinstance(d, dict))
-        if changed:
+        recents = copy.deepcopy(recents)
+        changed = sum(_remap_descriptor(d, remapper) for d in recents if isinstance(d, dict))
+        if changed and not dry_run:
             app_info_cache.set(RECENT_DESCRIPTORS_KEY, recents)
-            app_info_cache.store()
+        changes += changed
+    return changes
@@ -32,6 +32,8 @@ class Globals:
         CHANCE_SPEAK_BEFORE_TRACK = "chance_speak_before_track"
         TOPIC_DISCUSSION_CHANCE_FACTOR = "topic_discussion_chance_factor"
         MIN_SECONDS_BETWEEN_SPOTS = "min_seconds_between_spots"
+        STREAM_SPOTS = "stream_spots"
+        SPOT_POOL_SIZE = "spot_pool_size"
 
     @classmethod
     def set_delay(cls, delay=5):
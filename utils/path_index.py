@@ -0,0 +1,126 @@
+"""
+Path-keyed dict with a directory prefix index.
+
+PathIndexedDict behaves like a plain dict keyed by filesystem paths, but also
+keeps its keys in a trie of normalized path components, so every key at or
+under a directory can be found by visiting only that subtree instead of
+scanning the whole mapping.  Used for the LibraryData caches so that
+utils.filepath_update can propagate a directory rename or delete in
+O(size of subtree).
+
+The trie is built on the first keys_under() call and maintained incrementally
+after that, so loading a large cache does not pay for an index nobody uses.
+"""
+
+import os
+from typing import Iterator, List
+
+# Trie nodes are dicts of component -> child node; this key holds the set of
+# original dict keys that normalize to the node's path.
+_KEYS = None
+
+
+def _components(path: str) -> List[str]:
+    normalized = os.path.normcase(os.path.normpath(path))
+    return [part for part in normalized.split(os.sep) if part]
+
+
+class PathIndexedDict(dict):
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self._root = None
+        self.update(*args, **kwargs)
+
+    # Pickle/deepcopy rebuild through __init__ so the index is restored too
+    def __reduce__(self):
+        return (PathIndexedDict, (dict(self),))
+
+    def __setitem__(self, key, value):
+        if key not in self:
+            self._index_add(key)
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._index_remove(key)
+
+    def pop(self, key, *default):
+        if key in self:
+            value = super().pop(key)
+            self._index_remove(key)
+            return value
+        return super().pop(key, *default)
+
+    def popitem(self):
+        key, value = super().popitem()
+        self._index_remove(key)
+        return key, value
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs):
+        if self._root is None:
+            super().update(*args, **kwargs)
+            return
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def clear(self):
+        super().clear()
+        self._root = None
+
+    def copy(self):
+        return PathIndexedDict(self)
+
+    def keys_under(self, directory: str) -> Iterator[str]:
+        """Yield every key equal to *directory* or located anywhere beneath it."""
+        if self._root is None:
+            self._root = {}
+            for key in self.keys():
+                self._index_add(key)
+        node = self._root
+        for part in _components(directory):
+            node = node.get(part)
+            if node is None:
+                return
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            for part, child in node.items():
+                if part is _KEYS:
+                    yield from list(child)
+                else:
+                    stack.append(child)
+
+    def _index_add(self, key) -> None:
+        if self._root is None or not isinstance(key, str):
+            return
+        node = self._root
+        for part in _components(key):
+            node = node.setdefault(part, {})
+        node.setdefault(_KEYS, set()).add(key)
+
+    def _index_remove(self, key) -> None:
+        if self._root is None or not isinstance(key, str):
+            return
+        path = [self._root]
+        parts = _components(key)
+        for part in parts:
+            child = path[-1].get(part)
+            if child is None:
+                return
+            path.append(child)
+        keys = path[-1].get(_KEYS)
+        if keys is None:
+            return
+        keys.discard(key)
+        if not keys:
+            del path[-1][_KEYS]
+        # Prune empty branches so the trie does not grow with renamed-away paths
+        for depth in range(len(parts), 0, -1):
+            if path[depth]:
+                break
+            del path[depth - 1][parts[depth - 1]]
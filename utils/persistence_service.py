@@ -0,0 +1,386 @@
+"""
+Background persistence with per-component dirty flags.
+
+Components are registered with a store callable and an optional group. Marking a
+component dirty schedules a debounced (trailing-edge) flush on a worker thread;
+repeated marks inside the quiet period coalesce into one write. Components in the
+same group run in order on one thread (e.g. everything that writes into
+app_info_cache before app_info_cache itself is stored); separate groups run in
+parallel. Per-component timings are kept for diagnostics.
+
+A component may also have a capture callable, run on the marking thread under a
+lock when the component is marked. It takes a copy of state that other threads
+mutate, and its result is what the worker later passes to store, so the worker
+never serializes live objects. A component that fails to store is retried with
+an exponential backoff rather than on every flush.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from utils.logging_setup import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class ComponentTiming:
+    """Accumulated store timings for one component, in seconds."""
+    count: int = 0
+    failures: int = 0
+    total: float = 0.0
+    last: float = 0.0
+    max: float = 0.0
+
+    def record(self, duration: float, success: bool) -> None:
+        self.count += 1
+        if not success:
+            self.failures += 1
+        self.total += duration
+        self.last = duration
+        self.max = max(self.max, duration)
+
+    @property
+    def average(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "failures": self.failures,
+            "total": self.total,
+            "average": self.average,
+            "last": self.last,
+            "max": self.max,
+        }
+
+
+_NOT_CAPTURED = object()
+
+
+@dataclass
+class _Component:
+    name: str
+    store: Optional[Callable[..., None]]
+    group: str
+    capture: Optional[Callable[[], Any]] = None
+
+
+class PersistenceService:
+    SLOW_STORE_SECONDS = 1.0
+
+    def __init__(
+        self,
+        name: str = "Persistence",
+        debounce_seconds: float = 5.0,
+        max_delay_seconds: float = 30.0,
+        max_workers: int = 3,
+        max_retry_delay_seconds: float = 600.0,
+    ):
+        """
+        Args:
+            name: Used for the worker thread name and log messages.
+            debounce_seconds: Quiet period after the last mark before a flush starts.
+            max_delay_seconds: Upper bound on how long continuous marking can postpone a flush.
+            max_workers: Number of groups that may be stored in parallel.
+            max_retry_delay_seconds: Upper bound on the backoff before a failed component is retried.
+        """
+        self.name = name
+        self.debounce_seconds = debounce_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self.max_workers = max_workers
+        self.max_retry_delay_seconds = max_retry_delay_seconds
+        self._components: Dict[str, _Component] = {}
+        self._group_order: List[str] = []
+        self._finalizers: Dict[str, Callable[[], None]] = {}
+        self._timings: Dict[str, ComponentTiming] = {}
+        self._dirty: set = set()
+        self._captured: Dict[str, Any] = {}
+        self._failure_counts: Dict[str, int] = {}
+        self._retry_at: Dict[str, float] = {}
+        self._condition = threading.Condition()
+        self._deadline: Optional[float] = None
+        self._first_mark_time: Optional[float] = None
+        self._running = False
+        self._stopped = False
+        self._thread: Optional[threading.Thread] = None
+        # Serializes batches whether they run on the worker or on a caller thread
+        self._batch_lock = threading.Lock()
+        # Serializes captures taken on the marking threads
+        self._capture_lock = threading.RLock()
+
+    def register(
+        self,
+        name: str,
+        store: Optional[Callable[..., None]],
+        group: Optional[str] = None,
+        capture: Optional[Callable[[], Any]] = None,
+    ) -> None:
+        """
+        Args:
+            store: Writes the component. Called with the result of capture if one is given.
+            group: Components of a group are stored in order on one thread.
+            capture: Copies the component's state when it is marked dirty, on the marking thread.
+                A component with only a capture (store None) just needs its group finalizer to run.
+        """
+        group = group or name
+        self._components[name] = _Component(name, store, group, capture)
+        if group not in self._group_order:
+            self._group_order.append(group)
+        self._timings.setdefault(name, ComponentTiming())
+        if capture is not None:
+            self._timings.setdefault(self._capture_name(name), ComponentTiming())
+
+    def register_group_finalizer(self, group: str, finalizer: Callable[[], None]) -> None:
+        """Run finalizer after the dirty components of group have been stored."""
+        self._finalizers[group] = finalizer
+        if group not in self._group_order:
+            self._group_order.append(group)
+        self._timings.setdefault(self._finalizer_name(group), ComponentTiming())
+
+    @property
+    def component_names(self) -> List[str]:
+        return list(self._components.keys())
+
+    def mark_dirty(self, *names: str) -> None:
+        """
+        Capture the named components and flag them for the next debounced flush.
+        A component that recently failed to store waits out its backoff instead.
+        """
+        names = self._check_names(names)
+        if not names:
+            return
+        with self._condition:
+            if self._stopped:
+                return
+        names = self._capture(names)
+        with self._condition:
+            if self._stopped:
+                return
+            names -= self._retry_at.keys()
+            if not names:
+                return
+            now = time.monotonic()
+            if not self._dirty:
+                self._first_mark_time = now
+            self._dirty.update(names)
+            latest = self._first_mark_time + self.max_delay_seconds
+            self._deadline = min(now + self.debounce_seconds, latest)
+            self._ensure_worker()
+            self._condition.notify_all()
+
+    def mark_all_dirty(self) -> None:
+        """Capture and flag every component, e.g. before a final flush on exit."""
+        self.mark_dirty(*self._components.keys())
+
+    def is_dirty(self, name: Optional[str] = None) -> bool:
+        with self._condition:
+            return bool(self._dirty) if name is None else name in self._dirty
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Start any pending stores immediately and wait for them to finish.
+        Returns False if the timeout elapsed first.
+        """
+        end = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            # Components waiting out a backoff get one more attempt
+            self._dirty.update(self._retry_at.keys())
+            self._retry_at.clear()
+            if self._dirty:
+                self._deadline = time.monotonic()
+                self._ensure_worker()
+                self._condition.notify_all()
+            while self._dirty or self._running:
+                remaining = None if end is None else end - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    logger.warning(
+                        f"{self.name}: flush timed out after {timeout}s, pending: {sorted(self._dirty)}"
+                    )
+                    return False
+                self._condition.wait(remaining)
+        return True
+
+    def store_now(self, names: Iterable[str] = ()) -> None:
+        """Store components (all if none given) on the calling thread, bypassing the debounce."""
+        names = self._check_names(names) or set(self._components.keys())
+        names = self._capture(names)
+        with self._condition:
+            self._dirty.difference_update(names)
+            for name in names:
+                self._retry_at.pop(name, None)
+        self._record_results(names, self._run_batch(names))
+
+    def shutdown(self, timeout: Optional[float] = None) -> bool:
+        """Flush everything that is dirty within timeout, then stop the worker."""
+        completed = self.flush(timeout)
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+        return completed
+
+    def get_timings(self) -> Dict[str, dict]:
+        return {name: timing.to_dict() for name, timing in self._timings.items()}
+
+    def retry_delay(self, failures: int) -> float:
+        """Seconds to wait before retrying a component that has failed failures times in a row."""
+        return min(self.debounce_seconds * 2 ** failures, self.max_retry_delay_seconds)
+
+    def _check_names(self, names: Iterable[str]) -> set:
+        names = set(names)
+        unknown = names - set(self._components.keys())
+        if unknown:
+            raise ValueError(f"{self.name}: unknown components {sorted(unknown)}")
+        return names
+
+    def _capture(self, names: set) -> set:
+        """Run the capture of each named component, returning the names that are ready to store."""
+        ready = set()
+        with self._capture_lock:
+            for name in names:
+                component = self._components[name]
+                if component.capture is None:
+                    ready.add(name)
+                    continue
+                result = []
+                if self._timed(self._capture_name(name), lambda: result.append(component.capture())):
+                    with self._condition:
+                        self._captured[name] = result[0]
+                    ready.add(name)
+        return ready
+
+    def _record_results(self, names: set, failed: set) -> None:
+        """Reset the failure count of stored components and schedule a backoff retry of failed ones."""
+        with self._condition:
+            now = time.monotonic()
+            for name in names - failed:
+                self._failure_counts.pop(name, None)
+            for name in failed:
+                failures = self._failure_counts.get(name, 0) + 1
+                self._failure_counts[name] = failures
+                delay = self.retry_delay(failures)
+                self._retry_at[name] = now + delay
+                logger.warning(f"{self.name}: {name} failed to store {failures} time(s), retrying in {delay:.0f}s")
+            if failed:
+                self._ensure_worker()
+                self._condition.notify_all()
+
+    def _release_retries(self, now: float) -> None:
+        """Move components whose backoff has elapsed back to dirty. Must be called while holding _condition."""
+        due = [name for name, retry_at in self._retry_at.items() if retry_at <= now]
+        for name in due:
+            del self._retry_at[name]
+        if due:
+            if not self._dirty:
+                self._first_mark_time = now
+            self._dirty.update(due)
+            self._deadline = now
+
+    def _ensure_worker(self) -> None:
+        """Must be called while holding _condition."""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._worker_loop, name=self.name, daemon=True)
+            self._thread.start()
+
+    def _worker_loop(self) -> None:
+        while True:
+            with self._condition:
+                while not self._stopped:
+                    now = time.monotonic()
+                    self._release_retries(now)
+                    if self._dirty and now >= self._deadline:
+                        break
+                    wake_times = list(self._retry_at.values())
+                    if self._dirty:
+                        wake_times.append(self._deadline)
+                    self._condition.wait(max(0.0, min(wake_times) - now) if wake_times else None)
+                if self._stopped:
+                    return
+                names = set(self._dirty)
+                self._dirty.clear()
+                self._deadline = None
+                self._first_mark_time = None
+                self._running = True
+            failed = names
+            try:
+                failed = self._run_batch(names)
+            finally:
+                self._record_results(names, failed)
+                with self._condition:
+                    self._running = False
+                    self._condition.notify_all()
+
+    def _run_batch(self, names: set) -> set:
+        """Store the given components, returning the names that failed."""
+        if not names:
+            return set()
+        groups = [
+            (group, [c for c in self._components.values() if c.group == group and c.name in names])
+            for group in self._group_order
+        ]
+        groups = [(group, components) for group, components in groups if components]
+        start = time.monotonic()
+        failed = set()
+        with self._batch_lock:
+            if len(groups) == 1 or self.max_workers <= 1:
+                for group, components in groups:
+                    failed |= self._run_group(group, components)
+            else:
+                with ThreadPoolExecutor(
+                    max_workers=min(self.max_workers, len(groups)),
+                    thread_name_prefix=self.name,
+                ) as executor:
+                    futures = [
+                        executor.submit(self._run_group, group, components)
+                        for group, components in groups
+                    ]
+                    for future in futures:
+                        failed |= future.result()
+        logger.debug(
+            f"{self.name}: stored {len(names)} components in {time.monotonic() - start:.3f}s"
+        )
+        return failed
+
+    def _run_group(self, group: str, components: List[_Component]) -> set:
+        failed = set()
+        for component in components:
+            if component.store is None:
+                continue
+            store = component.store
+            if component.capture is not None:
+                with self._condition:
+                    captured = self._captured.get(component.name, _NOT_CAPTURED)
+                if captured is _NOT_CAPTURED:
+                    continue
+                store = lambda store=component.store, captured=captured: store(captured)
+            if not self._timed(component.name, store):
+                failed.add(component.name)
+        finalizer = self._finalizers.get(group)
+        if finalizer is not None and not self._timed(self._finalizer_name(group), finalizer):
+            failed.update(c.name for c in components)
+        return failed
+
+    def _timed(self, name: str, store: Callable[[], None]) -> bool:
+        start = time.monotonic()
+        success = True
+        try:
+            store()
+        except Exception as e:
+            success = False
+            logger.error(f"{self.name}: error storing {name}: {e}")
+        duration = time.monotonic() - start
+        self._timings[name].record(duration, success)
+        if duration > PersistenceService.SLOW_STORE_SECONDS:
+            logger.info(f"{self.name}: storing {name} took {duration:.2f}s")
+        return success
+
+    @staticmethod
+    def _finalizer_name(group: str) -> str:
+        return f"{group}:finalize"
+
+    @staticmethod
+    def _capture_name(name: str) -> str:
+        return f"{name}:capture"
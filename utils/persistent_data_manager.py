@@ -3,56 +3,212 @@ Persistent data manager for the PySide6 (Qt) UI context.
 
 Load/store populates ui_qt window class-level data (e.g. SearchWindow.recent_searches)
 so that the Qt app sees recent searches, favorites, etc.
+
+Stores go through a PersistenceService: callers mark the components they changed
+and the writes happen, coalesced, on a background thread. Components that only
+copy state into app_info_cache do so when marked, on the caller's thread, and
+share one group followed by app_info_cache.store(); muse memory is pickled when
+marked and written by the worker, and the library caches copy the cache dicts
+before writing them. Independent groups run in parallel.
+
+The components are imported when first loaded or stored rather than with this
+module, so importing it does not pull in the extension manager and window
+modules ahead of the main window. load() reads only what the main window needs;
+the extension history and the window data (recent searches, favorites) are read
+by load_deferred(), after the first paint or when the extension thread starts or
+one of those windows opens, whichever comes first. Until then their stores are
+skipped, so the values in app_info_cache are kept.
 """
 
-from extensions.extension_manager import ExtensionManager
-from library_data.library_data import LibraryData
-from muse.muse_memory import muse_memory
-from muse.playback_state import PlaybackStateManager
-from muse.playlist import Playlist
-from muse.schedules_manager import SchedulesManager
-from ui_qt.composers_window import ComposersWindow
-from ui_qt.favorites_window import FavoritesWindow
-from ui_qt.forms_window import FormsWindow
-from ui_qt.search_window import SearchWindow
-from utils.audio_device_manager import AudioDeviceManager
+import threading
+
+from lib.startup_trace import startup_trace
+from utils.logging_setup import get_logger
+from utils.persistence_service import PersistenceService
+
+logger = get_logger(__name__)
 
 
 class PersistentDataManager:
     """Load/store persistent data into UI window classes."""
 
+    MUSE_MEMORY = "muse_memory"
+    LIBRARY_CACHES = "library_caches"
+    RECENTLY_PLAYED = "recently_played"
+    SCHEDULES = "schedules"
+    EXTENSIONS = "extensions"
+    RECENT_SEARCHES = "recent_searches"
+    RECENT_COMPOSER_SEARCHES = "recent_composer_searches"
+    RECENT_FORM_SEARCHES = "recent_form_searches"
+    FAVORITES = "favorites"
+    AUDIO_DEVICE_SETTINGS = "audio_device_settings"
+    SORT_CONFIG = "sort_config"
+    # State set on app_info_cache directly (config history, playback session)
+    APP_INFO_CACHE = "app_info_cache"
+    APP_INFO_CACHE_GROUP = "app_info_cache"
+
+    STORE_DEBOUNCE_SECONDS = 5.0
+    STORE_MAX_DELAY_SECONDS = 30.0
+    EXIT_FLUSH_TIMEOUT_SECONDS = 20.0
+
     _is_loaded = False
+    _is_deferred_loaded = False
+    _deferred_load_lock = threading.RLock()
+    _service = None
+
+    @staticmethod
+    def _get_service() -> PersistenceService:
+        if PersistentDataManager._service is None:
+            from extensions.extension_manager import ExtensionManager
+            from library_data.library_data import LibraryData
+            from muse.playback_state import PlaybackStateManager
+            from muse.playlist import Playlist
+            from muse.schedules_manager import SchedulesManager
+            from ui_qt.composers_window import ComposersWindow
+            from ui_qt.favorites_window import FavoritesWindow
+            from ui_qt.forms_window import FormsWindow
+            from ui_qt.search_window import SearchWindow
+            from utils.audio_device_manager import AudioDeviceManager
+            service = PersistenceService(
+                name="PersistentDataManager",
+                debounce_seconds=PersistentDataManager.STORE_DEBOUNCE_SECONDS,
+                max_delay_seconds=PersistentDataManager.STORE_MAX_DELAY_SECONDS,
+            )
+            # Resolve module-level singletons at call time so they can be swapped (tests, reloads)
+            service.register(
+                PersistentDataManager.MUSE_MEMORY,
+                PersistentDataManager._write_muse_memory,
+                capture=PersistentDataManager._snapshot_muse_memory,
+            )
+            service.register(PersistentDataManager.LIBRARY_CACHES, LibraryData.store_caches)
+            group = PersistentDataManager.APP_INFO_CACHE_GROUP
+            deferred = PersistentDataManager._if_deferred_loaded
+            for name, capture in (
+                (PersistentDataManager.RECENTLY_PLAYED, Playlist.store_recently_played_lists),
+                (PersistentDataManager.SCHEDULES, SchedulesManager.store_schedules),
+                (PersistentDataManager.EXTENSIONS, deferred(ExtensionManager.store_extensions)),
+                (PersistentDataManager.RECENT_SEARCHES, deferred(SearchWindow.store_recent_searches)),
+                (PersistentDataManager.RECENT_COMPOSER_SEARCHES, deferred(ComposersWindow.store_recent_searches)),
+                (PersistentDataManager.RECENT_FORM_SEARCHES, deferred(FormsWindow.store_recent_searches)),
+                (PersistentDataManager.FAVORITES, deferred(FavoritesWindow.store_favorites)),
+                (PersistentDataManager.AUDIO_DEVICE_SETTINGS, AudioDeviceManager.store_settings),
+                (PersistentDataManager.SORT_CONFIG, PlaybackStateManager.store_override_sort_config),
+            ):
+                service.register(name, None, group, capture=capture)
+            service.register(PersistentDataManager.APP_INFO_CACHE, None, group)
+            service.register_group_finalizer(group, PersistentDataManager._store_app_info_cache)
+            PersistentDataManager._service = service
+        return PersistentDataManager._service
+
+    @staticmethod
+    def _if_deferred_loaded(capture):
+        """Wrap the capture of a component read by load_deferred() so it is skipped until then."""
+        def capture_if_loaded():
+            if PersistentDataManager._is_deferred_loaded:
+                capture()
+        return capture_if_loaded
+
+    @staticmethod
+    def _snapshot_muse_memory() -> bytes:
+        from muse.muse_memory import muse_memory
+        return muse_memory.snapshot()
+
+    @staticmethod
+    def _write_muse_memory(data: bytes):
+        from muse.muse_memory import muse_memory
+        muse_memory.write_snapshot(data)
+
+    @staticmethod
+    def _store_app_info_cache():
+        from utils.app_info_cache import app_info_cache
+        app_info_cache.store()
 
     @staticmethod
     def store():
-        muse_memory.save()
-        LibraryData.store_caches()
-        Playlist.store_recently_played_lists()
-        SchedulesManager.store_schedules()
-        ExtensionManager.store_extensions()
-        SearchWindow.store_recent_searches()
-        ComposersWindow.store_recent_searches()
-        FormsWindow.store_recent_searches()
-        FavoritesWindow.store_favorites()
-        AudioDeviceManager.store_settings()
-        PlaybackStateManager.store_override_sort_config()
+        """Store every component now on the calling thread (independent groups still run in parallel)."""
+        PersistentDataManager._get_service().store_now()
+
+    @staticmethod
+    def request_store(*components):
+        """Mark the given components changed; they are written on a background thread after a short quiet period."""
+        PersistentDataManager._get_service().mark_dirty(*components)
+
+    @staticmethod
+    def flush(timeout=None) -> bool:
+        """Write pending changes now and wait for them. Returns False if timeout elapsed first."""
+        return PersistentDataManager._get_service().flush(timeout)
+
+    @staticmethod
+    def store_on_exit(timeout=EXIT_FLUSH_TIMEOUT_SECONDS) -> bool:
+        """
+        Mark everything dirty and flush with a bounded wait so shutdown cannot hang on a slow store.
+        Files are replaced only once fully written, so a store cut off at exit leaves the previous version.
+        """
+        service = PersistentDataManager._get_service()
+        service.mark_all_dirty()
+        completed = service.shutdown(timeout)
+        logger.info(f"Persistent data store timings: {PersistentDataManager.get_store_timings()}")
+        return completed
+
+    @staticmethod
+    def get_store_timings() -> dict:
+        """Per-component store timings in seconds (count, failures, total, average, last, max)."""
+        return PersistentDataManager._get_service().get_timings()
 
     @staticmethod
     def load():
         if PersistentDataManager._is_loaded:
             return
 
-        muse_memory.load()
-        LibraryData.load_directory_cache()
-        LibraryData.load_media_track_cache()
-        Playlist.load_recently_played_lists()
-        SchedulesManager.set_schedules()
-        ExtensionManager.load_extensions()
-        SearchWindow.load_recent_searches()
-        ComposersWindow.load_recent_searches()
-        FormsWindow.load_recent_searches()
-        FavoritesWindow.load_favorites()
-        AudioDeviceManager.load_settings()
-        PlaybackStateManager.load_override_sort_config()
+        # Each step includes the import of its module the first time round, so
+        # a startup trace (see lib.startup_trace) attributes import cost to the
+        # step that needs it.
+        with startup_trace.step("load: muse memory"):
+            from muse.muse_memory import muse_memory
+            muse_memory.load()
+        with startup_trace.step("load: directory cache"):
+            from library_data.library_data import LibraryData
+            LibraryData.load_directory_cache()
+        with startup_trace.step("load: media track cache"):
+            LibraryData.load_media_track_cache()
+        with startup_trace.step("load: recently played lists"):
+            from muse.playlist import Playlist
+            Playlist.load_recently_played_lists()
+        with startup_trace.step("load: schedules"):
+            from muse.schedules_manager import SchedulesManager
+            SchedulesManager.set_schedules()
+        with startup_trace.step("load: audio device settings"):
+            from utils.audio_device_manager import AudioDeviceManager
+            AudioDeviceManager.load_settings()
+        with startup_trace.step("load: sort config"):
+            from muse.playback_state import PlaybackStateManager
+            PlaybackStateManager.load_override_sort_config()
 
         PersistentDataManager._is_loaded = True
+
+    @staticmethod
+    def load_deferred():
+        """
+        Read the extension history and the window data. Called after the first
+        paint, and before the extension thread starts or one of the windows
+        using this data opens in case that comes first; only the first call loads.
+        """
+        with PersistentDataManager._deferred_load_lock:
+            if PersistentDataManager._is_deferred_loaded:
+                return
+            with startup_trace.step("load: extensions"):
+                from extensions.extension_manager import ExtensionManager
+                ExtensionManager.load_extensions()
+            with startup_trace.step("load: recent searches"):
+                from ui_qt.search_window import SearchWindow
+                SearchWindow.load_recent_searches()
+            with startup_trace.step("load: recent composer searches"):
+                from ui_qt.composers_window import ComposersWindow
+                ComposersWindow.load_recent_searches()
+            with startup_trace.step("load: recent form searches"):
+                from ui_qt.forms_window import FormsWindow
+                FormsWindow.load_recent_searches()
+            with startup_trace.step("load: favorites"):
+                from ui_qt.favorites_window import FavoritesWindow
+                FavoritesWindow.load_favorites()
+            PersistentDataManager._is_deferred_loaded = True
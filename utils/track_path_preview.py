@@ -5,13 +5,17 @@ Computes the on-disk path that would result from applying metadata and optional
 directory / file actions. Used by TrackDetailsWindow (default actions: tag-only
 dirs, rename file when title changes) and RenameConfirmationWindow (user-selected
 actions).
+
+For batch renames, compute_rename_mapping builds the ``{old: new}`` mapping for
+many tracks, find_rename_conflicts flags collisions before anything moves, and
+preview_renames dry-runs the cache updates that propagate_renames would make.
 """
 
 from __future__ import annotations
 
 import os
 from enum import Enum
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
 class DirAction(str, Enum):
     NONE       = "none"
@@ -82,3 +86,50 @@ def compute_proposed_filepath(
             basename = stem + track.ext
 
     return os.path.join(new_album_dir, basename)
+
+
+def compute_rename_mapping(tracks, metadata_by_filepath: Dict[str, dict], **actions) -> Dict[str, str]:
+    """Return ``{current_path: proposed_path}`` for every track whose path would change.
+
+    *metadata_by_filepath* maps each track's filepath to its edited metadata
+    (missing entries mean no metadata change); *actions* are passed through to
+    compute_proposed_filepath.  The result can be handed to
+    ``utils.filepath_update.propagate_renames`` once the files have moved.
+    """
+    mapping: Dict[str, str] = {}
+    for track in tracks:
+        metadata = metadata_by_filepath.get(track.filepath, {})
+        proposed = compute_proposed_filepath(track, metadata, **actions)
+        if proposed != os.path.normpath(track.filepath):
+            mapping[track.filepath] = proposed
+    return mapping
+
+
+def find_rename_conflicts(mapping: Dict[str, str]) -> List[Tuple[str, str, str]]:
+    """Return ``(old_path, new_path, reason)`` for renames that cannot be applied as-is.
+
+    A rename conflicts when another entry targets the same path, or when the
+    destination already exists on disk and is not itself being renamed away.
+    """
+    from utils.path_move import destination_occupied, normcase_path
+
+    targets: Dict[str, List[str]] = {}
+    for old, new in mapping.items():
+        targets.setdefault(normcase_path(os.path.normpath(new)), []).append(old)
+    vacated = {normcase_path(os.path.normpath(old)) for old in mapping}
+
+    conflicts = []
+    for old, new in mapping.items():
+        key = normcase_path(os.path.normpath(new))
+        if len(targets[key]) > 1:
+            conflicts.append((old, new, "duplicate target"))
+        elif key not in vacated and destination_occupied(old, new):
+            conflicts.append((old, new, "destination exists"))
+    return conflicts
+
+
+def preview_renames(mapping: Dict[str, str]):
+    """Dry-run ``propagate_renames``: per-store counts of the entries *mapping* would change."""
+    from utils.filepath_update import propagate_renames
+
+    return propagate_renames(mapping, dry_run=True)
@@ -202,6 +202,40 @@ class Utils:
         # after the last swap, the results of v1 are now in v0
         return v0[len(t)]
 
+    @staticmethod
+    def string_distances(s, targets):
+        # Edit distances from s to each of targets, same as string_distance.
+        # Bit-parallel (Myers/Hyyrö): the columns of the distance matrix for s
+        # are held in the bits of an int, so each target costs one pass over
+        # its characters instead of len(s) * len(t) steps.
+        m = len(s)
+        if m == 0:
+            return [len(t) for t in targets]
+        peq = {}
+        for i, c in enumerate(s):
+            peq[c] = peq.get(c, 0) | (1 << i)
+        mask = (1 << m) - 1
+        last = 1 << (m - 1)
+        distances = []
+        for t in targets:
+            pv, mv, score = mask, 0, m
+            for c in t:
+                eq = peq.get(c, 0)
+                xv = eq | mv
+                xh = (((eq & pv) + pv) ^ pv) | eq
+                ph = mv | (~(xh | pv) & mask)
+                mh = pv & xh
+                if ph & last:
+                    score += 1
+                elif mh & last:
+                    score -= 1
+                ph = ((ph << 1) | 1) & mask
+                mh = (mh << 1) & mask
+                pv = mh | (~(xv | ph) & mask)
+                mv = ph & xv
+            distances.append(score)
+        return distances
+
     @staticmethod
     def longest_common_substring(str1, str2):
         m = [[0] * (1 + len(str2)) for _ in range(1 + len(str1))]
@@ -218,15 +252,20 @@ class Utils:
         return str1[x_longest - longest: x_longest]
 
     @staticmethod
-    def is_similar_strings(s0, s1, do_print=False):
-        l_distance = Utils.string_distance(s0, s1)
-        min_len = min(len(s0), len(s1))
-        if min_len == len(s0):
-            weighted_avg_len = (len(s0) + len(s1) / 2) / 2
+    def similar_strings_threshold(len0, len1):
+        # is_similar_strings holds when the edit distance is below this
+        min_len = min(len0, len1)
+        if min_len == len0:
+            weighted_avg_len = (len0 + len1 / 2) / 2
         else:
-            weighted_avg_len = (len(s0) / 2 + len(s1)) / 2
+            weighted_avg_len = (len0 / 2 + len1) / 2
         threshold = int(weighted_avg_len / 2.1) - int(math.log(weighted_avg_len))
-        threshold = min(threshold, int(min_len * 0.8))
+        return min(threshold, int(min_len * 0.8))
+
+    @staticmethod
+    def is_similar_strings(s0, s1, do_print=False):
+        l_distance = Utils.string_distance(s0, s1)
+        threshold = Utils.similar_strings_threshold(len(s0), len(s1))
         if do_print:
             print(f"Threshold:  {threshold}, Distance: {l_distance}\ns0: {s0}\ns1: {s1}\n")
         return l_distance < threshold